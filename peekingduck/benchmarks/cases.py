@@ -0,0 +1,219 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark cases which time individual nodes and utilities on synthetic data.
+
+Nodes are imported when a case is set up, so a case whose optional
+dependencies are not installed is skipped instead of breaking the suite.
+"""
+
+import itertools
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from peekingduck.benchmarks.synthetic import (
+    make_detections,
+    make_frame,
+    make_raw_predictions,
+    make_track_sequence,
+)
+from peekingduck.utils.bbox import transforms
+
+# Callable timed by the harness, created from the parameters of a case
+Setup = Callable[[Dict[str, Any]], Callable[[], Any]]
+
+
+class BenchmarkCase:  # pylint: disable=too-few-public-methods
+    """A function to benchmark and the grid of parameters to benchmark it
+    with.
+
+    Args:
+        name (str): Name of the case, e.g. the name of the node.
+        setup (Setup): Creates the callable to time from one combination of
+            parameters. Expensive preparation, such as creating nodes and
+            synthetic data, is done here so it is not timed.
+        grid (Dict[str, List[Any]]): Values of each parameter. Every
+            combination of values is benchmarked.
+    """
+
+    def __init__(self, name: str, setup: Setup, grid: Dict[str, List[Any]]) -> None:
+        self.name = name
+        self.setup = setup
+        self.grid = grid
+
+    def iter_params(self) -> Iterator[Dict[str, Any]]:
+        """Yields every combination of parameters in the grid."""
+        keys = list(self.grid)
+        for values in itertools.product(*(self.grid[key] for key in keys)):
+            yield dict(zip(keys, values))
+
+
+def parse_resolution(resolution: str) -> Tuple[int, int]:
+    """Parses a resolution formatted as ``"<width>x<height>"``."""
+    width, height = resolution.split("x")
+    return int(width), int(height)
+
+
+def _setup_bbox_transform(params: Dict[str, Any]) -> Callable[[], Any]:
+    bboxes, _, _ = make_detections(params["num_objects"])
+    width, height = parse_resolution(params["resolution"])
+    pixel_bboxes = bboxes * np.array([width, height, width, height], dtype=np.float32)
+    funcs: Dict[str, Callable[[], Any]] = {
+        "xyxyn2tlwh": lambda: transforms.xyxyn2tlwh(bboxes, height, width),
+        "xyxyn2xyxy": lambda: transforms.xyxyn2xyxy(bboxes, height, width),
+        "xyxy2xywhn": lambda: transforms.xyxy2xywhn(pixel_bboxes, height, width),
+        "tlwh2xyah": lambda: transforms.tlwh2xyah(pixel_bboxes),
+        "xywh2xyxy": lambda: transforms.xywh2xyxy(pixel_bboxes),
+    }
+    return funcs[params["transform"]]
+
+
+def _setup_zone_count(params: Dict[str, Any]) -> Callable[[], Any]:
+    # pylint: disable=import-outside-toplevel
+    from peekingduck.nodes.dabble.zone_count import Node
+
+    width, height = 1280, 720
+    num_zones = params["num_zones"]
+    # vertical strips covering the frame
+    zones = []
+    for i in range(num_zones):
+        left, right = i / num_zones, (i + 1) / num_zones
+        zones.append([[left, 0], [right, 0], [right, 1], [left, 1]])
+    node = Node(resolution=[width, height], zones=zones)
+    bboxes, _, _ = make_detections(params["num_objects"])
+    btm_midpoints = [
+        (int((x1 + x2) / 2 * width), int(y2 * height)) for x1, _, x2, y2 in bboxes
+    ]
+    return lambda: node.run({"btm_midpoint": btm_midpoints})
+
+
+def _setup_draw_bbox(params: Dict[str, Any]) -> Callable[[], Any]:
+    # pylint: disable=import-outside-toplevel
+    from peekingduck.nodes.draw.bbox import Node
+
+    node = Node(show_labels=True, show_scores=True)
+    img = make_frame(*parse_resolution(params["resolution"]))
+    bboxes, labels, scores = make_detections(params["num_objects"])
+    inputs = {
+        "img": img,
+        "bboxes": bboxes,
+        "bbox_labels": labels,
+        "bbox_scores": scores,
+    }
+    return lambda: node.run(inputs)
+
+
+def _setup_tracking(params: Dict[str, Any]) -> Callable[[], Any]:
+    # pylint: disable=import-outside-toplevel
+    from peekingduck.nodes.dabble.tracking import Node
+
+    node = Node(tracking_type=params["tracking_type"])
+    img = make_frame(1280, 720)
+    sequence = make_track_sequence(100, params["num_objects"])
+    _, _, scores = make_detections(params["num_objects"])
+    frame_indices = itertools.cycle(range(len(sequence)))
+
+    def _run() -> Dict[str, Any]:
+        bboxes = sequence[next(frame_indices)]
+        return node.run({"img": img, "bboxes": bboxes, "bbox_scores": scores})
+
+    return _run
+
+
+def _setup_yolox_postprocess(params: Dict[str, Any]) -> Callable[[], Any]:
+    # pylint: disable=import-outside-toplevel
+    import torch
+
+    from peekingduck.nodes.model.yoloxv1.yolox_files.detector import Detector
+    from peekingduck.nodes.model.yoloxv1.yolox_files.model import YOLOX
+
+    class UntrainedDetector(Detector):
+        """Detector with randomly initialized weights. Only the postprocessing
+        is timed, so the weights are not downloaded.
+        """
+
+        def _load_yolox_weights(self) -> YOLOX:
+            return self._get_model(self.model_size)
+
+    num_classes = 80
+    input_size = 416
+    detector = UntrainedDetector(
+        model_dir=Path(),
+        class_names=[str(i) for i in range(num_classes)],
+        detect_ids=[0],
+        model_format="pytorch",
+        model_type="yolox-tiny",
+        num_classes=num_classes,
+        model_size={"yolox-tiny": {"depth": 0.33, "width": 0.375}},
+        model_file={"yolox-tiny": "yolox-tiny.pth"},
+        agnostic_nms=True,
+        fuse=False,
+        half=False,
+        input_size=input_size,
+        iou_threshold=0.45,
+        score_threshold=params["score_threshold"],
+    )
+    prediction = torch.from_numpy(
+        make_raw_predictions(params["num_anchors"], num_classes, input_size)
+    ).to(detector.device)
+
+    def _run() -> Any:
+        # pylint: disable=protected-access
+        return detector._postprocess(
+            prediction.clone(), 1.0, (720, 1280), detector.class_names
+        )
+
+    return _run
+
+
+CASES = [
+    BenchmarkCase(
+        "utils.bbox.transforms",
+        _setup_bbox_transform,
+        {
+            "transform": [
+                "xyxyn2tlwh",
+                "xyxyn2xyxy",
+                "xyxy2xywhn",
+                "tlwh2xyah",
+                "xywh2xyxy",
+            ],
+            "num_objects": [10, 100, 1000],
+            "resolution": ["1280x720"],
+        },
+    ),
+    BenchmarkCase(
+        "dabble.zone_count",
+        _setup_zone_count,
+        {"num_objects": [10, 100, 1000], "num_zones": [1, 4]},
+    ),
+    BenchmarkCase(
+        "draw.bbox",
+        _setup_draw_bbox,
+        {"num_objects": [10, 100], "resolution": ["640x480", "1280x720", "1920x1080"]},
+    ),
+    BenchmarkCase(
+        "dabble.tracking",
+        _setup_tracking,
+        {"num_objects": [10, 50, 200], "tracking_type": ["iou"]},
+    ),
+    BenchmarkCase(
+        "model.yolox.postprocess",
+        _setup_yolox_postprocess,
+        {"num_anchors": [3549, 8400], "score_threshold": [0.25, 0.5]},
+    ),
+]
@@ -0,0 +1,202 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Times benchmark cases and collects the results.
+"""
+
+import fnmatch
+import json
+import logging
+import platform
+import statistics
+import sys
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from peekingduck import __version__
+from peekingduck.benchmarks.cases import CASES, BenchmarkCase
+from peekingduck.benchmarks.store import get_fingerprint
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+def time_callable(
+    func: Callable[[], Any], repeats: int, warmup: int, min_sample_time: float
+) -> List[float]:
+    """Times ``func``. Each sample calls ``func`` enough times to take at
+    least ``min_sample_time`` so that short calls are timed accurately.
+
+    Args:
+        func (Callable[[], Any]): The function to time.
+        repeats (int): Number of samples.
+        warmup (int): Number of untimed calls before sampling.
+        min_sample_time (float): Minimum duration of each sample in seconds.
+
+    Returns:
+        (List[float]): The average duration of a call in each sample, in
+        seconds.
+    """
+    for _ in range(warmup):
+        func()
+    start_time = perf_counter()
+    func()
+    duration = perf_counter() - start_time
+    number = max(1, int(min_sample_time / duration)) if duration > 0 else 1000
+
+    samples = []
+    for _ in range(repeats):
+        start_time = perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((perf_counter() - start_time) / number)
+    return samples
+
+
+def run_case(
+    case: BenchmarkCase,
+    params: Dict[str, Any],
+    repeats: int = 20,
+    warmup: int = 3,
+    min_sample_time: float = 0.001,
+) -> Dict[str, Any]:
+    """Benchmarks one combination of parameters of a case.
+
+    Args:
+        case (BenchmarkCase): The case to benchmark.
+        params (Dict[str, Any]): The parameters to benchmark the case with.
+        repeats (int): Number of samples.
+        warmup (int): Number of untimed calls before sampling.
+        min_sample_time (float): Minimum duration of each sample in seconds.
+
+    Returns:
+        (Dict[str, Any]): The name and parameters of the case with either the
+        latency statistics and samples in milliseconds and the peak memory
+        allocated by one call in KiB, or the reason the case was skipped if
+        its optional dependencies are not installed.
+    """
+    result: Dict[str, Any] = {"case": case.name, "params": params}
+    try:
+        func = case.setup(params)
+    except ImportError as error:
+        logger.warning(f"Skipping {case.name} {params}: {error}")
+        result["skipped"] = str(error)
+        return result
+    samples = [
+        sample * 1000
+        for sample in time_callable(func, repeats, warmup, min_sample_time)
+    ]
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    result.update(
+        {
+            "repeats": repeats,
+            "mean_ms": statistics.mean(samples),
+            "median_ms": statistics.median(samples),
+            "min_ms": min(samples),
+            "max_ms": max(samples),
+            "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "peak_memory_kb": peak_memory / 1024,
+            "samples_ms": samples,
+        }
+    )
+    return result
+
+
+def run_benchmarks(
+    cases: Optional[List[BenchmarkCase]] = None,
+    name_filter: Optional[str] = None,
+    repeats: int = 20,
+    warmup: int = 3,
+    min_sample_time: float = 0.001,
+) -> Dict[str, Any]:
+    """Benchmarks every combination of parameters of each case.
+
+    Args:
+        cases (Optional[List[BenchmarkCase]]): The cases to benchmark. If
+            ``None``, uses all built-in cases.
+        name_filter (Optional[str]): Only benchmark cases with names matching
+            this shell-style pattern, e.g. ``"dabble.*"``.
+        repeats (int): Number of samples of each combination.
+        warmup (int): Number of untimed calls before sampling.
+        min_sample_time (float): Minimum duration of each sample in seconds.
+
+    Returns:
+        (Dict[str, Any]): Metadata of the environment and the result of each
+        combination, see :func:`run_case`.
+    """
+    if cases is None:
+        cases = CASES
+    results = []
+    for case in cases:
+        if name_filter is not None and not fnmatch.fnmatch(case.name, name_filter):
+            continue
+        for params in case.iter_params():
+            logger.info(f"Benchmarking {case.name} {params}")
+            results.append(run_case(case, params, repeats, warmup, min_sample_time))
+    return {"metadata": get_metadata(), "results": results}
+
+
+def get_metadata() -> Dict[str, Any]:
+    """Describes the environment the benchmarks were run in."""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "peekingduck": __version__,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "fingerprint": get_fingerprint(),
+    }
+
+
+def save_results(results: Dict[str, Any], output_path: Union[Path, str]) -> None:
+    """Writes benchmark results to a JSON file.
+
+    Args:
+        results (Dict[str, Any]): Results from :func:`run_benchmarks`.
+        output_path (Union[Path, str]): Path of the JSON file.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as outfile:
+        json.dump(results, outfile, indent=2)
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """Formats benchmark results as a text table."""
+    rows = []
+    for result in results["results"]:
+        params = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+        name = f"{result['case']} [{params}]"
+        if "skipped" in result:
+            rows.append((name, "skipped"))
+        else:
+            rows.append(
+                (
+                    name,
+                    f"{result['median_ms']:10.4f} ms (min {result['min_ms']:.4f}, "
+                    f"stdev {result['stdev_ms']:.4f})",
+                )
+            )
+    name_width = max((len(name) for name, _ in rows), default=0)
+    return "\n".join(f"{name:<{name_width}}  {value}" for name, value in rows)
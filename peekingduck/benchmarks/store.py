@@ -0,0 +1,237 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Stores benchmark results per machine and detects regressions against a
+baseline.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from scipy.stats import mannwhitneyu
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+BASELINE_LABEL = "baseline"
+LATEST_LABEL = "latest"
+DEFAULT_RESULTS_DIR = Path("PeekingDuck") / "data" / "benchmarks"
+
+
+def get_fingerprint() -> Dict[str, Any]:
+    """Describes the hardware and interpreter which affect benchmark results.
+
+    Returns:
+        (Dict[str, Any]): The machine properties and an ``id`` hashed from
+        them, which is the same for every run on the same machine.
+    """
+    fingerprint: Dict[str, Any] = {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": f"{sys.version_info.major}.{sys.version_info.minor}",
+    }
+    digest = hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode("utf-8"))
+    fingerprint["id"] = digest.hexdigest()[:12]
+    return fingerprint
+
+
+def get_run_path(
+    label: str, results_dir: Union[Path, str] = DEFAULT_RESULTS_DIR
+) -> Path:
+    """Returns the path of the stored run ``label`` of this machine.
+
+    Args:
+        label (str): Name of the run, e.g. ``"baseline"`` or a commit hash.
+        results_dir (Union[Path, str]): Directory of the results store.
+
+    Returns:
+        (Path): ``<results_dir>/<fingerprint id>/<label>.json``.
+    """
+    return Path(results_dir) / get_fingerprint()["id"] / f"{label}.json"
+
+
+def save_run(
+    results: Dict[str, Any],
+    label: str,
+    results_dir: Union[Path, str] = DEFAULT_RESULTS_DIR,
+) -> Path:
+    """Stores benchmark results under ``label`` for this machine, replacing
+    any run with the same label.
+
+    Args:
+        results (Dict[str, Any]): Results from
+            :func:`~peekingduck.benchmarks.harness.run_benchmarks`.
+        label (str): Name of the run.
+        results_dir (Union[Path, str]): Directory of the results store.
+
+    Returns:
+        (Path): Path of the stored run.
+    """
+    run_path = get_run_path(label, results_dir)
+    run_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(run_path, "w", encoding="utf-8") as outfile:
+        json.dump(results, outfile, indent=2)
+    return run_path
+
+
+def load_run(
+    label_or_path: Union[Path, str],
+    results_dir: Union[Path, str] = DEFAULT_RESULTS_DIR,
+) -> Dict[str, Any]:
+    """Loads stored benchmark results.
+
+    Args:
+        label_or_path (Union[Path, str]): Path of a results JSON file, or the
+            label of a run of this machine in the results store.
+        results_dir (Union[Path, str]): Directory of the results store.
+
+    Returns:
+        (Dict[str, Any]): The benchmark results.
+
+    Raises:
+        FileNotFoundError: Neither a file nor a stored run exists.
+    """
+    run_path = Path(label_or_path)
+    if not run_path.is_file():
+        run_path = get_run_path(str(label_or_path), results_dir)
+    if not run_path.is_file():
+        raise FileNotFoundError(
+            f"{label_or_path} is neither a results file nor a stored run in "
+            f"{run_path.parent}."
+        )
+    with open(run_path, encoding="utf-8") as infile:
+        return json.load(infile)
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    alpha: float = 0.01,
+    min_slowdown: float = 0.05,
+    max_memory_increase: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """Compares every benchmark in ``current`` with the same benchmark in
+    ``baseline``.
+
+    A benchmark is slower if a one-sided Mann-Whitney U test on the latency
+    samples is significant at ``alpha`` and the median latency increased by
+    more than ``min_slowdown``. Requiring both ignores significant but
+    negligible changes as well as large changes caused by noise. Peak memory
+    is deterministic, so it is compared against ``max_memory_increase``
+    directly.
+
+    Args:
+        baseline (Dict[str, Any]): The baseline results.
+        current (Dict[str, Any]): The results to check.
+        alpha (float): Significance level of the latency test.
+        min_slowdown (float): Minimum relative increase of the median latency
+            which is reported.
+        max_memory_increase (float): Maximum relative increase of the peak
+            memory which is not reported.
+
+    Returns:
+        (List[Dict[str, Any]]): For each benchmark, the baseline and current
+        median latency and peak memory, the relative changes, the p-value,
+        and ``regressions``, which lists ``"latency"`` and/or ``"memory"`` if
+        they regressed. Benchmarks which are not in both results are skipped.
+    """
+    baseline_fingerprint = baseline["metadata"].get("fingerprint", {}).get("id")
+    current_fingerprint = current["metadata"].get("fingerprint", {}).get("id")
+    if baseline_fingerprint != current_fingerprint:
+        logger.warning(
+            "Baseline was measured on a different machine, latency changes may "
+            "not be caused by the code."
+        )
+    baseline_results = {_get_key(result): result for result in baseline["results"]}
+    comparisons = []
+    for result in current["results"]:
+        base = baseline_results.get(_get_key(result))
+        if base is None or "skipped" in base or "skipped" in result:
+            continue
+        _, p_value = mannwhitneyu(
+            base["samples_ms"], result["samples_ms"], alternative="less"
+        )
+        latency_change = result["median_ms"] / base["median_ms"] - 1
+        memory_change = _relative_change(
+            base.get("peak_memory_kb"), result.get("peak_memory_kb")
+        )
+        regressions = []
+        if p_value < alpha and latency_change > min_slowdown:
+            regressions.append("latency")
+        if memory_change is not None and memory_change > max_memory_increase:
+            regressions.append("memory")
+        comparisons.append(
+            {
+                "case": result["case"],
+                "params": result["params"],
+                "baseline_median_ms": base["median_ms"],
+                "median_ms": result["median_ms"],
+                "latency_change": latency_change,
+                "p_value": float(p_value),
+                "baseline_peak_memory_kb": base.get("peak_memory_kb"),
+                "peak_memory_kb": result.get("peak_memory_kb"),
+                "memory_change": memory_change,
+                "regressions": regressions,
+            }
+        )
+    return comparisons
+
+
+def format_comparisons(comparisons: List[Dict[str, Any]]) -> str:
+    """Formats the output of :func:`compare_results` as a text table."""
+    rows = []
+    for row in comparisons:
+        params = ", ".join(f"{key}={value}" for key, value in row["params"].items())
+        memory = (
+            f"{row['memory_change']:+7.1%}"
+            if row["memory_change"] is not None
+            else "    n/a"
+        )
+        status = "REGRESSION (" + ", ".join(row["regressions"]) + ")"
+        rows.append(
+            (
+                f"{row['case']} [{params}]",
+                f"{row['baseline_median_ms']:10.4f} -> {row['median_ms']:10.4f} ms "
+                f"({row['latency_change']:+7.1%}, p={row['p_value']:.3f}), "
+                f"memory {memory}  {status if row['regressions'] else 'ok'}",
+            )
+        )
+    name_width = max((len(name) for name, _ in rows), default=0)
+    return "\n".join(f"{name:<{name_width}}  {value}" for name, value in rows)
+
+
+def _get_key(result: Dict[str, Any]) -> str:
+    """Identifies a benchmark by its case and parameters."""
+    return json.dumps([result["case"], result["params"]], sort_keys=True)
+
+
+def _relative_change(
+    baseline: Optional[float], current: Optional[float]
+) -> Optional[float]:
+    """Returns the relative change from ``baseline`` to ``current``, or
+    ``None`` if either is unavailable.
+    """
+    if baseline is None or current is None:
+        return None
+    if baseline == 0:
+        return 0.0 if current == 0 else float("inf")
+    return current / baseline - 1
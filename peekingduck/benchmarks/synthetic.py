@@ -0,0 +1,108 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Deterministic synthetic frames and detections for benchmarks.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+LABELS = ["person", "car", "bicycle", "dog"]
+
+
+def make_frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """Creates a BGR image filled with random noise.
+
+    Args:
+        width (int): Width of the image.
+        height (int): Height of the image.
+        seed (int): Seed of the random number generator.
+
+    Returns:
+        (np.ndarray): An image of shape (height, width, 3) and dtype uint8.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+def make_detections(
+    num_objects: int, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Creates random detections which lie within the frame.
+
+    Args:
+        num_objects (int): Number of detections.
+        seed (int): Seed of the random number generator.
+
+    Returns:
+        (Tuple[np.ndarray, np.ndarray, np.ndarray]): Bounding boxes in
+        normalized (x1, y1, x2, y2) format, labels, and scores.
+    """
+    rng = np.random.default_rng(seed)
+    top_left = rng.uniform(0.0, 0.8, size=(num_objects, 2))
+    size = rng.uniform(0.05, 0.2, size=(num_objects, 2))
+    bboxes = np.hstack([top_left, np.clip(top_left + size, 0.0, 1.0)])
+    labels = np.array([LABELS[i % len(LABELS)] for i in range(num_objects)])
+    scores = rng.uniform(0.3, 1.0, size=num_objects)
+    return bboxes.astype(np.float32), labels, scores.astype(np.float32)
+
+
+def make_track_sequence(
+    num_frames: int, num_objects: int, seed: int = 0
+) -> List[np.ndarray]:
+    """Creates the bounding boxes of objects moving a small random step every
+    frame, as seen by a tracker.
+
+    Args:
+        num_frames (int): Number of frames.
+        num_objects (int): Number of objects in each frame.
+        seed (int): Seed of the random number generator.
+
+    Returns:
+        (List[np.ndarray]): Bounding boxes in normalized (x1, y1, x2, y2)
+        format for each frame.
+    """
+    rng = np.random.default_rng(seed)
+    bboxes, _, _ = make_detections(num_objects, seed)
+    sequence = []
+    for _ in range(num_frames):
+        step = rng.uniform(-0.005, 0.005, size=(num_objects, 2))
+        bboxes = np.clip(bboxes + np.tile(step, 2), 0.0, 1.0)
+        sequence.append(bboxes.astype(np.float32))
+    return sequence
+
+
+def make_raw_predictions(
+    num_anchors: int, num_classes: int, input_size: int, seed: int = 0
+) -> np.ndarray:
+    """Creates raw predictions in the (x, y, w, h, objectness, class scores)
+    layout of the YOLOX head.
+
+    Args:
+        num_anchors (int): Number of predictions.
+        num_classes (int): Number of object classes.
+        input_size (int): Size of the square model input in pixels.
+        seed (int): Seed of the random number generator.
+
+    Returns:
+        (np.ndarray): Predictions of shape (num_anchors, 5 + num_classes).
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, input_size, size=(num_anchors, 2))
+    sizes = rng.uniform(8, input_size / 4, size=(num_anchors, 2))
+    objectness = rng.uniform(0.0, 1.0, size=(num_anchors, 1))
+    class_scores = rng.uniform(0.0, 1.0, size=(num_anchors, num_classes))
+    return np.hstack([centers, sizes, objectness, class_scores]).astype(np.float32)
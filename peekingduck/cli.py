@@ -25,10 +25,12 @@ import peekingduck.commands.model_hub.mediapipe
 
 # pylint: enable=unused-import
 from peekingduck import __version__
+from peekingduck.commands.bench import bench, bench_compare
 from peekingduck.commands.core import init, run, verify_install
 from peekingduck.commands.create_node import create_node
 from peekingduck.commands.model_hub import model_hub
 from peekingduck.commands.nodes import nodes
+from peekingduck.commands.quantize import quantize
 
 
 @click.group()
@@ -39,9 +41,12 @@ def cli() -> None:
     """
 
 
+cli.add_command(bench)
+cli.add_command(bench_compare)
 cli.add_command(create_node)
 cli.add_command(init)
 cli.add_command(model_hub)
 cli.add_command(nodes)
+cli.add_command(quantize)
 cli.add_command(run)
 cli.add_command(verify_install)
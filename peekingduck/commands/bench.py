@@ -0,0 +1,164 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""PeekingDuck CLI `bench` command."""
+
+import sys
+from typing import Optional
+
+import click
+
+from peekingduck.benchmarks.cases import CASES
+from peekingduck.benchmarks.harness import format_results, run_benchmarks, save_results
+from peekingduck.benchmarks.store import (
+    BASELINE_LABEL,
+    DEFAULT_RESULTS_DIR,
+    LATEST_LABEL,
+    compare_results,
+    format_comparisons,
+    load_run,
+    save_run,
+)
+from peekingduck.utils.logger import LoggerSetup
+
+
+@click.command()
+@click.option(
+    "--filter",
+    "name_filter",
+    default=None,
+    help="Only run benchmarks with names matching this pattern, e.g. 'dabble.*'",
+)
+@click.option(
+    "--repeats", default=20, type=click.IntRange(min=1), help="Samples per benchmark"
+)
+@click.option(
+    "--warmup",
+    default=3,
+    type=click.IntRange(min=0),
+    help="Untimed calls per benchmark",
+)
+@click.option(
+    "--output",
+    default=None,
+    type=click.Path(),
+    help="JSON file to write the results to",
+)
+@click.option(
+    "--save",
+    default=None,
+    help="Store the results under this label, e.g. 'baseline' or a commit hash",
+)
+@click.option(
+    "--results_dir",
+    default=str(DEFAULT_RESULTS_DIR),
+    type=click.Path(),
+    help="Directory of the benchmark results store",
+)
+@click.option(
+    "--list", "list_cases", default=False, is_flag=True, help="List the benchmarks"
+)
+@click.option(
+    "--log_level",
+    default="warning",
+    help="""Modify log level {"critical", "error", "warning", "info", "debug"}""",
+)
+def bench(  # pylint: disable=too-many-arguments
+    name_filter: Optional[str],
+    repeats: int,
+    warmup: int,
+    output: Optional[str],
+    save: Optional[str],
+    results_dir: str,
+    list_cases: bool,
+    log_level: str,
+) -> None:
+    """Runs micro-benchmarks of individual nodes and utilities on
+    deterministic synthetic frames and detections. No network access or model
+    weights are required. Every run is stored per machine as 'latest', and
+    under another label with --save, for comparison with bench-compare.
+    """
+    LoggerSetup.set_log_level(log_level)
+    if list_cases:
+        for case in CASES:
+            params = ", ".join(f"{key}={values}" for key, values in case.grid.items())
+            click.echo(f"{case.name}: {params}")
+        return
+
+    results = run_benchmarks(name_filter=name_filter, repeats=repeats, warmup=warmup)
+    click.echo(format_results(results))
+    if output is not None:
+        save_results(results, output)
+        click.echo(f"Results written to {output}")
+    run_path = save_run(results, LATEST_LABEL, results_dir)
+    if save is not None:
+        save_run(results, save, results_dir)
+    click.echo(f"Results stored in {run_path.parent}")
+
+
+@click.command()
+@click.argument("baseline", default=BASELINE_LABEL)
+@click.argument("current", default=LATEST_LABEL)
+@click.option(
+    "--results_dir",
+    default=str(DEFAULT_RESULTS_DIR),
+    type=click.Path(),
+    help="Directory of the benchmark results store",
+)
+@click.option(
+    "--alpha",
+    default=0.01,
+    type=click.FloatRange(0, 1),
+    help="Significance level of the latency test",
+)
+@click.option(
+    "--min_slowdown",
+    default=0.05,
+    type=click.FloatRange(min=0),
+    help="Minimum relative increase of the median latency to report",
+)
+@click.option(
+    "--max_memory_increase",
+    default=0.1,
+    type=click.FloatRange(min=0),
+    help="Maximum relative increase of the peak memory which is not reported",
+)
+def bench_compare(  # pylint: disable=too-many-arguments
+    baseline: str,
+    current: str,
+    results_dir: str,
+    alpha: float,
+    min_slowdown: float,
+    max_memory_increase: float,
+) -> None:
+    """Compares the benchmark results CURRENT against BASELINE and exits with
+    status 1 if any benchmark became significantly slower or uses more memory.
+    Each argument is either a results JSON file or the label of a run stored
+    for this machine with `peekingduck bench --save`.
+    """
+    try:
+        comparisons = compare_results(
+            load_run(baseline, results_dir),
+            load_run(current, results_dir),
+            alpha,
+            min_slowdown,
+            max_memory_increase,
+        )
+    except FileNotFoundError as error:
+        raise click.ClickException(str(error)) from error
+    click.echo(format_comparisons(comparisons))
+    num_regressions = sum(bool(row["regressions"]) for row in comparisons)
+    click.echo(f"{num_regressions} of {len(comparisons)} benchmarks regressed")
+    if num_regressions > 0:
+        sys.exit(1)
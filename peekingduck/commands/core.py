@@ -14,6 +14,7 @@
 
 """Core PeekingDuck CLI commands."""
 
+import ast
 import locale
 import logging
 import os
@@ -74,12 +75,56 @@ def init(custom_folder_name: str) -> None:
     is_flag=True,
     help="Launch PeekingDuck viewer",
 )
-def run(  # pylint: disable=too-many-arguments
+@click.option(
+    "--executor",
+    default="sequential",
+    type=click.Choice(
+        ["sequential", "pipelined", "parallel", "batched", "multi_stream", "sharded"]
+    ),
+    help="Strategy used to execute the nodes of the pipeline",
+)
+@click.option(
+    "--executor_config",
+    default="None",
+    help="""Modify executor settings by wrapping desired settings in a JSON string.\n
+        Example: --executor_config '{"queue_size": 8}'""",
+)
+@click.option(
+    "--profile",
+    default=False,
+    is_flag=True,
+    help="Report the latency percentiles of every node at the end of the run",
+)
+@click.option(
+    "--profile_output",
+    default="profile.json",
+    type=click.Path(),
+    help="JSON file to write the latency report to when profiling",
+)
+@click.option(
+    "--trace_output",
+    default=None,
+    type=click.Path(),
+    help="Write a Chrome Trace Event file of every node run to this path",
+)
+@click.option(
+    "--cache_results",
+    default=False,
+    is_flag=True,
+    help="Reuse the outputs of model nodes on repeated frames",
+)
+def run(  # pylint: disable=too-many-arguments,too-many-locals
     config_path: str,
     log_level: str,
     node_config: str,
     num_iter: int,
     viewer: bool,
+    executor: str,
+    executor_config: str,
+    profile: bool,
+    profile_output: str,
+    trace_output: Optional[str],
+    cache_results: bool,
     nodes_parent_dir: str = "src",
 ) -> None:
     """Runs PeekingDuck"""
@@ -108,6 +153,12 @@ def run(  # pylint: disable=too-many-arguments
             config_updates_cli=node_config,
             custom_nodes_parent_subdir=nodes_parent_dir,
             num_iter=num_iter,
+            executor=executor,
+            executor_config=ast.literal_eval(executor_config),
+            profile=profile,
+            profile_output=profile_output,
+            trace_output=trace_output,
+            cache_results=cache_results,
         )
         end_time = perf_counter()
         logger.debug(f"Startup time = {end_time - start_time:.2f} sec")
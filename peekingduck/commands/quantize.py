@@ -0,0 +1,182 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""PeekingDuck CLI `quantize` command."""
+
+import ast
+import importlib
+import json
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+import cv2
+import numpy as np
+
+from peekingduck.utils.logger import LoggerSetup
+from peekingduck.utils.quantization import Detections, compare_detections
+
+QUANTIZABLE_NODES = ["model.mask_rcnn", "model.yolox"]
+IMAGE_EXTENSIONS = {".jpeg", ".jpg", ".png"}
+# Fraction of IMAGES_DIR held out for evaluation when --eval_dir is not set
+HOLDOUT_FRACTION = 0.2
+
+
+@click.command()
+@click.argument("node_name", type=click.Choice(QUANTIZABLE_NODES))
+@click.argument("images_dir", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--mode",
+    default="static",
+    type=click.Choice(["dynamic", "static"]),
+    help="Quantize linear layers only (dynamic) or also calibrate the backbone",
+)
+@click.option(
+    "--node_config",
+    default="None",
+    help="""Modify node configs by wrapping desired configs in a JSON string.\n
+        Example: --node_config '{"model_type": "yolox-s"}'""",
+)
+@click.option(
+    "--eval_dir",
+    default=None,
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of images to compare the float and quantized models on. "
+    "If not set, a fifth of the images in IMAGES_DIR are held out from "
+    "calibration for the comparison",
+)
+@click.option(
+    "--num_images",
+    default=100,
+    type=click.IntRange(min=1),
+    help="Maximum number of images to read from each directory",
+)
+@click.option(
+    "--report",
+    default=None,
+    type=click.Path(),
+    help="JSON file to write the accuracy drift and speedup report to",
+)
+@click.option(
+    "--log_level",
+    default="info",
+    help="""Modify log level {"critical", "error", "warning", "info", "debug"}""",
+)
+def quantize(  # pylint: disable=too-many-arguments, too-many-locals
+    node_name: str,
+    images_dir: str,
+    eval_dir: Optional[str],
+    mode: str,
+    node_config: str,
+    num_images: int,
+    report: Optional[str],
+    log_level: str,
+) -> None:
+    """Quantizes the model of NODE_NAME to INT8 for faster inference on the
+    CPU, calibrating on the images in IMAGES_DIR, and caches the quantized
+    model next to the weights. Set the `quantization` config of the node to
+    use it. The detections and latency of the quantized model are compared
+    with the float model, both on the CPU, on images which were not used for
+    calibration.
+    """
+    LoggerSetup.set_log_level(log_level)
+    calibration_images, eval_images = _split_images(images_dir, eval_dir, num_images)
+
+    node = _load_node(node_name, ast.literal_eval(node_config) or {})
+    try:
+        node.model.to_cpu()
+        float_results, float_latency = _predict(node.model, eval_images)
+        quantized_path = node.model.quantize(mode, calibration_images)
+    except ValueError as error:
+        raise click.ClickException(str(error)) from error
+    quantized_results, quantized_latency = _predict(node.model, eval_images)
+
+    stats: Dict[str, Any] = {
+        "node": node_name,
+        "mode": mode,
+        "quantized_model": str(quantized_path),
+        "num_calibration_images": len(calibration_images),
+        "num_eval_images": len(eval_images),
+        "float_latency_ms": float_latency * 1000,
+        "quantized_latency_ms": quantized_latency * 1000,
+        "speedup": float_latency / quantized_latency,
+        **compare_detections(float_results, quantized_results),
+    }
+    click.echo(f"Quantized model saved to {quantized_path}")
+    click.echo(
+        f"Latency: {stats['float_latency_ms']:.1f} ms (float) -> "
+        f"{stats['quantized_latency_ms']:.1f} ms (int8), "
+        f"{stats['speedup']:.2f}x speedup"
+    )
+    click.echo(
+        f"Detections matched: {stats['recall']:.1%} of float, "
+        f"{stats['precision']:.1%} of int8, mean IoU {stats['mean_iou']:.3f}, "
+        f"mean score difference {stats['mean_score_diff']:.3f}"
+    )
+    if report is not None:
+        with open(report, "w", encoding="utf-8") as outfile:
+            json.dump(stats, outfile, indent=2)
+        click.echo(f"Report written to {report}")
+
+
+def _load_node(node_name: str, config: Dict[str, Any]) -> Any:
+    """Creates the float model node to quantize."""
+    module = importlib.import_module(f"peekingduck.nodes.{node_name}")
+    return module.Node(**{**config, "quantization": None})
+
+
+def _predict(model: Any, images: List[np.ndarray]) -> Tuple[List[Detections], float]:
+    """Returns the bboxes, labels, and scores predicted by ``model`` on each
+    image, and the mean latency after an untimed warm-up call.
+    """
+    model.predict(images[0])
+    results = []
+    start_time = perf_counter()
+    for image in images:
+        bboxes, labels, scores = model.predict(image)[:3]
+        results.append((bboxes, labels, scores))
+    return results, (perf_counter() - start_time) / len(images)
+
+
+def _split_images(
+    images_dir: str, eval_dir: Optional[str], num_images: int
+) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    """Reads the calibration images, and the evaluation images from
+    ``eval_dir``, or holds them out from the images in ``images_dir``.
+    """
+    images = _read_images(Path(images_dir), num_images)
+    if not images:
+        raise click.ClickException(f"No images found in {images_dir}")
+    if eval_dir is not None:
+        eval_images = _read_images(Path(eval_dir), num_images)
+        if not eval_images:
+            raise click.ClickException(f"No images found in {eval_dir}")
+        return images, eval_images
+    if len(images) < 2:
+        raise click.ClickException(
+            f"At least 2 images are needed in {images_dir} to hold out images for "
+            "evaluation, or set --eval_dir"
+        )
+    num_eval = max(int(len(images) * HOLDOUT_FRACTION), 1)
+    return images[:-num_eval], images[-num_eval:]
+
+
+def _read_images(images_dir: Path, num_images: int) -> List[np.ndarray]:
+    """Reads up to ``num_images`` images from ``images_dir`` in sorted order."""
+    paths = sorted(
+        path for path in images_dir.iterdir() if path.suffix.lower() in IMAGE_EXTENSIONS
+    )
+    images = [cv2.imread(str(path)) for path in paths[:num_images]]
+    return [image for image in images if image is not None]
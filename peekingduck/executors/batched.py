@@ -0,0 +1,154 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Batched executor which passes several frames at a time through the nodes.
+"""
+
+import logging
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline import Pipeline, get_node_inputs
+
+
+class BatchedExecutor:
+    """Accumulates frames from the first node of the pipeline into
+    micro-batches and passes each batch through the remaining nodes using
+    :py:meth:`AbstractNode.run_batch() <peekingduck.nodes.abstract_node.AbstractNode.run_batch>`.
+    Batch-aware nodes, such as :mod:`model.yolox`, run the whole batch in a
+    single inference call while other nodes transparently fall back to running
+    each frame in order.
+
+    Each frame starts from an empty data pool. A batch is dispatched once it
+    has ``batch_size`` frames, once ``max_wait_ms`` has passed since its first
+    frame was read, or when the input ends.
+
+    If the first node reads several frames per run and provides a
+    ``split_frames()`` method, such as :mod:`input.multi_visual`, each run is
+    split into one data pool per frame and all of them are added to the same
+    batch, so a batch never splits the frames of one run.
+
+    Args:
+        pipeline (:obj:`Pipeline`): The pipeline to execute.
+        num_iter (int): Stop the pipeline after this number of frames. ``0``
+            runs the pipeline until the input is exhausted.
+        batch_size (int): Maximum number of frames in a batch.
+        max_wait_ms (:obj:`float` | :obj:`None`): Maximum time to spend
+            reading frames for a batch. If ``None``, always waits for
+            ``batch_size`` frames.
+
+    Raises:
+        ValueError: ``batch_size`` is not positive or ``max_wait_ms`` is
+            negative.
+    """
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        num_iter: int = 0,
+        batch_size: int = 4,
+        max_wait_ms: Optional[float] = None,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        if max_wait_ms is not None and max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative.")
+        self.pipeline = pipeline
+        self.num_iter = num_iter
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self.num_frames = 0
+
+    def run(self) -> int:
+        """Runs the pipeline until the input is exhausted, a node ends the
+        pipeline, or ``num_iter`` frames have been processed.
+
+        Returns:
+            (int): The number of frames processed.
+        """
+        num_batches = 0
+        while not self.pipeline.terminate:
+            frames = self._read_batch()
+            self.run_nodes(self.pipeline.nodes[1:], frames)
+            self.pipeline.data = frames[-1]
+            num_batches += 1
+            if any(frame.get("pipeline_end", False) for frame in frames):
+                self.pipeline.terminate = True
+            elif 0 < self.num_iter <= self.num_frames:
+                self.logger.info(
+                    f"Stopping pipeline after {self.num_frames} iterations"
+                )
+                break
+        self.logger.info(
+            f"Processed {self.num_frames} frames in {num_batches} batches "
+            f"(average batch size = {self.num_frames / max(1, num_batches):.2f})"
+        )
+        return self.num_frames
+
+    @staticmethod
+    def run_nodes(nodes: List[AbstractNode], frames: List[Dict[str, Any]]) -> None:
+        """Runs each of ``nodes`` on every frame in ``frames`` as a batch,
+        following the ``pipeline_end`` handling of the sequential runner.
+
+        Args:
+            nodes (:obj:`List[AbstractNode]`): The nodes to run, in pipeline
+                order.
+            frames (:obj:`List[Dict[str, Any]]`): The data pool of each frame
+                in the batch.
+        """
+        for node in nodes:
+            batch = [
+                frame
+                for frame in frames
+                if not frame.get("pipeline_end", False) or "pipeline_end" in node.inputs
+            ]
+            if not batch:
+                continue
+            inputs_list = [get_node_inputs(node, frame) for frame in batch]
+            for frame in batch:
+                node.callback_list.on_run_begin(frame)
+            outputs_list = node.run_batch(inputs_list)
+            for frame, outputs in zip(batch, outputs_list):
+                frame.update(outputs)
+                node.callback_list.on_run_end(frame)
+
+    def _read_batch(self) -> List[Dict[str, Any]]:
+        """Runs the first node of the pipeline until a batch is complete."""
+        source = self.pipeline.nodes[0]
+        frames: List[Dict[str, Any]] = []
+        start_time = perf_counter()
+        split_frames = getattr(source, "split_frames", None)
+        while True:
+            data: Dict[str, Any] = {}
+            source.callback_list.on_run_begin(data)
+            data.update(source.run(get_node_inputs(source, data)))
+            source.callback_list.on_run_end(data)
+            for frame in split_frames(data) if split_frames else [data]:
+                frames.append(frame)
+                if frame.get("pipeline_end", False):
+                    return frames
+                self.num_frames += 1
+            if (
+                len(frames) >= self.batch_size
+                or 0 < self.num_iter <= self.num_frames
+                or (
+                    self.max_wait_ms is not None
+                    and (perf_counter() - start_time) * 1000 >= self.max_wait_ms
+                )
+            ):
+                break
+        return frames
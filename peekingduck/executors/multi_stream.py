@@ -0,0 +1,204 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Multi-stream executor which serves several input sources with one pipeline.
+"""
+
+import copy
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline import Pipeline, get_node_inputs
+
+# Model nodes which keep state across frames, e.g. trackers, and therefore
+# cannot be shared between streams
+STATEFUL_MODEL_NODES = {"model.fairmot", "model.jde"}
+
+
+class MultiStreamExecutor:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Runs one pipeline definition over several ``input.visual`` sources.
+
+    Model nodes are stateless (apart from the stateful trackers in
+    ``STATEFUL_MODEL_NODES``), so a single instance of each is shared by all
+    streams and receives the frames of every stream in one
+    :py:meth:`AbstractNode.run_batch() <peekingduck.nodes.abstract_node.AbstractNode.run_batch>`
+    call, or one frame at a time in stream order if ``batch`` is ``False``.
+    Every other node, e.g. :mod:`dabble.tracking`, :mod:`dabble.statistics`,
+    and :mod:`output.media_writer`, is instantiated once per stream from the
+    configuration of the pipeline node so its state stays isolated. Each
+    stream also has its own data pool, in which :term:`source_id` is set to
+    the index of the stream, so that shared nodes can tell the frames of the
+    streams apart, e.g. when the motion gate reuses the outputs of a gated
+    model node.
+
+    Args:
+        pipeline (:obj:`Pipeline`): The pipeline to execute. Its first node
+            must be ``input.visual``.
+        num_iter (int): Stop the pipeline after this number of iterations,
+            where each iteration reads one frame from every stream. ``0`` runs
+            the pipeline until every stream is exhausted.
+        sources (:obj:`List[Union[int, str]]`): The ``source`` of the
+            ``input.visual`` node of each stream. If the first source is the
+            one configured in the pipeline, the pipeline's own nodes are used
+            for the first stream.
+        batch (bool): Whether shared model nodes should receive the frames of
+            all streams as a single batch.
+
+    Raises:
+        ValueError: ``sources`` is empty or the pipeline does not start with
+            ``input.visual``.
+    """
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        num_iter: int = 0,
+        sources: Optional[List[Union[int, str]]] = None,
+        batch: bool = True,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        if not sources:
+            raise ValueError("sources must contain at least one input source.")
+        if pipeline.nodes[0].node_name != "input.visual":
+            raise ValueError(
+                "The first node of the pipeline must be input.visual, "
+                f"got {pipeline.nodes[0].node_name}."
+            )
+        self.pipeline = pipeline
+        self.num_iter = num_iter
+        self.batch = batch
+        self.shared = [self._is_shareable(node) for node in pipeline.nodes]
+        self.streams = [
+            self._create_stream_nodes(idx, source) for idx, source in enumerate(sources)
+        ]
+        self.stream_data: List[Dict[str, Any]] = [
+            {"source_id": stream_idx} for stream_idx in range(len(self.streams))
+        ]
+        self.num_frames = [0] * len(self.streams)
+
+    def run(self) -> int:
+        """Runs the pipeline until every stream is exhausted, or ``num_iter``
+        iterations have been run.
+
+        Returns:
+            (int): The number of iterations run.
+        """
+        shared_names = [
+            node.name
+            for node, shared in zip(self.pipeline.nodes, self.shared)
+            if shared
+        ]
+        self.logger.info(
+            f"Serving {len(self.streams)} streams with shared nodes: {shared_names}"
+        )
+        active = list(range(len(self.streams)))
+        num_iter = 0
+        try:
+            while active:
+                for idx, node in enumerate(self.pipeline.nodes):
+                    self._run_node(idx, node, active)
+                for stream_idx in list(active):
+                    if self.stream_data[stream_idx].get("pipeline_end", False):
+                        self.logger.info(
+                            f"Stream {stream_idx} ended after "
+                            f"{self.num_frames[stream_idx]} frames"
+                        )
+                        active.remove(stream_idx)
+                    else:
+                        self.num_frames[stream_idx] += 1
+                num_iter += 1
+                if 0 < self.num_iter <= num_iter:
+                    self.logger.info(f"Stopping pipeline after {num_iter} iterations")
+                    break
+        finally:
+            # the pipeline's own input node is released by the runner
+            for nodes in self.streams:
+                if nodes[0] is not self.pipeline.nodes[0]:
+                    nodes[0].release_resources()
+        self.pipeline.data = self.stream_data[0]
+        self.pipeline.terminate = True
+        return num_iter
+
+    def _create_stream_nodes(
+        self, stream_idx: int, source: Union[int, str]
+    ) -> List[AbstractNode]:
+        """Creates the nodes of a stream. Shared nodes are reused, all other
+        nodes are instantiated from the configuration of the pipeline node.
+        """
+        input_node = self.pipeline.nodes[0]
+        if stream_idx == 0 and source == input_node.config["source"]:
+            return self.pipeline.nodes
+        if stream_idx == 0:
+            # the pipeline's own input node will not be used
+            input_node.release_resources()
+
+        nodes = []
+        for node, shared in zip(self.pipeline.nodes, self.shared):
+            if shared:
+                nodes.append(node)
+                continue
+            config = copy.deepcopy(node.config)
+            if node is input_node:
+                config["source"] = source
+                # keep the names of the files written for live streams apart
+                filename = Path(config["filename"])
+                config["filename"] = f"{filename.stem}_{stream_idx}{filename.suffix}"
+            nodes.append(type(node)(config))
+        return nodes
+
+    def _run_node(self, idx: int, node: AbstractNode, active: List[int]) -> None:
+        """Runs the node at position ``idx`` of the pipeline for every active
+        stream, following the ``pipeline_end`` handling of the sequential
+        runner.
+        """
+        stream_indices = []
+        for stream_idx in active:
+            data = self.stream_data[stream_idx]
+            if data.get("pipeline_end", False) and "pipeline_end" not in node.inputs:
+                continue
+            stream_indices.append(stream_idx)
+        if not stream_indices:
+            return
+
+        if self.shared[idx] and self.batch:
+            inputs_list = [
+                get_node_inputs(node, self.stream_data[stream_idx])
+                for stream_idx in stream_indices
+            ]
+            for stream_idx in stream_indices:
+                node.callback_list.on_run_begin(self.stream_data[stream_idx])
+            outputs_list = node.run_batch(inputs_list)
+            for stream_idx, outputs in zip(stream_indices, outputs_list):
+                self.stream_data[stream_idx].update(outputs)
+                node.callback_list.on_run_end(self.stream_data[stream_idx])
+            return
+
+        for stream_idx in stream_indices:
+            stream_node = self.streams[stream_idx][idx]
+            data = self.stream_data[stream_idx]
+            inputs = get_node_inputs(stream_node, data)
+            stream_node.callback_list.on_run_begin(data)
+            data.update(stream_node.run(inputs))
+            stream_node.callback_list.on_run_end(data)
+
+    @staticmethod
+    def _is_shareable(node: AbstractNode) -> bool:
+        """Checks if a single instance of ``node`` can serve every stream."""
+        return (
+            node.node_name.split(".")[0] == "model"
+            and node.node_name not in STATEFUL_MODEL_NODES
+        )
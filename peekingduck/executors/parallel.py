@@ -0,0 +1,215 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Parallel executor which runs independent nodes of a frame concurrently.
+"""
+
+import logging
+from collections import ChainMap
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline import Pipeline, get_node_inputs
+
+# Nodes of these types only read their inputs. Nodes of every other type
+# (e.g. draw nodes drawing on "img") may modify their inputs in place, so
+# their inputs are also treated as outputs when building the dependency graph.
+READ_ONLY_NODE_TYPES = {"model", "dabble"}
+
+
+class ParallelExecutor:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Builds a dependency graph of the pipeline from the declared inputs and
+    outputs of its nodes, then runs nodes without mutual dependencies
+    concurrently on a thread pool. Frames are still processed one at a time,
+    so per-frame latency is reduced to roughly the critical path of the graph.
+
+    Node B depends on an earlier node A if B reads a key which A writes, or if
+    B modifies a key in place which A reads. Nodes which take ``"all"`` as
+    input depend on every earlier node which writes data, and every node
+    depends on earlier nodes which write ``pipeline_end``. Nodes which only
+    output the same keys (e.g. ``bboxes`` from both a face and a pose model)
+    run concurrently. Each node reads its inputs from the latest earlier node
+    which wrote them, and the outputs are merged into the data pool in
+    pipeline order, which produces the same data pool as sequential mode.
+
+    Args:
+        pipeline (:obj:`Pipeline`): The pipeline to execute.
+        num_iter (int): Stop the pipeline after this number of iterations.
+            ``0`` runs the pipeline until the input is exhausted.
+        max_workers (:obj:`int` | :obj:`None`): Maximum number of nodes to run
+            at the same time. If ``None``, uses the widest level of the
+            dependency graph.
+
+    Raises:
+        ValueError: ``max_workers`` is not positive.
+    """
+
+    def __init__(
+        self, pipeline: Pipeline, num_iter: int = 0, max_workers: Optional[int] = None
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be a positive integer.")
+        self.pipeline = pipeline
+        self.num_iter = num_iter
+        self.dependencies = self._build_dependencies(pipeline.nodes)
+        self.dependents: List[List[int]] = [[] for _ in pipeline.nodes]
+        for idx, deps in enumerate(self.dependencies):
+            for dep in deps:
+                self.dependents[dep].append(idx)
+        self.levels = self._get_levels(self.dependencies)
+        self.max_workers = max_workers or max(len(level) for level in self.levels)
+
+    def run(self) -> int:
+        """Runs the pipeline until the input is exhausted, a node ends the
+        pipeline, or ``num_iter`` iterations have been run.
+
+        Returns:
+            (int): The number of iterations run.
+        """
+        for i, level in enumerate(self.levels):
+            node_names = ", ".join(self.pipeline.nodes[idx].name for idx in level)
+            self.logger.info(f"Parallel execution level {i}: {node_names}")
+        num_iter = 0
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pkd-node"
+        ) as pool:
+            while not self.pipeline.terminate:
+                self._run_frame(pool)
+                num_iter += 1
+                if self.num_iter > 0 and num_iter >= self.num_iter:
+                    self.logger.info(f"Stopping pipeline after {num_iter} iterations")
+                    break
+        return num_iter
+
+    def _run_frame(self, pool: ThreadPoolExecutor) -> None:
+        """Runs every node once, launching each node as soon as the nodes it
+        depends on have completed. Only the main thread modifies the data
+        pool, by merging the outputs of the completed nodes in pipeline order.
+        """
+        data = self.pipeline.data
+        outputs: List[Optional[Dict[str, Any]]] = [None] * len(self.pipeline.nodes)
+        num_merged = 0
+        num_pending = [len(deps) for deps in self.dependencies]
+        ready = [idx for idx, count in enumerate(num_pending) if count == 0]
+        running: Dict["Future[Dict[str, Any]]", int] = {}
+        while ready or running:
+            for idx in ready:
+                node = self.pipeline.nodes[idx]
+                # Outputs of completed earlier nodes which have not been merged
+                # yet take precedence over the data pool, latest node first
+                node_data = dict(
+                    ChainMap(
+                        *(out for out in reversed(outputs[num_merged:idx]) if out),
+                        data,
+                    )
+                )
+                if node_data.get("pipeline_end", False):
+                    self.pipeline.terminate = True
+                    if "pipeline_end" not in node.inputs:
+                        future: "Future[Dict[str, Any]]" = Future()
+                        future.set_result({})
+                        running[future] = idx
+                        continue
+                future = pool.submit(self._run_node, node, node_data)
+                running[future] = idx
+            ready = []
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = running.pop(future)
+                # re-raises any exception from the node
+                outputs[idx] = future.result()
+                for dependent in self.dependents[idx]:
+                    num_pending[dependent] -= 1
+                    if num_pending[dependent] == 0:
+                        ready.append(dependent)
+            while num_merged < len(outputs):
+                node_outputs = outputs[num_merged]
+                if node_outputs is None:
+                    break
+                data.update(node_outputs)
+                num_merged += 1
+            ready.sort()
+
+    @staticmethod
+    def _run_node(node: AbstractNode, node_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs a single node in a worker thread.
+
+        Args:
+            node (:obj:`AbstractNode`): The node to run.
+            node_data (:obj:`Dict[str, Any]`): The data pool as seen by
+                ``node`` in sequential mode.
+
+        Returns:
+            (:obj:`Dict[str, Any]`): The outputs of ``node``, including any
+            data set by its callbacks.
+        """
+        inputs = get_node_inputs(node, node_data)
+        outputs: Dict[str, Any] = {}
+        # Data set by the callbacks is stored with the outputs of the node
+        pipeline_data = ChainMap(outputs, node_data)
+        node.callback_list.on_run_begin(pipeline_data)
+        outputs.update(node.run(inputs))
+        node.callback_list.on_run_end(pipeline_data)
+        return outputs
+
+    @staticmethod
+    def _build_dependencies(nodes: List[AbstractNode]) -> List[Set[int]]:
+        """Finds the indices of the earlier nodes which each node depends
+        on.
+        """
+        reads: List[Set[str]] = []
+        modifies: List[Set[str]] = []
+        writes: List[Set[str]] = []
+        for node in nodes:
+            node_reads = set(node.inputs) | set(getattr(node, "optional_inputs", []))
+            node_reads = node_reads - {"none"} | {"pipeline_end"}
+            if node.node_name.split(".")[0] in READ_ONLY_NODE_TYPES:
+                node_modifies = set()
+            else:
+                node_modifies = node_reads - {"all", "pipeline_end"}
+            reads.append(node_reads)
+            modifies.append(node_modifies)
+            writes.append(set(node.outputs) - {"none"} | node_modifies)
+
+        # Outputs are merged in pipeline order, so nodes which write the same
+        # keys do not depend on each other
+        dependencies: List[Set[int]] = []
+        for j, _ in enumerate(nodes):
+            deps = set()
+            for i in range(j):
+                if (  # pylint: disable=too-many-boolean-expressions
+                    writes[i] & reads[j]
+                    or reads[i] & modifies[j]
+                    or ("all" in reads[j] and writes[i])
+                    or ("all" in reads[i] and modifies[j])
+                ):
+                    deps.add(i)
+            dependencies.append(deps)
+        return dependencies
+
+    @staticmethod
+    def _get_levels(dependencies: List[Set[int]]) -> List[List[int]]:
+        """Groups the nodes by the length of the longest dependency chain
+        leading to them. Nodes in the same level can run concurrently.
+        """
+        depths: List[int] = []
+        for deps in dependencies:
+            depths.append(max((depths[dep] + 1 for dep in deps), default=0))
+        levels: List[List[int]] = [[] for _ in range(max(depths, default=-1) + 1)]
+        for idx, depth in enumerate(depths):
+            levels[depth].append(idx)
+        return levels
@@ -0,0 +1,301 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pipelined executor which overlaps the processing of consecutive frames.
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline import Pipeline, get_node_inputs
+
+# Nodes of the same group are placed in the same stage when the stages are
+# determined automatically. Custom node types join the stage of the node
+# before them.
+STAGE_GROUPS = {
+    "input": 0,
+    "augment": 0,
+    "model": 1,
+    "dabble": 1,
+    "draw": 2,
+    "output": 2,
+}
+POLL_INTERVAL = 0.1  # seconds
+
+
+class Frame:  # pylint: disable=too-few-public-methods
+    """Holds the data pool of a single frame as it moves through the stages.
+
+    Args:
+        index (int): Position of the frame in the input stream.
+    """
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.data: Dict[str, Any] = {}
+
+
+class PipelinedExecutor:  # pylint: disable=too-many-instance-attributes
+    """Splits the nodes of a pipeline into stages which are connected by
+    bounded queues. Each stage runs in its own worker thread, so frame N+1 can
+    be read while frame N is in the model nodes and frame N-1 is being drawn
+    and written.
+
+    Every node still runs in a single thread and sees frames in input order,
+    so stateful nodes behave as they do in sequential mode and frame order is
+    preserved at the output nodes. Unlike sequential mode, each frame starts
+    from an empty data pool.
+
+    Args:
+        pipeline (:obj:`Pipeline`): The pipeline to execute.
+        num_iter (int): Stop the pipeline after this number of frames. ``0``
+            runs the pipeline until the input is exhausted.
+        queue_size (int): Maximum number of frames buffered between two
+            consecutive stages.
+        stages (:obj:`List[int]` | :obj:`None`): Number of nodes in each stage,
+            in pipeline order. If ``None``, consecutive nodes are grouped into
+            input/augment, model/dabble, and draw/output stages.
+
+    Raises:
+        ValueError: ``queue_size`` is not positive or ``stages`` does not
+            cover every node of the pipeline.
+    """
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        num_iter: int = 0,
+        queue_size: int = 4,
+        stages: Optional[List[int]] = None,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        if queue_size < 1:
+            raise ValueError("queue_size must be a positive integer.")
+        self.pipeline = pipeline
+        self.num_iter = num_iter
+        self.stages = self._split_stages(pipeline.nodes, stages)
+        self.queues: List["queue.Queue[Optional[Frame]]"] = [
+            queue.Queue(maxsize=queue_size) for _ in range(len(self.stages) - 1)
+        ]
+        self.results: "queue.Queue[Optional[Frame]]" = queue.Queue()
+
+        self._abort = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._end_index: Optional[int] = None
+        self._error: Optional[BaseException] = None
+        self._depth_max = [0] * len(self.queues)
+        self._depth_sum = [0] * len(self.queues)
+        self._depth_count = [0] * len(self.queues)
+
+    @property
+    def queue_depths(self) -> List[int]:
+        """Current number of frames waiting in front of each stage, excluding
+        the first stage.
+        """
+        return [stage_queue.qsize() for stage_queue in self.queues]
+
+    def get_queue_stats(self) -> List[Dict[str, Any]]:
+        """Returns the queue depth statistics sampled whenever a frame is
+        passed on to the next stage.
+
+        Returns:
+            (:obj:`List[Dict[str, Any]]`): The first node, mean depth, and
+            maximum depth of the queue in front of each stage, excluding the
+            first stage.
+        """
+        return [
+            {
+                "stage": self.stages[i + 1][0].name,
+                "mean": self._depth_sum[i] / max(1, self._depth_count[i]),
+                "max": self._depth_max[i],
+            }
+            for i in range(len(self.queues))
+        ]
+
+    def run(self) -> int:
+        """Runs the pipeline until the input is exhausted, a node ends the
+        pipeline, or ``num_iter`` frames have been processed.
+
+        Returns:
+            (int): The number of frames which completed every stage.
+        """
+        threads = [
+            threading.Thread(
+                target=self._run_stage, args=(i,), name=f"pkd-stage-{i}", daemon=True
+            )
+            for i in range(len(self.stages))
+        ]
+        stage_names = " | ".join(
+            ", ".join(node.name for node in nodes) for nodes in self.stages
+        )
+        self.logger.info(f"Pipelined execution with stages: {stage_names}")
+        for thread in threads:
+            thread.start()
+        num_frames = 0
+        try:
+            while True:
+                frame = self._get(self.results)
+                if frame is None:
+                    break
+                num_frames += 1
+                self.pipeline.data = frame.data
+                if frame.data.get("pipeline_end", False):
+                    self.pipeline.terminate = True
+        except KeyboardInterrupt:
+            self._abort.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+        if self._error is not None:
+            raise self._error
+        if self.num_iter > 0 and num_frames >= self.num_iter:
+            self.logger.info(f"Stopping pipeline after {num_frames} iterations")
+        for stats in self.get_queue_stats():
+            self.logger.info(
+                f"Queue before {stats['stage']}: mean depth = {stats['mean']:.2f}, "
+                f"max depth = {stats['max']}"
+            )
+        return num_frames
+
+    def _end_pipeline(self, index: int) -> None:
+        """Marks frame ``index`` as the last frame to be processed."""
+        with self._lock:
+            if self._end_index is None or index < self._end_index:
+                self._end_index = index
+        self._stop.set()
+
+    def _get(self, in_queue: "queue.Queue[Optional[Frame]]") -> Optional[Frame]:
+        """Waits for the next frame. Returns ``None`` at the end of the
+        stream or if the pipeline is aborted.
+        """
+        while True:
+            try:
+                return in_queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if self._abort.is_set():
+                    return None
+
+    def _put(
+        self, out_queue: "queue.Queue[Optional[Frame]]", frame: Optional[Frame]
+    ) -> bool:
+        """Waits for space in ``out_queue`` and records its depth. Returns
+        ``False`` if the pipeline is aborted before the frame is queued.
+        """
+        while True:
+            try:
+                out_queue.put(frame, timeout=POLL_INTERVAL)
+                break
+            except queue.Full:
+                if self._abort.is_set():
+                    return False
+        if frame is not None and out_queue is not self.results:
+            idx = self.queues.index(out_queue)
+            depth = out_queue.qsize()
+            self._depth_max[idx] = max(self._depth_max[idx], depth)
+            self._depth_sum[idx] += depth
+            self._depth_count[idx] += 1
+        return True
+
+    def _produce(
+        self, nodes: List[AbstractNode], out_queue: "queue.Queue[Optional[Frame]]"
+    ) -> None:
+        """Runs the first stage, which creates a new frame every iteration."""
+        index = 0
+        while not self._stop.is_set() and not self._abort.is_set():
+            frame = Frame(index)
+            self._run_nodes(nodes, frame)
+            if not self._put(out_queue, frame):
+                break
+            index += 1
+            if frame.data.get("pipeline_end", False) or 0 < self.num_iter <= index:
+                break
+
+    def _run_nodes(self, nodes: List[AbstractNode], frame: Frame) -> None:
+        """Runs ``nodes`` on the data pool of ``frame``, following the
+        ``pipeline_end`` handling of the sequential runner.
+        """
+        for node in nodes:
+            if frame.data.get("pipeline_end", False):
+                self._end_pipeline(frame.index)
+                if "pipeline_end" not in node.inputs:
+                    continue
+            inputs = get_node_inputs(node, frame.data)
+            node.callback_list.on_run_begin(frame.data)
+            outputs = node.run(inputs)
+            frame.data.update(outputs)
+            node.callback_list.on_run_end(frame.data)
+
+    def _run_stage(self, stage_idx: int) -> None:
+        """Worker thread target for the stage at ``stage_idx``."""
+        nodes = self.stages[stage_idx]
+        out_queue = (
+            self.queues[stage_idx] if stage_idx < len(self.queues) else self.results
+        )
+        try:
+            if stage_idx == 0:
+                self._produce(nodes, out_queue)
+            else:
+                in_queue = self.queues[stage_idx - 1]
+                while True:
+                    frame = self._get(in_queue)
+                    if frame is None:
+                        break
+                    if self._end_index is not None and frame.index > self._end_index:
+                        # a later stage has ended the pipeline, discard frames
+                        # which were already in flight
+                        continue
+                    self._run_nodes(nodes, frame)
+                    if not self._put(out_queue, frame):
+                        break
+        except BaseException as error:  # pylint: disable=broad-except
+            with self._lock:
+                if self._error is None:
+                    self._error = error
+            self._abort.set()
+        finally:
+            self._put(out_queue, None)
+
+    @staticmethod
+    def _split_stages(
+        nodes: List[AbstractNode], stages: Optional[List[int]]
+    ) -> List[List[AbstractNode]]:
+        """Groups ``nodes`` into stages."""
+        if stages is not None:
+            if any(size < 1 for size in stages) or sum(stages) != len(nodes):
+                raise ValueError(
+                    f"stages {stages} must be positive numbers of nodes which sum "
+                    f"up to the number of nodes in the pipeline ({len(nodes)})."
+                )
+            split = []
+            start = 0
+            for size in stages:
+                split.append(nodes[start : start + size])
+                start += size
+            return split
+
+        split = []
+        prev_group = None
+        for node in nodes:
+            group = STAGE_GROUPS.get(node.node_name.split(".")[0], prev_group)
+            if not split or group != prev_group:
+                split.append([])
+            split[-1].append(node)
+            prev_group = group
+        return split
@@ -0,0 +1,239 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Sharded executor which splits a directory source across worker processes.
+"""
+
+import copy
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline import Pipeline, get_node_inputs
+
+# Name, class, and configuration used to instantiate a node in a worker process
+NodeSpec = Tuple[str, Type[AbstractNode], Dict[str, Any]]
+# Nodes which write to a destination derived from their configuration
+PER_FILE_NODES = {"output.csv_writer", "output.media_writer"}
+
+
+class ShardedExecutor:  # pylint: disable=too-few-public-methods
+    """Distributes the files of a directory source of :mod:`input.visual`
+    across a pool of worker processes. Every worker instantiates the full
+    pipeline from the node configurations and processes its shard of files one
+    after another.
+
+    Each file is read by a new :mod:`input.visual` node and starts from an
+    empty data pool. :mod:`output.media_writer` and :mod:`output.csv_writer`
+    are also instantiated per file, with the input file name appended to
+    ``output_filename`` and ``file_path`` respectively, so no two files share
+    an output destination. All other nodes are instantiated once per worker
+    and keep their state across the files of a shard.
+
+    Files are assigned to workers by size, largest first, so each worker gets
+    a similar amount of data. A summary of the throughput of each worker is
+    logged when all workers are done.
+
+    Args:
+        pipeline (:obj:`Pipeline`): The pipeline to execute. Its first node
+            must be ``input.visual`` with a directory as ``source``.
+        num_iter (int): Stop each worker after this number of frames. ``0``
+            processes every file.
+        num_workers (:obj:`int` | :obj:`None`): Number of worker processes.
+            If ``None``, uses the number of CPUs. Never more than the number
+            of files.
+
+    Raises:
+        ValueError: ``num_workers`` is not positive or the pipeline does not
+            start with ``input.visual`` reading from a directory.
+    """
+
+    def __init__(
+        self, pipeline: Pipeline, num_iter: int = 0, num_workers: Optional[int] = None
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        if num_workers is not None and num_workers < 1:
+            raise ValueError("num_workers must be a positive integer.")
+        input_node = pipeline.nodes[0]
+        if input_node.node_name != "input.visual" or not (
+            isinstance(input_node.source, str) and Path(input_node.source).is_dir()
+        ):
+            raise ValueError(
+                "The first node of the pipeline must be input.visual with a "
+                "directory as source."
+            )
+        self.pipeline = pipeline
+        self.num_iter = num_iter
+        files = [
+            path
+            for path in sorted(Path(input_node.source).iterdir())
+            if path.is_file()
+            and input_node._is_valid_file_type(path)  # pylint: disable=protected-access
+        ]
+        num_workers = min(num_workers or os.cpu_count() or 1, max(1, len(files)))
+        self.shards = self._split_shards(files, num_workers)
+        self.worker_stats: List[Dict[str, Any]] = []
+
+    def run(self) -> int:
+        """Processes every file of the directory and logs the throughput of
+        each worker.
+
+        Returns:
+            (int): The total number of frames processed.
+        """
+        node_specs: List[NodeSpec] = [
+            (node.node_name, type(node), copy.deepcopy(node.config))
+            for node in self.pipeline.nodes
+        ]
+        # the workers open their own inputs
+        self.pipeline.nodes[0].release_resources()
+        self.logger.info(
+            f"Processing {sum(len(shard) for shard in self.shards)} files with "
+            f"{len(self.shards)} workers"
+        )
+        start_time = perf_counter()
+        # forking after models have been loaded in this process is unsafe
+        with ProcessPoolExecutor(
+            max_workers=len(self.shards),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = [
+                pool.submit(process_shard, idx, node_specs, shard, self.num_iter)
+                for idx, shard in enumerate(self.shards)
+            ]
+            self.worker_stats = [future.result() for future in futures]
+        elapsed = perf_counter() - start_time
+
+        for stats in self.worker_stats:
+            self.logger.info(
+                f"Worker {stats['worker']} (pid {stats['pid']}): "
+                f"{stats['num_files']} files, {stats['num_frames']} frames in "
+                f"{stats['elapsed']:.2f} sec ({stats['fps']:.2f} FPS)"
+            )
+        num_frames = sum(stats["num_frames"] for stats in self.worker_stats)
+        self.logger.info(
+            f"Total: {num_frames} frames in {elapsed:.2f} sec "
+            f"({num_frames / max(elapsed, 1e-9):.2f} FPS)"
+        )
+        self.pipeline.terminate = True
+        return num_frames
+
+    @staticmethod
+    def _split_shards(files: List[Path], num_workers: int) -> List[List[Path]]:
+        """Assigns each file, largest first, to the worker with the least
+        data. Files within a shard are kept in directory order.
+        """
+        shards: List[List[Path]] = [[] for _ in range(num_workers)]
+        loads = [0] * num_workers
+        for path in sorted(files, key=lambda path: path.stat().st_size, reverse=True):
+            idx = loads.index(min(loads))
+            shards[idx].append(path)
+            loads[idx] += path.stat().st_size
+        return [sorted(shard) for shard in shards]
+
+
+def process_shard(
+    worker_idx: int, node_specs: List[NodeSpec], files: List[Path], num_iter: int
+) -> Dict[str, Any]:
+    """Runs the pipeline on every file of a shard. Executed in a worker
+    process.
+
+    Args:
+        worker_idx (int): Index of the worker.
+        node_specs (:obj:`List[NodeSpec]`): Name, class, and configuration of
+            each node of the pipeline.
+        files (:obj:`List[Path]`): The files of the shard.
+        num_iter (int): Stop after this number of frames. ``0`` processes
+            every file.
+
+    Returns:
+        (:obj:`Dict[str, Any]`): The throughput statistics of the worker.
+    """
+    start_time = perf_counter()
+    shared: List[Optional[AbstractNode]] = [
+        None if node_name in PER_FILE_NODES else node_cls(config)
+        for node_name, node_cls, config in node_specs[1:]
+    ]
+    num_frames = 0
+    num_files = 0
+    for path in files:
+        if 0 < num_iter <= num_frames:
+            break
+        nodes = [_create_file_node(*node_specs[0][1:], path)] + [
+            node or _create_file_node(node_cls, config, path)
+            for node, (_, node_cls, config) in zip(shared, node_specs[1:])
+        ]
+        try:
+            num_frames += _process_file(nodes, num_iter - num_frames)
+        finally:
+            nodes[0].release_resources()
+        num_files += 1
+    elapsed = perf_counter() - start_time
+    return {
+        "worker": worker_idx,
+        "pid": os.getpid(),
+        "num_files": num_files,
+        "num_frames": num_frames,
+        "elapsed": elapsed,
+        "fps": num_frames / max(elapsed, 1e-9),
+    }
+
+
+def _create_file_node(
+    node_cls: Type[AbstractNode], config: Dict[str, Any], path: Path
+) -> AbstractNode:
+    """Instantiates a node which reads from or writes to a single file."""
+    config = copy.deepcopy(config)
+    if "source" in config:
+        config["source"] = str(path)
+    if config.get("output_filename") is not None:
+        output_filename = Path(config["output_filename"])
+        config[
+            "output_filename"
+        ] = f"{output_filename.stem}_{path.stem}{output_filename.suffix}"
+    if "file_path" in config:
+        file_path = Path(config["file_path"])
+        config["file_path"] = str(
+            file_path.with_name(f"{file_path.stem}_{path.stem}{file_path.suffix}")
+        )
+    return node_cls(config)
+
+
+def _process_file(nodes: List[AbstractNode], max_frames: int) -> int:
+    """Runs the nodes until the input file is exhausted, following the
+    ``pipeline_end`` handling of the sequential runner. Returns the number of
+    frames processed.
+    """
+    data: Dict[str, Any] = {}
+    num_frames = 0
+    while True:
+        for node in nodes:
+            if data.get("pipeline_end", False) and "pipeline_end" not in node.inputs:
+                continue
+            inputs = get_node_inputs(node, data)
+            node.callback_list.on_run_begin(data)
+            data.update(node.run(inputs))
+            node.callback_list.on_run_end(data)
+        if data.get("pipeline_end", False):
+            return num_frames
+        num_frames += 1
+        if 0 < max_frames <= num_frames:
+            return num_frames
@@ -94,6 +94,23 @@ class AbstractNode(ABC):  # pylint: disable=too-many-instance-attributes
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Abstract method needed for running node."""
 
+    def run_batch(self, inputs_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Runs the node on the inputs of several frames at once.
+
+        NOTE: To be overridden by nodes which can process a batch of frames
+        more efficiently, e.g. in a single inference call. The default
+        implementation calls ``run()`` on each frame in order.
+
+        Args:
+            inputs_list (:obj:`List[Dict[str, Any]]`): Inputs of each frame,
+                ordered from the earliest to the latest frame.
+
+        Returns:
+            (:obj:`List[Dict[str, Any]]`): Outputs of each frame, in the same
+            order as ``inputs_list``.
+        """
+        return [self.run(inputs) for inputs in inputs_list]
+
     def load_node_config(
         self, config: Dict[str, Any], kwargs_config: Dict[str, Any]
     ) -> None:
@@ -32,6 +32,9 @@ from peekingduck.utils.requirement_checker import RequirementChecker, check_requ
 BASE_URL = "https://storage.googleapis.com/peekingduck/models"
 PEEKINGDUCK_WEIGHTS_SUBDIR = "peekingduck_weights"
 TIMEOUT = 60  # seconds
+# model formats which are converted on the local machine from the weights of
+# another format
+CONVERTED_MODEL_FORMATS = {"tflite": "tensorflow"}
 
 
 class RequirementCheckerMixin:  # pylint: disable=too-few-public-methods
@@ -234,7 +237,16 @@ class WeightsDownloaderMixin:
         """Dictionary of `blob_file`, `config_file`, and `model_file` names
         based on the selected `model_format`.
         """
-        return self.config["weights"][self.config["model_format"]]
+        return self.config["weights"][self.weights_format]
+
+    @property
+    def weights_format(self) -> str:
+        """The format of the weights to download. Model formats which are
+        converted from another format on the local machine, e.g. "tflite",
+        use the weights of that format.
+        """
+        model_format = self.config["model_format"]
+        return CONVERTED_MODEL_FORMATS.get(model_format, model_format)
 
     @property
     def model_filename(self) -> str:
@@ -278,7 +290,9 @@ class WeightsDownloaderMixin:
         torch.hub.set_dir(model_dir)
         return model_dir
 
-    def _download_to(self, filename: str, destination_dir: Path) -> None:
+    def _download_to(
+        self, filename: str, destination_dir: Path, model_format: Optional[str] = None
+    ) -> None:
         """Downloads publicly shared files from Google Cloud Platform.
 
         Saves download content in chunks. Chunk size set to large integer as
@@ -286,9 +300,13 @@ class WeightsDownloaderMixin:
 
         Args:
             destination_dir (Path): Destination directory of downloaded file.
+            model_format (Optional[str]): The model format folder to download
+                from. Defaults to the weights format of the selected
+                `model_format`.
         """
+        model_format = model_format or self.weights_format
         with open(destination_dir / filename, "wb") as outfile, requests.get(
-            f"{BASE_URL}/{self.model_subdir}/{self.config['model_format']}/{filename}",
+            f"{BASE_URL}/{self.model_subdir}/{model_format}/{filename}",
             timeout=TIMEOUT,
             stream=True,
         ) as response:
@@ -346,7 +364,7 @@ class WeightsDownloaderMixin:
         if model_type_subdirs is not None:
             return parent_dir.joinpath(*model_type_subdirs)
 
-        return parent_dir / self.config["model_format"]
+        return parent_dir / self.weights_format
 
     def _get_weights_checksum(self) -> str:
         with requests.get(
@@ -354,7 +372,7 @@ class WeightsDownloaderMixin:
         ) as response:
             checksums = response.json()
         self.logger.debug(f"weights_checksums: {checksums[self.model_subdir]}")
-        return checksums[self.model_subdir][self.config["model_format"]][
+        return checksums[self.model_subdir][self.weights_format][
             str(self.config["model_type"])
         ]
 
@@ -415,3 +433,38 @@ class WeightsDownloaderMixin:
                 for chunk in iter(lambda: infile.read(buffer_size), b""):
                     hash_func.update(chunk)
         return hash_func
+
+    @staticmethod
+    def stat_hash(
+        path: Path, hash_func: Optional["hashlib._Hash"] = None
+    ) -> "hashlib._Hash":
+        """Hashes the resolved path, size, and modification time of the
+        specified file/directory using SHA256. Unlike :meth:`sha256sum`, the
+        contents are not read, so it is fast enough to identify large weights
+        files on every startup, while replacing or modifying the file still
+        changes the hash.
+
+        When a directory path is passed as the argument, sort the folder
+        content and hash the content recursively.
+
+        Args:
+            path (Path): Path to the file to be hashed.
+            hash_func (Optional[hashlib._Hash]): A hash function which uses the
+                SHA-256 algorithm.
+
+        Returns:
+            (hashlib._Hash): The updated hash function.
+        """
+        if hash_func is None:
+            hash_func = hashlib.sha256()
+
+        if path.is_dir():
+            for subpath in sorted(path.iterdir()):
+                if subpath.name not in {".DS_Store", "__MACOSX"}:
+                    hash_func = WeightsDownloaderMixin.stat_hash(subpath, hash_func)
+        else:
+            stat = path.stat()
+            hash_func.update(
+                f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+            )
+        return hash_func
@@ -23,7 +23,7 @@ import logging
 import sys
 from pathlib import Path
 from types import ModuleType
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, MutableMapping
 
 
 class CallbackList:
@@ -50,28 +50,45 @@ class CallbackList:
         """
         self.callbacks[event_type].append(callback)
 
-    def on_run_begin(self, pipeline_data: Dict[str, Any]) -> None:
+    def prepend(self, event_type: str, callback: Callable) -> None:
+        """Adds a callback to the specified `event_type` which is called
+        before all existing callbacks.
+
+        Args:
+            event_type (str): Determines the point in the run loop at which the
+                callback is called.
+            callback (Callable): A function which can take in a dictionary as
+                an argument.
+        """
+        self.callbacks[event_type].insert(0, callback)
+
+    def on_run_begin(self, pipeline_data: MutableMapping[str, Any]) -> None:
         """Triggers all callbacks set to run at the `run_begin` event.
 
         Args:
-            pipeline_data (Dict[str, Any]): The current pipeline data.
+            pipeline_data (MutableMapping[str, Any]): The current pipeline
+                data.
         """
         self._on_event("run_begin", pipeline_data)
 
-    def on_run_end(self, pipeline_data: Dict[str, Any]) -> None:
+    def on_run_end(self, pipeline_data: MutableMapping[str, Any]) -> None:
         """Triggers all callbacks set to run at the `run_end` event.
 
         Args:
-            pipeline_data (Dict[str, Any]): The current pipeline data.
+            pipeline_data (MutableMapping[str, Any]): The current pipeline
+                data.
         """
         self._on_event("run_end", pipeline_data)
 
-    def _on_event(self, event_type: str, pipeline_data: Dict[str, Any]) -> None:
+    def _on_event(
+        self, event_type: str, pipeline_data: MutableMapping[str, Any]
+    ) -> None:
         """Triggers all callbacks based on the specified event.
 
         Args:
             event_type (str): The specified event.
-            pipeline_data (Dict[str, Any]): The current pipeline data.
+            pipeline_data (MutableMapping[str, Any]): The current pipeline
+                data.
         """
         for callback in self.callbacks[event_type]:
             callback(pipeline_data)
@@ -0,0 +1,186 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Detects motion between frames to skip inference on static frames.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from peekingduck.nodes.abstract_node import AbstractNode
+
+METHODS = ["frame_diff", "background_subtraction"]
+
+
+class _SourceState:  # pylint: disable=too-few-public-methods
+    """Motion detection state of a single source."""
+
+    def __init__(self) -> None:
+        self.reference: Optional[np.ndarray] = None
+        self.subtractor: Optional[cv2.BackgroundSubtractor] = None
+        self.num_skipped = 0
+
+
+class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
+    """Detects motion in each frame with a cheap comparison of downscaled
+    frames, so that model nodes can be skipped on static frames, e.g. a fixed
+    CCTV view at night.
+
+    When this node is in the pipeline, the runner gates the nodes listed in
+    ``gated_nodes``, which must come after this node. On frames where
+    :term:`motion_detected` is ``False``, a gated node is not run and its
+    outputs from the last frame it ran on are reused. The number of runs
+    saved for each gated node is logged at the end of the pipeline, see
+    :py:class:`~peekingduck.utils.inference_gate.InferenceGate`.
+
+    The motion score is computed on a grayscale copy of the frame downscaled
+    to ``downscale_width``, with one of the following ``method``:
+
+    - ``"frame_diff"``: the fraction of pixels which differ by more than
+      ``pixel_threshold`` from the frame the gated nodes last ran on, so
+      slow motion accumulates until it is detected.
+    - ``"background_subtraction"``: the fraction of foreground pixels found
+      by OpenCV's MOG2 background subtractor, which adapts to gradual lighting
+      changes and repetitive motion such as swaying trees.
+
+    The first frame is always processed. Frames from different sources of
+    :mod:`input.multi_visual` are compared separately using
+    :term:`source_id`.
+
+    Inputs:
+        |img_data|
+
+        |source_id_data|
+
+    Outputs:
+        |motion_detected_data|
+
+        |motion_score_data|
+
+    Configs:
+        method (:obj:`str`):
+            **{"frame_diff", "background_subtraction"},
+            default = "frame_diff"**. |br|
+            Method used to compute the motion score, see above.
+        threshold (:obj:`float`): **[0, 1], default = 0.005**. |br|
+            Motion is detected when the motion score, the fraction of changed
+            pixels, is above this value.
+        pixel_threshold (:obj:`int`): **[0, 255], default = 25**. |br|
+            Minimum grayscale difference for a pixel to count as changed when
+            ``method`` is "frame_diff".
+        downscale_width (:obj:`int`): **[1, sys.maxsize), default = 160**.
+            |br|
+            Width the frame is downscaled to, keeping its aspect ratio,
+            before it is compared.
+        max_skip (:obj:`int`): **[0, sys.maxsize), default = 30**. |br|
+            Maximum number of consecutive frames to skip. The gated nodes run
+            on the next frame regardless of the motion score, so their outputs
+            are refreshed periodically. ``0`` never skips frames.
+        gated_nodes (:obj:`Optional[List[str]]`): **default = null**. |br|
+            Names of the nodes to skip on static frames, e.g.
+            ``["model.yolox"]``. If ``null``, every model node after this node
+            is gated.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        super().__init__(config, node_path=__name__, **kwargs)
+        if self.method not in METHODS:
+            raise ValueError(f"method {self.method}: must be one of {METHODS}")
+        if not 0 <= self.threshold <= 1:
+            raise ValueError("threshold must be between [0, 1].")
+        if not 0 <= self.pixel_threshold <= 255:
+            raise ValueError("pixel_threshold must be between [0, 255].")
+        if self.downscale_width < 1:
+            raise ValueError("downscale_width must be a positive integer.")
+        if self.max_skip < 0:
+            raise ValueError("max_skip must be a non-negative integer.")
+        self.gated_nodes: Optional[List[str]] = getattr(self, "gated_nodes", None)
+        self.num_frames = 0
+        self.num_static = 0
+        self._states: Dict[int, _SourceState] = {}
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Computes the motion score of the frame.
+
+        Args:
+            inputs (dict): Dictionary with key "img", and optionally
+                "source_id".
+
+        Returns:
+            outputs (dict): Dictionary with keys "motion_detected" and
+            "motion_score".
+        """
+        state = self._states.setdefault(inputs.get("source_id", 0), _SourceState())
+        frame = self._downscale(inputs["img"])
+        if self.method == "frame_diff":
+            score = self._get_diff_score(frame, state)
+        else:
+            score = self._get_foreground_score(frame, state)
+
+        # the first frame of each source is always processed
+        motion_detected = (
+            score > self.threshold
+            or state.num_skipped >= self.max_skip
+            or state.reference is None
+        )
+        if motion_detected:
+            state.num_skipped = 0
+            state.reference = frame
+        else:
+            state.num_skipped += 1
+            self.num_static += 1
+        self.num_frames += 1
+        return {"motion_detected": motion_detected, "motion_score": score}
+
+    def _downscale(self, img: np.ndarray) -> np.ndarray:
+        """Converts the frame to a downscaled grayscale image."""
+        height, width = img.shape[:2]
+        if width > self.downscale_width:
+            size = (
+                self.downscale_width,
+                max(1, height * self.downscale_width // width),
+            )
+            img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+
+    def _get_config_types(self) -> Dict[str, Any]:
+        """Returns dictionary mapping the node's config keys to respective types."""
+        return {
+            "downscale_width": int,
+            "gated_nodes": Optional[List[str]],
+            "max_skip": int,
+            "method": str,
+            "pixel_threshold": int,
+            "threshold": float,
+        }
+
+    def _get_diff_score(self, frame: np.ndarray, state: _SourceState) -> float:
+        """Returns the fraction of pixels which changed since the reference
+        frame, or 1 if the reference frame has a different size.
+        """
+        if state.reference is None or state.reference.shape != frame.shape:
+            return 1.0
+        diff = cv2.absdiff(frame, state.reference)
+        return float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+
+    @staticmethod
+    def _get_foreground_score(frame: np.ndarray, state: _SourceState) -> float:
+        """Returns the fraction of foreground pixels, excluding shadows."""
+        if state.subtractor is None:
+            state.subtractor = cv2.createBackgroundSubtractorMOG2()
+        mask = state.subtractor.apply(frame)
+        return float(np.count_nonzero(mask == 255)) / mask.size
@@ -0,0 +1,144 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Maps results on the regions of interest back to the full frame."""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.utils.roi import (
+    assign_rois,
+    get_canvas_boxes,
+    map_points_to_frame,
+    paste_masks,
+)
+
+
+class Node(AbstractNode):
+    """Maps the results of model nodes which ran on the regions of interest
+    (ROIs) cropped by :mod:`input.visual` back to the full frame, and replaces
+    :term:`img` with the uncropped :term:`full_img`.
+
+    Place this node after the model nodes, and before :mod:`draw` and
+    :mod:`output` nodes, to render the results on the full frame. Drawings
+    made on the cropped :term:`img` before this node are discarded. Each
+    detection is assigned to the ROI which contains the center of its bounding
+    box, or the mean of its valid keypoints, and is clipped to that ROI.
+    Undetected keypoints, which have coordinates of ``-1``, are left as they
+    are. Every output is always set, optional inputs which are not found
+    upstream are output as empty arrays.
+
+    Inputs:
+        |img_data|
+
+        |full_img_data|
+
+        |roi_boxes_data|
+
+        |bboxes_data|
+
+        |keypoints_data|
+
+        |keypoint_conns_data|
+
+        |masks_data|
+
+    Outputs:
+        |img_data|
+
+        |bboxes_data|
+
+        |keypoints_data|
+
+        |keypoint_conns_data|
+
+        |masks_data|
+
+    Configs:
+        None.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        super().__init__(config, node_path=__name__, **kwargs)
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Maps normalized coordinates in the cropped image to the full frame.
+
+        Args:
+            inputs (dict): Dictionary with keys "img", "full_img",
+                "roi_boxes", and optionally "bboxes", "keypoints",
+                "keypoint_conns", and "masks".
+
+        Returns:
+            outputs (dict): Dictionary with keys "img", "bboxes", "keypoints",
+            "keypoint_conns", and "masks".
+        """
+        crop_size = np.array(inputs["img"].shape[1::-1])
+        frame_size = np.array(inputs["full_img"].shape[1::-1])
+        roi_boxes = inputs["roi_boxes"]
+        canvas_boxes = get_canvas_boxes(roi_boxes)
+        outputs: Dict[str, Any] = {
+            "img": inputs["full_img"],
+            "bboxes": np.empty((0, 4)),
+            "keypoints": np.empty(0),
+            "keypoint_conns": np.empty(0),
+            "masks": np.empty((0, *inputs["full_img"].shape[:2]), dtype=np.uint8),
+        }
+
+        def map_points(points: np.ndarray, roi_indices: np.ndarray) -> np.ndarray:
+            return map_points_to_frame(
+                points, roi_indices, roi_boxes, canvas_boxes, crop_size, frame_size
+            )
+
+        if "bboxes" in inputs:
+            bboxes = np.asarray(inputs["bboxes"], dtype=np.float64).reshape(-1, 2, 2)
+            bbox_rois = assign_rois(bboxes.mean(axis=1) * crop_size, canvas_boxes)
+            outputs["bboxes"] = map_points(bboxes, bbox_rois).reshape(-1, 4)
+            if "masks" in inputs:
+                outputs["masks"] = paste_masks(
+                    np.asarray(inputs["masks"]),
+                    bbox_rois,
+                    roi_boxes,
+                    canvas_boxes,
+                    frame_size,
+                )
+        if "keypoints" in inputs and len(inputs["keypoints"]) > 0:
+            keypoints = np.asarray(inputs["keypoints"], dtype=np.float64)
+            pose_rois = assign_rois(
+                _get_pose_centers(keypoints, crop_size), canvas_boxes
+            )
+            outputs["keypoints"] = np.where(
+                keypoints == -1, -1, map_points(keypoints, pose_rois)
+            )
+            if "keypoint_conns" in inputs:
+                outputs["keypoint_conns"] = np.array(
+                    [
+                        map_points(
+                            np.asarray(conns, dtype=np.float64).reshape(-1, 2),
+                            np.array([idx]),
+                        ).reshape(np.shape(conns))
+                        for conns, idx in zip(inputs["keypoint_conns"], pose_rois)
+                    ],
+                    dtype=object,
+                )
+        return outputs
+
+
+def _get_pose_centers(keypoints: np.ndarray, crop_size: np.ndarray) -> np.ndarray:
+    """Returns the mean pixel coordinates of the valid keypoints of each pose."""
+    valid = np.all(keypoints != -1, axis=-1, keepdims=True)
+    counts = np.maximum(valid.sum(axis=1), 1)
+    return (keypoints * valid).sum(axis=1) / counts * crop_size
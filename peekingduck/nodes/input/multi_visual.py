@@ -0,0 +1,212 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Reads frames from several visual sources at once.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.nodes.input.utils.preprocess import resize_image
+from peekingduck.nodes.input.utils.read import VideoThread
+
+SYNC_MODES = ["latest", "sequential"]
+
+
+class Node(AbstractNode):
+    """Reads frames from several sources at once, e.g. multiple video files,
+    RTSP streams, or webcams. Each source is read by its own
+    :class:`~peekingduck.nodes.input.utils.read.VideoThread`, and every
+    iteration emits one frame from each source which has not ended, together
+    with the index of the source in ``sources`` and the time the frame was
+    captured.
+
+    Frames are aligned according to ``sync``:
+
+    - ``"latest"``: the most recent frame of each source, so the frames of an
+      iteration were captured at about the same time. Suitable for live
+      streams and webcams.
+    - ``"sequential"``: the next buffered frame of each source, waiting for
+      slower sources, so the n-th iteration holds the n-th frame of every
+      source. Suitable for video files.
+
+    The pipeline ends once every source has ended.
+
+    The rest of the pipeline is run by the ``batched`` executor, which is
+    selected automatically in place of the default sequential execution. It
+    splits each iteration into one data pool per frame, which additionally
+    holds the keys ``img``, ``source_id``, and ``timestamp`` of the frame, and
+    passes them through the remaining nodes as a batch. Batch-aware model
+    nodes, such as :mod:`model.yolox`, then run a single inference over the
+    frames of all sources.
+
+    Inputs:
+        |none_input_data|
+
+    Outputs:
+        |imgs_data|
+
+        |source_ids_data|
+
+        |timestamps_data|
+
+        |pipeline_end_data|
+
+    Configs:
+        sources (:obj:`List[Union[int, str]]`):
+            **default = [https://storage.googleapis.com/peekingduck/videos/wave.mp4]**.
+            |br|
+            The sources to read, each of which can be a video file, an
+            http/rtsp URL, or a webcam index.
+        sync (:obj:`str`): **{"latest", "sequential"}, default = "latest"**.
+            |br|
+            How frames of different sources are aligned, see above.
+        mirror_image (:obj:`bool`): **default = False**. |br|
+            Flag to set extracted image frames as mirror images of the input
+            streams.
+        resize (:obj:`Dict[str, Any]`):
+            **default = { do_resizing: False, width: 1280, height: 720 }** |br|
+            Dimension of extracted image frames.
+        buffer_size (:obj:`int`): **[0, sys.maxsize), default = 30**. |br|
+            Maximum number of frames buffered for each source when ``sync`` is
+            "sequential". ``0`` does not limit the buffers.
+        buffer_policy (:obj:`str`):
+            **{"block", "drop_oldest", "drop_newest"}, default = "block"**.
+            |br|
+            Action taken when a frame is read while the buffer of its source
+            is full, see :mod:`input.visual`.
+        frames_log_freq (:obj:`int`): **default = 100**. |br|
+            Logs frequency of iterations passed in CLI.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        node_path: str = "",
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(config, node_path=__name__, **kwargs)
+        if not self.sources:
+            raise ValueError("sources must contain at least one input source.")
+        if self.sync not in SYNC_MODES:
+            raise ValueError(f"sync {self.sync}: must be one of {SYNC_MODES}")
+        self.iteration: int = 0
+        # keys added to the data pool of each frame by split_frames()
+        self.frame_outputs = ["img", "source_id", "timestamp"]
+        self.readers: List[VideoThread] = []
+        try:
+            for source in self.sources:
+                self.readers.append(self._open_source(source))
+        except ValueError:
+            self.release_resources()
+            raise
+        self.active = list(range(len(self.readers)))
+
+    def release_resources(self) -> None:
+        """Override base class method to free video resources"""
+        for reader in self.readers:
+            reader.shutdown()
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Reads a frame from each source which has not ended.
+
+        Args:
+            inputs (dict): Dictionary with key "none".
+
+        Returns:
+            outputs (dict): Dictionary with keys "imgs", "source_ids",
+            "timestamps", and "pipeline_end".
+        """
+        imgs = []
+        source_ids = []
+        timestamps = []
+        if self.sync == "sequential":
+            for source_id in self.active:
+                self.readers[source_id].wait_for_frame()
+        for source_id in list(self.active):
+            reader = self.readers[source_id]
+            success, img = reader.read_frame()
+            if not success:
+                self.logger.info(f"Source {source_id} ended: {self.sources[source_id]}")
+                self.active.remove(source_id)
+                continue
+            if self.resize["do_resizing"]:
+                img = resize_image(img, self.resize["width"], self.resize["height"])
+            imgs.append(img)
+            source_ids.append(source_id)
+            timestamps.append(reader.timestamp)
+
+        if imgs:
+            self.iteration += 1
+            if self.iteration % self.frames_log_freq == 0:
+                self.logger.info(
+                    f"Frames Processed: {self.iteration} from "
+                    f"{len(self.active)} active sources"
+                )
+        return {
+            "imgs": imgs,
+            "source_ids": source_ids,
+            "timestamps": timestamps,
+            "pipeline_end": not imgs,
+        }
+
+    @staticmethod
+    def split_frames(outputs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Splits the outputs of an iteration into one data pool per frame.
+
+        Args:
+            outputs (Dict[str, Any]): Outputs of :meth:`run`.
+
+        Returns:
+            (List[Dict[str, Any]]): A copy of ``outputs`` with the keys
+            ``img``, ``source_id``, and ``timestamp`` of each frame, or a
+            single data pool if every source has ended.
+        """
+        if outputs["pipeline_end"]:
+            return [{**outputs, "img": None, "source_id": -1, "timestamp": 0.0}]
+        return [
+            {**outputs, "img": img, "source_id": source_id, "timestamp": timestamp}
+            for img, source_id, timestamp in zip(
+                outputs["imgs"], outputs["source_ids"], outputs["timestamps"]
+            )
+        ]
+
+    def _get_config_types(self) -> Dict[str, Any]:
+        """Returns dictionary mapping the node's config keys to respective types."""
+        return {
+            "buffer_policy": str,
+            "buffer_size": int,
+            "frames_log_freq": int,
+            "mirror_image": bool,
+            "resize": Dict[str, Union[bool, int]],
+            "resize.do_resizing": bool,
+            "resize.height": int,
+            "resize.width": int,
+            "sources": List[Union[int, str]],
+            "sync": str,
+        }
+
+    def _open_source(self, source: Union[int, str]) -> VideoThread:
+        """Starts the reader thread of a source."""
+        reader = VideoThread(
+            source,
+            self.mirror_image,
+            buffering=self.sync == "sequential",
+            buffer_size=self.buffer_size,
+            buffer_policy=self.buffer_policy,
+        )
+        width, height = reader.resolution
+        self.logger.info(f"Source {len(self.readers)}: {source} ({width} by {height})")
+        return reader
@@ -0,0 +1,142 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Custom reader which replays pre-decoded frames from a NumPy .npy file
+"""
+
+from time import perf_counter, sleep
+from typing import Any, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class NpyReader:
+    """Replays pre-decoded frames from a memory-mapped NumPy ``.npy`` file,
+    mimicking opencv's video capture object.
+
+    The file holds a ``uint8`` array of shape :math:`(N, H, W, 3)`, or
+    :math:`(H, W, 3)` for a single frame, in BGR format, e.g. saved with
+    ``np.save()``. The file is memory-mapped read-only, and each frame is
+    copied out of the map as it is returned, without decoding. Nodes which
+    draw on the frames then write to their own copy rather than to private
+    copy-on-write pages of the map, which would stay resident for the whole
+    replay, so memory usage does not grow with the number of frames played.
+
+    Args:
+        input_source (str): Path of the ``.npy`` file.
+        fps (float): Rate at which frames are returned. ``0`` returns frames
+            as fast as they are read.
+
+    Raises:
+        ValueError: The file is not a valid ``.npy`` file of frames.
+    """
+
+    def __init__(self, input_source: str, fps: float = 0) -> None:
+        try:
+            frames = np.load(input_source, mmap_mode="r")
+        except (OSError, ValueError) as error:
+            raise ValueError(f"Invalid frames file {input_source}: {error}") from error
+        if frames.ndim == 3:
+            frames = frames[np.newaxis]
+        if frames.ndim != 4 or frames.shape[-1] != 3 or frames.dtype != np.uint8:
+            raise ValueError(
+                f"Invalid frames file {input_source}: expected a uint8 array of "
+                f"shape (N, H, W, 3), got {frames.dtype} array of shape "
+                f"{frames.shape}"
+            )
+        self.frames = frames
+        self.fps = fps
+        self.position = 0
+        self._next_time: Optional[float] = None
+
+    def get(self, param: Any) -> float:
+        """To mimic opencv's video capture object get(cv2.SOME_PROPERTY)
+
+        Args:
+            param (Any): cv2 property
+
+        Returns:
+            float: value of cv2 property if supported, otherwise -1
+        """
+        get_map = {
+            cv2.CAP_PROP_FPS: self.fps,
+            cv2.CAP_PROP_FRAME_COUNT: len(self.frames),
+            cv2.CAP_PROP_FRAME_WIDTH: self.frames.shape[2],
+            cv2.CAP_PROP_FRAME_HEIGHT: self.frames.shape[1],
+            cv2.CAP_PROP_POS_FRAMES: self.position,
+        }
+        return get_map.get(param, -1)
+
+    def grab(self) -> bool:
+        """To mimic opencv's video capture object grab()
+
+        Returns:
+            bool: True if there was a frame to skip.
+        """
+        if self.position >= len(self.frames):
+            return False
+        self.position += 1
+        return True
+
+    def isOpened(self) -> bool:  # pylint: disable=invalid-name
+        """To mimic opencv's video capture object isOpened()
+
+        Returns:
+            bool: always True
+        """
+        return True
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """To mimic opencv's video capture object read(). Waits until the
+        next frame is due if ``fps`` is set.
+
+        Returns:
+            Tuple[bool, Optional[np.ndarray]]: Tuple of return status, image
+            frame if return status is True.
+        """
+        if self.position >= len(self.frames):
+            return False, None
+        if self.fps > 0:
+            self._wait()
+        frame = np.array(self.frames[self.position])
+        self.position += 1
+        return True, frame
+
+    def release(self) -> None:
+        """To mimic opencv's video capture object release().
+        Dummy method does nothing, the file is unmapped once the frames are
+        no longer referenced.
+        """
+
+    def set(self, param: Any, value: Any) -> bool:
+        """To mimic opencv's video capture object set(cv2.SOME_PROPERTY, value)
+
+        Returns:
+            bool: True if the property was set, only the frame position is
+            supported
+        """
+        if param != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        self.position = min(max(0, int(value)), len(self.frames))
+        return True
+
+    def _wait(self) -> None:
+        """Sleeps until the next frame is due."""
+        now = perf_counter()
+        if self._next_time is not None and now < self._next_time:
+            sleep(self._next_time - now)
+            now = self._next_time
+        self._next_time = now + 1 / self.fps
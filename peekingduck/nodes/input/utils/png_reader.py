@@ -23,10 +23,12 @@ import numpy as np
 
 
 class PNGReader:
-    """Custom PNG reader to fix opencv 'PNG magic' problem on Windows platform"""
+    """Custom PNG reader to fix opencv 'PNG magic' problem on Windows platform.
+    Also serves images which have already been decoded, passed as ``img``.
+    """
 
-    def __init__(self, input_source: str) -> None:
-        self.img = cv2.imread(input_source)
+    def __init__(self, input_source: str, img: Optional[np.ndarray] = None) -> None:
+        self.img = cv2.imread(input_source) if img is None else img
         self.height, self.width, _ = self.img.shape
         self.get_map = {
             cv2.CAP_PROP_FPS: 0,
@@ -49,6 +51,16 @@ class PNGReader:
             return self.get_map[param]
         return -1
 
+    def grab(self) -> bool:
+        """To mimic opencv's video capture object grab()
+
+        Returns:
+            bool: True if the image has not been read yet.
+        """
+        has_frames = self.has_frames
+        self.has_frames = False
+        return has_frames
+
     def isOpened(self) -> bool:  # pylint: disable=invalid-name
         """To mimic opencv's video capture object isOpened()
 
@@ -69,6 +81,14 @@ class PNGReader:
             return True, self.img
         return False, None
 
+    def set(self, param: Any, value: Any) -> bool:  # pylint: disable=unused-argument
+        """To mimic opencv's video capture object set(cv2.SOME_PROPERTY, value)
+
+        Returns:
+            bool: always False as no property can be set
+        """
+        return False
+
     def release(self) -> None:
         """To mimic opencv's video capture object release().
         Dummy method does nothing.
@@ -0,0 +1,188 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Background decoding of the images in a directory
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+JPEG_SOI = b"\xff\xd8"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# start of frame markers, which hold the image size, excluding DHT (0xC4),
+# JPG (0xC8) and DAC (0xCC) which share the same range
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# markers without a length field
+JPEG_STANDALONE_MARKERS = set(range(0xD0, 0xD9)) | {0x01}
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def get_image_size(data: np.ndarray) -> Optional[Tuple[int, int]]:
+    """Reads the size of a JPEG or PNG image from its header without
+    decoding it.
+
+    Args:
+        data (np.ndarray): The encoded image as an array of bytes.
+
+    Returns:
+        (Optional[Tuple[int, int]]): The width and height of the image, or
+        ``None`` if the image is not a JPEG or PNG image or its header is
+        malformed.
+    """
+    header = data.data
+    if bytes(header[:8]) == PNG_SIGNATURE and len(header) >= 24:
+        return (
+            int.from_bytes(header[16:20], "big"),
+            int.from_bytes(header[20:24], "big"),
+        )
+    if bytes(header[:2]) != JPEG_SOI:
+        return None
+    idx = 2
+    while idx + 9 <= len(header):
+        if header[idx] != 0xFF:
+            return None
+        marker = header[idx + 1]
+        if marker == 0xFF:  # fill byte
+            idx += 1
+        elif marker in JPEG_SOF_MARKERS:
+            return (
+                int.from_bytes(header[idx + 7 : idx + 9], "big"),
+                int.from_bytes(header[idx + 5 : idx + 7], "big"),
+            )
+        elif marker in JPEG_STANDALONE_MARKERS:
+            idx += 2
+        else:
+            idx += 2 + int.from_bytes(header[idx + 2 : idx + 4], "big")
+    return None
+
+
+def get_decode_flag(image_size: Tuple[int, int], target_size: Tuple[int, int]) -> int:
+    """Selects the largest reduced-resolution decode flag which still
+    produces an image at least as large as ``target_size``.
+
+    Args:
+        image_size (Tuple[int, int]): Width and height of the encoded image.
+        target_size (Tuple[int, int]): Width and height the image will be
+            resized to.
+
+    Returns:
+        (int): The ``cv2.IMREAD_*`` flag to decode the image with.
+    """
+    width, height = image_size
+    target_width, target_height = target_size
+    for factor, flag in REDUCED_DECODE_FLAGS:
+        if width // factor >= target_width and height // factor >= target_height:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_image(
+    file_path: Path, target_size: Optional[Tuple[int, int]] = None
+) -> Optional[np.ndarray]:
+    """Decodes an image file.
+
+    Args:
+        file_path (Path): Path of the image file.
+        target_size (Optional[Tuple[int, int]]): Width and height the image
+            will be resized to. If set, JPEG and PNG images are decoded at a
+            reduced resolution which is no smaller than this size.
+
+    Returns:
+        (Optional[np.ndarray]): The decoded image in BGR format, or ``None``
+        if the file cannot be decoded.
+    """
+    data = np.fromfile(str(file_path), dtype=np.uint8)
+    flag = cv2.IMREAD_COLOR
+    if target_size is not None:
+        image_size = get_image_size(data)
+        if image_size is not None:
+            flag = get_decode_flag(image_size, target_size)
+    return cv2.imdecode(data, flag)
+
+
+class ImagePrefetcher:
+    """Decodes the next ``num_prefetch`` images of a directory on a thread
+    pool while the pipeline processes the current image. Images must be
+    requested in the order of ``file_paths``.
+
+    Args:
+        file_paths (List[Path]): The image files, in reading order.
+        num_prefetch (int): Number of images to decode ahead.
+        target_size (Optional[Tuple[int, int]]): Width and height the images
+            will be resized to, enables reduced-resolution decoding. See
+            :func:`decode_image`.
+    """
+
+    def __init__(
+        self,
+        file_paths: List[Path],
+        num_prefetch: int,
+        target_size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        if num_prefetch < 1:
+            raise ValueError("num_prefetch must be a positive integer.")
+        self.target_size = target_size
+        self._file_paths = deque(file_paths)
+        self._pending: Deque[Tuple[Path, "Future[Optional[np.ndarray]]"]] = deque()
+        self._pool = ThreadPoolExecutor(
+            max_workers=min(num_prefetch, os.cpu_count() or 1),
+            thread_name_prefix="pkd-prefetch",
+        )
+        for _ in range(num_prefetch):
+            self._submit_next()
+
+    def get(self, file_path: Path) -> Optional[np.ndarray]:
+        """Returns the decoded image of ``file_path``, waiting for it to be
+        decoded if necessary. Images queued before ``file_path`` are
+        discarded.
+
+        Args:
+            file_path (Path): Path of the image file.
+
+        Returns:
+            (Optional[np.ndarray]): The decoded image, or ``None`` if the file
+            cannot be decoded.
+        """
+        while self._pending:
+            path, future = self._pending.popleft()
+            self._submit_next()
+            if path == file_path:
+                return future.result()
+        return decode_image(file_path, self.target_size)
+
+    def shutdown(self) -> None:
+        """Cancels pending decodes and stops the worker threads."""
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+
+    def _submit_next(self) -> None:
+        """Starts decoding the next image, if any."""
+        if self._file_paths:
+            path = self._file_paths.popleft()
+            self._pending.append(
+                (path, self._pool.submit(decode_image, path, self.target_size))
+            )
@@ -19,18 +19,64 @@ Reader functions for input nodes
 import http.client
 import logging
 import platform
-import queue
 from abc import ABC, abstractmethod
+from collections import deque
 from pathlib import Path
-from threading import Event, Thread
-from typing import Any, Tuple, Union
+from threading import Condition, Event, Thread
+from time import time
+from typing import Any, Deque, NamedTuple, Optional, Tuple, Union
 
 import cv2
+import numpy as np
 
+from peekingduck.nodes.input.utils.npy_reader import NpyReader
 from peekingduck.nodes.input.utils.png_reader import PNGReader
 from peekingduck.nodes.input.utils.preprocess import mirror
 
+BUFFER_POLICIES = ["block", "drop_newest", "drop_oldest"]
 GOOGLE_DNS = "8.8.8.8"
+POLL_INTERVAL = 0.1  # seconds
+
+
+class FrameRange(NamedTuple):
+    """Selects the frames read from a video. Frames from ``start_frame``
+    (inclusive) to ``end_frame`` (exclusive) are read, keeping one frame out of
+    every ``stride`` frames. ``start_time`` and ``end_time``, in seconds,
+    further narrow the range once the FPS of the video is known.
+    """
+
+    stride: int = 1
+    start_frame: int = 0
+    end_frame: Optional[int] = None
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
+    def resolve(self, fps: float) -> Tuple[int, Optional[int]]:
+        """Converts the range to frame indices.
+
+        Args:
+            fps (float): FPS of the video.
+
+        Returns:
+            (Tuple[int, Optional[int]]): The start frame and the end frame,
+            which is ``None`` if the range extends to the end of the video.
+
+        Raises:
+            ValueError: A time is set but the FPS of the video is unknown.
+        """
+        start, end = self.start_frame, self.end_frame
+        if self.start_time is None and self.end_time is None:
+            return start, end
+        if fps <= 0:
+            raise ValueError(
+                "start_time and end_time require a source with a known FPS."
+            )
+        if self.start_time is not None:
+            start = max(start, round(self.start_time * fps))
+        if self.end_time is not None:
+            end_from_time = round(self.end_time * fps)
+            end = end_from_time if end is None else min(end, end_from_time)
+        return start, end
 
 
 def has_internet() -> bool:
@@ -48,21 +94,19 @@ def has_internet() -> bool:
         connection.close()
 
 
-class VideoReader(ABC):
+class VideoReader(ABC):  # pylint: disable=too-many-instance-attributes
     """Class to read in videos and images."""
 
-    def __init__(self, input_source: Union[int, str], mirror_image: bool) -> None:
+    def __init__(
+        self,
+        input_source: Union[int, str],
+        mirror_image: bool,
+        frame_range: FrameRange = FrameRange(),
+        replay_fps: float = 0,
+    ) -> None:
         assert isinstance(input_source, (int, str))
-        if isinstance(input_source, int):
-            if platform.system().startswith("Windows"):
-                # to eliminate opencv's "[WARN] terminating async callback" on Windows
-                self.stream = cv2.VideoCapture(input_source, cv2.CAP_DSHOW)
-            else:
-                self.stream = cv2.VideoCapture(input_source)
-        elif Path(input_source.lower()).suffix == ".png":
-            self.stream = PNGReader(input_source)
-        else:
-            self.stream = cv2.VideoCapture(input_source)
+        self.replay_fps = replay_fps
+        self.stream = self._open_stream(input_source)
         self._frame_counter = 0
         self.logger = logging.getLogger(type(self).__name__)
         self.mirror = mirror_image
@@ -70,17 +114,75 @@ class VideoReader(ABC):
             if self.is_url(input_source) and not has_internet():
                 self.logger.warning("Possible network connectivity error.")
             raise ValueError(f"Video or image path incorrect: {input_source}")
+        self.frame_stride = frame_range.stride
+        self.start_frame, self.end_frame = frame_range.resolve(self.fps)
+        self._position = 0  # index of the next frame in the stream
+        self._num_to_skip = 0
+        if self.start_frame > 0:
+            self._seek(self.start_frame)
 
     def __del__(self) -> None:
         # Note: self.logger.debug below crashes on Nvidia Jetson Xavier Ubuntu 18.04 python 3.6
         #       but does not crash on Intel MacBook Pro Ubuntu 20.04 python 3.7
         # self.logger.debug("__del__")
-        self.stream.release()
+        if hasattr(self, "stream"):  # not set if the stream failed to open
+            self.stream.release()
 
     @abstractmethod
     def read_frame(self) -> Tuple[bool, Any]:
         """Reads the frame."""
 
+    def _open_stream(self, input_source: Union[int, str]) -> Any:
+        """Opens an OpenCV video capture object, or an object which mimics
+        it, for ``input_source``.
+        """
+        if isinstance(input_source, int):
+            if platform.system().startswith("Windows"):
+                # to eliminate opencv's "[WARN] terminating async callback" on Windows
+                return cv2.VideoCapture(input_source, cv2.CAP_DSHOW)
+            return cv2.VideoCapture(input_source)
+        if Path(input_source.lower()).suffix == ".png":
+            return PNGReader(input_source)
+        if Path(input_source.lower()).suffix == ".npy":
+            return NpyReader(input_source, self.replay_fps)
+        return cv2.VideoCapture(input_source)
+
+    def _read_stream(self) -> Tuple[bool, Any]:
+        """Reads the next selected frame from the stream. Frames skipped by
+        the stride are only grabbed, not decoded.
+        """
+        while self._num_to_skip > 0 and not self._is_past_end():
+            if not self.stream.grab():
+                return False, None
+            self._position += 1
+            self._num_to_skip -= 1
+        if self._is_past_end():
+            return False, None
+        ret, frame = self.stream.read()
+        if ret:
+            self._position += 1
+            self._num_to_skip = self.frame_stride - 1
+        return ret, frame
+
+    def _is_past_end(self) -> bool:
+        """Checks if the stream has reached the end of the frame range."""
+        return self.end_frame is not None and self._position >= self.end_frame
+
+    def _seek(self, frame_index: int) -> None:
+        """Moves the stream to ``frame_index``. Falls back to grabbing the
+        frames in between if the stream does not support seeking, e.g. live
+        streams.
+        """
+        if (
+            self.stream.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+            and int(self.stream.get(cv2.CAP_PROP_POS_FRAMES)) == frame_index
+        ):
+            self._position = frame_index
+            return
+        self.logger.debug(f"Seeking not supported, grabbing {frame_index} frames")
+        while self._position < frame_index and self.stream.grab():
+            self._position += 1
+
     def shutdown(self) -> None:
         """Shuts down this class.
         Cannot be merged into __del__ as threading code needs to run here.
@@ -97,6 +199,15 @@ class VideoReader(ABC):
             int: number of frames in buffer
         """
 
+    @property
+    def dropped_frames(self) -> int:
+        """Get number of frames discarded because the buffer was full
+
+        Returns:
+            int: number of dropped frames
+        """
+        return 0
+
     @property
     def fps(self) -> float:
         """Get FPS of videofile
@@ -117,6 +228,21 @@ class VideoReader(ABC):
         num_frames = self.stream.get(cv2.CAP_PROP_FRAME_COUNT)
         return int(num_frames)
 
+    @property
+    def selected_frame_count(self) -> int:
+        """Get number of frames which will be read from the file, taking the
+        frame range into account
+
+        Returns:
+            int: number of frames to be read, 0 if the frame count of the
+            source is unknown
+        """
+        num_frames = self.frame_count
+        if num_frames <= 0:
+            return 0
+        end = num_frames if self.end_frame is None else min(num_frames, self.end_frame)
+        return max(0, -(-(end - self.start_frame) // self.frame_stride))
+
     @property
     def resolution(self) -> Tuple[int, int]:
         """Get resolution of the file.
@@ -138,14 +264,35 @@ class VideoReader(ABC):
 class VideoThread(VideoReader):
     """
     Videos will be threaded to improve FPS by reducing I/O blocking latency.
+
+    When buffering, ``buffer_size`` limits the number of frames held in the
+    buffer and ``buffer_policy`` decides what happens when it is full:
+
+    - ``"block"``: the reading thread waits for space, so no frames are lost.
+    - ``"drop_oldest"``: the oldest buffered frame is discarded, so the
+      buffer holds the latest frames.
+    - ``"drop_newest"``: the newly read frame is discarded.
+
+    A ``buffer_size`` of ``0`` does not limit the buffer.
     """
 
     # pylint: disable=too-many-instance-attributes
 
-    def __init__(
-        self, input_source: Union[int, str], mirror_image: bool, buffering: bool
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        input_source: Union[int, str],
+        mirror_image: bool,
+        buffering: bool,
+        buffer_size: int = 0,
+        buffer_policy: str = "block",
+        frame_range: FrameRange = FrameRange(),
+        replay_fps: float = 0,
     ) -> None:
-        super().__init__(input_source, mirror_image)
+        super().__init__(input_source, mirror_image, frame_range, replay_fps)
+        if buffer_size < 0:
+            raise ValueError("buffer_size must be a non-negative integer.")
+        if buffer_policy not in BUFFER_POLICIES:
+            raise ValueError(f"buffer_policy must be one of {BUFFER_POLICIES}.")
         self.logger = logging.getLogger(type(self).__name__)
         # events to coordinate threading
         self.is_done = Event()
@@ -153,8 +300,15 @@ class VideoThread(VideoReader):
         # frame storage and buffering
         self.frame = None
         self.prev_frame = None
+        # capture times of the latest frame and the frame last returned
+        self.frame_timestamp = 0.0
+        self.timestamp = 0.0
         self.buffer = buffering
-        self.queue: queue.Queue = queue.Queue()
+        self.buffer_size = buffer_size
+        self.buffer_policy = buffer_policy
+        self.queue: Deque[Tuple[float, Any]] = deque()
+        self._queue_changed = Condition()
+        self._dropped_frames = 0
         # start threading
         self.thread = Thread(target=self._reading_thread, args=(), daemon=True)
         self.thread.start()
@@ -167,6 +321,8 @@ class VideoThread(VideoReader):
         """
         self.logger.debug("VideoThread.shutdown")
         self.is_done.set()
+        with self._queue_changed:
+            self._queue_changed.notify_all()
         self.thread.join()
 
     def _reading_thread(self) -> None:
@@ -175,7 +331,7 @@ class VideoThread(VideoReader):
         """
         while not self.is_done.is_set():
             if self.stream.isOpened():
-                ret, frame = self.stream.read()
+                ret, frame = self._read_stream()
                 if not ret:
                     self.logger.debug(
                         f"_reading_thread: ret={ret}, "
@@ -185,34 +341,88 @@ class VideoThread(VideoReader):
                 else:
                     if self.mirror:
                         frame = mirror(frame)
-                    self.frame = frame
+                    timestamp = time()
+                    self.frame, self.frame_timestamp = frame, timestamp
                     self.is_thread_start.set()  # thread really started
                     self._frame_counter += 1
                     if self.buffer:
-                        self.queue.put(self.frame)
+                        self._put(timestamp, frame)
+        # a stream which fails on the first read would otherwise block __init__
+        self.is_thread_start.set()
+        with self._queue_changed:
+            self._queue_changed.notify_all()
+
+    def _put(self, timestamp: float, frame: Any) -> None:
+        """Adds a frame to the buffer, applying the buffer policy if the
+        buffer is full.
+        """
+        with self._queue_changed:
+            if self.buffer_size > 0 and len(self.queue) >= self.buffer_size:
+                if self.buffer_policy == "block":
+                    while (
+                        len(self.queue) >= self.buffer_size
+                        and not self.is_done.is_set()
+                    ):
+                        self._queue_changed.wait(POLL_INTERVAL)
+                elif self.buffer_policy == "drop_oldest":
+                    self.queue.popleft()
+                    self._dropped_frames += 1
+                else:
+                    self._dropped_frames += 1
+                    return
+            self.queue.append((timestamp, frame))
+            self._queue_changed.notify_all()
 
     def read_frame(self) -> Tuple[bool, Any]:
         """
-        Reads the frame.
+        Reads the frame. Its capture time is stored in ``timestamp``.
         """
         # pylint: disable=no-else-return
         if self.buffer:
-            if self.queue.empty():
-                if self.is_done.is_set():
-                    # end of input
-                    return False, None
+            with self._queue_changed:
+                if not self.queue:
+                    if self.is_done.is_set():
+                        # end of input
+                        return False, None
+                    else:
+                        # input slow, so duplicate frame
+                        return True, self.prev_frame
                 else:
-                    # input slow, so duplicate frame
+                    self.timestamp, self.prev_frame = self.queue.popleft()
+                    self._queue_changed.notify_all()
                     return True, self.prev_frame
-            else:
-                self.prev_frame = self.queue.get()
-                return True, self.prev_frame
         else:
             if self.is_done.is_set():
                 return False, None
             else:
+                self.timestamp = self.frame_timestamp
                 return True, self.frame
 
+    def wait_for_frame(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the buffer holds a frame or the input has ended.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait in seconds. Waits
+                indefinitely if ``None``.
+
+        Returns:
+            bool: True if a frame is buffered or the input has ended, False if
+            the wait timed out
+        """
+        with self._queue_changed:
+            return self._queue_changed.wait_for(
+                lambda: bool(self.queue) or self.is_done.is_set(), timeout
+            )
+
+    @property
+    def dropped_frames(self) -> int:
+        """Get number of frames discarded because the buffer was full
+
+        Returns:
+            int: number of dropped frames
+        """
+        return self._dropped_frames
+
     @property
     def queue_size(self) -> int:
         """Get buffer queue size
@@ -220,7 +430,7 @@ class VideoThread(VideoReader):
         Returns:
             int: number of frames in buffer
         """
-        return self.queue.qsize()
+        return len(self.queue)
 
 
 class VideoNoThread(VideoReader):
@@ -232,7 +442,7 @@ class VideoNoThread(VideoReader):
         """
         Reads the frame.
         """
-        ret, frame = self.stream.read()
+        ret, frame = self._read_stream()
         if not ret:
             self.logger.debug(
                 f"read_frame: ret={ret}, #frames read={self._frame_counter}"
@@ -251,3 +461,22 @@ class VideoNoThread(VideoReader):
             int: number of frames in buffer
         """
         return 0
+
+
+class ImageReader(VideoNoThread):
+    """
+    Serves an image which has already been decoded, e.g. by
+    :class:`~peekingduck.nodes.input.utils.prefetch.ImagePrefetcher`.
+    """
+
+    def __init__(
+        self, input_source: str, mirror_image: bool, image: Optional[np.ndarray]
+    ) -> None:
+        self._image = image
+        super().__init__(input_source, mirror_image)
+
+    def _open_stream(self, input_source: Union[int, str]) -> Any:
+        # an unopened capture object reports that the image could not be read
+        if self._image is None:
+            return cv2.VideoCapture()
+        return PNGReader(str(input_source), self._image)
@@ -24,8 +24,19 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.nodes.input.utils.prefetch import ImagePrefetcher
 from peekingduck.nodes.input.utils.preprocess import resize_image
-from peekingduck.nodes.input.utils.read import VideoNoThread, VideoThread
+from peekingduck.nodes.input.utils.read import (
+    BUFFER_POLICIES,
+    FrameRange,
+    ImageReader,
+    VideoNoThread,
+    VideoThread,
+)
+from peekingduck.utils.roi import crop_rois, get_roi_boxes
+
+# Only output when roi is set
+ROI_OUTPUTS = ["full_img", "roi_boxes"]
 
 
 class SourceType:  # pylint: disable=too-few-public-methods
@@ -52,6 +63,12 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
 
         |saved_video_fps_data|
 
+        |dropped_frames_data|
+
+        |full_img_data|
+
+        |roi_boxes_data|
+
     Configs:
         filename (:obj:`str`): **default = "video.mp4"**. |br|
             If source is a live stream/webcam, filename defines the name of the
@@ -68,6 +85,8 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             **default = https://storage.googleapis.com/peekingduck/videos/wave.mp4**. |br|
             Input source can be: |br|
             - filename : local image or video file |br|
+            - filename : local ``.npy`` file of pre-decoded frames, see
+            ``replay_fps`` |br|
             - directory name : all media files will be processed |br|
             - http URL for online cloud source : http[s]://... |br|
             - rtsp URL for CCTV : rtsp://... |br|
@@ -85,7 +104,7 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             If source is an image file, this value is ignored as it is not
             applicable. |br|
             If source is a video file, this value will be overridden by the
-            actual FPS of the video. |br|
+            actual FPS of the video divided by ``frame_stride``. |br|
             If source is a live stream/webcam, this value is used as the FPS of
             the output file.  It is recommended to set this to the actual FPS
             obtained on the machine running PeekingDuck
@@ -102,6 +121,75 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             One side effect of setting threading=True, buffering=True for a
             live stream/webcam is the onscreen video could appear to be playing
             in slow-mo.
+        buffer_size (:obj:`int`): **[0, sys.maxsize), default = 0**. [1]_ |br|
+            Maximum number of frames held in the buffer when threading and
+            buffering are True. ``0`` does not limit the buffer. Use a limit
+            to run a live stream/webcam with buffering at a fixed memory
+            ceiling.
+        buffer_policy (:obj:`str`):
+            **{"block", "drop_oldest", "drop_newest"}, default = "block"**.
+            [1]_ |br|
+            Action taken when a frame is read while the buffer is full. |br|
+            - block: wait for space in the buffer, no frames are lost. Suitable
+            for video files. |br|
+            - drop_oldest: discard the oldest buffered frame, so the latest
+            frames are processed with bounded latency. Suitable for live
+            streams. |br|
+            - drop_newest: discard the frame which was just read. |br|
+            The number of discarded frames is available as
+            :term:`dropped_frames`.
+        frame_stride (:obj:`int`): **[1, sys.maxsize), default = 1**. [1]_
+            |br|
+            Read one out of every ``frame_stride`` frames of each video.
+            Skipped frames are not decoded.
+        start_frame (:obj:`int`): **[0, sys.maxsize), default = 0**. [1]_
+            |br|
+            Index of the first frame to read from each video. The video is
+            seeked to this frame instead of decoding the frames before it.
+        end_frame (:obj:`Optional[int]`): **default = null**. [1]_ |br|
+            Stop reading each video before this frame index. If ``null``,
+            reads to the end of the video.
+        start_time (:obj:`Optional[float]`): **default = null**. [1]_ |br|
+            Time in seconds to start reading each video from. Combined with
+            ``start_frame``, the later of the two is used.
+        end_time (:obj:`Optional[float]`): **default = null**. [1]_ |br|
+            Time in seconds to stop reading each video at. Combined with
+            ``end_frame``, the earlier of the two is used.
+        prefetch (:obj:`int`): **[0, sys.maxsize), default = 0**. [1]_ |br|
+            If source is a directory, the number of JPEG/PNG images to decode
+            ahead on background threads, in sorted order. ``0`` decodes each
+            image when it is reached.
+        reduced_decode (:obj:`bool`): **default = False**. [1]_ |br|
+            If prefetching and resizing to a smaller size, decode JPEG/PNG
+            images at 1/2, 1/4, or 1/8 of their resolution while staying at
+            least as large as the resize dimensions. This speeds up decoding
+            large images at a small cost in image quality.
+        replay_fps (:obj:`float`): **[0, sys.maxsize), default = 0**. [1]_
+            |br|
+            Rate at which frames are returned from ``.npy`` files. ``0``
+            returns frames as fast as the pipeline consumes them. |br|
+            A ``.npy`` file holds a ``uint8`` array of shape
+            :math:`(N, H, W, 3)` in BGR format, e.g. saved with
+            ``np.save()``. It is memory-mapped and its frames are returned
+            without decoding, at the cost of one copy per frame, which makes
+            it a deterministic, network-free source for benchmarks and soak
+            tests.
+        roi (:obj:`Optional[List[List[Union[float, int]]]]`):
+            **default = null**. [1]_ |br|
+            Regions of interest to crop from each frame, in
+            :math:`(x1, y1, x2, y2)` format. An ROI whose values are all at
+            most 1 is in normalized coordinates, otherwise in pixels of the
+            (resized) frame. |br|
+            The ROIs are copied into a new image, and several ROIs are packed
+            side by side, so a model runs once over all of them. The uncropped
+            frame is available as :term:`full_img` and the pixel coordinates
+            of the ROIs as :term:`roi_boxes`, which are only output when
+            ``roi`` is set. Use :mod:`dabble.roi_to_full_frame` to map the
+            results of a model back to the full frame. :mod:`draw` nodes must
+            come after it, as drawings on the cropped :term:`img` are
+            discarded. |br|
+            Models only process the ROIs, which speeds up pipelines where
+            the area of interest is a small part of a large frame.
 
     .. [#] advanced configuration
 
@@ -127,7 +215,8 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
     \+ : potentially faster FPS |br|
     ! : lost frames if source is faster than PeekingDuck |br|
     !! : "slow-mo" video, potential out-of-memory error due to buffer overflow
-    if source is faster than PeekingDuck
+    if source is faster than PeekingDuck. Set ``buffer_size`` with the
+    "drop_oldest" ``buffer_policy`` to avoid both.
 
     Note: If threading=False, then the secondary parameter buffering is ignored
     regardless if it is set to True/False.
@@ -154,7 +243,8 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
         super().__init__(config, node_path=__name__, **kwargs)
         self._image_ext = ["gif", "jpeg", "jpg", "png"]
         self._video_ext = ["avi", "m4v", "mkv", "mov", "mp4"]
-        self._allowed_extensions = self._image_ext + self._video_ext
+        self._array_ext = ["npy"]
+        self._allowed_extensions = self._image_ext + self._video_ext + self._array_ext
         self._fps: float = 0  # self._fps > 0 if file playback
         self._file_name: str = ""
         self._filepaths: List[Path] = []
@@ -164,11 +254,37 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
         self.has_multiple_inputs: bool = False
         self.progress: int = 0
         self.videocap: Optional[Union[VideoNoThread, VideoThread]] = None
+        self.buffer_size: int = getattr(self, "buffer_size", 0)
+        self.buffer_policy: str = getattr(self, "buffer_policy", "block")
+        if self.buffer_policy not in BUFFER_POLICIES:
+            raise ValueError(
+                f"buffer_policy {self.buffer_policy}: must be one of {BUFFER_POLICIES}"
+            )
+        if self.buffer_size < 0:
+            raise ValueError("buffer_size must be a non-negative integer.")
+        self.frame_range = self._get_frame_range()
+        self.prefetch: int = getattr(self, "prefetch", 0)
+        self.reduced_decode: bool = getattr(self, "reduced_decode", False)
+        if self.prefetch < 0:
+            raise ValueError("prefetch must be a non-negative integer.")
+        self._prefetch_ext = ["jpeg", "jpg", "png"]
+        self._prefetcher: Optional[ImagePrefetcher] = None
+        self.replay_fps: float = getattr(self, "replay_fps", 0)
+        if self.replay_fps < 0:
+            raise ValueError("replay_fps must be non-negative.")
+        self.roi: Optional[List[List[Union[float, int]]]] = getattr(self, "roi", None)
+        if self.roi is not None and not self.roi:
+            raise ValueError("roi must contain at least one region of interest.")
+        if self.roi is not None and any(len(roi) != 4 for roi in self.roi):
+            raise ValueError("Each roi must be in (x1, y1, x2, y2) format.")
+        if self.roi is None:
+            self._remove_roi_outputs()
         self._determine_source_type()
         # error checking for user-defined output filename
-        if not self._is_valid_file_type(Path(self.filename)):
+        if Path(self.filename).suffix[1:] not in self._image_ext + self._video_ext:
             raise ValueError(
-                f"filename {self.filename}: extension must be one of {self._allowed_extensions}"
+                f"filename {self.filename}: extension must be one of "
+                f"{self._image_ext + self._video_ext}"
             )
         self._open_next_input()
 
@@ -176,6 +292,8 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
         """Override base class method to free video resource"""
         if self.videocap:
             self.videocap.shutdown()
+        if self._prefetcher:
+            self._prefetcher.shutdown()
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         outputs = self._get_next_frame()
@@ -189,6 +307,30 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             outputs = self._get_next_frame()
         return outputs
 
+    def _create_prefetcher(self) -> None:
+        """Starts decoding the images in the source directory ahead of the
+        pipeline.
+        """
+        target_size = (
+            (self.resize["width"], self.resize["height"])
+            if self.reduced_decode and self.do_resize
+            else None
+        )
+        self._prefetcher = ImagePrefetcher(
+            [path for path in self._filepaths if self._is_prefetchable(path)],
+            self.prefetch,
+            target_size,
+        )
+
+    def _remove_roi_outputs(self) -> None:
+        """Removes ``full_img`` and ``roi_boxes`` from the output keys, they
+        are only output when ``roi`` is set.
+        """
+        self.config["output"] = [
+            key for key in self.config["output"] if key not in ROI_OUTPUTS
+        ]
+        self.output = self.config["output"]
+
     def _determine_source_type(self) -> None:
         """
         Determine which one of the following types is self.source:
@@ -215,6 +357,8 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
                 self.has_multiple_inputs = True
                 self._num_files = len(self._filepaths)
                 self._curr_file_num = 0
+                if self.prefetch > 0:
+                    self._create_prefetcher()
             else:
                 self._source_type = SourceType.FILE
                 self._file_name = path.name
@@ -222,16 +366,27 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
     def _get_config_types(self) -> Dict[str, Any]:
         """Returns dictionary mapping the node's config keys to respective types."""
         return {
+            "buffer_policy": str,
+            "buffer_size": int,
             "buffering": bool,
+            "end_frame": Optional[int],
+            "end_time": Optional[Union[float, int]],
             "filename": str,
+            "frame_stride": int,
             "frames_log_freq": int,
             "mirror_image": bool,
+            "prefetch": int,
+            "reduced_decode": bool,
+            "replay_fps": Union[float, int],
             "resize": Dict[str, Union[bool, int]],
             "resize.do_resizing": bool,
             "resize.height": int,
             "resize.width": int,
+            "roi": Optional[List[List[Union[float, int]]]],
             "saved_video_fps": int,
             "source": Union[int, str],
+            "start_frame": int,
+            "start_time": Optional[Union[float, int]],
             "threading": bool,
         }
 
@@ -251,6 +406,34 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
         self._filepaths = list(path.iterdir())
         self._filepaths.sort()
 
+    def _get_frame_range(self) -> FrameRange:
+        """Validates the frame selection configs and groups them into a
+        :class:`FrameRange`.
+        """
+        frame_range = FrameRange(
+            stride=getattr(self, "frame_stride", 1),
+            start_frame=getattr(self, "start_frame", 0),
+            end_frame=getattr(self, "end_frame", None),
+            start_time=getattr(self, "start_time", None),
+            end_time=getattr(self, "end_time", None),
+        )
+        if frame_range.stride < 1:
+            raise ValueError("frame_stride must be a positive integer.")
+        if frame_range.start_frame < 0:
+            raise ValueError("start_frame must be a non-negative integer.")
+        if (
+            frame_range.end_frame is not None
+            and frame_range.end_frame <= frame_range.start_frame
+        ):
+            raise ValueError("end_frame must be greater than start_frame.")
+        if frame_range.start_time is not None and frame_range.start_time < 0:
+            raise ValueError("start_time must be non-negative.")
+        if frame_range.end_time is not None and frame_range.end_time <= (
+            frame_range.start_time or 0
+        ):
+            raise ValueError("end_time must be greater than start_time.")
+        return frame_range
+
     def _get_next_frame(self) -> Dict[str, Any]:
         """Read next frame from current input file/source"""
         self.file_end = True  # assume no more frames
@@ -261,13 +444,22 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
             "saved_video_fps": self._fps
             if 0 < self._fps <= 200
             else self.saved_video_fps,
+            "dropped_frames": self.videocap.dropped_frames if self.videocap else 0,
         }
+        if self.roi is not None:
+            outputs.update({"full_img": None, "roi_boxes": None})
         if self.videocap:
             success, img = self.videocap.read_frame()
             if success:
                 self.file_end = False
                 if self.do_resize:
                     img = resize_image(img, self.resize["width"], self.resize["height"])
+                if self.roi is not None:
+                    outputs["full_img"] = img
+                    outputs["roi_boxes"] = get_roi_boxes(
+                        self.roi, img.shape[1], img.shape[0]
+                    )
+                    img = crop_rois(img, outputs["roi_boxes"])
                 outputs["img"] = img
                 outputs["pipeline_end"] = False
                 self._show_progress()
@@ -275,6 +467,10 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
                 self.logger.debug("No video frames available for processing.")
         return outputs
 
+    def _is_prefetchable(self, filepath: Path) -> bool:
+        """Checks if given file is an image which can be prefetched."""
+        return filepath.suffix[1:] in self._prefetch_ext
+
     def _is_valid_file_type(self, filepath: Path) -> bool:
         """Check if given file has a supported file extension.
 
@@ -296,12 +492,29 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
                                 - online cloud source
                                 - CCTV or webcam live feed
         """
-        if self.threading:
-            self.videocap = VideoThread(self.source, self.mirror_image, self.buffering)
+        if self._prefetcher is not None and self._is_prefetchable(Path(input_source)):
+            self.videocap = ImageReader(
+                input_source,
+                self.mirror_image,
+                self._prefetcher.get(Path(input_source)),
+            )
+        elif self.threading:
+            self.videocap = VideoThread(
+                input_source,
+                self.mirror_image,
+                self.buffering,
+                self.buffer_size,
+                self.buffer_policy,
+                self.frame_range,
+                self.replay_fps,
+            )
         else:
-            self.videocap = VideoNoThread(input_source, self.mirror_image)
-        self._fps = self.videocap.fps
-        self.total_frame_count = max(0, self.videocap.frame_count)
+            self.videocap = VideoNoThread(
+                input_source, self.mirror_image, self.frame_range, self.replay_fps
+            )
+        # the output plays back at the original speed when frames are skipped
+        self._fps = self.videocap.fps / self.frame_range.stride
+        self.total_frame_count = self.videocap.selected_frame_count
         self.frame_counter = 0  # reset for newly opened input
         self._progress_tenth: int = 1  # each 10% progress
         # check resizing configuration
@@ -339,7 +552,8 @@ class Node(AbstractNode):  # pylint: disable=too-many-instance-attributes
         self.frame_counter += 1
         if self.frame_counter % self.frames_log_freq == 0 and self.videocap:
             buffer_info = (
-                f", buffer: {self.videocap.queue_size}"
+                f", buffer: {self.videocap.queue_size}, "
+                f"dropped: {self.videocap.dropped_frames}"
                 if self.threading and self.buffering
                 else ""
             )
@@ -43,6 +43,11 @@ class Node(AbstractNode):
         |count_data|
 
     Configs:
+        model_format (:obj:`str`): **{"tensorflow", "tflite"},
+            default="tensorflow"** |br|
+            Defines the weights format of the model. ``"tflite"`` converts the
+            TensorFlow model to TensorFlow Lite on first use, caches it next to
+            the weights, and runs it with the XNNPACK delegate on the CPU.
         model_type (:obj:`str`): **{"dense", "sparse"}, default="sparse"**. |br|
             Defines the type of CSRNet model to be used. The node uses the
             sparse crowd model by default and can be changed to using the dense
@@ -58,6 +63,14 @@ class Node(AbstractNode):
             to preserve its aspect ratio. In general, decreasing the width of
             an image will improve inference speed. However, this might impact
             the accuracy of the model.
+        tflite_num_threads (:obj:`int`): **[0, sys.maxsize), default = 0**.
+            |br|
+            Number of threads TensorFlow Lite uses when ``model_format`` is
+            ``"tflite"``. ``0`` uses one thread per CPU core.
+        tflite_int8 (:obj:`bool`): **default = False**. |br|
+            Flag to determine if the weights of the ``"tflite"`` model should
+            be quantized to INT8, for a smaller model which usually runs
+            faster on the CPU.
 
     References:
         CSRNet: Dilated Convolutional Neural Networks for Understanding the
@@ -90,4 +103,11 @@ class Node(AbstractNode):
 
     def _get_config_types(self) -> Dict[str, Any]:
         """Returns dictionary mapping the node's config keys to respective types."""
-        return {"model_type": str, "weights_parent_dir": Optional[str], "width": int}
+        return {
+            "model_format": str,
+            "model_type": str,
+            "tflite_int8": bool,
+            "tflite_num_threads": int,
+            "weights_parent_dir": Optional[str],
+            "width": int,
+        }
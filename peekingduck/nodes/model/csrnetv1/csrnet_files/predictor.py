@@ -19,24 +19,34 @@ Crowd counting class using csrnet model to predict density map and crowd count
 import logging
 import math
 from pathlib import Path
-from typing import Callable, Dict, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import cv2
 import numpy as np
 import tensorflow as tf
 
+from peekingduck.utils.tflite import load_tflite_model
 
-class Predictor:  # pylint: disable=too-few-public-methods
+
+class Predictor:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
     """Crowd counting class using csrnet model to predict density map and crowd count"""
 
-    def __init__(
-        self, model_dir: Path, model_type: str, model_file: Dict[str, str], width: int
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        model_dir: Path,
+        model_format: str,
+        model_type: str,
+        model_file: Dict[str, str],
+        width: int,
+        tflite_options: Optional[Dict[str, Any]] = None,
     ) -> None:
         self.logger = logging.getLogger(__name__)
 
+        self.model_format = model_format
         self.model_type = model_type
         self.model_path = model_dir / model_file[self.model_type]
         self.width = width
+        self.tflite_options = tflite_options or {}
 
         self.csrnet = self._create_csrnet_model()
 
@@ -46,6 +56,7 @@ class Predictor:  # pylint: disable=too-few-public-methods
         """
         self.logger.info(
             "CSRNet model loaded with following configs: \n\t"
+            f"Model format: {self.model_format}, \n\t"
             f"Model type: {self.model_type}, \n\t"
             f"Input width: {self.width} \n\t"
         )
@@ -53,6 +64,8 @@ class Predictor:  # pylint: disable=too-few-public-methods
         return self._load_csrnet_weights()
 
     def _load_csrnet_weights(self) -> Callable:
+        if self.model_format == "tflite":
+            return load_tflite_model(self.model_path, **self.tflite_options)
         # Have to create this member variable to keep the loaded weights in
         # memory
         self.model = tf.saved_model.load(str(self.model_path))
@@ -32,14 +32,21 @@ class CSRNetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         self.config = config
         self.logger = logging.getLogger(__name__)
 
+        self.check_valid_choice("model_format", {"tensorflow", "tflite"})
         self.check_bounds("width", "(0, +inf]")
+        self.check_bounds("tflite_num_threads", "[0, +inf)")
 
         model_dir = self.download_weights()
         self.predictor = Predictor(
             model_dir,
+            self.config["model_format"],
             self.config["model_type"],
             self.weights["model_file"],
             self.config["width"],
+            {
+                "num_threads": self.config["tflite_num_threads"],
+                "int8": self.config["tflite_int8"],
+            },
         )
 
     def predict(self, frame: np.ndarray) -> Tuple[np.ndarray, int]:
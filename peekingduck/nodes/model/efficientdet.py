@@ -49,6 +49,11 @@ class Node(RequirementCheckerMixin, AbstractNode):
         |bbox_scores_data|
 
     Configs:
+        model_format (:obj:`str`): **{"tensorflow", "tflite"},
+            default="tensorflow"** |br|
+            Defines the weights format of the model. ``"tflite"`` converts the
+            TensorFlow model to TensorFlow Lite on first use, caches it next to
+            the weights, and runs it with the XNNPACK delegate on the CPU.
         model_type (:obj:`int`): **{0, 1, 2, 3, 4}, default = 0**. |br|
             Defines the compound coefficient for EfficientDet.
         score_threshold (:obj:`float`): **[0, 1], default = 0.3**.
@@ -63,7 +68,45 @@ class Node(RequirementCheckerMixin, AbstractNode):
         use_jit (:obj:`bool`): **default = False**. |br|
             Flag to enable compile parts of the model code with Numba JIT compiler
             to improve inference speed. Requires installing ``numba`` as an
-            optional dependency.
+            optional dependency. Only used when ``model_format`` is
+            ``"tflite"``, the ``"tensorflow"`` model preprocesses the image in
+            its graph.
+        tflite_num_threads (:obj:`int`): **[0, sys.maxsize), default = 0**.
+            |br|
+            Number of threads TensorFlow Lite uses when ``model_format`` is
+            ``"tflite"``. ``0`` uses one thread per CPU core.
+        tflite_int8 (:obj:`bool`): **default = False**. |br|
+            Flag to determine if the weights of the ``"tflite"`` model should
+            be quantized to INT8, for a smaller model which usually runs
+            faster on the CPU.
+        jit_compile (:obj:`bool`): **default = False**. |br|
+            Flag to compile the network with XLA when ``model_format`` is
+            ``"tensorflow"``. The first frame takes longer while the network
+            is compiled, later frames usually run faster.
+        tiled_inference (:obj:`bool`): **default = False**. |br|
+            Flag to split each frame into overlapping tiles, which are
+            detected on one at a time, and merge the detections which
+            overlap. This detects small objects in high
+            resolution frames which are missed when the whole frame is
+            downscaled to the model input size, at the cost of throughput.
+        tile_size (:obj:`int`): **(0, sys.maxsize), default = 640**. |br|
+            Width and height of the tiles in pixels, when ``tiled_inference``
+            is ``True``.
+        tile_overlap (:obj:`float`): **[0, 1), default = 0.2**. |br|
+            Fraction of ``tile_size`` which adjacent tiles overlap by, so
+            that objects cut by the edge of one tile are whole in the next.
+        tile_full_frame (:obj:`bool`): **default = True**. |br|
+            Flag to also detect on the full frame, to detect the large
+            objects which do not fit in a tile.
+        tile_iou_threshold (:obj:`float`): **[0, 1], default = 0.5**. |br|
+            Overlapping detections of the same class above the specified IoU
+            threshold are merged with non-maximum suppression.
+        tile_match_threshold (:obj:`float`): **[0, 1], default = 0.5**. |br|
+            An object cut by the inner edge of a tile is only partially
+            detected in it. Such a detection is merged with a larger
+            detection of the same class from another tile, or the full
+            frame, when their intersection over the area of the cut
+            detection is above the specified threshold.
 
     References:
         EfficientDet: Scalable and Efficient Object Detection:
@@ -93,7 +136,17 @@ class Node(RequirementCheckerMixin, AbstractNode):
         """Returns dictionary mapping the node's config keys to respective types."""
         return {
             "detect": List[Union[int, str]],
+            "jit_compile": bool,
+            "model_format": str,
             "model_type": int,
             "score_threshold": float,
+            "tflite_int8": bool,
+            "tflite_num_threads": int,
+            "tile_full_frame": bool,
+            "tile_iou_threshold": float,
+            "tile_match_threshold": float,
+            "tile_overlap": float,
+            "tile_size": int,
+            "tiled_inference": bool,
             "weights_parent_dir": Optional[str],
         }
@@ -18,26 +18,33 @@ Detector class to handle detection of bboxes for efficientdet
 
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import tensorflow as tf
 
+from peekingduck.nodes.model.efficientdet_d04.efficientdet_files.constants import (
+    IMG_MEAN,
+    IMG_STD,
+)
 from peekingduck.nodes.model.efficientdet_d04.efficientdet_files.model_process import (
     postprocess_boxes,
     preprocess_image,
+    resize_image,
 )
-from peekingduck.utils.graph_functions import load_graph
+from peekingduck.utils.graph_functions import GraphFunction, load_graph
+from peekingduck.utils.tflite import load_tflite_model
 
 
 class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
     """Detector class to handle detection of bboxes for efficientdet"""
 
-    def __init__(  # pylint: disable=too-many-arguments
+    def __init__(  # pylint: disable=too-many-arguments,too-many-locals
         self,
         model_dir: Path,
         class_names: Dict[int, str],
         detect_ids: List[int],
+        model_format: str,
         model_type: int,
         num_classes: int,
         model_file: Dict[int, str],
@@ -45,10 +52,13 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         image_size: Dict[int, int],
         score_threshold: float,
         use_jit: bool,
+        tflite_options: Optional[Dict[str, Any]] = None,
+        jit_compile: bool = False,
     ) -> None:
         self.logger = logging.getLogger(__name__)
 
         self.class_names = class_names
+        self.model_format = model_format
         self.model_type = model_type
         self.num_classes = num_classes
         self.model_path = model_dir / model_file[self.model_type]
@@ -56,9 +66,14 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         self.image_size = image_size[self.model_type]
         self.score_threshold = score_threshold
         self.use_jit = use_jit
+        self.tflite_options = tflite_options or {}
+        self.jit_compile = jit_compile
 
         self.detect_ids = detect_ids
         self.efficient_det = self._create_efficient_det_model()
+        self.detect_all = GraphFunction(
+            self._detect_all, [tf.TensorSpec([None, None, 3], tf.uint8)], "EfficientDet"
+        )
 
         # pylint: disable=import-outside-toplevel
         if use_jit:
@@ -88,11 +103,14 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
             scores (np.ndarray): array of scores
         """
         img_shape = image.shape[0], image.shape[1]
-        image, scale = self._preprocess(image)
-
-        # run network
-        graph_input = tf.convert_to_tensor(image, dtype=tf.float32)
-        boxes, scores, labels = self.efficient_det(x=graph_input)
+        if self.model_format == "tflite":
+            # TensorFlow Lite models run outside of the TensorFlow graph
+            image, scale = self._preprocess(image)
+            graph_input = tf.convert_to_tensor(image, dtype=tf.float32)
+            boxes, scores, labels = self.efficient_det(x=graph_input)
+        else:
+            image, scale = resize_image(image, self.image_size)
+            boxes, scores, labels = self.detect_all(image)
         network_output = (
             np.squeeze(boxes.numpy()),
             np.squeeze(scores.numpy()),
@@ -104,21 +122,54 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         return boxes, labels, scores
 
     def _create_efficient_det_model(self) -> tf.keras.Model:
-        model = load_graph(
-            str(self.model_path),
-            inputs=self.model_nodes["inputs"],
-            outputs=self.model_nodes["outputs"],
-        )
+        model: Callable
+        if self.model_format == "tflite":
+            model = load_tflite_model(
+                self.model_path, model_nodes=self.model_nodes, **self.tflite_options
+            )
+        else:
+            model = load_graph(
+                str(self.model_path),
+                inputs=self.model_nodes["inputs"],
+                outputs=self.model_nodes["outputs"],
+            )
         self.logger.info(
             "EfficientDet model loaded with following configs:\n\t"
+            f"Model format: {self.model_format}\n\t"
             f"Model type: D{self.model_type}\n\t"
             f"IDs being detected: {self.detect_ids}\n\t"
             f"Score threshold: {self.score_threshold}\n\t"
-            f"Compile with Numba JIT: {self.use_jit}"
+            f"Compile with Numba JIT: {self.use_jit}\n\t"
+            f"XLA compilation: {self.jit_compile}"
         )
-
+        if self.jit_compile:
+            return tf.function(model, jit_compile=True)
         return model
 
+    def _detect_all(self, image: tf.Tensor) -> Tuple[tf.Tensor, tf.Tensor, tf.Tensor]:
+        """Normalizes and pads the resized ``image`` and detects the bboxes of
+        all classes in it, in a single graph.
+
+        Args:
+            image (tf.Tensor): Resized image with uint8 pixel values, whose
+                longer side is ``image_size``.
+
+        Returns:
+            (Tuple[tf.Tensor, tf.Tensor, tf.Tensor]): The boxes, scores and
+            labels from the network.
+        """
+        image = tf.cast(image, tf.float32) / 255.0
+        image = (image - tf.constant(IMG_MEAN, tf.float32)) / tf.constant(
+            IMG_STD, tf.float32
+        )
+        pad_height = self.image_size - tf.shape(image)[0]
+        pad_width = self.image_size - tf.shape(image)[1]
+        image = tf.pad(image, [[0, pad_height], [0, pad_width], [0, 0]])
+        image = tf.reshape(image, (1, self.image_size, self.image_size, 3))
+        boxes, scores, labels = self.efficient_det(x=image)
+
+        return boxes[0], scores[0], labels[0]
+
     def _postprocess(
         self,
         network_output: Tuple[np.ndarray, np.ndarray, np.ndarray],
@@ -38,6 +38,26 @@ def preprocess_image(
         image (np.ndarray): the preprocessed image
         scale (float): the scale in which the original image was resized to
     """
+    image, scale = resize_image(image, image_size)
+    pad_height = image_size - image.shape[0]
+    pad_width = image_size - image.shape[1]
+    image = normalize_and_pad(image, pad_height, pad_width)
+
+    return image, scale
+
+
+def resize_image(image: np.ndarray, image_size: int) -> Tuple[np.ndarray, float]:
+    """Resizes the image so that its longer side is ``image_size``, keeping
+    its aspect ratio.
+
+    Args:
+        image (np.ndarray): the input image in numpy array
+        image_size (int): the model input size as specified in config
+
+    Returns:
+        image (np.ndarray): the resized image
+        scale (float): the scale in which the original image was resized to
+    """
     # image, RGB
     height, width = image.shape[:2]
     scale = image_size / max(height, width)
@@ -47,13 +67,8 @@ def preprocess_image(
     else:
         resized_height = int(height * scale)
         resized_width = image_size
-    pad_height = image_size - resized_height
-    pad_width = image_size - resized_width
-
-    image = cv2.resize(image, (resized_width, resized_height))
-    image = normalize_and_pad(image, pad_height, pad_width)
 
-    return image, scale
+    return cv2.resize(image, (resized_width, resized_height)), scale
 
 
 def postprocess_boxes(
@@ -18,7 +18,7 @@ EfficientDet model with model types: D0-D4
 
 import json
 import logging
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
@@ -26,6 +26,7 @@ from peekingduck.nodes.base import ThresholdCheckerMixin, WeightsDownloaderMixin
 from peekingduck.nodes.model.efficientdet_d04.efficientdet_files.detector import (
     Detector,
 )
+from peekingduck.utils.tiling import TiledInference
 
 
 class EfficientDetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
@@ -35,8 +36,17 @@ class EfficientDetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         self.config = config
         self.logger = logging.getLogger(__name__)
 
+        self.check_valid_choice("model_format", {"tensorflow", "tflite"})
         self.check_valid_choice("model_type", {0, 1, 2, 3, 4})
         self.check_bounds("score_threshold", "[0, 1]")
+        self.check_bounds("tflite_num_threads", "[0, +inf)")
+        self.check_bounds("tile_size", "(0, +inf)")
+        self.check_bounds("tile_overlap", "[0, 1)")
+        self.check_bounds(["tile_iou_threshold", "tile_match_threshold"], "[0, 1]")
+        if self.config["jit_compile"] and self.config["model_format"] != "tensorflow":
+            raise ValueError(
+                "jit_compile is only supported by the tensorflow model_format."
+            )
 
         model_dir = self.download_weights()
         classes_path = model_dir / self.weights["classes_file"]
@@ -49,6 +59,7 @@ class EfficientDetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             model_dir,
             class_names,
             self.detect_ids,
+            self.config["model_format"],
             self.config["model_type"],
             self.config["num_classes"],
             self.weights["model_file"],
@@ -56,7 +67,25 @@ class EfficientDetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             self.config["image_size"],
             self.config["score_threshold"],
             self.config["use_jit"],
+            {
+                "num_threads": self.config["tflite_num_threads"],
+                "int8": self.config["tflite_int8"],
+            },
+            self.config["jit_compile"],
         )
+        self.tiled_inference: Optional[TiledInference] = None
+        if self.config["tiled_inference"]:
+            self.tiled_inference = TiledInference(
+                lambda images: [
+                    self.detector.predict_object_bbox_from_image(image)
+                    for image in images
+                ],
+                self.config["tile_size"],
+                self.config["tile_overlap"],
+                self.config["tile_full_frame"],
+                self.config["tile_iou_threshold"],
+                self.config["tile_match_threshold"],
+            )
 
     @property
     def detect_ids(self) -> List[int]:
@@ -84,5 +113,7 @@ class EfficientDetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         """
         if not isinstance(image, np.ndarray):
             raise TypeError("image must be a np.ndarray")
+        if self.tiled_inference is not None:
+            return self.tiled_inference(image)
 
         return self.detector.predict_object_bbox_from_image(image)
@@ -64,6 +64,11 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
             Size (width, height) of the input image to the model. Raw
             video/image frames will be resized to the ``input_size`` before
             they are fed to the model.
+        torchscript_cache (:obj:`bool`): **default = False**. |br|
+            If ``True``, the model is traced with TorchScript and cached next
+            to the weights on the first run, and later runs load the compiled
+            model directly for a faster startup. The cache is keyed by the
+            weights, ``input_size``, the device, and the PyTorch version.
 
     References:
         FairMOT: On the Fairness of Detection and Re-Identification in Multiple
@@ -129,6 +134,7 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
             "K": int,
             "min_box_area": int,
             "score_threshold": float,
+            "torchscript_cache": bool,
             "track_buffer": int,
             "weights_parent_dir": Optional[str],
         }
@@ -62,6 +62,7 @@ from peekingduck.nodes.model.fairmotv1.fairmot_files.utils import (
     transpose_and_gather_feat,
 )
 from peekingduck.utils.bbox.transforms import tlwh2xyxyn, xyxy2tlwh
+from peekingduck.utils.torchscript_cache import get_cache_path, load_or_compile
 
 
 class Tracker:  # pylint: disable=too-many-instance-attributes
@@ -72,6 +73,8 @@ class Tracker:  # pylint: disable=too-many-instance-attributes
         model_dir (Path): Directory to model weights files.
         frame_rate (float): Frame rate of the current video sequence, used
             for computing size of track buffer.
+        torchscript_cache (bool): Flag to determine if the model is compiled
+            with TorchScript and cached for later runs.
     """
 
     heads = {"hm": 1, "wh": 4, "id": 128, "reg": 2}
@@ -91,6 +94,7 @@ class Tracker:  # pylint: disable=too-many-instance-attributes
         min_box_area: int,
         track_buffer: int,
         score_threshold: float,
+        torchscript_cache: bool = False,
     ) -> None:
         self.logger = logging.getLogger(__name__)
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
@@ -102,6 +106,7 @@ class Tracker:  # pylint: disable=too-many-instance-attributes
         self.min_box_area = min_box_area
         self.track_buffer = track_buffer
         self.score_threshold = score_threshold
+        self.torchscript_cache = torchscript_cache
 
         self.model = self._create_model()
 
@@ -367,6 +372,7 @@ class Tracker:  # pylint: disable=too-many-instance-attributes
             f"Max number of output objects: {self.max_per_image}\n\t"
             f"Min bounding box area: {self.min_box_area}\n\t"
             f"Track buffer: {self.track_buffer}\n\t"
+            f"TorchScript cache: {self.torchscript_cache}\n\t"
         )
         return self._load_model_weights()
 
@@ -375,7 +381,24 @@ class Tracker:  # pylint: disable=too-many-instance-attributes
             raise ValueError(
                 f"Model file does not exist. Please check that {self.model_path} exists."
             )
+        if self.torchscript_cache:
+            cache_path = get_cache_path(
+                [self.model_path],
+                {
+                    "model_type": self.model_type,
+                    "input_size": self.input_size,
+                    "device": self.device.type,
+                },
+            )
+            example_input = torch.zeros(
+                1, 3, self.input_size[1], self.input_size[0]
+            ).to(self.device)
+            return load_or_compile(  # type: ignore
+                cache_path, self._load_eager_model, self.device, (example_input,)
+            )
+        return self._load_eager_model()
 
+    def _load_eager_model(self) -> DLASeg:
         ckpt = torch.load(str(self.model_path), map_location="cpu")
         model = DLASeg(self.heads, self.down_ratio)
         model.load_state_dict(ckpt["state_dict"], strict=False)
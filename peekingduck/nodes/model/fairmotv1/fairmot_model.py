@@ -74,6 +74,7 @@ class FairMOTModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             self.config["min_box_area"],
             self.config["track_buffer"],
             self.config["score_threshold"],
+            self.config["torchscript_cache"],
         )
 
     def predict(self, image: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[int]]:
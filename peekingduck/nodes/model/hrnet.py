@@ -49,6 +49,11 @@ class Node(AbstractNode):
         |keypoint_conns_data|
 
     Configs:
+        model_format (:obj:`str`): **{"tensorflow", "tflite"},
+            default="tensorflow"** |br|
+            Defines the weights format of the model. ``"tflite"`` converts the
+            TensorFlow model to TensorFlow Lite on first use, caches it next to
+            the weights, and runs it with the XNNPACK delegate on the CPU.
         weights_parent_dir (:obj:`Optional[str]`): **default = null**. |br|
             Change the parent directory where weights will be stored by
             replacing ``null`` with an absolute path to the desired directory.
@@ -57,6 +62,19 @@ class Node(AbstractNode):
             Resolution of input array to HRNet model.
         score_threshold (:obj:`float`): **[0, 1], default = 0.1**. |br|
             Threshold to determine if detection should be returned
+        max_batch_size (:obj:`int`): **[1, sys.maxsize), default = 8**. |br|
+            Maximum number of bboxes cropped and passed to the model in a
+            single batch. Each batch is padded to the next power of two, or
+            ``max_batch_size``, so that the model only sees a few batch sizes
+            as the number of people in the frame changes.
+        tflite_num_threads (:obj:`int`): **[0, sys.maxsize), default = 0**.
+            |br|
+            Number of threads TensorFlow Lite uses when ``model_format`` is
+            ``"tflite"``. ``0`` uses one thread per CPU core.
+        tflite_int8 (:obj:`bool`): **default = False**. |br|
+            Flag to determine if the weights of the ``"tflite"`` model should
+            be quantized to INT8, for a smaller model which usually runs
+            faster on the CPU.
 
     References:
         Deep High-Resolution Representation Learning for Visual Recognition:
@@ -85,9 +103,13 @@ class Node(AbstractNode):
     def _get_config_types(self) -> Dict[str, Any]:
         """Returns dictionary mapping the node's config keys to respective types."""
         return {
+            "max_batch_size": int,
+            "model_format": str,
             "resolution": Dict[str, int],
             "resolution.height": int,
             "resolution.width": int,
             "score_threshold": float,
+            "tflite_int8": bool,
+            "tflite_num_threads": int,
             "weights_parent_dir": Optional[str],
         }
@@ -18,7 +18,7 @@ Detector class to handle detection of poses for HRNet
 
 import logging
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import tensorflow as tf
@@ -33,6 +33,7 @@ from peekingduck.nodes.model.hrnetv1.hrnet_files.preprocessing import (
 from peekingduck.utils.bbox.transforms import xyxyn2tlwh
 from peekingduck.utils.graph_functions import load_graph
 from peekingduck.utils.pose.keypoint_handler import COCOBody
+from peekingduck.utils.tflite import load_tflite_model
 
 
 class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
@@ -41,22 +42,34 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
     def __init__(  # pylint: disable=too-many-arguments
         self,
         model_dir: Path,
+        model_format: str,
         model_type: str,
         model_file: Dict[str, str],
         model_nodes: Dict[str, List[str]],
         resolution: Dict[str, int],
         score_threshold: float,
+        max_batch_size: int,
+        tflite_options: Optional[Dict[str, Any]] = None,
     ) -> None:
         self.logger = logging.getLogger(__name__)
 
+        self.model_format = model_format
         self.model_type = model_type
         self.model_path = model_dir / model_file[self.model_type]
         self.model_nodes = model_nodes
         self.resolution = resolution
         self.score_threshold = score_threshold
+        self.max_batch_size = max_batch_size
+        self.tflite_options = tflite_options or {}
 
         self.keypoint_handler = COCOBody(score_threshold=self.score_threshold)
         self.hrnet = self._create_hrnet_model()
+        # Crops are warped into crop_buffer, which matches the dtype of the
+        # frame, and scaled into the zero-padded input_buffer, so that the
+        # network only sees a few batch sizes.
+        buffer_shape = (max_batch_size, resolution["height"], resolution["width"], 3)
+        self.crop_buffer = np.empty(buffer_shape, np.uint8)
+        self.input_buffer = np.zeros(buffer_shape, np.float32)
 
     def predict(
         self, frame: np.ndarray, bboxes: np.ndarray
@@ -72,13 +85,20 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
             bboxes and pose related info, i.e., coordinates, scores, and
             connections
         """
-        cropped_frames, affine_matrices, crop_size, frame_size = self._preprocess(
-            frame, bboxes
-        )
-        heatmaps = self.hrnet(tf.cast(cropped_frames, float))[0]
+        heatmaps = []
+        affine_matrices = []
+        for i in range(0, len(bboxes), self.max_batch_size):
+            cropped_frames, matrices, crop_size, frame_size = self._preprocess(
+                frame, bboxes[i : i + self.max_batch_size]
+            )
+            heatmaps.append(self._predict_heatmaps(cropped_frames))
+            affine_matrices.append(matrices)
 
         keypoints, keypoint_scores = self._postprocess(
-            heatmaps.numpy(), affine_matrices, crop_size, frame_size
+            np.concatenate(heatmaps),
+            np.concatenate(affine_matrices),
+            crop_size,
+            frame_size,
         )
         self.keypoint_handler.update(keypoints, keypoint_scores)
 
@@ -92,23 +112,56 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         resolution_tuple = (self.resolution["height"], self.resolution["width"])
         self.logger.info(
             "HRNet graph model loaded with following configs:\n\t"
+            f"Model format: {self.model_format}\n\t"
             f"Resolution: {resolution_tuple},\n\t"
-            f"Score threshold: {self.score_threshold}"
+            f"Score threshold: {self.score_threshold}\n\t"
+            f"Max batch size: {self.max_batch_size}"
         )
         return self._load_hrnet_weights()
 
     def _load_hrnet_weights(self) -> Callable:
+        if self.model_format == "tflite":
+            return load_tflite_model(
+                self.model_path, model_nodes=self.model_nodes, **self.tflite_options
+            )
         return load_graph(
             str(self.model_path),
             inputs=self.model_nodes["inputs"],
             outputs=self.model_nodes["outputs"],
         )
 
+    def _predict_heatmaps(self, cropped_frames: np.ndarray) -> np.ndarray:
+        """Predicts the heatmaps of at most `max_batch_size` cropped frames.
+        The batch is scaled into the input buffer, and padded to the next
+        power of two, or `max_batch_size`, so that the network is only run on
+        a few batch shapes.
+
+        Args:
+            cropped_frames (np.ndarray): Array of cropped images.
+
+        Returns:
+            (np.ndarray): Heatmaps of the cropped frames.
+        """
+        num_crops = len(cropped_frames)
+        batch_size = min(1 << (num_crops - 1).bit_length(), self.max_batch_size)
+        np.multiply(
+            cropped_frames,
+            np.float32(1 / 255.0),
+            out=self.input_buffer[:num_crops],
+            casting="unsafe",
+        )
+        # clear stale crops of an earlier, larger batch from the padding
+        self.input_buffer[num_crops:batch_size] = 0
+        heatmaps = self.hrnet(tf.constant(self.input_buffer[:batch_size]))[0]
+
+        return heatmaps.numpy()[:num_crops]
+
     def _preprocess(
         self, frame: np.ndarray, bboxes: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int], Tuple[int, int]]:
         """Crops the input image frame with the specified `bboxes` while
-        preserving aspect ratio.
+        preserving aspect ratio. The crops are warped directly from `frame`
+        into the crop buffer, which holds at most `max_batch_size` crops.
 
         Args:
             frame (np.ndarray): Input image in numpy array.
@@ -119,13 +172,16 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
             Array of cropped images, transformation matrices, cropped frame size,
             and original frame size.
         """
-        frame = frame / 255.0
         frame_size = (frame.shape[1], frame.shape[0])
         crop_size = (self.resolution["width"], self.resolution["height"])
+        if self.crop_buffer.dtype != frame.dtype:
+            self.crop_buffer = np.empty(self.crop_buffer.shape, frame.dtype)
 
         tlwhs = xyxyn2tlwh(bboxes, frame.shape[0] - 1, frame.shape[1] - 1)
         xywhs = tlwh2xywh(tlwhs, self.resolution["width"] / self.resolution["height"])
-        cropped_frames, affine_matrices = crop_and_resize(frame, xywhs, crop_size)
+        cropped_frames, affine_matrices = crop_and_resize(
+            frame, xywhs, crop_size, self.crop_buffer
+        )
 
         return cropped_frames, affine_matrices, crop_size, frame_size
 
@@ -16,7 +16,7 @@
 Preprocessing functions for HRNet
 """
 
-from typing import Tuple
+from typing import Optional, Tuple
 
 import cv2
 import numpy as np
@@ -71,7 +71,10 @@ def tlwh2xywh(inputs: np.ndarray, aspect_ratio: float) -> np.ndarray:
 
 
 def crop_and_resize(
-    frame: np.ndarray, bboxes: np.ndarray, out_size: Tuple[int, int]
+    frame: np.ndarray,
+    bboxes: np.ndarray,
+    out_size: Tuple[int, int],
+    out: Optional[np.ndarray] = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """Crop a region from frame specified by its center and size. The
     cropped region is resized to out_size.
@@ -80,6 +83,10 @@ def crop_and_resize(
         frame (np.ndarray): Image in numpy array.
         bboxes (np.ndarray): Bboxes center (x, y, w, h) coordinates.
         out_size (tuple): Cropped region will be resized to out_size.
+        out (Optional[np.ndarray]): Preallocated array with the same dtype as
+            `frame` which the cropped regions are written into, with at least
+            one (height, width, channels) slot per bbox. A new array is
+            allocated if `None`.
 
     Returns:
         (Tuple[np.ndarray, np.ndarray]): The resized and cropped region array
@@ -97,10 +104,16 @@ def crop_and_resize(
     affine_matrices = np.concatenate((x_mat, y_mat), axis=1)
     affine_matrices = affine_matrices.reshape((-1, 2, 3))
 
-    transformed_images = [
+    if out is None:
+        out = np.empty(
+            (len(bboxes), out_size[1], out_size[0]) + frame.shape[2:], frame.dtype
+        )
+    for i, matrix in enumerate(affine_matrices):
         cv2.warpAffine(
-            frame, matrix, out_size, flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP
+            frame,
+            matrix,
+            out_size,
+            dst=out[i],
+            flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
         )
-        for matrix in affine_matrices
-    ]
-    return np.array(transformed_images), affine_matrices
+    return out[: len(bboxes)], affine_matrices
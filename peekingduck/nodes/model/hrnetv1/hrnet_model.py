@@ -30,16 +30,25 @@ class HRNetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         self.config = config
         self.logger = logging.getLogger(__name__)
 
+        self.check_valid_choice("model_format", {"tensorflow", "tflite"})
         self.check_bounds("score_threshold", "[0, 1]")
+        self.check_bounds("max_batch_size", "[1, +inf)")
+        self.check_bounds("tflite_num_threads", "[0, +inf)")
 
         model_dir = self.download_weights()
         self.detector = Detector(
             model_dir,
+            self.config["model_format"],
             self.config["model_type"],
             self.weights["model_file"],
             self.config["model_nodes"],
             self.config["resolution"],
             self.config["score_threshold"],
+            self.config["max_batch_size"],
+            {
+                "num_threads": self.config["tflite_num_threads"],
+                "int8": self.config["tflite_int8"],
+            },
         )
 
     def predict(
@@ -60,6 +60,12 @@ class Node(AbstractNode):
         track_buffer (:obj:`int`): **default = 30**. |br|
             Threshold to remove track if track is lost for more frames than
             value.
+        torchscript_cache (:obj:`bool`): **default = False**. |br|
+            If ``True``, the model is traced with TorchScript and cached next
+            to the weights on the first run, and later runs load the compiled
+            model directly for a faster startup. The cache is keyed by the
+            weights, the model config file, the device, and the PyTorch
+            version.
 
     References:
         Towards Real-Time Multi-Object Tracking:
@@ -123,6 +129,7 @@ class Node(AbstractNode):
             "min_box_area": int,
             "nms_threshold": float,
             "score_threshold": float,
+            "torchscript_cache": bool,
             "track_buffer": int,
             "weights_parent_dir": Optional[str],
         }
@@ -59,6 +59,7 @@ from peekingduck.nodes.model.jdev1.jde_files.utils import (
     scale_coords,
 )
 from peekingduck.utils.bbox.transforms import tlwh2xyxyn, xyxy2tlwh
+from peekingduck.utils.torchscript_cache import get_cache_path, load_or_compile
 
 
 class Tracker:  # pylint: disable=too-many-instance-attributes
@@ -69,6 +70,8 @@ class Tracker:  # pylint: disable=too-many-instance-attributes
         model_dir (Path): Directory to model weights files.
         frame_rate (float): Frame rate of the current video sequence, used
             for computing size of track buffer.
+        torchscript_cache (bool): Flag to determine if the model is compiled
+            with TorchScript and cached for later runs.
     """
 
     def __init__(  # pylint: disable=too-many-arguments
@@ -83,15 +86,15 @@ class Tracker:  # pylint: disable=too-many-instance-attributes
         iou_threshold: float,
         nms_threshold: float,
         score_threshold: float,
+        torchscript_cache: bool = False,
     ) -> None:
         self.logger = logging.getLogger(__name__)
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
         self.model_type = model_type
         self.model_path = model_dir / model_file[self.model_type]
-        self.model_settings = self._parse_model_config(
-            model_dir / model_config_file[self.model_type]
-        )
+        self.model_config_path = model_dir / model_config_file[self.model_type]
+        self.model_settings = self._parse_model_config(self.model_config_path)
         self.input_size = [
             int(self.model_settings[0]["width"]),
             int(self.model_settings[0]["height"]),
@@ -101,6 +104,7 @@ class Tracker:  # pylint: disable=too-many-instance-attributes
         self.iou_threshold = iou_threshold
         self.nms_threshold = nms_threshold
         self.score_threshold = score_threshold
+        self.torchscript_cache = torchscript_cache
 
         self.model = self._create_darknet_model()
 
@@ -359,7 +363,8 @@ class Tracker:  # pylint: disable=too-many-instance-attributes
             f"NMS threshold: {self.nms_threshold}\n\t"
             f"Score threshold: {self.score_threshold}\n\t"
             f"Min bounding box area: {self.min_box_area}\n\t"
-            f"Track buffer: {self.track_buffer}"
+            f"Track buffer: {self.track_buffer}\n\t"
+            f"TorchScript cache: {self.torchscript_cache}"
         )
         return self._load_darknet_weights()
 
@@ -379,6 +384,26 @@ class Tracker:  # pylint: disable=too-many-instance-attributes
             raise ValueError(
                 f"Model file does not exist. Please check that {self.model_path} exists."
             )
+        if self.torchscript_cache:
+            cache_path = get_cache_path(
+                [self.model_path, self.model_config_path],
+                {"model_type": self.model_type, "device": self.device.type},
+            )
+            example_input = torch.zeros(
+                1, 3, self.input_size[1], self.input_size[0]
+            ).to(self.device)
+            return load_or_compile(  # type: ignore
+                cache_path, self._load_eager_model, self.device, (example_input,)
+            )
+        return self._load_eager_model()
+
+    def _load_eager_model(self) -> Darknet:
+        """Creates the Darknet-53 model and loads its weights.
+
+        Returns:
+            (Darknet): Darknet backbone of the specified architecture and
+                weights.
+        """
         ckpt = torch.load(str(self.model_path), map_location="cpu")
         model = Darknet(self.model_settings, self.device, num_identities=14455)
         model.load_state_dict(ckpt["model"], strict=False)
@@ -77,6 +77,7 @@ class JDEModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             self.config["iou_threshold"],
             self.config["nms_threshold"],
             self.config["score_threshold"],
+            self.config["torchscript_cache"],
         )
 
     def predict(self, image: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[int]]:
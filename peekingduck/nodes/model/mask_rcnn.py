@@ -66,6 +66,21 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         mask_threshold (:obj:`float`): **[0, 1], default = 0.5**. |br|
             The confidence threshold for binarizing the masks' pixel values; determines whether an
             object is detected at a particular pixel.
+        quantization (:obj:`Optional[str]`): **{null, "dynamic", "static"},
+            default = null**. |br|
+            INT8 post-training quantization mode for faster inference on the
+            CPU, where quantized models run. ``"dynamic"`` quantizes the
+            linear layers of the box head and is created on first use.
+            ``"static"`` additionally quantizes the ResNet backbone and must
+            be calibrated first with ``peekingduck quantize model.mask_rcnn
+            <images_dir> --mode static``. Quantized models are cached next to
+            the weights.
+        torchscript_cache (:obj:`bool`): **default = False**. |br|
+            If ``True``, the ResNet-FPN backbone is traced with TorchScript and
+            cached next to the weights on the first run, and later runs load
+            the compiled backbone directly for a faster startup. The cache is
+            keyed by the weights, ``model_type``, the device, and the PyTorch
+            version.
 
     References:
         Mask R-CNN: A conceptually simple, flexible, and general framework for object
@@ -117,6 +132,8 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
             "max_size": int,
             "min_size": int,
             "model_type": str,
+            "quantization": Optional[str],
             "score_threshold": float,
+            "torchscript_cache": bool,
             "weights_parent_dir": Optional[str],
         }
@@ -18,13 +18,13 @@ Detector class to handle detection of bboxes and masks for mask_rcnn
 
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 import torch
 import torchvision.transforms as T
-from torch import Tensor
+from torch import Tensor, nn
 
 from peekingduck.nodes.model.mask_rcnnv1.mask_rcnn_files.detection.backbone_utils import (
     resnet_fpn_backbone,
@@ -32,7 +32,17 @@ from peekingduck.nodes.model.mask_rcnnv1.mask_rcnn_files.detection.backbone_util
 from peekingduck.nodes.model.mask_rcnnv1.mask_rcnn_files.detection.mask_rcnn import (
     MaskRCNN,
 )
+from peekingduck.nodes.model.mask_rcnnv1.mask_rcnn_files.ops.misc import (
+    FrozenBatchNorm2d,
+)
 from peekingduck.utils.bbox.transforms import xyxy2xyxyn
+from peekingduck.utils.quantization import (
+    convert_static,
+    get_quantized_path,
+    prepare_static,
+    quantize_dynamic,
+)
+from peekingduck.utils.torchscript_cache import get_cache_path, load_or_compile
 
 
 class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
@@ -60,10 +70,16 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         max_num_detections: int,
         score_threshold: float,
         mask_threshold: float,
+        quantization: Optional[str] = None,
+        torchscript_cache: bool = False,
     ) -> None:
         self.logger = logging.getLogger(__name__)
 
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.quantization = quantization
+        # Quantized operators only run on the CPU
+        self.device = torch.device(
+            "cuda" if torch.cuda.is_available() and quantization is None else "cpu"
+        )
         self.class_names = class_names
         self.detect_ids = torch.tensor(
             detect_ids, dtype=torch.int64, device=self.device
@@ -77,6 +93,7 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         self.max_num_detections = max_num_detections
         self.score_threshold = score_threshold
         self.mask_threshold = mask_threshold
+        self.torchscript_cache = torchscript_cache
         self.mask_rcnn = self._create_mask_rcnn_model()
         self.filtered_output: Dict[str, Tensor] = {}
 
@@ -103,6 +120,39 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
 
         return bboxes, labels, scores, masks
 
+    def quantize(self, mode: str, images: List[np.ndarray]) -> Path:
+        """Quantizes the model to INT8 and caches the quantized model next to
+        the float weights. The quantized model replaces the current model and
+        runs on the CPU.
+
+        Args:
+            mode (str): The quantization mode. "dynamic" quantizes the linear
+                layers of the box head. "static" additionally quantizes the
+                ResNet backbone, using `images` to calibrate its activations.
+            images (List[np.ndarray]): Calibration images.
+
+        Returns:
+            (Path): Path to the cached quantized model.
+        """
+        self.quantization = mode
+        self._use_cpu()
+        self.mask_rcnn = self._quantize_model(self._load_float_model(), images)
+        quantized_path = get_quantized_path(self.model_path, mode)
+        torch.save(self.mask_rcnn.state_dict(), quantized_path)
+        return quantized_path
+
+    def to_cpu(self) -> None:
+        """Reloads the float model on the CPU, where quantized models run, so
+        that it can be compared with its quantized model.
+        """
+        self._use_cpu()
+        self.mask_rcnn = self._load_float_model()
+
+    def _use_cpu(self) -> None:
+        """Switches the device and ``detect_ids`` to the CPU."""
+        self.device = torch.device("cpu")
+        self.detect_ids = self.detect_ids.to(self.device)
+
     def _create_mask_rcnn_model(self) -> MaskRCNN:
         """Creates a Mask-RCNN model and loads its weights. It also logs model configurations.
 
@@ -118,21 +168,28 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
             f"Mask threshold: {self.mask_threshold}\n\t"
             f"Maximum number of detections per image: {self.max_num_detections}\n\t"
             f"Maximum size of the image: {self.max_size}\n\t"
-            f"Minimum size of the image: {self.min_size}"
+            f"Minimum size of the image: {self.min_size}\n\t"
+            f"INT8 quantization: {self.quantization}\n\t"
+            f"TorchScript cache: {self.torchscript_cache}"
         )
 
         return self._load_mask_rcnn_weights()
 
-    def _get_model(self) -> MaskRCNN:
+    def _get_model(self, backbone: Optional[nn.Module] = None) -> MaskRCNN:
         """Constructs Mask-RCNN model based on parsed configuration.
 
+        Args:
+            backbone (Optional[nn.Module]): A loaded ResNet-FPN backbone. A
+                new backbone is constructed if not provided.
+
         Returns:
             (MaskRCNN): Mask-RCNN model.
         """
-        backbone_name = Detector.model_name_map[self.model_type]
-        backbone = resnet_fpn_backbone(
-            backbone_name=backbone_name,
-        )
+        if backbone is None:
+            backbone_name = Detector.model_name_map[self.model_type]
+            backbone = resnet_fpn_backbone(
+                backbone_name=backbone_name,
+            )
         return MaskRCNN(
             backbone=backbone,
             num_classes=self.num_classes,
@@ -153,16 +210,125 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
             (MaskRCNN): Mask-RCNN model loaded with weights
         """
         if self.model_path.is_file():
-            state_dict = torch.load(self.model_path, map_location=self.device)
-            model = self._get_model()
-            model.load_state_dict(state_dict)
-            model.eval().to(self.device)
+            if self.torchscript_cache:
+                return self._load_torchscript_model()
+            model = self._load_float_model()
+            if self.quantization is not None:
+                return self._load_quantized_model(model)
             return model
 
         raise FileNotFoundError(
             f"Model file does not exist. Please check that {self.model_path} exists."
         )
 
+    def _load_float_model(self) -> MaskRCNN:
+        """Loads the float weights into a Mask-RCNN model.
+
+        Returns:
+            (MaskRCNN): Mask-RCNN model loaded with weights
+        """
+        state_dict = torch.load(self.model_path, map_location=self.device)
+        model = self._get_model()
+        model.load_state_dict(state_dict)
+        model.eval().to(self.device)
+        return model
+
+    def _load_torchscript_model(self) -> MaskRCNN:
+        """Loads the cached TorchScript model of the ResNet-FPN backbone, and
+        loads the remaining weights into the heads. The backbone is traced
+        and cached if it is not found. Only the backbone is compiled as the
+        region proposal network and RoI heads are not TorchScript compatible.
+
+        Returns:
+            (MaskRCNN): Mask-RCNN model with a compiled backbone.
+        """
+        cache_path = get_cache_path(
+            [self.model_path],
+            {"model_type": self.model_type, "device": self.device.type},
+        )
+        example_input = torch.zeros(1, 3, self.min_size, self.min_size).to(self.device)
+        backbone = load_or_compile(
+            cache_path,
+            lambda: self._load_float_model().backbone,
+            self.device,
+            (example_input,),
+        )
+        # compiled modules only keep their methods, MaskRCNN needs this attribute
+        backbone.out_channels = 256  # type: ignore
+        model = self._get_model(backbone)
+        state_dict = torch.load(self.model_path, map_location=self.device)
+        if isinstance(backbone, torch.jit.ScriptModule):
+            # the frozen backbone has no parameters left to load
+            state_dict = {
+                key: value
+                for key, value in state_dict.items()
+                if not key.startswith("backbone.")
+            }
+        model.load_state_dict(state_dict)
+        model.eval().to(self.device)
+        return model
+
+    def _load_quantized_model(self, model: MaskRCNN) -> MaskRCNN:
+        """Loads the cached quantized model created by :meth:`quantize`. A
+        dynamically quantized model is created and cached if it is not found,
+        as it does not need calibration.
+
+        Args:
+            model (MaskRCNN): The float Mask-RCNN model.
+
+        Returns:
+            (MaskRCNN): The quantized Mask-RCNN model.
+
+        Raises:
+            FileNotFoundError: The statically quantized model has not been
+                created.
+        """
+        quantized_path = get_quantized_path(self.model_path, str(self.quantization))
+        if not quantized_path.is_file():
+            if self.quantization == "static":
+                raise FileNotFoundError(
+                    f"Quantized model does not exist at {quantized_path}. Please "
+                    "create it by calibrating on a folder of images with "
+                    "`peekingduck quantize model.mask_rcnn <images_dir> --mode "
+                    "static`."
+                )
+            model = self._quantize_model(model, [])
+            torch.save(model.state_dict(), quantized_path)
+            self.logger.info(f"Saved quantized model to {quantized_path}")
+            return model
+        model = self._quantize_model(model, [])
+        model.load_state_dict(torch.load(quantized_path, map_location="cpu"))
+        self.logger.info(f"Loaded quantized model from {quantized_path}")
+        return model
+
+    def _quantize_model(
+        self, model: MaskRCNN, calibration_images: List[np.ndarray]
+    ) -> MaskRCNN:
+        """Quantizes `model` to INT8 according to `quantization`.
+
+        Args:
+            model (MaskRCNN): The float Mask-RCNN model.
+            calibration_images (List[np.ndarray]): Calibration images for
+                "static" quantization. If empty, the quantized structure is
+                created so that a cached quantized model can be loaded into
+                it.
+
+        Returns:
+            (MaskRCNN): The quantized Mask-RCNN model.
+        """
+        if self.quantization == "static":
+            backbone: Any = model.backbone
+            _unfreeze_batch_norm(backbone.body)
+            example_input = torch.zeros(1, 3, self.min_size, self.min_size)
+            backbone.body = prepare_static(backbone.body, (example_input,))
+            with torch.no_grad():
+                for image in calibration_images:
+                    model(self._preprocess(image))
+            backbone.body = convert_static(
+                backbone.body, calibrated=bool(calibration_images)
+            )
+        return quantize_dynamic(model)  # type: ignore
+
     def _postprocess(
         self,
         network_output: Dict[str, Tensor],
@@ -226,3 +392,20 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         """
         image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         return [Detector.preprocess_transform(image_rgb).to(self.device)]
+
+
+def _unfreeze_batch_norm(module: nn.Module) -> None:
+    """Replaces the FrozenBatchNorm2d layers of `module` with equivalent
+    BatchNorm2d layers in evaluation mode, so that they are fused into the
+    preceding convolutions during static quantization.
+
+    Args:
+        module (nn.Module): The module to modify in place.
+    """
+    for name, child in module.named_children():
+        if isinstance(child, FrozenBatchNorm2d):
+            batch_norm = nn.BatchNorm2d(child.weight.numel(), eps=child.eps)
+            batch_norm.load_state_dict(child.state_dict(), strict=False)
+            setattr(module, name, batch_norm.eval().to(child.weight.device))
+        else:
+            _unfreeze_batch_norm(child)
@@ -18,6 +18,7 @@ Mask R-CNN model with backbone type: r50-fpn and r101-fpn
 
 import json
 import logging
+from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 import numpy as np
@@ -37,6 +38,12 @@ class MaskRCNNModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             ["iou_threshold", "score_threshold", "mask_threshold"], "[0, 1]"
         )
         self.check_bounds(["min_size", "max_size", "max_num_detections"], "[1 , +inf)")
+        if self.config["quantization"] is not None:
+            self.check_valid_choice("quantization", {"dynamic", "static"})
+            if self.config["torchscript_cache"]:
+                raise ValueError(
+                    "torchscript_cache is not supported by quantized models."
+                )
 
         model_dir = self.download_weights()
         classes_path = model_dir / self.weights["classes_file"]
@@ -59,6 +66,8 @@ class MaskRCNNModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             self.config["max_num_detections"],
             self.config["score_threshold"],
             self.config["mask_threshold"],
+            self.config["quantization"],
+            self.config["torchscript_cache"],
         )
 
     @property
@@ -96,3 +105,20 @@ class MaskRCNNModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         if not isinstance(image, np.ndarray):
             raise TypeError("image must be a np.ndarray")
         return self.detector.predict_instance_mask_from_image(image)
+
+    def quantize(self, mode: str, images: List[np.ndarray]) -> Path:
+        """Quantizes the model to INT8 using calibration images and caches
+        it next to the weights, see :meth:`Detector.quantize`.
+
+        Args:
+            mode (str): The quantization mode.
+            images (List[np.ndarray]): Calibration images.
+
+        Returns:
+            (Path): Path to the cached quantized model.
+        """
+        return self.detector.quantize(mode, images)
+
+    def to_cpu(self) -> None:
+        """Reloads the float model on the CPU, see :meth:`Detector.to_cpu`."""
+        self.detector.to_cpu()
@@ -51,9 +51,11 @@ class Node(AbstractNode):
         |bbox_labels_data|
 
     Configs:
-        model_format (:obj:`str`): **{"tensorflow", "tensorrt"},
+        model_format (:obj:`str`): **{"tensorflow", "tensorrt", "tflite"},
             default="tensorflow"** |br|
-            Defines the weights format of the model.
+            Defines the weights format of the model. ``"tflite"`` converts the
+            TensorFlow model to TensorFlow Lite on first use, caches it next to
+            the weights, and runs it with the XNNPACK delegate on the CPU.
         model_type (:obj:`str`):
             **{"
             singlepose_lightning", "singlepose_thunder", "multipose_lightning"
@@ -70,6 +72,14 @@ class Node(AbstractNode):
         keypoint_score_threshold (:obj:`float`): **[0,1], default = 0.3** |br|
             Detected keypoints confidence score threshold, only keypoints above
             threshold will be kept in output.
+        tflite_num_threads (:obj:`int`): **[0, sys.maxsize), default = 0**.
+            |br|
+            Number of threads TensorFlow Lite uses when ``model_format`` is
+            ``"tflite"``. ``0`` uses one thread per CPU core.
+        tflite_int8 (:obj:`bool`): **default = False**. |br|
+            Flag to determine if the weights of the ``"tflite"`` model should
+            be quantized to INT8, for a smaller model which usually runs
+            faster on the CPU.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
@@ -109,5 +119,7 @@ class Node(AbstractNode):
             "keypoint_score_threshold": float,
             "model_format": str,
             "model_type": str,
+            "tflite_int8": bool,
+            "tflite_num_threads": int,
             "weights_parent_dir": Optional[str],
         }
@@ -18,7 +18,7 @@ Predictor class to handle detection of poses for movenet
 
 import logging
 from pathlib import Path
-from typing import Callable, Dict, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import cv2
 import numpy as np
@@ -26,6 +26,7 @@ import tensorflow as tf
 from tensorflow.python.saved_model import tag_constants
 
 from peekingduck.utils.pose.keypoint_handler import COCOBody
+from peekingduck.utils.tflite import load_tflite_model
 
 
 class Predictor:  # pylint: disable=too-many-instance-attributes
@@ -40,6 +41,7 @@ class Predictor:  # pylint: disable=too-many-instance-attributes
         resolution: Dict[str, Dict[str, int]],
         bbox_score_threshold: float,
         keypoint_score_threshold: float,
+        tflite_options: Optional[Dict[str, Any]] = None,
     ) -> None:
         self.logger = logging.getLogger(__name__)
 
@@ -50,6 +52,7 @@ class Predictor:  # pylint: disable=too-many-instance-attributes
 
         self.bbox_score_threshold = bbox_score_threshold
         self.keypoint_score_threshold = keypoint_score_threshold
+        self.tflite_options = tflite_options or {}
 
         self.keypoint_handler = COCOBody(score_threshold=keypoint_score_threshold)
         self.movenet = self._create_movenet_model()
@@ -198,6 +201,9 @@ class Predictor:  # pylint: disable=too-many-instance-attributes
         )
 
     def _load_movenet_weights(self) -> Callable:
+        if self.model_format == "tflite":
+            self.model = load_tflite_model(self.model_path, **self.tflite_options)
+            return self.model
         self.model = tf.saved_model.load(
             str(self.model_path), tags=[tag_constants.SERVING]
         )
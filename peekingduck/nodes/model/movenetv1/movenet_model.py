@@ -30,6 +30,7 @@ class MoveNetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         self.config = config
         self.logger = logging.getLogger(__name__)
 
+        self.check_valid_choice("model_format", {"tensorflow", "tensorrt", "tflite"})
         self.check_valid_choice(
             "model_type",
             {"singlepose_lightning", "singlepose_thunder", "multipose_lightning"},
@@ -37,6 +38,7 @@ class MoveNetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         self.check_bounds(
             ["bbox_score_threshold", "keypoint_score_threshold"], "[0, 1]"
         )
+        self.check_bounds("tflite_num_threads", "[0, +inf)")
 
         model_dir = self.download_weights()
         self.predictor = Predictor(
@@ -47,6 +49,10 @@ class MoveNetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             self.config["resolution"],
             self.config["bbox_score_threshold"],
             self.config["keypoint_score_threshold"],
+            {
+                "num_threads": self.config["tflite_num_threads"],
+                "int8": self.config["tflite_int8"],
+            },
         )
 
     def predict(
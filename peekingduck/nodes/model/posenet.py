@@ -46,6 +46,11 @@ class Node(RequirementCheckerMixin, AbstractNode):
         |bbox_labels_data|
 
     Configs:
+        model_format (:obj:`str`): **{"tensorflow", "tflite"},
+            default="tensorflow"** |br|
+            Defines the weights format of the model. ``"tflite"`` converts the
+            TensorFlow model to TensorFlow Lite on first use, caches it next to
+            the weights, and runs it with the XNNPACK delegate on the CPU.
         model_type (:obj:`Union[str, int]`):
             **{"resnet", 50, 75, 100}, default="resnet"**. |br|
             Defines the backbone model for PoseNet.
@@ -64,6 +69,14 @@ class Node(RequirementCheckerMixin, AbstractNode):
             Flag to enable compile parts of the model code with Numba JIT compiler
             to improve inference speed. Requires installing ``numba`` as an
             optional dependency.
+        tflite_num_threads (:obj:`int`): **[0, sys.maxsize), default = 0**.
+            |br|
+            Number of threads TensorFlow Lite uses when ``model_format`` is
+            ``"tflite"``. ``0`` uses one thread per CPU core.
+        tflite_int8 (:obj:`bool`): **default = False**. |br|
+            Flag to determine if the weights of the ``"tflite"`` model should
+            be quantized to INT8, for a smaller model which usually runs
+            faster on the CPU.
 
     References:
         PersonLab: Person Pose Estimation and Instance Segmentation with a
@@ -102,10 +115,13 @@ class Node(RequirementCheckerMixin, AbstractNode):
         """Returns dictionary mapping the node's config keys to respective types."""
         return {
             "max_pose_detection": int,
+            "model_format": str,
             "model_type": Union[str, int],
             "resolution": Dict[str, int],
             "resolution.height": int,
             "resolution.width": int,
             "score_threshold": float,
+            "tflite_int8": bool,
+            "tflite_num_threads": int,
             "weights_parent_dir": Optional[str],
         }
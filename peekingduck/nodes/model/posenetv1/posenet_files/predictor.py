@@ -18,7 +18,7 @@ Predictor class to handle detection of poses for posenet
 
 import logging
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -32,6 +32,7 @@ from peekingduck.nodes.model.posenetv1.posenet_files.constants import (
 from peekingduck.nodes.model.posenetv1.posenet_files.decoder import Decoder
 from peekingduck.utils.graph_functions import load_graph
 from peekingduck.utils.pose.keypoint_handler import COCOBody
+from peekingduck.utils.tflite import load_tflite_model
 
 
 class Predictor:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
@@ -40,6 +41,7 @@ class Predictor:  # pylint: disable=too-many-instance-attributes,too-few-public-
     def __init__(  # pylint: disable=too-many-arguments
         self,
         model_dir: Path,
+        model_format: str,
         model_type: Union[int, str],
         model_file: Dict[Union[int, str], str],
         model_nodes: Dict[str, Dict[str, List[str]]],
@@ -47,9 +49,11 @@ class Predictor:  # pylint: disable=too-many-instance-attributes,too-few-public-
         max_pose_detection: int,
         score_threshold: float,
         use_jit: bool,
+        tflite_options: Optional[Dict[str, Any]] = None,
     ) -> None:
         self.logger = logging.getLogger(__name__)
 
+        self.model_format = model_format
         self.model_type = model_type
         self.model_path = model_dir / model_file[self.model_type]
         self.model_nodes = model_nodes[
@@ -60,6 +64,7 @@ class Predictor:  # pylint: disable=too-many-instance-attributes,too-few-public-
         self.max_pose_detection = max_pose_detection
         self.score_threshold = score_threshold
         self.use_jit = use_jit
+        self.tflite_options = tflite_options or {}
 
         self.keypoint_handler = COCOBody(score_threshold=MIN_PART_SCORE)
         self.decoder = Decoder(score_threshold, use_jit)
@@ -94,6 +99,7 @@ class Predictor:  # pylint: disable=too-many-instance-attributes,too-few-public-
     def _create_posenet_model(self) -> Callable:
         self.logger.info(
             "PoseNet model loaded with following configs:\n\t"
+            f"Model format: {self.model_format}\n\t"
             f"Model type: {self.model_type}\n\t"
             f"Input resolution: {self.resolution}\n\t"
             f"Max pose detection: {self.max_pose_detection}\n\t"
@@ -113,6 +119,10 @@ class Predictor:  # pylint: disable=too-many-instance-attributes,too-few-public-
             raise ValueError(
                 f"Graph file does not exist. Please check that {self.model_path} exists"
             )
+        if self.model_format == "tflite":
+            return load_tflite_model(
+                self.model_path, model_nodes=self.model_nodes, **self.tflite_options
+            )
         return load_graph(
             str(self.model_path),
             inputs=self.model_nodes["inputs"],
@@ -34,12 +34,15 @@ class PoseNetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         self.config = config
         self.logger = logging.getLogger(__name__)
 
+        self.check_valid_choice("model_format", {"tensorflow", "tflite"})
         self.check_valid_choice("model_type", {50, 75, 100, "resnet"})
         self.check_bounds("score_threshold", "[0, 1]")
+        self.check_bounds("tflite_num_threads", "[0, +inf)")
 
         model_dir = self.download_weights()
         self.predictor = Predictor(
             model_dir,
+            self.config["model_format"],
             self.config["model_type"],
             self.weights["model_file"],
             self.config["model_nodes"],
@@ -47,6 +50,10 @@ class PoseNetModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             self.config["max_pose_detection"],
             self.config["score_threshold"],
             self.config["use_jit"],
+            {
+                "num_threads": self.config["tflite_num_threads"],
+                "int8": self.config["tflite_int8"],
+            },
         )
 
     def predict(
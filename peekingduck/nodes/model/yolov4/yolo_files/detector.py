@@ -18,12 +18,13 @@ Object detection class using yolo model to find object bboxes
 
 import logging
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import tensorflow as tf
 
-from peekingduck.utils.graph_functions import load_graph
+from peekingduck.utils.graph_functions import GraphFunction, load_graph
+from peekingduck.utils.tflite import load_tflite_model
 
 
 class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
@@ -34,6 +35,7 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         model_dir: Path,
         class_names: List[str],
         detect_ids: List[int],
+        model_format: str,
         model_type: str,
         model_file: Dict[str, str],
         model_nodes: Dict[str, List[str]],
@@ -42,10 +44,13 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         input_size: int,
         iou_threshold: float,
         score_threshold: float,
+        tflite_options: Optional[Dict[str, Any]] = None,
+        jit_compile: bool = False,
     ) -> None:
         self.logger = logging.getLogger(__name__)
 
         self.class_names = class_names
+        self.model_format = model_format
         self.model_type = model_type
         self.model_path = model_dir / model_file[self.model_type]
         self.model_nodes = model_nodes
@@ -55,9 +60,19 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         self.input_size = (input_size, input_size)
         self.iou_threshold = iou_threshold
         self.score_threshold = score_threshold
+        self.tflite_options = tflite_options or {}
+        self.jit_compile = jit_compile
 
         self.detect_ids = detect_ids
         self.yolo = self._create_yolo_model()
+        self.detect_all: Callable
+        if self.model_format == "tflite":
+            # TensorFlow Lite models run outside of the TensorFlow graph
+            self.detect_all = self._detect_all
+        else:
+            self.detect_all = GraphFunction(
+                self._detect_all, [tf.TensorSpec([None, None, 3], tf.uint8)], "YOLO"
+            )
 
     def predict_object_bbox_from_image(
         self, image: np.ndarray
@@ -74,11 +89,9 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
             labels (np.ndarray): array of labels
             scores (np.ndarray): array of scores
         """
-        image = self._preprocess(image)
-
-        pred = self.yolo(image)[-1]
-
-        bboxes, scores, classes = self._postprocess(pred[:, :, :4], pred[:, :, 4:])
+        bboxes, scores, classes = self._postprocess(
+            *(output.numpy() for output in self.detect_all(image))
+        )
         labels = np.array([self.class_names[int(i)] for i in classes])
 
         return bboxes, labels, scores
@@ -87,16 +100,20 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
         """Creates YOLO model for human detection."""
         self.logger.info(
             "YOLO model loaded with following configs: \n\t"
+            f"Model format: {self.model_format}, \n\t"
             f"Model type: {self.model_type}, \n\t"
             f"Input resolution: {self.input_size}, \n\t"
             f"IDs being detected: {self.detect_ids} \n\t"
             f"Max detections per class: {self.max_output_size_per_class}, \n\t"
             f"Max total detections: {self.max_total_size}, \n\t"
             f"IOU threshold: {self.iou_threshold}, \n\t"
-            f"Score threshold: {self.score_threshold}"
+            f"Score threshold: {self.score_threshold}, \n\t"
+            f"XLA compilation: {self.jit_compile}"
         )
-
-        return self._load_yolo_weights()
+        model = self._load_yolo_weights()
+        if self.jit_compile:
+            return tf.function(model, jit_compile=True)
+        return model
 
     def _load_yolo_weights(self) -> Callable:
         """When loading a graph model, you need to explicitly state the input
@@ -107,15 +124,30 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
             raise ValueError(
                 f"Graph file does not exist. Please check that {self.model_path} exists"
             )
+        if self.model_format == "tflite":
+            return load_tflite_model(
+                self.model_path, model_nodes=self.model_nodes, **self.tflite_options
+            )
         return load_graph(
             str(self.model_path),
             inputs=self.model_nodes["inputs"],
             outputs=self.model_nodes["outputs"],
         )
 
-    def _postprocess(
-        self, pred_boxes: tf.Tensor, pred_scores: tf.Tensor
-    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    def _detect_all(self, image: tf.Tensor) -> Tuple[tf.Tensor, tf.Tensor, tf.Tensor]:
+        """Detects the bboxes of all classes in ``image``. The preprocessing,
+        network, and non-maximum suppression are compiled into a single graph,
+        except for TensorFlow Lite models.
+
+        Args:
+            image (tf.Tensor): Input image with uint8 pixel values.
+
+        Returns:
+            (Tuple[tf.Tensor, tf.Tensor, tf.Tensor]): The bboxes in (x1, y1,
+            x2, y2) format, scores, and class IDs of the valid detections.
+        """
+        pred = self.yolo(self._preprocess(image))[-1]
+        pred_boxes, pred_scores = pred[:, :, :4], pred[:, :, 4:]
         bboxes, scores, classes, valid_dets = tf.image.combined_non_max_suppression(
             tf.reshape(pred_boxes, (tf.shape(pred_boxes)[0], -1, 1, 4)),
             tf.reshape(
@@ -127,29 +159,21 @@ class Detector:  # pylint: disable=too-few-public-methods,too-many-instance-attr
             self.score_threshold,
         )
         num_valid = valid_dets[0]
+        # swapping x and y axes
+        bboxes = tf.gather(bboxes[0, :num_valid], [1, 0, 3, 2], axis=1)
 
-        classes = classes.numpy()[0]
-        classes = classes[:num_valid]
+        return bboxes, scores[0, :num_valid], classes[0, :num_valid]
+
+    def _postprocess(
+        self, bboxes: np.ndarray, scores: np.ndarray, classes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         # only identify objects we are interested in
         mask = np.isin(classes, self.detect_ids)
-        classes = classes[mask]
-
-        scores = scores.numpy()[0]
-        scores = scores[:num_valid]
-        scores = scores[mask]
-
-        bboxes = bboxes.numpy()[0]
-        bboxes = bboxes[:num_valid]
-        bboxes = bboxes[mask]
-
-        # swapping x and y axes
-        bboxes[:, [0, 1]] = bboxes[:, [1, 0]]
-        bboxes[:, [2, 3]] = bboxes[:, [3, 2]]
 
-        return bboxes, scores, classes
+        return bboxes[mask], scores[mask], classes[mask]
 
-    def _preprocess(self, image: np.ndarray) -> tf.Tensor:
-        processed_image = tf.convert_to_tensor(image.astype(np.float32))
+    def _preprocess(self, image: tf.Tensor) -> tf.Tensor:
+        processed_image = tf.cast(image, tf.float32)
         processed_image = tf.expand_dims(processed_image, 0)
         processed_image = tf.image.resize(processed_image, self.input_size) / 255.0
 
@@ -16,12 +16,13 @@
 
 import locale
 import logging
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from peekingduck.nodes.base import ThresholdCheckerMixin, WeightsDownloaderMixin
 from peekingduck.nodes.model.yolov4.yolo_files.detector import Detector
+from peekingduck.utils.tiling import TiledInference
 
 
 class YOLOModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
@@ -31,7 +32,16 @@ class YOLOModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         self.config = config
         self.logger = logging.getLogger(__name__)
 
+        self.check_valid_choice("model_format", {"tensorflow", "tflite"})
         self.check_bounds(["iou_threshold", "score_threshold"], "[0, 1]")
+        self.check_bounds("tflite_num_threads", "[0, +inf)")
+        self.check_bounds("tile_size", "(0, +inf)")
+        self.check_bounds("tile_overlap", "[0, 1)")
+        self.check_bounds(["tile_iou_threshold", "tile_match_threshold"], "[0, 1]")
+        if self.config["jit_compile"] and self.config["model_format"] != "tensorflow":
+            raise ValueError(
+                "jit_compile is only supported by the tensorflow model_format."
+            )
 
         model_dir = self.download_weights()
         with open(
@@ -45,6 +55,7 @@ class YOLOModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             model_dir,
             class_names,
             self.detect_ids,
+            self.config["model_format"],
             self.config["model_type"],
             self.weights["model_file"],
             self.config["model_nodes"],
@@ -53,7 +64,25 @@ class YOLOModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             self.config["input_size"],
             self.config["iou_threshold"],
             self.config["score_threshold"],
+            {
+                "num_threads": self.config["tflite_num_threads"],
+                "int8": self.config["tflite_int8"],
+            },
+            self.config["jit_compile"],
         )
+        self.tiled_inference: Optional[TiledInference] = None
+        if self.config["tiled_inference"]:
+            self.tiled_inference = TiledInference(
+                lambda images: [
+                    self.detector.predict_object_bbox_from_image(image)
+                    for image in images
+                ],
+                self.config["tile_size"],
+                self.config["tile_overlap"],
+                self.config["tile_full_frame"],
+                self.config["tile_iou_threshold"],
+                self.config["tile_match_threshold"],
+            )
 
     @property
     def detect_ids(self) -> List[int]:
@@ -83,5 +112,7 @@ class YOLOModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         """
         if not isinstance(image, np.ndarray):
             raise TypeError("image must be a np.ndarray")
+        if self.tiled_inference is not None:
+            return self.tiled_inference(image)
 
         return self.detector.predict_object_bbox_from_image(image)
@@ -20,6 +20,7 @@ import numpy as np
 
 from peekingduck.nodes.abstract_node import AbstractNode
 from peekingduck.nodes.model.yoloxv1 import yolox_model
+from peekingduck.utils.requirement_checker import RequirementChecker, check_requirements
 
 
 class Node(AbstractNode):  # pylint: disable=too-few-public-methods
@@ -42,9 +43,12 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         |bbox_scores_data|
 
     Configs:
-        model_format (:obj:`str`): **{"pytorch", "tensorrt"},
+        model_format (:obj:`str`): **{"pytorch", "tensorrt", "onnx"},
             default="pytorch"** |br|
-            Defines the weights format of the model.
+            Defines the weights format of the model. ``"onnx"`` runs the model
+            with ONNX Runtime on the CPU and requires the ONNX graphs exported
+            by ``scripts/converters/pytorch_to_onnx/convert_yolox_to_onnx.py``
+            in the ``yolox/onnx`` folder of the weights directory.
         model_type (:obj:`str`): **{"yolox-tiny", "yolox-s", "yolox-m",
             "yolox-l"}, default="yolox-tiny"**. |br|
             Defines the type of YOLOX model to be used.
@@ -72,6 +76,58 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
         fuse (:obj:`bool`): **default = False**. |br|
             Flag to determine if the convolution and batch normalization layers
             should be fused for inference.
+        onnx_intra_op_threads (:obj:`int`): **[0, sys.maxsize), default = 0**.
+            |br|
+            Number of threads ONNX Runtime uses within an operator when
+            ``model_format`` is ``"onnx"``. ``0`` uses one thread per physical
+            core.
+        onnx_inter_op_threads (:obj:`int`): **[0, sys.maxsize), default = 0**.
+            |br|
+            Number of threads ONNX Runtime uses to run independent operators
+            in parallel when ``model_format`` is ``"onnx"``. Operators are run
+            sequentially unless it is greater than 1.
+        onnx_graph_optimization (:obj:`str`): **{"disable", "basic",
+            "extended", "all"}, default = "all"**. |br|
+            Graph optimization level of ONNX Runtime when ``model_format`` is
+            ``"onnx"``.
+        quantization (:obj:`Optional[str]`): **{null, "static"},
+            default = null**. |br|
+            INT8 post-training quantization mode of the ``"pytorch"`` model
+            for faster inference on the CPU, where quantized models run.
+            ``"static"`` quantizes the backbone, and must be calibrated first
+            with ``peekingduck quantize model.yolox <images_dir>``. Quantized
+            models are cached next to the weights. YOLOX has no linear layers
+            for ``"dynamic"`` quantization.
+        torchscript_cache (:obj:`bool`): **default = False**. |br|
+            If ``True``, the ``"pytorch"`` model is traced with TorchScript
+            and cached next to the weights on the first run, and later runs
+            load the compiled model directly for a faster startup. The cache
+            is keyed by the weights, ``model_type``, ``input_size``,
+            ``fuse``, ``half``, the device, and the PyTorch version.
+        tiled_inference (:obj:`bool`): **default = False**. |br|
+            Flag to split each frame into overlapping tiles, which are
+            detected on as a single batch by the ``"pytorch"`` model, and
+            merge the detections which overlap. This detects small objects
+            in high resolution frames which are missed when the whole frame
+            is downscaled to the model input size, at the cost of throughput.
+        tile_size (:obj:`int`): **(0, sys.maxsize), default = 640**. |br|
+            Width and height of the tiles in pixels, when ``tiled_inference``
+            is ``True``.
+        tile_overlap (:obj:`float`): **[0, 1), default = 0.2**. |br|
+            Fraction of ``tile_size`` which adjacent tiles overlap by, so
+            that objects cut by the edge of one tile are whole in the next.
+        tile_full_frame (:obj:`bool`): **default = True**. |br|
+            Flag to also detect on the full frame, in the same batch as the
+            tiles, to detect the large objects which do not fit in a tile.
+        tile_iou_threshold (:obj:`float`): **[0, 1], default = 0.5**. |br|
+            Overlapping detections of the same class above the specified IoU
+            threshold are merged with non-maximum suppression.
+        tile_match_threshold (:obj:`float`): **[0, 1], default = 0.5**. |br|
+            An object cut by the inner edge of a tile is only partially
+            detected in it. Such a detection is merged with a larger
+            detection of the same class from another tile, or the full
+            frame, when their intersection over the area of the cut
+            detection is above the specified threshold.
 
     References:
         YOLOX: Exceeding YOLO Series in 2021:
@@ -83,6 +139,10 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
 
     def __init__(self, config: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
+        if self.config["model_format"] == "onnx":
+            RequirementChecker.n_update += check_requirements(
+                self.node_name, flags="model_format=onnx"
+            )
         self.model = yolox_model.YOLOXModel(self.config)
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -106,6 +166,27 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
 
         return outputs
 
+    def run_batch(self, inputs_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reads `img` from each of the `inputs_list` and runs them through
+        the model as a single batch.
+
+        Args:
+            inputs_list (List[Dict]): Inputs dictionaries with the key `img`.
+
+        Returns:
+            (List[Dict]): Outputs dictionaries with the keys `bboxes`,
+                `bbox_labels`, and `bbox_scores`.
+        """
+        results = self.model.predict_batch([inputs["img"] for inputs in inputs_list])
+        return [
+            {
+                "bboxes": np.clip(bboxes, 0, 1),
+                "bbox_labels": labels,
+                "bbox_scores": scores,
+            }
+            for bboxes, labels, scores in results
+        ]
+
     def _get_config_types(self) -> Dict[str, Any]:
         """Returns dictionary mapping the node's config keys to respective types."""
         return {
@@ -117,6 +198,17 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
             "iou_threshold": float,
             "model_format": str,
             "model_type": str,
+            "onnx_graph_optimization": str,
+            "onnx_inter_op_threads": int,
+            "onnx_intra_op_threads": int,
+            "quantization": Optional[str],
             "score_threshold": float,
+            "tile_full_frame": bool,
+            "tile_iou_threshold": float,
+            "tile_match_threshold": float,
+            "tile_overlap": float,
+            "tile_size": int,
+            "tiled_inference": bool,
+            "torchscript_cache": bool,
             "weights_parent_dir": Optional[str],
         }
@@ -16,7 +16,7 @@
 
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
@@ -26,6 +26,12 @@ import torchvision
 from peekingduck.nodes.model.yoloxv1.yolox_files.model import YOLOX
 from peekingduck.nodes.model.yoloxv1.yolox_files.utils import fuse_model
 from peekingduck.utils.bbox.transforms import xywh2xyxy, xyxy2xyxyn
+from peekingduck.utils.quantization import (
+    convert_static,
+    get_quantized_path,
+    prepare_static,
+)
+from peekingduck.utils.torchscript_cache import get_cache_path, load_or_compile
 
 NUM_CHANNELS = 3
 
@@ -40,10 +46,16 @@ class Detector:  # pylint: disable=too-many-instance-attributes
         device (torch.device): Represents the device on which the torch.Tensor
             will be allocated.
         half (bool): Flag to determine if half-precision should be used.
+        onnx_options (Dict[str, Any]): ONNX Runtime session options, used
+            when `model_format` is "onnx".
+        quantization (Optional[str]): INT8 quantization mode of the
+            "pytorch" model. Quantized models run on the CPU.
+        torchscript_cache (bool): Flag to determine if the "pytorch" model is
+            compiled with TorchScript and cached for later runs.
         yolox (YOLOX): The YOLOX model for performing inference.
     """
 
-    def __init__(  # pylint: disable=too-many-arguments
+    def __init__(  # pylint: disable=too-many-arguments, too-many-locals
         self,
         model_dir: Path,
         class_names: List[str],
@@ -59,9 +71,16 @@ class Detector:  # pylint: disable=too-many-instance-attributes
         input_size: int,
         iou_threshold: float,
         score_threshold: float,
+        onnx_options: Optional[Dict[str, Any]] = None,
+        quantization: Optional[str] = None,
+        torchscript_cache: bool = False,
     ) -> None:
         self.logger = logging.getLogger(__name__)
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.quantization = quantization
+        # Quantized operators only run on the CPU
+        self.device = torch.device(
+            "cuda" if torch.cuda.is_available() and quantization is None else "cpu"
+        )
 
         self.class_names = class_names
         self.model_format = model_format
@@ -76,6 +95,8 @@ class Detector:  # pylint: disable=too-many-instance-attributes
         self.input_size = (input_size, input_size)
         self.iou_threshold = iou_threshold
         self.score_threshold = score_threshold
+        self.onnx_options = onnx_options or {}
+        self.torchscript_cache = torchscript_cache
 
         self.update_detect_ids(detect_ids)
 
@@ -118,6 +139,9 @@ class Detector:  # pylint: disable=too-many-instance-attributes
             res_arr = self.yolox(image)
             pred = np.squeeze(res_arr)
             prediction = torch.from_numpy(pred).to(self.device)
+        elif model_format == "onnx":
+            pred = self.yolox(image[np.newaxis, :])[0]
+            prediction = torch.from_numpy(pred).to(self.device)
         else:
             self.logger.error(f"Unknown model format: {model_format}")
             raise NotImplementedError
@@ -128,6 +152,75 @@ class Detector:  # pylint: disable=too-many-instance-attributes
 
         return bboxes, classes, scores
 
+    @torch.no_grad()
+    def predict_object_bboxes_from_images(
+        self, images: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Detects bounding boxes of selected object categories from a batch
+        of images.
+
+        The images are preprocessed individually, so they may have different
+        sizes, and passed to the model as a single batch. Only the "pytorch"
+        model format supports batched inference, other formats run the images
+        one at a time.
+
+        Args:
+            images (List[np.ndarray]): Input images.
+
+        Returns:
+            (List[Tuple[np.ndarray, np.ndarray, np.ndarray]]): The detection
+            bboxes, human-friendly class names, and scores of each image.
+        """
+        if self.model_format != "pytorch":
+            return [self.predict_object_bbox_from_image(image) for image in images]
+
+        image_sizes = [(image.shape[0], image.shape[1]) for image in images]
+        preprocessed = [self._preprocess(image) for image in images]
+        images_tensor = torch.from_numpy(
+            np.stack([image for image, _ in preprocessed])
+        ).to(self.device)
+        images_tensor = images_tensor.half() if self.half else images_tensor.float()
+        predictions = self.yolox(images_tensor)
+
+        return [
+            self._postprocess(prediction, scale, image_size, self.class_names)
+            for prediction, (_, scale), image_size in zip(
+                predictions, preprocessed, image_sizes
+            )
+        ]
+
+    def quantize(self, mode: str, images: List[np.ndarray]) -> Path:
+        """Quantizes the backbone of the "pytorch" model to INT8, using
+        `images` to calibrate its activations, and caches the quantized model
+        next to the float weights. The quantized model replaces the current
+        model and runs on the CPU.
+
+        Args:
+            mode (str): The quantization mode, only "static" is supported as
+                YOLOX has no linear layers to quantize dynamically.
+            images (List[np.ndarray]): Calibration images.
+
+        Returns:
+            (Path): Path to the cached quantized model.
+        """
+        self.quantization = mode
+        self._use_cpu()
+        calibration_inputs = [
+            torch.from_numpy(self._preprocess(image)[0]).unsqueeze(0)
+            for image in images
+        ]
+        self.yolox = self._quantize_model(self._load_float_model(), calibration_inputs)
+        quantized_path = get_quantized_path(self.model_path, mode)
+        torch.save(self.yolox.state_dict(), quantized_path)
+        return quantized_path
+
+    def to_cpu(self) -> None:
+        """Reloads the float "pytorch" model on the CPU, where quantized
+        models run, so that it can be compared with its quantized model.
+        """
+        self._use_cpu()
+        self.yolox = self._load_float_model()
+
     def update_detect_ids(self, ids: List[int]) -> None:
         """Updates list of selected object category IDs. When the list is
         empty, all available object category IDs are detected.
@@ -158,10 +251,20 @@ class Detector:  # pylint: disable=too-many-instance-attributes
             f"Score threshold: {self.score_threshold}\n\t"
             f"Class agnostic NMS: {self.agnostic_nms}\n\t"
             f"Half-precision floating-point: {self.half}\n\t"
-            f"Fuse convolution and batch normalization layers: {self.fuse}"
+            f"Fuse convolution and batch normalization layers: {self.fuse}\n\t"
+            f"INT8 quantization: {self.quantization}\n\t"
+            f"TorchScript cache: {self.torchscript_cache}"
         )
         return self._load_yolox_weights()
 
+    def _use_cpu(self) -> None:
+        """Switches the device and ``detect_ids`` to the CPU in full
+        precision.
+        """
+        self.device = torch.device("cpu")
+        self.half = False
+        self.detect_ids = self.detect_ids.float().to(self.device)  # type: ignore
+
     def _get_model(self, model_size: Dict[str, float]) -> YOLOX:
         """Constructs YOLOX model based on parsed configuration.
 
@@ -194,13 +297,11 @@ class Detector:  # pylint: disable=too-many-instance-attributes
         model_format = self.model_format
         if model_format == "pytorch":
             if self.model_path.is_file():
-                ckpt = torch.load(str(self.model_path), map_location="cpu")
-                model = self._get_model(self.model_size).to(self.device)
-                if self.half:
-                    model.half()
-                model.eval()
-                model.load_state_dict(ckpt["model"])
-
+                if self.torchscript_cache:
+                    return self._load_torchscript_model()
+                model = self._load_float_model()
+                if self.quantization is not None:
+                    return self._load_quantized_model(model)
                 if self.fuse:
                     model = fuse_model(model)
                 return model
@@ -211,6 +312,23 @@ class Detector:  # pylint: disable=too-many-instance-attributes
             self.logger.info("creating tensorrt model")
             model = TrtModel(str(self.model_path))
             return model
+        elif model_format == "onnx":
+            if self.model_path.is_file():
+                # pylint: disable=import-outside-toplevel
+                from peekingduck.nodes.model.yoloxv1.yolox_files.onnx_model import (
+                    OnnxModel,
+                )
+
+                self.logger.info(f"ONNX Runtime session options: {self.onnx_options}")
+                model = OnnxModel(
+                    str(self.model_path), self.input_size, **self.onnx_options
+                )
+                return model
+            raise ValueError(
+                f"Model file does not exist. Please check that {self.model_path} "
+                "exists. ONNX graphs are exported from the PyTorch weights with "
+                "scripts/converters/pytorch_to_onnx/convert_yolox_to_onnx.py."
+            )
         else:
             self.logger.error(f"Unknown model format: {model_format}")
 
@@ -218,6 +336,101 @@ class Detector:  # pylint: disable=too-many-instance-attributes
             f"Model file does not exist. Please check that {self.model_path} exists."
         )
 
+    def _load_float_model(self) -> YOLOX:
+        """Loads the "pytorch" weights into a YOLOX model.
+
+        Returns:
+            (YOLOX): YOLOX model.
+        """
+        ckpt = torch.load(str(self.model_path), map_location="cpu")
+        model = self._get_model(self.model_size).to(self.device)
+        if self.half:
+            model.half()
+        model.eval()
+        model.load_state_dict(ckpt["model"])
+        return model
+
+    def _load_torchscript_model(self) -> YOLOX:
+        """Loads the cached TorchScript model of the "pytorch" weights. The
+        model is traced and cached if it is not found.
+
+        Returns:
+            (YOLOX): The compiled YOLOX model.
+        """
+        cache_path = get_cache_path(
+            [self.model_path],
+            {
+                "model_type": self.model_type,
+                "num_classes": self.num_classes,
+                "input_size": self.input_size,
+                "fuse": self.fuse,
+                "half": self.half,
+                "device": self.device.type,
+            },
+        )
+
+        def create_model() -> YOLOX:
+            model = self._load_float_model()
+            return fuse_model(model) if self.fuse else model
+
+        example_input = torch.zeros(1, NUM_CHANNELS, *self.input_size).to(self.device)
+        if self.half:
+            example_input = example_input.half()
+        return load_or_compile(  # type: ignore
+            cache_path, create_model, self.device, (example_input,)
+        )
+
+    def _load_quantized_model(self, model: YOLOX) -> YOLOX:
+        """Loads the cached quantized model created by :meth:`quantize`.
+
+        Args:
+            model (YOLOX): The float YOLOX model.
+
+        Returns:
+            (YOLOX): The quantized YOLOX model.
+
+        Raises:
+            FileNotFoundError: The quantized model has not been created.
+        """
+        quantized_path = get_quantized_path(self.model_path, str(self.quantization))
+        if not quantized_path.is_file():
+            raise FileNotFoundError(
+                f"Quantized model does not exist at {quantized_path}. Please "
+                "create it by calibrating on a folder of images with "
+                f"`peekingduck quantize model.yolox <images_dir> --mode "
+                f"{self.quantization}`."
+            )
+        model = self._quantize_model(model, [])
+        model.load_state_dict(torch.load(quantized_path, map_location="cpu"))
+        self.logger.info(f"Loaded quantized model from {quantized_path}")
+        return model
+
+    def _quantize_model(
+        self, model: YOLOX, calibration_inputs: List[torch.Tensor]
+    ) -> YOLOX:
+        """Replaces the backbone of `model` with an INT8 quantized backbone.
+        The head, which decodes the predictions, remains float.
+
+        Args:
+            model (YOLOX): The float YOLOX model.
+            calibration_inputs (List[torch.Tensor]): Preprocessed calibration
+                images. If empty, the quantized structure is created so that
+                a cached quantized model can be loaded into it.
+
+        Returns:
+            (YOLOX): The quantized YOLOX model.
+        """
+        example_input = torch.zeros(1, NUM_CHANNELS, *self.input_size)
+        prepared = prepare_static(model.backbone, (example_input,))
+        model.backbone = prepared  # type: ignore
+        with torch.no_grad():
+            for inputs in calibration_inputs:
+                model(inputs)
+        model.backbone = convert_static(  # type: ignore
+            prepared, calibrated=bool(calibration_inputs)
+        )
+        return model
+
     def _postprocess(
         self,
         prediction: torch.Tensor,
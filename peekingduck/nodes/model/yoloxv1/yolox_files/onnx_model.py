@@ -0,0 +1,90 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""ONNX Runtime model for PeekingDuck"""
+
+from typing import Tuple
+
+import numpy as np
+import onnxruntime as ort  # pylint: disable=import-error
+
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+class OnnxModel:  # pylint: disable=too-few-public-methods
+    """YoloX ONNX model class to load an exported ONNX graph and perform
+    inference with ONNX Runtime on the CPU.
+
+    Args:
+        model_path (str): Path to the ONNX graph file.
+        input_size (Tuple[int, int]): Expected input height and width.
+        intra_op_threads (int): Number of threads used within an operator.
+            ``0`` lets ONNX Runtime decide.
+        inter_op_threads (int): Number of threads used to run independent
+            operators in parallel. Operators are run sequentially unless it is
+            greater than 1.
+        graph_optimization (str): One of the keys of
+            ``GRAPH_OPTIMIZATION_LEVELS``.
+
+    Raises:
+        ValueError: The input size of the ONNX graph does not match
+            ``input_size``.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        model_path: str,
+        input_size: Tuple[int, int],
+        intra_op_threads: int = 0,
+        inter_op_threads: int = 0,
+        graph_optimization: str = "all",
+    ) -> None:
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS[graph_optimization]
+        if inter_op_threads > 1:
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self.session.get_inputs()[0]
+        graph_size = tuple(model_input.shape[2:])
+        # dynamic axes are reported as names instead of integers
+        if all(isinstance(dim, int) for dim in graph_size) and graph_size != tuple(
+            input_size
+        ):
+            raise ValueError(
+                f"The ONNX graph at {model_path} expects an input size of "
+                f"{graph_size} but input_size is {tuple(input_size)}. Please "
+                "export the graph with the configured input_size."
+            )
+        self.input_name = model_input.name
+
+    def __call__(self, data: np.ndarray) -> np.ndarray:
+        """To allow making inference calls via `model(img)`
+
+        Args:
+            data (np.ndarray): Batch of preprocessed images with the shape
+                (B, C, H, W).
+
+        Returns:
+            (np.ndarray): Decoded predictions with the shape (B, D, 85).
+        """
+        return self.session.run(None, {self.input_name: data.astype(np.float32)})[0]
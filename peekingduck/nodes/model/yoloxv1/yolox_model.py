@@ -16,12 +16,14 @@
 
 import locale
 import logging
-from typing import Any, Dict, List, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from peekingduck.nodes.base import ThresholdCheckerMixin, WeightsDownloaderMixin
 from peekingduck.nodes.model.yoloxv1.yolox_files.detector import Detector
+from peekingduck.utils.tiling import TiledInference
 
 
 class YOLOXModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
@@ -29,7 +31,8 @@ class YOLOXModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
 
     Configuration options are validated to ensure they have valid types and
     values. Model weights files are downloaded if not found in the location
-    indicated by the `weights_dir` configuration option.
+    indicated by the `weights_dir` configuration option. ONNX graphs are not
+    downloaded, they are exported locally from the PyTorch weights.
 
     Attributes:
         class_names (List[str]): Human-friendly class names of the object
@@ -45,9 +48,42 @@ class YOLOXModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         self.config = config
         self.logger = logging.getLogger(__name__)
 
+        self.check_valid_choice("model_format", {"pytorch", "tensorrt", "onnx"})
         self.check_bounds(["iou_threshold", "score_threshold"], "[0, 1]")
-
-        model_dir = self.download_weights()
+        self.check_bounds("tile_size", "(0, +inf)")
+        self.check_bounds("tile_overlap", "[0, 1)")
+        self.check_bounds(["tile_iou_threshold", "tile_match_threshold"], "[0, 1]")
+        if self.config["quantization"] is not None:
+            # YOLOX has no linear layers to quantize dynamically
+            self.check_valid_choice("quantization", {"static"})
+            if self.config["model_format"] != "pytorch":
+                raise ValueError(
+                    "quantization is only supported by the pytorch model_format."
+                )
+        if self.config["torchscript_cache"] and (
+            self.config["model_format"] != "pytorch"
+            or self.config["quantization"] is not None
+        ):
+            raise ValueError(
+                "torchscript_cache is only supported by the non-quantized "
+                "pytorch model_format."
+            )
+        onnx_options = {}
+        if self.config["model_format"] == "onnx":
+            self.check_valid_choice(
+                "onnx_graph_optimization", {"disable", "basic", "extended", "all"}
+            )
+            self.check_bounds(
+                ["onnx_intra_op_threads", "onnx_inter_op_threads"], "[0, +inf)"
+            )
+            onnx_options = {
+                "intra_op_threads": self.config["onnx_intra_op_threads"],
+                "inter_op_threads": self.config["onnx_inter_op_threads"],
+                "graph_optimization": self.config["onnx_graph_optimization"],
+            }
+            model_dir = self._prepare_onnx_dir()
+        else:
+            model_dir = self.download_weights()
         with open(
             model_dir / self.weights["classes_file"],
             encoding=locale.getpreferredencoding(False),
@@ -70,7 +106,20 @@ class YOLOXModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
             self.config["input_size"],
             self.config["iou_threshold"],
             self.config["score_threshold"],
+            onnx_options,
+            self.config["quantization"],
+            self.config["torchscript_cache"],
         )
+        self.tiled_inference: Optional[TiledInference] = None
+        if self.config["tiled_inference"]:
+            self.tiled_inference = TiledInference(
+                self.detector.predict_object_bboxes_from_images,
+                self.config["tile_size"],
+                self.config["tile_overlap"],
+                self.config["tile_full_frame"],
+                self.config["tile_iou_threshold"],
+                self.config["tile_match_threshold"],
+            )
 
     @property
     def detect_ids(self) -> List[int]:
@@ -101,4 +150,71 @@ class YOLOXModel(ThresholdCheckerMixin, WeightsDownloaderMixin):
         """
         if not isinstance(image, np.ndarray):
             raise TypeError("image must be a np.ndarray")
+        if self.tiled_inference is not None:
+            return self.tiled_inference(image)
         return self.detector.predict_object_bbox_from_image(image)
+
+    def predict_batch(
+        self, images: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Predicts bboxes from a batch of images.
+
+        Args:
+            images (List[np.ndarray]): Input image frames.
+
+        Returns:
+            (List[Tuple[np.ndarray, np.ndarray, np.ndarray]]): The detection
+            bboxes, human-friendly class names, and scores of each image.
+
+        Raises:
+            TypeError: Any of the provided `images` is not a numpy array.
+        """
+        if not all(isinstance(image, np.ndarray) for image in images):
+            raise TypeError("images must be a list of np.ndarray")
+        if self.tiled_inference is not None:
+            # the tiles of each image are already detected on as one batch
+            return [self.tiled_inference(image) for image in images]
+        return self.detector.predict_object_bboxes_from_images(images)
+
+    def quantize(self, mode: str, images: List[np.ndarray]) -> Path:
+        """Quantizes the model to INT8 using calibration images and caches
+        it next to the weights, see :meth:`Detector.quantize`.
+
+        Args:
+            mode (str): The quantization mode.
+            images (List[np.ndarray]): Calibration images.
+
+        Returns:
+            (Path): Path to the cached quantized model.
+
+        Raises:
+            ValueError: `mode` is not "static" or `model_format` is not
+                "pytorch".
+        """
+        if mode != "static":
+            raise ValueError("YOLOX only supports static quantization.")
+        self.check_valid_choice("model_format", {"pytorch"})
+        return self.detector.quantize(mode, images)
+
+    def to_cpu(self) -> None:
+        """Reloads the float model on the CPU, see :meth:`Detector.to_cpu`.
+
+        Raises:
+            ValueError: `model_format` is not "pytorch".
+        """
+        self.check_valid_choice("model_format", {"pytorch"})
+        self.detector.to_cpu()
+
+    def _prepare_onnx_dir(self) -> Path:
+        """Creates the directory of the exported ONNX graphs and downloads the
+        classes file, which is shared with the PyTorch weights, into it if it
+        is missing.
+
+        Returns:
+            (Path): Path to the directory where the ONNX graphs are stored.
+        """
+        model_dir = self._find_paths()
+        model_dir.mkdir(parents=True, exist_ok=True)
+        if not (model_dir / self.weights["classes_file"]).is_file():
+            self._download_to(self.weights["classes_file"], model_dir, "pytorch")
+        return model_dir
@@ -20,7 +20,7 @@ import csv
 import locale
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, List, Mapping
 
 
 class CSVLogger:
@@ -42,7 +42,7 @@ class CSVLogger:
         self.writer = csv.DictWriter(self.csv_file, fieldnames=self.headers)
         self.last_write = datetime.now()
 
-    def write(self, data_pool: Dict[str, Any], specific_data: List[str]) -> None:
+    def write(self, data_pool: Mapping[str, Any], specific_data: List[str]) -> None:
         """
         Writes a row of data in a csv file
 
@@ -57,7 +57,9 @@ class CSVLogger:
         if self.csv_file.tell() == 0:
             self.writer.writeheader()
 
-        content = {k: v for k, v in data_pool.items() if k in specific_data}
+        # Index the tracked keys directly, iterating over the data pool would
+        # read every value in it, including the frame
+        content = {key: data_pool[key] for key in specific_data if key in data_pool}
         curr_time = datetime.now()
         time_str = curr_time.strftime("%H:%M:%S")
         content.update({"Time": time_str})
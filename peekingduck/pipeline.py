@@ -17,11 +17,23 @@ Pipeline class that stores nodes and manages the data information used during
 inference.
 """
 
+import collections.abc
+import copy
 import textwrap
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Mapping, Set, cast
+
+import numpy as np
 
 from peekingduck.nodes.abstract_node import AbstractNode
 
+IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+# Built-in nodes which take "all" as input but never modify it, so they can be
+# given views of the arrays in the data pool instead of copies
+READ_ONLY_ALL_INPUT_NODES = {
+    "peekingduck.nodes.dabble.statistics",
+    "peekingduck.nodes.output.csv_writer",
+}
+
 
 class Pipeline:  # pylint: disable=too-few-public-methods
     """Pipeline class that stores nodes and manages flow of data used during
@@ -56,6 +68,9 @@ class Pipeline:  # pylint: disable=too-few-public-methods
 
         if nodes[0].inputs[0] == "none":
             data_pool.extend(nodes[0].outputs)
+            # source nodes which emit several frames per run, see
+            # peekingduck.executors.batched.BatchedExecutor
+            data_pool.extend(getattr(nodes[0], "frame_outputs", []))
 
         for node in nodes[1:]:
             if all(item in data_pool for item in node.inputs) or "all" in node.inputs:
@@ -70,3 +85,113 @@ class Pipeline:  # pylint: disable=too-few-public-methods
                     """
                 )
                 raise ValueError(msg)
+
+
+class DataPoolView(
+    collections.abc.MutableMapping
+):  # pylint: disable=too-many-ancestors
+    """A view of the pipeline data pool which is given to nodes that take
+    ``"all"`` as input, in place of a deep copy of the entire data pool.
+
+    Immutable values are returned without copying, and mutable values, such as
+    lists and numpy arrays, are copied the first time they are accessed, so the
+    node is free to modify them in place. Keys which the node never reads (e.g.
+    the full resolution ``img`` for most nodes) are never copied. Values set or
+    deleted by the node are stored in the view and never modify the data pool.
+
+    Args:
+        data (:obj:`Mapping[str, Any]`): The data pool of the pipeline.
+        share_arrays (:obj:`bool`): Whether numpy arrays are returned as
+            read-only views of the data pool instead of copies. Only for nodes
+            which never modify their inputs. **Default: False**.
+    """
+
+    def __init__(self, data: Mapping[str, Any], share_arrays: bool = False) -> None:
+        self._data = data
+        self._share_arrays = share_arrays
+        self._local: Dict[str, Any] = {}
+        self._deleted: Set[str] = set()
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._local:
+            return True
+        return key in self._data and key not in self._deleted
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._local.pop(key, None)
+        self._deleted.add(key)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._local:
+            return self._local[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        value = self._data[key]
+        if self._share_arrays and isinstance(value, np.ndarray):
+            value = value.view()
+            value.flags.writeable = False
+        elif not _is_immutable(value):
+            value = copy.deepcopy(value)
+            self._local[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._data:
+            if key not in self._deleted and key not in self._local:
+                yield key
+        yield from self._local
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)})"
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._local[key] = value
+        self._deleted.discard(key)
+
+    @property
+    def copied_keys(self) -> List[str]:
+        """Keys whose values have been copied or set in this view."""
+        return list(self._local)
+
+
+def get_node_inputs(node: AbstractNode, data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Collects the inputs required by ``node`` from the data pool.
+
+    Args:
+        node (:obj:`AbstractNode`): The node which is about to be run.
+        data (:obj:`Mapping[str, Any]`): The data pool containing the outputs
+            of the nodes which have run so far.
+
+    Returns:
+        (:obj:`Dict[str, Any]`): The inputs to be passed to ``node.run()``.
+        Nodes which take ``"all"`` as input receive a :obj:`DataPoolView` of
+        the data pool, which shares its arrays only with the built-in nodes in
+        ``READ_ONLY_ALL_INPUT_NODES``.
+    """
+    inputs: Dict[str, Any]
+    if "all" in node.inputs:
+        # Nodes only use the MutableMapping interface of their inputs, so the
+        # view stands in for the Dict expected by AbstractNode.run()
+        share_arrays = type(node).__module__ in READ_ONLY_ALL_INPUT_NODES
+        inputs = cast(Dict[str, Any], DataPoolView(data, share_arrays))
+    else:
+        inputs = {key: data[key] for key in node.inputs if key in data}
+    if hasattr(node, "optional_inputs"):
+        # The nodes will not receive inputs with the optional key if it's not
+        # found upstream
+        for key in node.optional_inputs:
+            if key in data:
+                inputs[key] = data[key]
+    return inputs
+
+
+def _is_immutable(value: Any) -> bool:
+    """Checks if ``value`` can be shared with a node without being copied."""
+    if isinstance(value, tuple):
+        return all(_is_immutable(item) for item in value)
+    return isinstance(value, IMMUTABLE_TYPES)
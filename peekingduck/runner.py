@@ -16,20 +16,28 @@
 Main engine for PeekingDuck processes.
 """
 
-import copy
 import logging
 import sys
 from pathlib import Path
 from time import perf_counter
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from peekingduck.declarative_loader import DeclarativeLoader, NodeList
+from peekingduck.executors.batched import BatchedExecutor
+from peekingduck.executors.multi_stream import MultiStreamExecutor
+from peekingduck.executors.parallel import ParallelExecutor
+from peekingduck.executors.pipelined import PipelinedExecutor
+from peekingduck.executors.sharded import ShardedExecutor
 from peekingduck.nodes.abstract_node import AbstractNode
-from peekingduck.pipeline import Pipeline
+from peekingduck.pipeline import Pipeline, get_node_inputs
+from peekingduck.utils.inference_gate import InferenceGate
+from peekingduck.utils.profiler import NodeProfiler
 from peekingduck.utils.requirement_checker import RequirementChecker
+from peekingduck.utils.result_cache import ResultCache
+from peekingduck.utils.tracer import PipelineTracer
 
 
-class Runner:
+class Runner:  # pylint: disable=too-many-instance-attributes
     """The runner class for creation of pipeline using declared/given nodes.
 
     The runner class uses the provided configurations to setup a node pipeline
@@ -53,6 +61,46 @@ class Runner:
         num_iter (int): Stop pipeline after running this number of iterations
         nodes (:obj:`List[AbstractNode]` | :obj:`None`): If a list of nodes is
             provided, initialize by the node stack directly.
+        executor (:obj:`str`): Strategy used to execute the nodes. One of
+            ``"sequential"`` (default), which runs every node in turn for each
+            frame, ``"pipelined"``, which runs groups of nodes as concurrent
+            stages, see
+            :py:class:`~peekingduck.executors.pipelined.PipelinedExecutor`,
+            ``"parallel"``, which runs independent nodes concurrently, see
+            :py:class:`~peekingduck.executors.parallel.ParallelExecutor`,
+            ``"batched"``, which passes micro-batches of frames through the
+            nodes, see
+            :py:class:`~peekingduck.executors.batched.BatchedExecutor`,
+            ``"multi_stream"``, which serves several input sources with
+            shared model nodes, see
+            :py:class:`~peekingduck.executors.multi_stream.MultiStreamExecutor`,
+            or ``"sharded"``, which splits the files of a directory source
+            across worker processes, see
+            :py:class:`~peekingduck.executors.sharded.ShardedExecutor`.
+        executor_config (:obj:`Dict[str, Any]` | :obj:`None`): Keyword
+            arguments passed to the selected executor.
+        profile (bool): Whether to record the latency of every node and report
+            their percentiles at the end of the run, see
+            :py:class:`~peekingduck.utils.profiler.NodeProfiler`. Nodes which
+            an executor instantiates itself, e.g. the per-stream nodes of
+            ``"multi_stream"`` and the worker nodes of ``"sharded"``, are not
+            profiled.
+        profile_output (:obj:`str` | :obj:`None`): Path of the JSON file to
+            write the latency report to. If ``None``, the report is only
+            logged.
+        trace_output (:obj:`str` | :obj:`None`): If provided, records a span
+            for every node run and writes them to this path as a Chrome Trace
+            Event file at the end of the run, see
+            :py:class:`~peekingduck.utils.tracer.PipelineTracer`. Nodes which
+            an executor instantiates itself, e.g. the per-stream nodes of
+            ``"multi_stream"``, are not traced. Not supported by the
+            ``"sharded"`` executor, whose nodes are all run by its workers.
+        cache_results (bool): Whether model nodes reuse their outputs when
+            they receive a repeated frame, e.g. from a threaded input source
+            which is slower than the pipeline, see
+            :py:class:`~peekingduck.utils.result_cache.ResultCache`. The
+            number of cache hits and misses is logged at the end of the run.
+            Not supported by the ``"sharded"`` executor.
     """
 
     def __init__(  # pylint: disable=too-many-arguments
@@ -62,6 +110,12 @@ class Runner:
         custom_nodes_parent_subdir: Optional[str] = None,
         num_iter: Optional[int] = None,
         nodes: Optional[List[AbstractNode]] = None,
+        executor: str = "sequential",
+        executor_config: Optional[Dict[str, Any]] = None,
+        profile: bool = False,
+        profile_output: Optional[str] = None,
+        trace_output: Optional[str] = None,
+        cache_results: bool = False,
     ) -> None:
         self.logger = logging.getLogger(__name__)
         try:
@@ -95,9 +149,158 @@ class Runner:
         else:
             self.num_iter = num_iter
             self.logger.info(f"Run pipeline for {num_iter} iterations")
+        try:
+            # attached before the executor reads the inputs of the nodes
+            self.inference_gate = self._create_inference_gate(executor)
+            self.result_cache: Optional[ResultCache] = None
+            if cache_results:
+                self.result_cache = self._create_result_cache(
+                    executor, executor_config or {}
+                )
+            if trace_output is not None and executor == "sharded":
+                raise ValueError(
+                    "trace_output is not supported by the sharded executor."
+                )
+            self.executor = self._create_executor(executor, executor_config or {})
+        except ValueError as error:
+            self.logger.error(str(error))
+            sys.exit(1)
+        self.profiler: Optional[NodeProfiler] = None
+        self.profile_output = profile_output
+        if profile:
+            self.profiler = NodeProfiler(self.pipeline.nodes)
+            self.profiler.attach()
+        self.tracer: Optional[PipelineTracer] = None
+        self.trace_output = trace_output
+        if trace_output is not None:
+            self.tracer = PipelineTracer(self.pipeline.nodes)
+            self.tracer.attach()
 
-    def run(self) -> None:  # pylint: disable=too-many-branches
+    def run(self) -> None:
         """execute single or continuous inference"""
+        try:
+            if self.executor is None:
+                self._run_sequential()
+            else:
+                self.executor.run()
+        finally:
+            if self.profiler is not None:
+                self.profiler.report(self.profile_output)
+            if self.tracer is not None and self.trace_output is not None:
+                self.tracer.write(self.trace_output)
+            if self.inference_gate is not None:
+                self.inference_gate.report()
+            if self.result_cache is not None:
+                self.result_cache.report()
+
+        # clean up nodes with threads
+        for node in self.pipeline.nodes:
+            if node.name.endswith((".visual", ".multi_visual")):
+                node.release_resources()
+
+    def get_pipeline(self) -> NodeList:
+        """Retrieves run configuration.
+
+        Returns:
+            (:obj:`Dict`): Run configurations being used by runner.
+        """
+        return self.node_loader.node_list
+
+    def _create_executor(
+        self, executor: str, executor_config: Dict[str, Any]
+    ) -> Optional[
+        Union[
+            BatchedExecutor,
+            MultiStreamExecutor,
+            ParallelExecutor,
+            PipelinedExecutor,
+            ShardedExecutor,
+        ]
+    ]:
+        """Creates the executor which runs the pipeline. Returns ``None`` for
+        the default sequential execution, which is handled by the runner
+        itself.
+        """
+        executor_classes = {
+            "batched": BatchedExecutor,
+            "multi_stream": MultiStreamExecutor,
+            "parallel": ParallelExecutor,
+            "pipelined": PipelinedExecutor,
+            "sharded": ShardedExecutor,
+        }
+        if self.pipeline.nodes and hasattr(self.pipeline.nodes[0], "split_frames"):
+            if executor == "sequential":
+                self.logger.info(
+                    f"{self.pipeline.nodes[0].name} reads several frames per run, "
+                    "using the batched executor"
+                )
+                executor = "batched"
+                executor_config = {
+                    "batch_size": len(self.pipeline.nodes[0].sources),
+                    **executor_config,
+                }
+            elif executor != "batched":
+                raise ValueError(
+                    f"{self.pipeline.nodes[0].name} reads several frames per run "
+                    "and requires the batched executor."
+                )
+        if executor == "sequential":
+            return None
+        if executor not in executor_classes:
+            raise ValueError(
+                f"Invalid executor: {executor}. Must be one of "
+                f"{['sequential'] + sorted(executor_classes)}."
+            )
+        try:
+            return executor_classes[executor](
+                self.pipeline, self.num_iter, **executor_config
+            )
+        except TypeError as error:
+            raise ValueError(
+                f"Invalid executor_config for {executor}: {error}"
+            ) from error
+
+    def _create_inference_gate(self, executor: str) -> Optional[InferenceGate]:
+        """Gates the nodes configured by a :mod:`dabble.motion_gate` node, so
+        they are skipped on frames without motion. Returns ``None`` if the
+        pipeline has no such node. The worker processes of the sharded
+        executor instantiate their own nodes, which cannot be gated.
+        """
+        gates = [node for node in self.pipeline.nodes if hasattr(node, "gated_nodes")]
+        if not gates:
+            return None
+        if len(gates) > 1:
+            raise ValueError("A pipeline can only contain one dabble.motion_gate node.")
+        if executor == "sharded":
+            raise ValueError(
+                "dabble.motion_gate is not supported by the sharded executor."
+            )
+        inference_gate = InferenceGate(self.pipeline.nodes, gates[0])
+        inference_gate.attach()
+        return inference_gate
+
+    def _create_result_cache(
+        self, executor: str, executor_config: Dict[str, Any]
+    ) -> ResultCache:
+        """Caches the outputs of the model nodes. The cache keeps one frame
+        per source, of the multi-stream executor, whose shared model nodes run
+        on a frame of every stream in turn, or of a source node which reads
+        several frames per run. The worker processes of the sharded executor
+        instantiate their own nodes, which cannot be cached.
+        """
+        if executor == "sharded":
+            raise ValueError("cache_results is not supported by the sharded executor.")
+        capacity = 1
+        if executor == "multi_stream":
+            capacity = max(len(executor_config.get("sources") or []), 1)
+        elif self.pipeline.nodes and hasattr(self.pipeline.nodes[0], "split_frames"):
+            capacity = max(len(self.pipeline.nodes[0].sources), 1)
+        result_cache = ResultCache(self.pipeline.nodes, capacity)
+        result_cache.attach()
+        return result_cache
+
+    def _run_sequential(self) -> None:
+        """Runs every node in turn for each frame."""
         num_iter = 0
         while not self.pipeline.terminate:
             for node in self.pipeline.nodes:
@@ -109,21 +312,7 @@ class Runner:
                     if "pipeline_end" not in node.inputs:
                         continue
 
-                if "all" in node.inputs:
-                    inputs = copy.deepcopy(self.pipeline.data)
-                else:
-                    inputs = {
-                        key: self.pipeline.data[key]
-                        for key in node.inputs
-                        if key in self.pipeline.data
-                    }
-                if hasattr(node, "optional_inputs"):
-                    for key in node.optional_inputs:
-                        # The nodes will not receive inputs with the optional
-                        # key if it's not found upstream
-                        if key in self.pipeline.data:
-                            inputs[key] = self.pipeline.data[key]
-
+                inputs = get_node_inputs(node, self.pipeline.data)
                 node.callback_list.on_run_begin(self.pipeline.data)
                 outputs = node.run(inputs)
                 self.pipeline.data.update(outputs)
@@ -137,16 +326,3 @@ class Runner:
             if self.num_iter > 0 and num_iter >= self.num_iter:
                 self.logger.info(f"Stopping pipeline after {num_iter} iterations")
                 break
-
-        # clean up nodes with threads
-        for node in self.pipeline.nodes:
-            if node.name.endswith(".visual"):
-                node.release_resources()
-
-    def get_pipeline(self) -> NodeList:
-        """Retrieves run configuration.
-
-        Returns:
-            (:obj:`Dict`): Run configurations being used by runner.
-        """
-        return self.node_loader.node_list
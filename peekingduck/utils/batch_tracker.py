@@ -0,0 +1,61 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Groups the run callbacks of a node into batches.
+"""
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class BatchTracker:
+    """Groups the ``run_begin`` and ``run_end`` callbacks of a node into the
+    batches the node ran on.
+
+    The batched executor calls ``run_begin`` for every frame of a batch
+    before the first ``run_end``, and other executors run one frame at a time.
+    The frames started since the last batch therefore form one batch, which is
+    completed by its first ``run_end``. The remaining ``run_end`` calls of the
+    batch belong to the same batch.
+    """
+
+    def __init__(self) -> None:
+        self._start_times: Deque[float] = deque()
+        self._num_unfinished = 0
+
+    def begin(self, start_time: float) -> None:
+        """Records the start of a frame.
+
+        Args:
+            start_time (float): The time ``run_begin`` was called.
+        """
+        self._start_times.append(start_time)
+
+    def end(self) -> Optional[Tuple[float, int]]:
+        """Records the end of a frame.
+
+        Returns:
+            (:obj:`Tuple[float, int]` | :obj:`None`): The earliest start time
+            and the number of frames of the batch, if this is the first
+            ``run_end`` of the batch, otherwise ``None``.
+        """
+        if self._num_unfinished > 0:
+            self._num_unfinished -= 1
+            return None
+        batch = (self._start_times[0], len(self._start_times))
+        self._start_times.clear()
+        self._num_unfinished = batch[1] - 1
+        return batch
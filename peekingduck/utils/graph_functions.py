@@ -18,7 +18,7 @@ Utility functions for Tensorflow Graphed models
 
 import logging
 import os
-from typing import Callable, List
+from typing import Any, Callable, List, Sequence
 
 import tensorflow as tf
 
@@ -70,6 +70,43 @@ def load_graph(file_path: str, inputs: List[str], outputs: List[str]) -> Callabl
         return frozen_func
 
 
+class GraphFunction:  # pylint: disable=too-few-public-methods
+    """Compiles ``python_function`` into a TensorFlow graph with a fixed
+    ``input_signature``, so that it is traced once instead of being retraced
+    when the shapes or values of its inputs change. The number of traces is
+    logged when it changes, and a retrace is logged as a warning.
+
+    Args:
+        python_function (Callable): The function to compile. It takes and
+            returns tensors.
+        input_signature (Sequence[tf.TensorSpec]): The shapes and dtypes of
+            the inputs of ``python_function``. Dimensions which vary between
+            calls, e.g., the size of the input frame, are ``None``.
+        name (str): Name of the function in the logs.
+    """
+
+    def __init__(
+        self,
+        python_function: Callable,
+        input_signature: Sequence[tf.TensorSpec],
+        name: str,
+    ) -> None:
+        self.function = tf.function(python_function, input_signature=input_signature)
+        self.name = name
+        self.num_traces = 0
+
+    def __call__(self, *args: Any) -> Any:
+        outputs = self.function(*args)
+        num_traces = self.function.experimental_get_tracing_count()
+        if num_traces != self.num_traces:
+            self.num_traces = num_traces
+            if num_traces == 1:
+                logger.info(f"Traced {self.name} graph")
+            else:
+                logger.warning(f"Retraced {self.name} graph, traced {num_traces} times")
+        return outputs
+
+
 def print_inputs(graph_def: tf.compat.v1.GraphDef) -> None:
     """Prints the input nodes of graph_def."""
     with tf.Graph().as_default() as graph:  # pylint: disable=not-context-manager
@@ -0,0 +1,145 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Skips nodes on frames without motion.
+"""
+
+import functools
+import logging
+from typing import Any, Dict, List
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.utils.node_wrapper import BatchFn, wrap_node_runs
+
+GATE_KEY = "motion_detected"
+SOURCE_KEY = "source_id"
+
+
+class InferenceGate:
+    """Skips the gated nodes of a :mod:`dabble.motion_gate` node on frames
+    where :term:`motion_detected` is ``False``, reusing the outputs of the
+    last frame each gated node ran on.
+
+    The ``run()`` and ``run_batch()`` methods of the gated nodes are wrapped,
+    see :func:`~peekingduck.utils.node_wrapper.wrap_node_runs`, and
+    :term:`motion_detected` is added to their optional inputs, so the flag is
+    read from the data pool of each frame. Outputs are reused separately for
+    each :term:`source_id`, which is set by :mod:`input.multi_visual` and by
+    the multi-stream executor, and a gated node always runs on the first frame
+    of each source.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): The nodes of the pipeline.
+        gate (:obj:`AbstractNode`): The :mod:`dabble.motion_gate` node, whose
+            ``gated_nodes`` config names the nodes to skip. If it is ``None``,
+            every model node after the gate node is gated.
+
+    Raises:
+        ValueError: A gated node is not found after the gate node.
+    """
+
+    def __init__(self, nodes: List[AbstractNode], gate: AbstractNode) -> None:
+        self.logger = logging.getLogger(__name__)
+        downstream = nodes[nodes.index(gate) + 1 :]
+        gated_nodes = getattr(gate, "gated_nodes", None)
+        if gated_nodes is None:
+            self.nodes = [
+                node for node in downstream if node.node_name.startswith("model.")
+            ]
+        else:
+            names = [node.node_name for node in downstream]
+            missing = [name for name in gated_nodes if name not in names]
+            if missing:
+                raise ValueError(
+                    f"gated_nodes {missing} of {gate.name} are not found after it "
+                    "in the pipeline."
+                )
+            self.nodes = [node for node in downstream if node.node_name in gated_nodes]
+        self.num_runs = [0] * len(self.nodes)
+        self.num_skipped = [0] * len(self.nodes)
+
+    def attach(self) -> None:
+        """Wraps the run methods of the gated nodes."""
+        for idx, node in enumerate(self.nodes):
+            optional_inputs = getattr(node, "optional_inputs", [])
+            added_keys = [
+                key
+                for key in (GATE_KEY, SOURCE_KEY)
+                if key not in node.inputs and key not in optional_inputs
+            ]
+            node.optional_inputs = optional_inputs + added_keys
+            cache: Dict[Any, Dict[str, Any]] = {}
+            wrap_node_runs(
+                node, functools.partial(self._gate_batch, idx, cache, added_keys)
+            )
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns the number of runs and skipped runs of each gated node."""
+        return {
+            node.name: {"runs": runs, "skipped": skipped}
+            for node, runs, skipped in zip(self.nodes, self.num_runs, self.num_skipped)
+        }
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Logs the number of runs saved for each gated node.
+
+        Returns:
+            (:obj:`Dict[str, Dict[str, int]]`): See :meth:`get_stats`.
+        """
+        stats = self.get_stats()
+        for name, counts in stats.items():
+            saved = counts["skipped"] / counts["runs"] if counts["runs"] else 0.0
+            self.logger.info(
+                f"Motion gate skipped {counts['skipped']} of {counts['runs']} "
+                f"runs of {name} ({saved:.1%})"
+            )
+        return stats
+
+    def _gate_batch(  # pylint: disable=too-many-arguments
+        self,
+        idx: int,
+        cache: Dict[Any, Dict[str, Any]],
+        added_keys: List[str],
+        inputs_list: List[Dict[str, Any]],
+        run_batch: BatchFn,
+    ) -> List[Dict[str, Any]]:
+        """Gates a batch of the node at ``idx``. Frames with motion, and the
+        first frame of each source, are passed to ``run_batch`` and the other
+        frames reuse the latest outputs of their source.
+        """
+        motion = [inputs.get(GATE_KEY, True) for inputs in inputs_list]
+        sources = [inputs.get(SOURCE_KEY, 0) for inputs in inputs_list]
+        for inputs in inputs_list:
+            for key in added_keys:
+                inputs.pop(key, None)
+        run_indices = []
+        cached_sources = set(cache)
+        for i, (moved, source) in enumerate(zip(motion, sources)):
+            if moved or source not in cached_sources:
+                run_indices.append(i)
+                cached_sources.add(source)
+        run_index_set = set(run_indices)
+        results = iter(
+            run_batch([inputs_list[i] for i in run_indices]) if run_indices else []
+        )
+        outputs_list = []
+        for i, source in enumerate(sources):
+            if i in run_index_set:
+                cache[source] = next(results)
+            outputs_list.append(cache[source])
+        self.num_runs[idx] += len(inputs_list)
+        self.num_skipped[idx] += len(inputs_list) - len(run_indices)
+        return outputs_list
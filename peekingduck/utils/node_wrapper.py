@@ -0,0 +1,68 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Wraps the run methods of a node instance.
+"""
+
+from typing import Any, Callable, Dict, List
+
+from peekingduck.nodes.abstract_node import AbstractNode
+
+BatchFn = Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+# Receives the inputs of a batch and the wrapped run_batch, returns the outputs
+BatchWrapper = Callable[[List[Dict[str, Any]], BatchFn], List[Dict[str, Any]]]
+
+
+def wrap_node_runs(node: AbstractNode, wrapper: BatchWrapper) -> None:
+    """Passes every call to the ``run()`` and ``run_batch()`` methods of
+    ``node`` through ``wrapper``, which decides which inputs are passed on to
+    the original method. ``run()`` is wrapped as a batch of one frame.
+
+    A ``run_batch()`` overridden by the node is wrapped as well. The calls it
+    makes to ``run()`` go directly to the original method, so each frame is
+    only passed through ``wrapper`` once.
+
+    Only the methods of this node instance are replaced, so the wrapper has no
+    effect on nodes which an executor instantiates itself, such as the worker
+    nodes of the sharded executor.
+
+    Args:
+        node (:obj:`AbstractNode`): The node to wrap.
+        wrapper (:obj:`BatchWrapper`): Called with the inputs of each batch
+            and the original run method, returns the outputs of each frame.
+    """
+    running = False
+
+    def _wrap(run_batch: BatchFn) -> BatchFn:
+        def _run_batch(inputs_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            nonlocal running
+            if running:
+                # run() called by the node's own run_batch()
+                return run_batch(inputs_list)
+            running = True
+            try:
+                return wrapper(inputs_list, run_batch)
+            finally:
+                running = False
+
+        return _run_batch
+
+    run = node.run
+    wrapped_batch = _wrap(lambda inputs_list: [run(inputs) for inputs in inputs_list])
+    node.run = lambda inputs: wrapped_batch([inputs])[0]  # type: ignore
+    # the default run_batch() already calls the wrapped run()
+    if type(node).run_batch is not AbstractNode.run_batch:
+        node.run_batch = _wrap(node.run_batch)  # type: ignore
@@ -0,0 +1,184 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Per-node latency profiler for the pipeline.
+"""
+
+import json
+import logging
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.utils.batch_tracker import BatchTracker
+
+PERCENTILES = [50, 95, 99]
+
+
+class NodeProfiler:  # pylint: disable=too-many-instance-attributes
+    """Records the wall time of every node invocation using the ``run_begin``
+    and ``run_end`` callbacks of the nodes. The profiler's callbacks wrap any
+    callbacks set in the pipeline config, so the recorded time includes them.
+
+    The latencies of each node are kept in a preallocated ring buffer, so the
+    percentiles describe the most recent ``capacity`` frames while the total
+    time, frame count, and maximum cover the whole run. When a node runs on a
+    batch of frames, each frame is charged an equal share of the batch time.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): The nodes to profile. The number of
+            frames is the number of invocations of the first node.
+        capacity (int): Number of latencies kept per node.
+
+    Raises:
+        ValueError: ``capacity`` is not positive.
+    """
+
+    def __init__(self, nodes: List[AbstractNode], capacity: int = 10000) -> None:
+        self.logger = logging.getLogger(__name__)
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer.")
+        self.nodes = nodes
+        self.capacity = capacity
+        self.latencies = np.zeros((len(nodes), capacity), dtype=np.float64)
+        self.counts = np.zeros(len(nodes), dtype=np.int64)
+        self.totals = np.zeros(len(nodes), dtype=np.float64)
+        self.maxima = np.zeros(len(nodes), dtype=np.float64)
+        self._batches = [BatchTracker() for _ in nodes]
+        self._frame_latencies = [0.0] * len(nodes)
+        self._first_time: Optional[float] = None
+        self._last_time: Optional[float] = None
+
+    def attach(self) -> None:
+        """Adds the timing callbacks to every node."""
+        for idx, node in enumerate(self.nodes):
+            node.callback_list.prepend("run_begin", self._make_begin(idx))
+            node.callback_list.append("run_end", self._make_end(idx))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Computes the latency statistics of every node.
+
+        Returns:
+            (:obj:`Dict[str, Any]`): The number of frames, frames per second,
+            and, for each node, the number of invocations, percentile and
+            maximum latencies in milliseconds, and share of the total time
+            spent in nodes.
+        """
+        num_frames = int(self.counts[0]) if len(self.nodes) > 0 else 0
+        elapsed = (
+            self._last_time - self._first_time
+            if self._first_time is not None and self._last_time is not None
+            else 0.0
+        )
+        total_time = float(self.totals.sum())
+        node_stats = []
+        for idx, node in enumerate(self.nodes):
+            samples = self.latencies[idx, : min(self.counts[idx], self.capacity)]
+            stats: Dict[str, Any] = {"node": node.name, "count": int(self.counts[idx])}
+            for percentile in PERCENTILES:
+                stats[f"p{percentile}_ms"] = (
+                    float(np.percentile(samples, percentile)) * 1000
+                    if samples.size > 0
+                    else 0.0
+                )
+            stats["max_ms"] = float(self.maxima[idx]) * 1000
+            stats["share"] = float(self.totals[idx]) / total_time if total_time else 0.0
+            node_stats.append(stats)
+        return {
+            "num_frames": num_frames,
+            "elapsed_sec": elapsed,
+            "fps": num_frames / elapsed if elapsed > 0 else 0.0,
+            "nodes": node_stats,
+        }
+
+    def report(self, output_path: Optional[Union[Path, str]] = None) -> Dict[str, Any]:
+        """Logs the latency statistics as a table, and optionally writes them
+        to a JSON file.
+
+        Args:
+            output_path (:obj:`Path` | :obj:`str` | :obj:`None`): Path of the
+                JSON file.
+
+        Returns:
+            (:obj:`Dict[str, Any]`): The latency statistics, see
+            :meth:`get_stats`.
+        """
+        stats = self.get_stats()
+        self.logger.info(f"Node latency profile:\n{self.format_table(stats)}")
+        if output_path is not None:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, "w", encoding="utf-8") as outfile:
+                json.dump(stats, outfile, indent=2)
+            self.logger.info(f"Node latency profile written to {output_path}")
+        return stats
+
+    @staticmethod
+    def format_table(stats: Dict[str, Any]) -> str:
+        """Formats the statistics from :meth:`get_stats` as a text table."""
+        name_width = max([len("node")] + [len(row["node"]) for row in stats["nodes"]])
+        headers = (
+            ["count"] + [f"p{p} (ms)" for p in PERCENTILES] + ["max (ms)", "share"]
+        )
+        lines = [f"{'node':<{name_width}}  " + "  ".join(f"{h:>9}" for h in headers)]
+        for row in stats["nodes"]:
+            values = [f"{row['count']:>9d}"]
+            values += [f"{row[f'p{p}_ms']:>9.2f}" for p in PERCENTILES]
+            values += [f"{row['max_ms']:>9.2f}", f"{row['share']:>9.1%}"]
+            lines.append(f"{row['node']:<{name_width}}  " + "  ".join(values))
+        lines.append(
+            f"{stats['num_frames']} frames in {stats['elapsed_sec']:.2f} sec "
+            f"({stats['fps']:.2f} FPS)"
+        )
+        return "\n".join(lines)
+
+    def _make_begin(self, idx: int) -> Callable[[Dict[str, Any]], None]:
+        """Creates the ``run_begin`` callback of the node at ``idx``."""
+
+        def _begin(_: Dict[str, Any]) -> None:
+            now = perf_counter()
+            if self._first_time is None:
+                self._first_time = now
+            self._batches[idx].begin(now)
+
+        return _begin
+
+    def _make_end(self, idx: int) -> Callable[[Dict[str, Any]], None]:
+        """Creates the ``run_end`` callback of the node at ``idx``. The first
+        ``run_end`` of a batch, see
+        :py:class:`~peekingduck.utils.batch_tracker.BatchTracker`, divides the
+        batch time by its number of frames, and every ``run_end`` of the
+        batch records this per-frame latency.
+        """
+
+        def _end(_: Dict[str, Any]) -> None:
+            now = perf_counter()
+            batch = self._batches[idx].end()
+            if batch is not None:
+                start_time, batch_size = batch
+                self._frame_latencies[idx] = (now - start_time) / batch_size
+            latency = self._frame_latencies[idx]
+            self.latencies[idx, self.counts[idx] % self.capacity] = latency
+            self.counts[idx] += 1
+            self.totals[idx] += latency
+            if latency > self.maxima[idx]:
+                self.maxima[idx] = latency
+            self._last_time = now
+
+        return _end
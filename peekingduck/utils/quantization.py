@@ -0,0 +1,177 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utility functions for INT8 post-training quantization of PyTorch models
+for CPU inference.
+
+Two modes are supported:
+
+- ``"dynamic"``: the weights of linear layers are quantized ahead of time and
+  their activations are quantized on the fly, so no calibration is needed.
+- ``"static"``: the weights and activations of a traceable submodule, such as
+  a convolutional backbone, are quantized with scales found by running
+  calibration images through it.
+
+Quantized models are cached as state dicts next to the float weights, under
+a name which includes the quantized engine, e.g. ``x86`` or ``qnnpack``, as
+the packed weights are specific to it.
+"""
+
+import warnings
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import torch
+from torch import nn
+from torch.ao.quantization import get_default_qconfig_mapping
+from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+from torch.fx import GraphModule
+
+QUANTIZATION_MODES = {"dynamic", "static"}
+
+Detections = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def get_quantized_path(model_path: Path, mode: str) -> Path:
+    """Returns the path of the cached quantized model of the float weights at
+    ``model_path``.
+
+    Args:
+        model_path (Path): Path to the float weights file.
+        mode (str): The quantization mode, "dynamic" or "static".
+
+    Returns:
+        (Path): Path to the quantized state dict in the same directory.
+    """
+    engine = torch.backends.quantized.engine
+    return model_path.with_name(f"{model_path.stem}-int8-{mode}-{engine}.pt")
+
+
+def quantize_dynamic(model: nn.Module) -> nn.Module:
+    """Quantizes the weights of the linear layers of ``model`` to INT8.
+
+    Args:
+        model (nn.Module): A float model in evaluation mode.
+
+    Returns:
+        (nn.Module): The model with dynamically quantized linear layers.
+    """
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, torch.qint8)
+
+
+def prepare_static(
+    module: nn.Module, example_inputs: Tuple[torch.Tensor, ...]
+) -> GraphModule:
+    """Traces ``module`` and inserts observers which record the range of its
+    activations during calibration. Convolution, batch normalization, and
+    activation layers are fused.
+
+    Args:
+        module (nn.Module): A traceable float module in evaluation mode.
+        example_inputs (Tuple[torch.Tensor, ...]): Example inputs of
+            ``module``.
+
+    Returns:
+        (GraphModule): The module to run calibration images through before
+        calling :func:`convert_static`.
+    """
+    qconfig_mapping = get_default_qconfig_mapping(torch.backends.quantized.engine)
+    return prepare_fx(module, qconfig_mapping, example_inputs)
+
+
+def convert_static(prepared: GraphModule, calibrated: bool = True) -> GraphModule:
+    """Converts a calibrated module from :func:`prepare_static` into a
+    quantized module. The inputs and outputs of the module remain float.
+
+    Args:
+        prepared (GraphModule): The calibrated module.
+        calibrated (bool): Whether calibration images were run through
+            ``prepared``. If ``False``, only the structure of the quantized
+            module is created, to load a cached state dict into, and the
+            warnings about uncalibrated observers are suppressed.
+
+    Returns:
+        (GraphModule): The quantized module.
+    """
+    if calibrated:
+        return convert_fx(prepared)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return convert_fx(prepared)
+
+
+def compare_detections(  # pylint: disable=too-many-locals
+    reference: Sequence[Detections],
+    candidate: Sequence[Detections],
+    iou_threshold: float = 0.5,
+) -> Dict[str, float]:
+    """Measures the drift of the detections of a quantized model from the
+    detections of the float model on the same images. A detection is matched
+    greedily, in order of decreasing score, to the unmatched detection of the
+    other model with the same label and the highest IoU above
+    ``iou_threshold``.
+
+    Args:
+        reference (Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]]): The
+            bboxes, labels, and scores of the float model on each image.
+        candidate (Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]]): The
+            bboxes, labels, and scores of the quantized model on each image.
+        iou_threshold (float): Minimum IoU of matched detections.
+
+    Returns:
+        (Dict[str, float]): The fraction of reference detections which are
+        matched ("recall") and of candidate detections which are matched
+        ("precision"), and the mean IoU ("mean_iou") and absolute score
+        difference ("mean_score_diff") of the matched detections.
+    """
+    ious: List[float] = []
+    score_diffs: List[float] = []
+    num_reference = num_candidate = 0
+    for (ref_bboxes, ref_labels, ref_scores), (bboxes, labels, scores) in zip(
+        reference, candidate
+    ):
+        num_reference += len(ref_bboxes)
+        num_candidate += len(bboxes)
+        if len(ref_bboxes) == 0 or len(bboxes) == 0:
+            continue
+        iou = _pairwise_iou(np.asarray(ref_bboxes), np.asarray(bboxes))
+        iou[np.asarray(ref_labels)[:, None] != np.asarray(labels)[None, :]] = 0
+        for i in np.argsort(-np.asarray(ref_scores)):
+            j = int(np.argmax(iou[i]))
+            if iou[i, j] < iou_threshold:
+                continue
+            ious.append(float(iou[i, j]))
+            score_diffs.append(abs(float(ref_scores[i]) - float(scores[j])))
+            iou[:, j] = 0
+    num_matched = len(ious)
+    return {
+        "recall": num_matched / num_reference if num_reference else 1.0,
+        "precision": num_matched / num_candidate if num_candidate else 1.0,
+        "mean_iou": float(np.mean(ious)) if ious else 0.0,
+        "mean_score_diff": float(np.mean(score_diffs)) if score_diffs else 0.0,
+    }
+
+
+def _pairwise_iou(bboxes_1: np.ndarray, bboxes_2: np.ndarray) -> np.ndarray:
+    """Computes the IoU of every pair of :math:`(x1, y1, x2, y2)` bboxes."""
+    top_left = np.maximum(bboxes_1[:, None, :2], bboxes_2[None, :, :2])
+    bottom_right = np.minimum(bboxes_1[:, None, 2:], bboxes_2[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_1 = np.prod(bboxes_1[:, 2:] - bboxes_1[:, :2], axis=1)
+    area_2 = np.prod(bboxes_2[:, 2:] - bboxes_2[:, :2], axis=1)
+    union = area_1[:, None] + area_2[None, :] - intersection
+    return np.divide(
+        intersection, union, out=np.zeros_like(intersection), where=union > 0
+    )
@@ -14,7 +14,7 @@
 
 """Python package requirements checker."""
 
-import importlib
+import importlib.abc
 import locale
 import logging
 import subprocess
@@ -0,0 +1,183 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Reuses the outputs of model nodes on repeated frames.
+"""
+
+import functools
+import logging
+import zlib
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.utils.node_wrapper import BatchFn, wrap_node_runs
+
+# Only every HASH_STRIDE-th row and column of a frame is hashed
+HASH_STRIDE = 4
+
+
+class _Entry(NamedTuple):
+    """The inputs and outputs of a cached node run."""
+
+    inputs: Dict[str, Any]
+    img_hash: int
+    outputs: Dict[str, Any]
+
+
+class ResultCache:
+    """Returns the previous outputs of model nodes when they receive a frame
+    again, e.g. when a threaded :mod:`input.visual` repeats its last frame
+    because the source is slower than the pipeline, or a static image is read
+    repeatedly.
+
+    A frame is recognised either as the same :term:`img` object, or as an
+    image of the same shape with the same CRC-32 of a strided sample of its
+    content, i.e. every ``HASH_STRIDE``-th row and column. Hashing the sample
+    reads 1/16 of the frame, but changes which only affect the pixels between
+    the sampled ones are not detected. The other
+    inputs of the node, such as the :term:`bboxes` of :mod:`model.hrnet`,
+    must be the same objects, which is the case when they come from a node
+    whose outputs were reused. The ``run()`` and ``run_batch()`` methods of
+    the cached nodes are wrapped, see
+    :func:`~peekingduck.utils.node_wrapper.wrap_node_runs`.
+
+    Draw nodes modify :term:`img` in place. A repeated frame object is still
+    matched by identity, as readers never reuse the buffer of an earlier
+    frame, but repeated content in a new object is only matched if it was not
+    drawn on before the model node ran.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): The nodes of the pipeline. Model
+            nodes which take :term:`img` as input are cached.
+        capacity (int): Number of recent frames kept per node, e.g. at least
+            the number of sources of :mod:`input.multi_visual`.
+
+    Raises:
+        ValueError: ``capacity`` is not positive.
+    """
+
+    def __init__(self, nodes: List[AbstractNode], capacity: int = 1) -> None:
+        self.logger = logging.getLogger(__name__)
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer.")
+        self.nodes = [
+            node
+            for node in nodes
+            if node.node_name.startswith("model.") and "img" in node.inputs
+        ]
+        self.capacity = capacity
+        self.hits = [0] * len(self.nodes)
+        self.misses = [0] * len(self.nodes)
+
+    def attach(self) -> None:
+        """Wraps the run methods of the cached nodes."""
+        for idx, node in enumerate(self.nodes):
+            entries: Deque[_Entry] = deque(maxlen=self.capacity)
+            wrap_node_runs(node, functools.partial(self._cache_batch, idx, entries))
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns the number of cache hits and misses of each cached node."""
+        return {
+            node.name: {"hits": hits, "misses": misses}
+            for node, hits, misses in zip(self.nodes, self.hits, self.misses)
+        }
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Logs the number of cache hits and misses of each cached node.
+
+        Returns:
+            (:obj:`Dict[str, Dict[str, int]]`): See :meth:`get_stats`.
+        """
+        stats = self.get_stats()
+        for name, counts in stats.items():
+            total = counts["hits"] + counts["misses"]
+            hit_rate = counts["hits"] / total if total else 0.0
+            self.logger.info(
+                f"Result cache of {name}: {counts['hits']} hits, "
+                f"{counts['misses']} misses ({hit_rate:.1%} hit rate)"
+            )
+        return stats
+
+    def _cache_batch(
+        self,
+        idx: int,
+        entries: Deque[_Entry],
+        inputs_list: List[Dict[str, Any]],
+        run_batch: BatchFn,
+    ) -> List[Dict[str, Any]]:
+        """Looks up a batch of the node at ``idx`` in the cache. Frames which
+        are not found in ``entries`` are passed to ``run_batch``.
+        """
+        outputs_list: List[Optional[Dict[str, Any]]] = []
+        missed: List[_Entry] = []
+        for inputs in inputs_list:
+            img_hash = _HashCache(inputs["img"])
+            entry = _find_entry(inputs, img_hash, [*entries, *missed])
+            if entry is None:
+                missed.append(_Entry(inputs, img_hash.value, {}))
+                outputs_list.append(None)
+            else:
+                outputs_list.append(entry.outputs)
+        results = run_batch([entry.inputs for entry in missed]) if missed else []
+        for entry, outputs in zip(missed, results):
+            entry.outputs.update(outputs)
+            entries.append(entry)
+        self.hits[idx] += sum(outputs is not None for outputs in outputs_list)
+        self.misses[idx] += len(missed)
+        # outputs of repeated frames within the batch are filled in above
+        return [
+            outputs if outputs is not None else missed.pop(0).outputs
+            for outputs in outputs_list
+        ]
+
+
+class _HashCache:  # pylint: disable=too-few-public-methods
+    """Computes the content hash of an image at most once."""
+
+    def __init__(self, img: np.ndarray) -> None:
+        self.img = img
+        self._value: Optional[int] = None
+
+    @property
+    def value(self) -> int:
+        """The CRC-32 of a strided sample of the image content."""
+        if self._value is None:
+            sample = self.img[::HASH_STRIDE, ::HASH_STRIDE]
+            self._value = zlib.crc32(np.ascontiguousarray(sample).data)
+        return self._value
+
+
+def _find_entry(
+    inputs: Dict[str, Any], img_hash: _HashCache, entries: List[_Entry]
+) -> Optional[_Entry]:
+    """Finds the most recent entry with the same inputs."""
+    img = inputs["img"]
+    for entry in reversed(entries):
+        cached_img = entry.inputs["img"]
+        if entry.inputs.keys() != inputs.keys() or any(
+            inputs[key] is not entry.inputs[key] for key in inputs if key != "img"
+        ):
+            continue
+        if img is cached_img or (
+            img.shape == cached_img.shape
+            and img.dtype == cached_img.dtype
+            and img_hash.value == entry.img_hash
+        ):
+            return entry
+    return None
@@ -0,0 +1,192 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utility functions which crop regions of interest (ROIs) from a frame and
+map coordinates in the cropped image back to the full frame.
+
+Several ROIs are packed side by side, in order and aligned to the top, into a
+single image so that a model runs once over all of them.
+"""
+
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+
+def get_roi_boxes(
+    rois: Sequence[Sequence[Union[float, int]]], width: int, height: int
+) -> np.ndarray:
+    """Converts ROIs to pixel coordinates of the frame. An ROI whose values
+    are all at most 1 is treated as normalized coordinates.
+
+    Args:
+        rois (Sequence[Sequence[Union[float, int]]]): The ROIs in
+            :math:`(x1, y1, x2, y2)` format.
+        width (int): Width of the frame.
+        height (int): Height of the frame.
+
+    Returns:
+        (np.ndarray): An integer array of shape :math:`(R, 4)` containing the
+        :math:`(x1, y1, x2, y2)` pixel coordinates of each ROI, clipped to
+        the frame.
+
+    Raises:
+        ValueError: An ROI does not have 4 values or is empty after clipping.
+    """
+    boxes = []
+    for roi in rois:
+        if len(roi) != 4:
+            raise ValueError(f"ROI {list(roi)} must be in (x1, y1, x2, y2) format.")
+        box = np.array(roi, dtype=np.float64)
+        if np.all(box <= 1):
+            box *= [width, height, width, height]
+        box = np.round(box).astype(np.int64)
+        box = np.clip(box, 0, [width, height, width, height])
+        if box[2] <= box[0] or box[3] <= box[1]:
+            raise ValueError(f"ROI {list(roi)} is empty in a {width}x{height} frame.")
+        boxes.append(box)
+    return np.array(boxes, dtype=np.int64).reshape(-1, 4)
+
+
+def get_canvas_boxes(roi_boxes: np.ndarray) -> np.ndarray:
+    """Finds where each ROI is placed in the cropped image.
+
+    Args:
+        roi_boxes (np.ndarray): Pixel coordinates of the ROIs in the frame,
+            see :func:`get_roi_boxes`.
+
+    Returns:
+        (np.ndarray): An integer array of shape :math:`(R, 4)` containing the
+        :math:`(x1, y1, x2, y2)` pixel coordinates of each ROI in the cropped
+        image.
+    """
+    widths = roi_boxes[:, 2] - roi_boxes[:, 0]
+    heights = roi_boxes[:, 3] - roi_boxes[:, 1]
+    offsets = np.concatenate([[0], np.cumsum(widths)[:-1]])
+    return np.stack(
+        [offsets, np.zeros_like(offsets), offsets + widths, heights], axis=1
+    ).astype(np.int64)
+
+
+def crop_rois(frame: np.ndarray, roi_boxes: np.ndarray) -> np.ndarray:
+    """Crops the ROIs from a frame into a new image, so nodes which draw on
+    the cropped image never modify the frame. Several ROIs are packed side by
+    side.
+
+    Args:
+        frame (np.ndarray): The frame of shape :math:`(H, W, C)`.
+        roi_boxes (np.ndarray): Pixel coordinates of the ROIs in the frame,
+            see :func:`get_roi_boxes`.
+
+    Returns:
+        (np.ndarray): The cropped image.
+    """
+    if len(roi_boxes) == 1:
+        return frame[_to_slices(roi_boxes[0])].copy()
+    canvas_boxes = get_canvas_boxes(roi_boxes)
+    canvas = np.zeros(
+        (canvas_boxes[:, 3].max(), canvas_boxes[-1, 2], *frame.shape[2:]),
+        dtype=frame.dtype,
+    )
+    for roi_box, canvas_box in zip(roi_boxes, canvas_boxes):
+        canvas[_to_slices(canvas_box)] = frame[_to_slices(roi_box)]
+    return canvas
+
+
+def assign_rois(points: np.ndarray, canvas_boxes: np.ndarray) -> np.ndarray:
+    """Finds the ROI each point of the cropped image falls in. Points in the
+    padding of the cropped image are assigned to the ROI above or below them.
+
+    Args:
+        points (np.ndarray): Pixel coordinates of shape :math:`(N, 2)` in the
+            cropped image.
+        canvas_boxes (np.ndarray): See :func:`get_canvas_boxes`.
+
+    Returns:
+        (np.ndarray): The index of the ROI of each point.
+    """
+    return np.clip(
+        np.searchsorted(canvas_boxes[:, 2], points[:, 0], side="right"),
+        0,
+        len(canvas_boxes) - 1,
+    )
+
+
+def map_points_to_frame(  # pylint: disable=too-many-arguments
+    points: np.ndarray,
+    roi_indices: np.ndarray,
+    roi_boxes: np.ndarray,
+    canvas_boxes: np.ndarray,
+    crop_size: np.ndarray,
+    frame_size: np.ndarray,
+) -> np.ndarray:
+    """Maps normalized coordinates in the cropped image to normalized
+    coordinates in the full frame.
+
+    Args:
+        points (np.ndarray): Normalized :math:`(x, y)` coordinates of shape
+            :math:`(N, ..., 2)` in the cropped image.
+        roi_indices (np.ndarray): The ROI of each of the :math:`N` items, see
+            :func:`assign_rois`.
+        roi_boxes (np.ndarray): See :func:`get_roi_boxes`.
+        canvas_boxes (np.ndarray): See :func:`get_canvas_boxes`.
+        crop_size (np.ndarray): Width and height of the cropped image.
+        frame_size (np.ndarray): Width and height of the full frame.
+
+    Returns:
+        (np.ndarray): The normalized coordinates in the full frame, clipped
+        to their ROI.
+    """
+    shape = (-1,) + (1,) * (points.ndim - 2) + (2,)
+    canvas_origin = canvas_boxes[roi_indices, :2].reshape(shape)
+    canvas_end = canvas_boxes[roi_indices, 2:].reshape(shape)
+    roi_origin = roi_boxes[roi_indices, :2].reshape(shape)
+    pixels = np.clip(points * np.asarray(crop_size), canvas_origin, canvas_end)
+    return (pixels - canvas_origin + roi_origin) / np.asarray(frame_size)
+
+
+def paste_masks(
+    masks: np.ndarray,
+    roi_indices: np.ndarray,
+    roi_boxes: np.ndarray,
+    canvas_boxes: np.ndarray,
+    frame_size: np.ndarray,
+) -> np.ndarray:
+    """Pastes masks of the cropped image into the full frame. Each mask only
+    keeps the part within its ROI.
+
+    Args:
+        masks (np.ndarray): Masks of shape :math:`(N, h, w)` in the cropped
+            image.
+        roi_indices (np.ndarray): The ROI of each mask, see
+            :func:`assign_rois`.
+        roi_boxes (np.ndarray): See :func:`get_roi_boxes`.
+        canvas_boxes (np.ndarray): See :func:`get_canvas_boxes`.
+        frame_size (np.ndarray): Width and height of the full frame.
+
+    Returns:
+        (np.ndarray): Masks of shape :math:`(N, H, W)` in the full frame.
+    """
+    width, height = frame_size
+    full_masks: List[np.ndarray] = []
+    for mask, idx in zip(masks, roi_indices):
+        full_mask = np.zeros((height, width), dtype=masks.dtype)
+        full_mask[_to_slices(roi_boxes[idx])] = mask[_to_slices(canvas_boxes[idx])]
+        full_masks.append(full_mask)
+    return np.reshape(np.array(full_masks, dtype=masks.dtype), (-1, height, width))
+
+
+def _to_slices(box: np.ndarray) -> Tuple[slice, slice]:
+    """Converts an :math:`(x1, y1, x2, y2)` box to row and column slices."""
+    return slice(box[1], box[3]), slice(box[0], box[2])
@@ -0,0 +1,188 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Converts TensorFlow frozen graphs and SavedModels to TensorFlow Lite, and
+runs them with the XNNPACK delegate for faster inference on the CPU.
+
+A model is converted once and cached next to its weights under a name which
+includes a hash of the path, size, and modification time of the weights,
+the conversion settings, and the TensorFlow version. Changing any of them
+converts and caches a new model.
+
+With ``int8``, the weights are quantized to INT8 (dynamic range quantization),
+which needs no calibration images, while the activations remain float.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import tensorflow as tf
+
+from peekingduck.nodes.base import WeightsDownloaderMixin
+from peekingduck.utils.graph_functions import load_graph
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_KEY = "serving_default"
+
+
+class TFLiteModel:  # pylint: disable=too-few-public-methods
+    """Runs a TensorFlow Lite model as a drop-in replacement for the
+    TensorFlow function it was converted from.
+
+    Models converted from a SavedModel signature take their inputs by
+    position or by name, and return a dictionary of outputs, like the
+    signature. Models converted from a frozen graph take their inputs by
+    position, or by name in the order of the graph inputs, and return a list
+    of outputs, like :func:`peekingduck.utils.graph_functions.load_graph`.
+    Inputs are resized on the fly when their shape changes. Outputs are
+    returned as ``tf.Tensor``.
+
+    Args:
+        model_path (Path): Path to the ``.tflite`` model.
+        num_threads (int): Number of threads used by the interpreter and the
+            XNNPACK delegate. ``0`` uses one thread per CPU core.
+    """
+
+    def __init__(self, model_path: Path, num_threads: int) -> None:
+        self.interpreter = tf.lite.Interpreter(
+            model_path=str(model_path), num_threads=num_threads or os.cpu_count()
+        )
+        signatures = self.interpreter.get_signature_list()
+        if SIGNATURE_KEY in signatures:
+            self.input_names: Optional[List[str]] = signatures[SIGNATURE_KEY]["inputs"]
+            self.runner = self.interpreter.get_signature_runner(SIGNATURE_KEY)
+        else:
+            self.input_names = None
+            self.interpreter.allocate_tensors()
+
+    def __call__(
+        self, *args: Any, **kwargs: Any
+    ) -> Union[Dict[str, tf.Tensor], List[tf.Tensor]]:
+        if self.input_names is not None:
+            feeds = dict(zip(self.input_names, args), **kwargs)
+            input_details = self.runner.get_input_details()
+            outputs = self.runner(
+                **{
+                    name: np.asarray(value, dtype=input_details[name]["dtype"])
+                    for name, value in feeds.items()
+                }
+            )
+            return {name: tf.constant(value) for name, value in outputs.items()}
+        return self._invoke([*args, *kwargs.values()])
+
+    def _invoke(self, inputs: List[Any]) -> List[tf.Tensor]:
+        """Runs a model converted from a frozen graph, which has no signature."""
+        resized = False
+        input_details = self.interpreter.get_input_details()
+        for detail, value in zip(input_details, inputs):
+            if tuple(detail["shape"]) != np.shape(value):
+                self.interpreter.resize_tensor_input(detail["index"], np.shape(value))
+                resized = True
+        if resized:
+            self.interpreter.allocate_tensors()
+        for detail, value in zip(input_details, inputs):
+            self.interpreter.set_tensor(
+                detail["index"], np.asarray(value, dtype=detail["dtype"])
+            )
+        self.interpreter.invoke()
+        return [
+            tf.constant(self.interpreter.get_tensor(detail["index"]))
+            for detail in self.interpreter.get_output_details()
+        ]
+
+
+def load_tflite_model(
+    model_path: Path,
+    num_threads: int = 0,
+    int8: bool = False,
+    model_nodes: Optional[Dict[str, List[str]]] = None,
+) -> TFLiteModel:
+    """Loads the TensorFlow Lite model converted from the frozen graph or
+    SavedModel at ``model_path``, converting and caching it first if needed.
+
+    Args:
+        model_path (Path): Path to the frozen graph ``.pb`` file, or the
+            SavedModel directory.
+        num_threads (int): Number of threads used at inference. ``0`` uses
+            one thread per CPU core.
+        int8 (bool): Whether to quantize the weights to INT8.
+        model_nodes (Optional[Dict[str, List[str]]]): The "inputs" and
+            "outputs" tensor names of a frozen graph. ``None`` if
+            ``model_path`` is a SavedModel, whose serving signature is
+            converted.
+
+    Returns:
+        (TFLiteModel): The TensorFlow Lite model.
+    """
+    tflite_path = get_tflite_path(model_path, {"int8": int8, "nodes": model_nodes})
+    if tflite_path.is_file():
+        try:
+            model = TFLiteModel(tflite_path, num_threads)
+            logger.info(f"Loaded TensorFlow Lite model from {tflite_path}")
+            return model
+        except ValueError as error:
+            logger.warning(f"Failed to load {tflite_path}, reconverting: {error}")
+
+    if model_nodes is None:
+        converter = tf.lite.TFLiteConverter.from_saved_model(
+            str(model_path), signature_keys=[SIGNATURE_KEY]
+        )
+    else:
+        converter = tf.lite.TFLiteConverter.from_concrete_functions(
+            [load_graph(str(model_path), **model_nodes)]
+        )
+    # ops without a TensorFlow Lite kernel fall back to TensorFlow
+    converter.target_spec.supported_ops = [
+        tf.lite.OpsSet.TFLITE_BUILTINS,
+        tf.lite.OpsSet.SELECT_TF_OPS,
+    ]
+    if int8:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    # write to a temporary file first so that a concurrent or interrupted run
+    # never loads a partially written model
+    temp_path = tflite_path.with_name(f"{tflite_path.name}.{os.getpid()}.tmp")
+    temp_path.write_bytes(converter.convert())
+    os.replace(temp_path, tflite_path)
+    logger.info(f"Saved TensorFlow Lite model to {tflite_path}")
+    return TFLiteModel(tflite_path, num_threads)
+
+
+def get_tflite_path(model_path: Path, settings: Dict[str, Any]) -> Path:
+    """Returns the path of the TensorFlow Lite model converted from the
+    weights at ``model_path`` with ``settings``.
+
+    Args:
+        model_path (Path): Path to the frozen graph or SavedModel. It is
+            identified by its path, size, and modification time, so the file
+            is not read.
+        settings (Dict[str, Any]): Settings which change the converted model.
+
+    Returns:
+        (Path): Path to the converted model in the same directory.
+    """
+    hash_func = WeightsDownloaderMixin.stat_hash(model_path)
+    hash_func.update(
+        json.dumps(
+            {"settings": settings, "tensorflow": tf.__version__}, sort_keys=True
+        ).encode()
+    )
+    int8_suffix = "-int8" if settings.get("int8") else ""
+    return model_path.with_name(
+        f"{model_path.stem}-tflite{int8_suffix}-{hash_func.hexdigest()[:16]}.tflite"
+    )
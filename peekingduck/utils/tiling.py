@@ -0,0 +1,273 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tiled (sliced) inference for object detection models on high resolution
+frames.
+
+A frame is split into overlapping tiles, which are detected on as a single
+batch. The tile-normalized bboxes are mapped back to the frame, the partial
+detections of objects cut by the inner edges of the tiles are merged with the
+matching detections from the other tiles, and the remaining duplicates found
+in the overlapping regions are removed with per-class non-maximum
+suppression. Small objects cover more of the model input in a tile than in
+the downscaled full frame, so they are more likely to be detected. An
+optional full-frame pass detects the large objects which do not fit in a
+single tile.
+"""
+
+from typing import Callable, List, Tuple
+
+import numpy as np
+import torch
+import torchvision
+
+from peekingduck.utils.bbox.transforms import xyxy2xyxyn, xyxyn2xyxy
+
+Detections = Tuple[np.ndarray, np.ndarray, np.ndarray]
+PredictBatchFn = Callable[[List[np.ndarray]], List[Detections]]
+# Distance in pixels from an inner tile edge within which a bbox is cut by it
+EDGE_MARGIN = 2
+
+
+class TiledInference:  # pylint: disable=too-few-public-methods
+    """Detects objects in overlapping tiles of a frame with
+    ``predict_batch``, and merges the detections.
+
+    Args:
+        predict_batch (PredictBatchFn): Detects objects in a list of images.
+            Returns the normalized (x1, y1, x2, y2) bboxes, class names, and
+            scores of each image.
+        tile_size (int): Width and height of the tiles in pixels. Frames
+            smaller than ``tile_size`` are detected as a single tile.
+        overlap (float): Fraction of ``tile_size`` which adjacent tiles
+            overlap by, so that objects cut by one tile are whole in the
+            next.
+        full_frame (bool): Whether the full frame is also detected on, in the
+            same batch as the tiles.
+        iou_threshold (float): Overlapping bboxes of the same class above this
+            IoU threshold are merged.
+        match_threshold (float): A bbox cut by an inner tile edge is merged
+            with a larger bbox of the same class from another tile, or the
+            full frame, when their intersection over the area of the cut bbox
+            is above this threshold.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        predict_batch: PredictBatchFn,
+        tile_size: int,
+        overlap: float,
+        full_frame: bool,
+        iou_threshold: float,
+        match_threshold: float,
+    ) -> None:
+        self.predict_batch = predict_batch
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.full_frame = full_frame
+        self.iou_threshold = iou_threshold
+        self.match_threshold = match_threshold
+
+    def __call__(self, image: np.ndarray) -> Detections:
+        """Detects objects in the tiles of ``image``.
+
+        Args:
+            image (np.ndarray): Input image frame.
+
+        Returns:
+            (Detections): The normalized (x1, y1, x2, y2) bboxes, class
+            names, and scores of the merged detections.
+        """
+        height, width = image.shape[:2]
+        tiles = get_tiles(height, width, self.tile_size, self.overlap)
+        images = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles]
+        if self.full_frame and len(tiles) > 1:
+            images.append(image)
+            tiles = np.vstack([tiles, [0, 0, width, height]])
+
+        columns = []
+        for tile_id, ((bboxes, labels, scores), tile) in enumerate(
+            zip(self.predict_batch(images), tiles)
+        ):
+            # tile-normalized to frame-normalized coordinates
+            bboxes = xyxyn2xyxy(
+                np.reshape(bboxes, (-1, 4)), tile[3] - tile[1], tile[2] - tile[0]
+            )
+            bboxes[:, [0, 2]] += tile[0]
+            bboxes[:, [1, 3]] += tile[1]
+            columns.append(
+                (
+                    xyxy2xyxyn(bboxes, height, width).astype(np.float32),
+                    labels,
+                    np.asarray(scores, dtype=np.float32),
+                    np.full(len(bboxes), tile_id),
+                    _is_cut(bboxes, tile, height, width),
+                )
+            )
+
+        bboxes, labels, scores, tile_ids, is_cut = (
+            np.concatenate(column) for column in zip(*columns)
+        )
+        bboxes, labels, scores = merge_cut_detections(
+            bboxes, labels, scores, tile_ids, is_cut, self.match_threshold
+        )
+        return merge_detections(bboxes, labels, scores, self.iou_threshold)
+
+
+def get_tiles(height: int, width: int, tile_size: int, overlap: float) -> np.ndarray:
+    """Splits a frame into overlapping square tiles which cover it. The last
+    tile in each row and column is aligned with the edge of the frame, so all
+    tiles have the same size, unless the frame is smaller than ``tile_size``.
+
+    Args:
+        height (int): Height of the frame.
+        width (int): Width of the frame.
+        tile_size (int): Width and height of the tiles.
+        overlap (float): Fraction of ``tile_size`` which adjacent tiles
+            overlap by.
+
+    Returns:
+        (np.ndarray): The (x1, y1, x2, y2) pixel coordinates of the tiles, in
+        row-major order.
+    """
+    stride = max(int(tile_size * (1 - overlap)), 1)
+    x_starts = _get_starts(width, tile_size, stride)
+    y_starts = _get_starts(height, tile_size, stride)
+    return np.array(
+        [
+            [x1, y1, min(x1 + tile_size, width), min(y1 + tile_size, height)]
+            for y1 in y_starts
+            for x1 in x_starts
+        ]
+    )
+
+
+def merge_cut_detections(  # pylint: disable=too-many-arguments
+    bboxes: np.ndarray,
+    labels: np.ndarray,
+    scores: np.ndarray,
+    tile_ids: np.ndarray,
+    is_cut: np.ndarray,
+    match_threshold: float,
+) -> Detections:
+    """Merges the partial detections of objects cut by the inner edges of the
+    tiles with the matching detections from other tiles.
+
+    A cut bbox has a low IoU with the whole bbox of the object, or with the
+    partial bbox from the adjacent tile, but lies mostly inside it. So two
+    bboxes of the same class from different tiles are matched on their
+    intersection over the area of the smaller bbox, when the smaller bbox is
+    cut. The higher scoring bbox is enlarged to enclose the bboxes merged into
+    it. Bboxes from the same tile, and whole bboxes, are left to
+    :func:`merge_detections`, so overlapping objects are not merged.
+
+    Args:
+        bboxes (np.ndarray): The (x1, y1, x2, y2) bboxes.
+        labels (np.ndarray): The class names of the bboxes.
+        scores (np.ndarray): The scores of the bboxes.
+        tile_ids (np.ndarray): The index of the tile, or full frame, which
+            each bbox was detected in.
+        is_cut (np.ndarray): Whether each bbox touches an inner edge of its
+            tile.
+        match_threshold (float): A cut bbox is merged into a larger bbox when
+            their intersection over the area of the cut bbox is above this
+            threshold.
+
+    Returns:
+        (Detections): The merged bboxes, class names, and scores, sorted by
+        decreasing score.
+    """
+    bboxes = bboxes.copy()
+    areas = np.prod(bboxes[:, 2:] - bboxes[:, :2], axis=1)
+    is_merged = np.zeros(len(bboxes), dtype=bool)
+    keep = []
+    for i in np.argsort(-scores, kind="stable"):
+        if is_merged[i]:
+            continue
+        keep.append(i)
+        is_merged[i] = True
+        candidates = np.flatnonzero(
+            ~is_merged & (labels == labels[i]) & (tile_ids != tile_ids[i])
+        )
+        # only the smaller bbox of a pair can be a partial detection
+        candidates = candidates[
+            np.where(areas[i] <= areas[candidates], is_cut[i], is_cut[candidates])
+        ]
+        top_left = np.maximum(bboxes[i, :2], bboxes[candidates, :2])
+        bottom_right = np.minimum(bboxes[i, 2:], bboxes[candidates, 2:])
+        intersections = np.prod(np.clip(bottom_right - top_left, 0, None), axis=1)
+        matches = candidates[
+            intersections
+            > match_threshold
+            * np.maximum(np.minimum(areas[i], areas[candidates]), 1e-12)
+        ]
+        if len(matches) > 0:
+            is_merged[matches] = True
+            bboxes[i, :2] = np.minimum(bboxes[i, :2], bboxes[matches, :2].min(axis=0))
+            bboxes[i, 2:] = np.maximum(bboxes[i, 2:], bboxes[matches, 2:].max(axis=0))
+    return bboxes[keep], labels[keep], scores[keep]
+
+
+def merge_detections(
+    bboxes: np.ndarray, labels: np.ndarray, scores: np.ndarray, iou_threshold: float
+) -> Detections:
+    """Merges overlapping detections of the same class with non-maximum
+    suppression.
+
+    Args:
+        bboxes (np.ndarray): The (x1, y1, x2, y2) bboxes.
+        labels (np.ndarray): The class names of the bboxes.
+        scores (np.ndarray): The scores of the bboxes.
+        iou_threshold (float): Bboxes of the same class which overlap a higher
+            scoring bbox above this IoU threshold are removed.
+
+    Returns:
+        (Detections): The remaining bboxes, class names, and scores, sorted by
+        decreasing score.
+    """
+    if len(bboxes) == 0:
+        return bboxes, labels, scores
+    _, class_ids = np.unique(labels, return_inverse=True)
+    keep = torchvision.ops.batched_nms(
+        torch.from_numpy(bboxes),
+        torch.from_numpy(scores),
+        torch.from_numpy(class_ids),
+        iou_threshold,
+    ).numpy()
+    return bboxes[keep], labels[keep], scores[keep]
+
+
+def _is_cut(
+    bboxes: np.ndarray, tile: np.ndarray, height: int, width: int
+) -> np.ndarray:
+    """Checks which of the (x1, y1, x2, y2) pixel ``bboxes`` detected in
+    ``tile`` touch one of its edges which lies inside the frame.
+    """
+    is_inner = np.concatenate([tile[:2] > 0, tile[2:] < [width, height]])
+    touches = np.concatenate(
+        [
+            bboxes[:, :2] <= tile[:2] + EDGE_MARGIN,
+            bboxes[:, 2:] >= tile[2:] - EDGE_MARGIN,
+        ],
+        axis=1,
+    )
+    return (touches & is_inner).any(axis=1)
+
+
+def _get_starts(length: int, tile_size: int, stride: int) -> List[int]:
+    """Returns the start coordinates of the tiles along one dimension."""
+    if length <= tile_size:
+        return [0]
+    starts = list(range(0, length - tile_size, stride))
+    return starts + [length - tile_size]
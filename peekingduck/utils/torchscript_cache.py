@@ -0,0 +1,125 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Caches compiled TorchScript models on disk, so that later runs load the
+compiled model directly instead of building the Python model, loading its
+checkpoint, and fusing its layers.
+
+A cached model is stored next to the weights under a name which includes a
+hash of the paths, sizes, and modification times of the weights files, the
+settings which change the compiled graph,
+e.g. the input size, precision and device, and the PyTorch version. Changing
+any of them compiles and caches a new model.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import torch
+from torch import nn
+
+from peekingduck.nodes.base import WeightsDownloaderMixin
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_path(weights_paths: Sequence[Path], settings: Dict[str, Any]) -> Path:
+    """Returns the path of the cached TorchScript model compiled from the
+    weights files at ``weights_paths`` with ``settings``.
+
+    Args:
+        weights_paths (Sequence[Path]): Paths to the weights file, and any
+            other files which define the model, e.g. a model config file. They
+            are identified by their path, size, and modification time, so the
+            files are not read.
+        settings (Dict[str, Any]): Configs which change the compiled model.
+            Values which are not JSON serializable are hashed as strings.
+
+    Returns:
+        (Path): Path to the cached model in the directory of the first weights
+        file.
+    """
+    hash_func = hashlib.sha256()
+    for path in weights_paths:
+        hash_func = WeightsDownloaderMixin.stat_hash(path, hash_func)
+    hash_func.update(
+        json.dumps(
+            {"settings": settings, "torch": torch.__version__},
+            default=str,
+            sort_keys=True,
+        ).encode()
+    )
+    model_path = weights_paths[0]
+    return model_path.with_name(
+        f"{model_path.stem}-torchscript-{hash_func.hexdigest()[:16]}.pt"
+    )
+
+
+def load_or_compile(
+    cache_path: Path,
+    create_model: Callable[[], nn.Module],
+    device: torch.device,
+    example_inputs: Optional[Tuple[Any, ...]] = None,
+) -> nn.Module:
+    """Loads the cached TorchScript model at ``cache_path``. If it does not
+    exist, the model from ``create_model`` is compiled, frozen, and cached.
+
+    The model is traced with ``example_inputs``, which suits models whose
+    control flow does not depend on the input, or scripted if
+    ``example_inputs`` is ``None``. If the model cannot be compiled, the
+    eager model is returned so the pipeline still runs.
+
+    Args:
+        cache_path (Path): Path from :func:`get_cache_path`.
+        create_model (Callable[[], nn.Module]): Creates the eager model in
+            evaluation mode, with its weights loaded.
+        device (torch.device): The device to load the cached model onto.
+        example_inputs (Optional[Tuple[Any, ...]]): Inputs to trace the model
+            with, on the same device and with the same precision as at
+            inference.
+
+    Returns:
+        (nn.Module): The compiled model, or the eager model if compilation
+        failed.
+    """
+    if cache_path.is_file():
+        try:
+            model = torch.jit.load(str(cache_path), map_location=device)
+            logger.info(f"Loaded TorchScript model from {cache_path}")
+            return model
+        except RuntimeError as error:
+            logger.warning(f"Failed to load {cache_path}, recompiling: {error}")
+
+    model = create_model()
+    try:
+        with torch.no_grad():
+            if example_inputs is None:
+                compiled = torch.jit.script(model)
+            else:
+                compiled = torch.jit.trace(model, example_inputs, strict=False)
+            compiled = torch.jit.freeze(compiled)
+    except (RuntimeError, torch.jit.Error) as error:
+        logger.warning(f"Failed to compile TorchScript model: {error}")
+        return model
+    # write to a temporary file first so that a concurrent or interrupted run
+    # never loads a partially written model
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    torch.jit.save(compiled, str(temp_path))
+    os.replace(temp_path, cache_path)
+    logger.info(f"Saved TorchScript model to {cache_path}")
+    return compiled
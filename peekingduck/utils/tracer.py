@@ -0,0 +1,191 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Chrome Trace Event exporter for the pipeline.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, List, Tuple, Union
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.nodes.input.utils.read import VideoThread
+from peekingduck.utils.batch_tracker import BatchTracker
+
+# (node index, frame index, thread ID, start time, end time, queue size,
+# batch size)
+Span = Tuple[int, int, int, float, float, int, int]
+
+
+class PipelineTracer:  # pylint: disable=too-many-instance-attributes
+    """Records one span per node invocation using the ``run_begin`` and
+    ``run_end`` callbacks of the nodes, and writes them as a Chrome Trace
+    Event file which can be opened in ``chrome://tracing`` or
+    `Perfetto <https://ui.perfetto.dev>`_.
+
+    Each span holds the thread which ran the node and the frame index, which
+    is the number of frames the node has run on before. A node running on a
+    batch of frames is recorded as a single span starting at the frame index
+    of the first frame, with the size of the batch. For nodes reading from a
+    :py:class:`~peekingduck.nodes.input.utils.read.VideoThread`, the size of
+    its frame buffer is also recorded as a counter track.
+
+    Only a tuple is stored per invocation and at most ``max_spans`` of the
+    most recent spans are kept, so the tracer can be left enabled on long
+    runs.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): The nodes to trace.
+        max_spans (int): Maximum number of spans kept.
+
+    Raises:
+        ValueError: ``max_spans`` is not positive.
+    """
+
+    def __init__(self, nodes: List[AbstractNode], max_spans: int = 1000000) -> None:
+        self.logger = logging.getLogger(__name__)
+        if max_spans < 1:
+            raise ValueError("max_spans must be a positive integer.")
+        self.nodes = nodes
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self._frame_indices = [0] * len(nodes)
+        self._batches = [BatchTracker() for _ in nodes]
+        self._thread_names: Dict[int, str] = {}
+        self._origin = perf_counter()
+
+    def attach(self) -> None:
+        """Adds the tracing callbacks to every node."""
+        for idx, node in enumerate(self.nodes):
+            node.callback_list.prepend("run_begin", self._make_begin(idx))
+            node.callback_list.append("run_end", self._make_end(idx))
+
+    def get_events(self) -> List[Dict[str, Any]]:
+        """Converts the recorded spans to trace events.
+
+        Returns:
+            (:obj:`List[Dict[str, Any]]`): Thread name metadata events,
+            followed by a complete event for every span and a counter event
+            for every buffer size sample. Times are in microseconds.
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in self._thread_names.items()
+        ]
+        for (
+            node_idx,
+            frame_idx,
+            tid,
+            start,
+            end,
+            queue_size,
+            batch_size,
+        ) in list(self.spans):
+            node_name = self.nodes[node_idx].name
+            events.append(
+                {
+                    "name": node_name,
+                    "cat": node_name.split(".")[0],
+                    "ph": "X",
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"frame": frame_idx, "batch_size": batch_size},
+                }
+            )
+            if queue_size >= 0:
+                events.append(
+                    {
+                        "name": f"{node_name} buffer",
+                        "ph": "C",
+                        "ts": (end - self._origin) * 1e6,
+                        "pid": pid,
+                        "args": {"queue_size": queue_size},
+                    }
+                )
+        return events
+
+    def write(self, output_path: Union[Path, str]) -> None:
+        """Writes the trace events to a JSON file.
+
+        Args:
+            output_path (:obj:`Path` | :obj:`str`): Path of the trace file.
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as outfile:
+            json.dump(
+                {"traceEvents": self.get_events(), "displayTimeUnit": "ms"}, outfile
+            )
+        self.logger.info(
+            f"Trace of {len(self.spans)} node runs written to {output_path}"
+        )
+
+    def _make_begin(self, idx: int) -> Callable[[Dict[str, Any]], None]:
+        """Creates the ``run_begin`` callback of the node at ``idx``."""
+
+        def _begin(_: Dict[str, Any]) -> None:
+            self._batches[idx].begin(perf_counter())
+
+        return _begin
+
+    def _make_end(self, idx: int) -> Callable[[Dict[str, Any]], None]:
+        """Creates the ``run_end`` callback of the node at ``idx``. Each
+        batch, see :py:class:`~peekingduck.utils.batch_tracker.BatchTracker`,
+        is recorded as a span by its first ``run_end``. The remaining
+        ``run_end`` calls of the batch are skipped.
+        """
+        node = self.nodes[idx]
+
+        def _end(_: Dict[str, Any]) -> None:
+            end = perf_counter()
+            batch = self._batches[idx].end()
+            if batch is None:
+                return
+            tid = threading.get_ident()
+            if tid not in self._thread_names:
+                self._thread_names[tid] = threading.current_thread().name
+            videocap = getattr(node, "videocap", None)
+            queue_size = (
+                videocap.queue_size if isinstance(videocap, VideoThread) else -1
+            )
+            start_time, batch_size = batch
+            self.spans.append(
+                (
+                    idx,
+                    self._frame_indices[idx],
+                    tid,
+                    start_time,
+                    end,
+                    queue_size,
+                    batch_size,
+                )
+            )
+            self._frame_indices[idx] += batch_size
+
+        return _end
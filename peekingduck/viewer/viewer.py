@@ -16,7 +16,6 @@
 Implement PeekingDuck Viewer
 """
 
-import copy
 import logging
 import os
 import platform
@@ -35,7 +34,7 @@ import numpy as np
 from PIL import Image, ImageTk
 
 from peekingduck.declarative_loader import DeclarativeLoader
-from peekingduck.pipeline import Pipeline
+from peekingduck.pipeline import Pipeline, get_node_inputs
 from peekingduck.viewer.playlist import PlayList
 from peekingduck.viewer.viewer_gui import create_window
 from peekingduck.viewer.viewer_utils import get_keyboard_char, get_keyboard_modifier
@@ -531,19 +530,7 @@ class Viewer:  # pylint: disable=too-many-instance-attributes, too-many-public-m
                         self._pipeline.terminate = True
                         if "pipeline_end" not in node.inputs:
                             continue
-                    if "all" in node.inputs:
-                        inputs = copy.deepcopy(self._pipeline.data)
-                    else:
-                        inputs = {
-                            key: self._pipeline.data[key]
-                            for key in node.inputs
-                            if key in self._pipeline.data
-                        }
-                    if hasattr(node, "optional_inputs"):
-                        # Nodes won't receive inputs with optional key if not found upstream
-                        for key in node.optional_inputs:
-                            if key in self._pipeline.data:
-                                inputs[key] = self._pipeline.data[key]
+                    inputs = get_node_inputs(node, self._pipeline.data)
                     if node.name.endswith("output.screen"):
                         pass  # disable duplicate video from output.screen
                     else:
@@ -15,6 +15,7 @@
 """Module to convert PyTorch YOLOX models to ONNX"""
 
 import logging
+from pathlib import Path
 from time import perf_counter
 
 import numpy as np
@@ -68,7 +69,7 @@ def convert_model(model_code: str) -> None:
     logger.info(f"Convert {model_code} to Onnx")
     model_path = MODEL_MAP[model_code]["path"]
     model_size = MODEL_MAP[model_code]["size"]
-    onnx_model_save_path = f"{YOLOX_DIR}/{model_code}.onnx"
+    onnx_model_save_path = f"{YOLOX_DIR}/onnx/{model_code}.onnx"
     model = YOLOX(80, model_size["depth"], model_size["width"])
     model.eval()
 
@@ -78,6 +79,7 @@ def convert_model(model_code: str) -> None:
     model.head.decode_in_inference = False
 
     logger.info(f"Converting model to {onnx_model_save_path}")
+    Path(onnx_model_save_path).parent.mkdir(parents=True, exist_ok=True)
     inp_random = torch.randn(1, 3, 416, 416)
     torch.onnx.export(
         model,
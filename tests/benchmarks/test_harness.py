@@ -0,0 +1,116 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import numpy as np
+import pytest
+
+from peekingduck.benchmarks.cases import CASES, BenchmarkCase
+from peekingduck.benchmarks.harness import (
+    format_results,
+    run_benchmarks,
+    run_case,
+    save_results,
+    time_callable,
+)
+from peekingduck.benchmarks.synthetic import (
+    make_detections,
+    make_frame,
+    make_raw_predictions,
+    make_track_sequence,
+)
+
+ALL_PARAMS = [(case, params) for case in CASES for params in case.iter_params()]
+
+
+class TestSynthetic:
+    def test_deterministic(self):
+        np.testing.assert_array_equal(make_frame(64, 48), make_frame(64, 48))
+        for first, second in zip(make_detections(20), make_detections(20)):
+            np.testing.assert_array_equal(first, second)
+        assert make_frame(64, 48).shape == (48, 64, 3)
+
+    def test_detections_within_frame(self):
+        bboxes, labels, scores = make_detections(100)
+
+        assert bboxes.shape == (100, 4)
+        assert ((bboxes >= 0) & (bboxes <= 1)).all()
+        assert (bboxes[:, :2] < bboxes[:, 2:]).all()
+        assert len(labels) == len(scores) == 100
+
+    def test_track_sequence(self):
+        sequence = make_track_sequence(5, 10)
+
+        assert len(sequence) == 5
+        assert all(bboxes.shape == (10, 4) for bboxes in sequence)
+
+    def test_raw_predictions(self):
+        assert make_raw_predictions(100, 80, 416).shape == (100, 85)
+
+
+class TestHarness:
+    def test_grid(self):
+        case = BenchmarkCase("case", lambda params: None, {"a": [1, 2], "b": ["x"]})
+
+        assert list(case.iter_params()) == [{"a": 1, "b": "x"}, {"a": 2, "b": "x"}]
+
+    def test_time_callable(self):
+        calls = []
+        samples = time_callable(lambda: calls.append(1), 3, 2, 0.0)
+
+        assert len(samples) == 3
+        assert len(calls) == 2 + 1 + 3
+
+    def test_skip_missing_dependency(self):
+        def setup(params):
+            raise ImportError("No module named 'missing'")
+
+        result = run_case(BenchmarkCase("case", setup, {}), {})
+        assert result == {
+            "case": "case",
+            "params": {},
+            "skipped": "No module named 'missing'",
+        }
+
+    def test_run_benchmarks(self, tmp_path):
+        case = BenchmarkCase("dabble.case", lambda params: lambda: None, {"a": [1]})
+        other_case = BenchmarkCase("draw.case", lambda params: lambda: None, {})
+
+        results = run_benchmarks(
+            [case, other_case], name_filter="dabble.*", repeats=2, warmup=0
+        )
+        assert results["metadata"]["fingerprint"]["cpu_count"] > 0
+        assert len(results["results"]) == 1
+        result = results["results"][0]
+        assert result["case"] == "dabble.case"
+        assert len(result["samples_ms"]) == 2
+        assert result["peak_memory_kb"] >= 0
+        assert result["min_ms"] <= result["median_ms"] <= result["max_ms"]
+        assert "dabble.case [a=1]" in format_results(results)
+
+        output_path = tmp_path / "results" / "bench.json"
+        save_results(results, output_path)
+        with open(output_path) as infile:
+            assert json.load(infile) == results
+
+    @pytest.mark.parametrize(
+        "case,params",
+        ALL_PARAMS,
+        ids=[f"{case.name}-{list(params.values())}" for case, params in ALL_PARAMS],
+    )
+    def test_builtin_cases(self, case, params):
+        result = run_case(case, params, repeats=1, warmup=0, min_sample_time=0.0)
+
+        assert "skipped" in result or result["median_ms"] > 0
@@ -0,0 +1,106 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from peekingduck.benchmarks.store import (
+    compare_results,
+    format_comparisons,
+    get_fingerprint,
+    get_run_path,
+    load_run,
+    save_run,
+)
+
+
+def make_results(median_ms, peak_memory_kb=100.0, fingerprint_id="abc", seed=0):
+    rng = np.random.default_rng(seed)
+    samples = (median_ms + rng.normal(0, median_ms * 0.01, size=20)).tolist()
+    return {
+        "metadata": {"fingerprint": {"id": fingerprint_id}},
+        "results": [
+            {
+                "case": "draw.bbox",
+                "params": {"num_objects": 10},
+                "median_ms": float(np.median(samples)),
+                "peak_memory_kb": peak_memory_kb,
+                "samples_ms": samples,
+            },
+            {"case": "model.yolox.postprocess", "params": {}, "skipped": "no torch"},
+        ],
+    }
+
+
+class TestStore:
+    def test_fingerprint_is_stable(self):
+        fingerprint = get_fingerprint()
+
+        assert fingerprint == get_fingerprint()
+        assert len(fingerprint["id"]) == 12
+
+    def test_save_and_load_run(self, tmp_path):
+        results = make_results(1.0)
+        run_path = save_run(results, "baseline", tmp_path)
+
+        assert run_path == tmp_path / get_fingerprint()["id"] / "baseline.json"
+        assert run_path == get_run_path("baseline", tmp_path)
+        assert load_run("baseline", tmp_path) == results
+        assert load_run(run_path) == results
+
+    def test_load_missing_run(self, tmp_path):
+        with pytest.raises(FileNotFoundError) as excinfo:
+            load_run("missing", tmp_path)
+        assert "neither a results file nor a stored run" in str(excinfo.value)
+
+
+class TestCompareResults:
+    def test_unchanged(self):
+        comparisons = compare_results(make_results(1.0), make_results(1.0, seed=1))
+
+        assert len(comparisons) == 1
+        assert comparisons[0]["regressions"] == []
+        assert "ok" in format_comparisons(comparisons)
+
+    def test_latency_regression(self):
+        comparisons = compare_results(make_results(1.0), make_results(1.5))
+
+        assert comparisons[0]["regressions"] == ["latency"]
+        assert comparisons[0]["latency_change"] == pytest.approx(0.5, abs=0.05)
+        assert comparisons[0]["p_value"] < 0.01
+        assert "REGRESSION (latency)" in format_comparisons(comparisons)
+
+    def test_small_slowdown_is_ignored(self):
+        comparisons = compare_results(make_results(1.0), make_results(1.02))
+
+        assert comparisons[0]["regressions"] == []
+
+    def test_speedup(self):
+        comparisons = compare_results(make_results(1.5), make_results(1.0))
+
+        assert comparisons[0]["regressions"] == []
+        assert comparisons[0]["latency_change"] < 0
+
+    def test_memory_regression(self):
+        comparisons = compare_results(
+            make_results(1.0), make_results(1.0, peak_memory_kb=200.0, seed=1)
+        )
+
+        assert comparisons[0]["regressions"] == ["memory"]
+        assert comparisons[0]["memory_change"] == pytest.approx(1.0)
+
+    def test_different_machine_warning(self, caplog):
+        compare_results(make_results(1.0), make_results(1.0, fingerprint_id="xyz"))
+
+        assert "different machine" in caplog.text
@@ -0,0 +1,96 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import statistics
+
+import pytest
+from click.testing import CliRunner
+
+from peekingduck.benchmarks.cases import CASES
+from peekingduck.benchmarks.harness import save_results
+from peekingduck.benchmarks.store import load_run, save_run
+from peekingduck.cli import cli
+
+BASELINE_SAMPLES_MS = [1.0, 1.02, 0.98, 1.01, 0.99, 1.03, 0.97, 1.0, 1.02, 0.98]
+
+
+def make_run(samples_ms):
+    return {
+        "metadata": {},
+        "results": [
+            {
+                "case": "draw.bbox",
+                "params": {"num_objects": 10},
+                "median_ms": statistics.median(samples_ms),
+                "peak_memory_kb": 100.0,
+                "samples_ms": samples_ms,
+            }
+        ],
+    }
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestCliBench:
+    def test_list(self):
+        result = CliRunner().invoke(cli, ["bench", "--list"])
+
+        assert result.exit_code == 0
+        for case in CASES:
+            assert f"{case.name}: " in result.output
+
+    def test_bench(self):
+        result = CliRunner().invoke(
+            cli,
+            [
+                "bench",
+                "--filter",
+                "utils.bbox.*",
+                "--repeats",
+                "2",
+                "--warmup",
+                "0",
+                "--output",
+                "bench.json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "utils.bbox.transforms [transform=xyxyn2tlwh" in result.output
+        with open("bench.json") as infile:
+            results = json.load(infile)
+        assert {row["case"] for row in results["results"]} == {"utils.bbox.transforms"}
+        assert load_run("latest") == results
+
+    def test_bench_compare(self):
+        save_run(make_run(BASELINE_SAMPLES_MS), "baseline")
+        save_run(make_run(BASELINE_SAMPLES_MS), "latest")
+        save_results(
+            make_run([sample * 1.5 for sample in BASELINE_SAMPLES_MS]), "slow.json"
+        )
+
+        result = CliRunner().invoke(cli, ["bench-compare"])
+        assert result.exit_code == 0
+        assert "0 of 1 benchmarks regressed" in result.output
+
+        result = CliRunner().invoke(cli, ["bench-compare", "baseline", "slow.json"])
+        assert result.exit_code == 1
+        assert "REGRESSION (latency)" in result.output
+        assert "1 of 1 benchmarks regressed" in result.output
+
+    def test_bench_compare_missing_run(self):
+        result = CliRunner().invoke(cli, ["bench-compare", "missing"])
+
+        assert result.exit_code == 1
+        assert "neither a results file nor a stored run" in result.output
@@ -0,0 +1,153 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from peekingduck.cli import cli
+
+
+class StubModel:
+    """Predicts one bbox, which shifts after quantization."""
+
+    def __init__(self):
+        self.on_cpu = False
+        self.quantized = False
+        self.calibration_images = []
+        self.predicted_images = []
+
+    def predict(self, image):
+        assert self.on_cpu
+        self.predicted_images.append(image)
+        offset = 0.1 if self.quantized else 0.0
+        bboxes = np.array([[0.0, 0.0, 0.5 + offset, 0.5]])
+        return bboxes, np.array(["person"]), np.array([0.9]), np.empty(0)
+
+    def to_cpu(self):
+        self.on_cpu = True
+
+    def quantize(self, mode, images):
+        if mode != "static":
+            raise ValueError("only static quantization")
+        self.quantized = True
+        self.calibration_images = images
+        return Path("weights") / "model-int8-static.pt"
+
+
+class StubNode:
+    def __init__(self):
+        self.model = StubModel()
+
+
+def make_images_dir(name, num_images, value):
+    images_dir = Path(name)
+    images_dir.mkdir()
+    for i in range(num_images):
+        cv2.imwrite(str(images_dir / f"{i}.png"), np.full((16, 16, 3), value + i))
+    return images_dir
+
+
+@pytest.fixture(name="images_dir")
+def fixture_images_dir():
+    images_dir = make_images_dir("images", 6, 0)
+    (images_dir / "notes.txt").write_text("not an image")
+    return images_dir
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestCliQuantize:
+    def test_quantize(self, images_dir):
+        node = StubNode()
+        with mock.patch(
+            "peekingduck.commands.quantize._load_node", return_value=node
+        ) as load_node:
+            result = CliRunner().invoke(
+                cli,
+                [
+                    "quantize",
+                    "model.yolox",
+                    str(images_dir),
+                    "--node_config",
+                    '{"model_type": "yolox-s"}',
+                    "--num_images",
+                    "5",
+                    "--report",
+                    "report.json",
+                ],
+            )
+
+        assert result.exit_code == 0
+        load_node.assert_called_once_with("model.yolox", {"model_type": "yolox-s"})
+        # the last image is held out from calibration for evaluation
+        assert [image[0, 0, 0] for image in node.model.calibration_images] == [
+            0,
+            1,
+            2,
+            3,
+        ]
+        assert {image[0, 0, 0] for image in node.model.predicted_images} == {4}
+        assert "Quantized model saved to" in result.output
+        with open("report.json") as infile:
+            report = json.load(infile)
+        assert report["node"] == "model.yolox"
+        assert report["mode"] == "static"
+        assert report["num_calibration_images"] == 4
+        assert report["num_eval_images"] == 1
+        assert report["recall"] == report["precision"] == 1.0
+        assert report["mean_iou"] == pytest.approx(0.25 / 0.3)
+        assert report["speedup"] > 0
+
+    def test_eval_dir(self, images_dir):
+        eval_dir = make_images_dir("eval", 2, 100)
+        node = StubNode()
+        with mock.patch("peekingduck.commands.quantize._load_node", return_value=node):
+            result = CliRunner().invoke(
+                cli,
+                ["quantize", "model.yolox", str(images_dir), "--eval_dir", "eval"],
+            )
+
+        assert result.exit_code == 0
+        assert len(node.model.calibration_images) == 6
+        assert {image[0, 0, 0] for image in node.model.predicted_images} == {100, 101}
+
+    def test_too_few_images_to_hold_out(self):
+        make_images_dir("images", 1, 0)
+        result = CliRunner().invoke(cli, ["quantize", "model.yolox", "images"])
+
+        assert result.exit_code != 0
+        assert "At least 2 images are needed in images" in result.output
+
+    def test_unsupported_mode(self, images_dir):
+        with mock.patch(
+            "peekingduck.commands.quantize._load_node", return_value=StubNode()
+        ):
+            result = CliRunner().invoke(
+                cli, ["quantize", "model.yolox", str(images_dir), "--mode", "dynamic"]
+            )
+
+        assert result.exit_code != 0
+        assert "only static quantization" in result.output
+
+    def test_no_images(self):
+        Path("empty").mkdir()
+        result = CliRunner().invoke(cli, ["quantize", "model.mask_rcnn", "empty"])
+
+        assert result.exit_code != 0
+        assert "No images found in empty" in result.output
@@ -25,6 +25,8 @@ import pytest
 import tensorflow.keras.backend as K
 import yaml
 
+from peekingduck.nodes.abstract_node import AbstractNode
+
 HUMAN_IMAGES = ["t1.jpg", "t2.jpg", "t4.jpg"]
 NO_HUMAN_IMAGES = ["black.jpg", "t3.jpg"]
 
@@ -267,3 +269,19 @@ def assert_msg_in_logs(msg: str, msg_logs) -> None:
             res = True
             break
     assert res
+
+
+class FramesNode(AbstractNode):
+    """Outputs the given frames in order, then ends the pipeline."""
+
+    def __init__(self, frames):
+        super().__init__(
+            {"input": ["none"], "output": ["img", "pipeline_end"]},
+            node_path="input.frames",
+        )
+        self.frames = list(frames)
+
+    def run(self, inputs):
+        if not self.frames:
+            return {"img": None, "pipeline_end": True}
+        return {"img": self.frames.pop(0), "pipeline_end": False}
@@ -0,0 +1,40 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from peekingduck.nodes.abstract_node import AbstractNode
+
+
+class SourceNode(AbstractNode):
+    """Outputs the frame number as "img", or as a one item list which draw
+    nodes can modify in place if `mutable` is True. Each frame takes `delay`
+    seconds to read.
+    """
+
+    def __init__(self, num_frames, mutable=False, delay=0.0):
+        super().__init__(
+            {"input": ["none"], "output": ["img", "pipeline_end"]},
+            node_path="input.source",
+        )
+        self.num_frames = num_frames
+        self.mutable = mutable
+        self.delay = delay
+        self.count = 0
+
+    def run(self, inputs):
+        time.sleep(self.delay)
+        self.count += 1
+        img = [self.count] if self.mutable else self.count
+        return {"img": img, "pipeline_end": self.count > self.num_frames}
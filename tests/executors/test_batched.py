@@ -0,0 +1,103 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from peekingduck.executors.batched import BatchedExecutor
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline import Pipeline
+from tests.executors.conftest import SourceNode
+
+
+class BatchModelNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["img"], "output": ["bboxes"]}, node_path="model.batch"
+        )
+        self.batch_sizes = []
+
+    def run(self, inputs):
+        raise AssertionError("run() should not be called")
+
+    def run_batch(self, inputs_list):
+        self.batch_sizes.append(len(inputs_list))
+        return [{"bboxes": [inputs["img"]]} for inputs in inputs_list]
+
+
+class OutputNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["img", "bboxes", "pipeline_end"], "output": ["none"]},
+            node_path="output.collector",
+        )
+        self.seen = []
+        self.ended = False
+
+    def run(self, inputs):
+        if inputs["pipeline_end"]:
+            self.ended = True
+        else:
+            self.seen.append((inputs["img"], inputs["bboxes"]))
+        return {}
+
+
+@pytest.fixture
+def model_node():
+    return BatchModelNode()
+
+
+@pytest.fixture
+def output_node():
+    return OutputNode()
+
+
+class TestBatchedExecutor:
+    @pytest.mark.parametrize(
+        "config",
+        [
+            {"batch_size": 0},
+            {"batch_size": -1},
+            {"max_wait_ms": -1},
+        ],
+    )
+    def test_invalid_config(self, model_node, output_node, config):
+        pipeline = Pipeline([SourceNode(1), model_node, output_node])
+        with pytest.raises(ValueError):
+            BatchedExecutor(pipeline, **config)
+
+    def test_batches_and_fallback(self, model_node, output_node):
+        pipeline = Pipeline([SourceNode(10), model_node, output_node])
+        num_frames = BatchedExecutor(pipeline, batch_size=4).run()
+
+        assert num_frames == 10
+        # the last batch ends with the pipeline_end frame which skips the
+        # model node
+        assert model_node.batch_sizes == [4, 4, 2]
+        assert output_node.seen == [(i, [i]) for i in range(1, 11)]
+        assert output_node.ended
+        assert pipeline.terminate
+
+    def test_num_iter(self, model_node, output_node):
+        pipeline = Pipeline([SourceNode(10), model_node, output_node])
+        num_frames = BatchedExecutor(pipeline, num_iter=6, batch_size=4).run()
+
+        assert num_frames == 6
+        assert model_node.batch_sizes == [4, 2]
+        assert not output_node.ended
+
+    def test_max_wait_ms(self, model_node, output_node):
+        pipeline = Pipeline([SourceNode(4, delay=0.02), model_node, output_node])
+        BatchedExecutor(pipeline, batch_size=4, max_wait_ms=0).run()
+
+        assert model_node.batch_sizes == [1, 1, 1, 1]
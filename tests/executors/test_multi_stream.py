@@ -0,0 +1,210 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from peekingduck.executors.multi_stream import MultiStreamExecutor
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.nodes.dabble.motion_gate import Node as MotionGateNode
+from peekingduck.pipeline import Pipeline
+from peekingduck.utils.inference_gate import InferenceGate
+
+DEFAULT_SOURCE = "default"
+# number of frames in each source
+SOURCES = {DEFAULT_SOURCE: 3, "short": 1, "long": 5}
+
+
+class InputNode(AbstractNode):
+    instances = []
+
+    def __init__(self, config):
+        super().__init__(config, node_path="input.visual")
+        self.num_frames = SOURCES[self.source]
+        self.count = 0
+        self.released = False
+        InputNode.instances.append(self)
+
+    def run(self, inputs):
+        self.count += 1
+        return {
+            "img": f"{self.source}_{self.count}",
+            "filename": self.filename,
+            "pipeline_end": self.count > self.num_frames,
+        }
+
+    def release_resources(self):
+        self.released = True
+
+
+class ModelNode(AbstractNode):
+    instances = []
+
+    def __init__(self, config):
+        super().__init__(config, node_path="model.shared")
+        self.batch_sizes = []
+        ModelNode.instances.append(self)
+
+    def run(self, inputs):
+        return {"bboxes": [inputs["img"]]}
+
+    def run_batch(self, inputs_list):
+        self.batch_sizes.append(len(inputs_list))
+        return super().run_batch(inputs_list)
+
+
+class CounterNode(AbstractNode):
+    instances = []
+
+    def __init__(self, config):
+        super().__init__(config, node_path="dabble.counter")
+        self.total = 0
+        CounterNode.instances.append(self)
+
+    def run(self, inputs):
+        self.total += len(inputs["bboxes"])
+        return {"total": self.total}
+
+
+@pytest.fixture
+def pipeline():
+    InputNode.instances = []
+    ModelNode.instances = []
+    CounterNode.instances = []
+    return Pipeline(
+        [
+            InputNode(
+                {
+                    "input": ["none"],
+                    "output": ["img", "filename", "pipeline_end"],
+                    "source": DEFAULT_SOURCE,
+                    "filename": "video.mp4",
+                }
+            ),
+            ModelNode({"input": ["img"], "output": ["bboxes"]}),
+            CounterNode({"input": ["bboxes"], "output": ["total"]}),
+        ]
+    )
+
+
+class TestMultiStreamExecutor:
+    def test_no_sources(self, pipeline):
+        with pytest.raises(ValueError) as excinfo:
+            MultiStreamExecutor(pipeline, sources=[])
+        assert "sources must contain at least one input source" in str(excinfo.value)
+
+    def test_first_node_not_input_visual(self):
+        pipeline = Pipeline([CounterNode({"input": ["none"], "output": ["bboxes"]})])
+        with pytest.raises(ValueError) as excinfo:
+            MultiStreamExecutor(pipeline, sources=[DEFAULT_SOURCE])
+        assert "must be input.visual" in str(excinfo.value)
+
+    @pytest.mark.parametrize("batch", [True, False])
+    def test_shared_and_isolated_nodes(self, pipeline, batch):
+        executor = MultiStreamExecutor(
+            pipeline, sources=[DEFAULT_SOURCE, "short", "long"], batch=batch
+        )
+        num_iter = executor.run()
+
+        assert len(InputNode.instances) == 3
+        assert len(ModelNode.instances) == 1
+        assert len(CounterNode.instances) == 3
+        assert num_iter == 6
+        assert executor.num_frames == [3, 1, 5]
+        assert [data["total"] for data in executor.stream_data] == [3, 1, 5]
+        assert executor.stream_data[2]["bboxes"] == ["long_5"]
+        assert [data["filename"] for data in executor.stream_data] == [
+            "video.mp4",
+            "video_1.mp4",
+            "video_2.mp4",
+        ]
+        if batch:
+            assert ModelNode.instances[0].batch_sizes == [3, 2, 2, 1, 1]
+        else:
+            assert ModelNode.instances[0].batch_sizes == []
+        assert pipeline.data is executor.stream_data[0]
+        # the pipeline's own input node is released by the runner
+        assert not InputNode.instances[0].released
+        assert all(node.released for node in InputNode.instances[1:])
+
+    def test_first_source_replaces_pipeline_source(self, pipeline):
+        executor = MultiStreamExecutor(pipeline, sources=["short"])
+
+        assert InputNode.instances[0].released
+        assert executor.streams[0][0] is InputNode.instances[1]
+
+    def test_num_iter(self, pipeline):
+        executor = MultiStreamExecutor(
+            pipeline, num_iter=2, sources=[DEFAULT_SOURCE, "long"]
+        )
+
+        assert executor.run() == 2
+        assert executor.num_frames == [2, 2]
+
+    def test_source_id_of_each_stream(self, pipeline):
+        executor = MultiStreamExecutor(pipeline, sources=[DEFAULT_SOURCE, "long"])
+        executor.run()
+
+        assert [data["source_id"] for data in executor.stream_data] == [0, 1]
+
+    def test_motion_gate_with_static_stream(self):
+        static = np.full((60, 80, 3), 100, dtype=np.uint8)
+
+        class FrameInputNode(InputNode):
+            def run(self, inputs):
+                outputs = super().run(inputs)
+                img = static.copy()
+                if self.source == "long":
+                    # a square moving across the frame
+                    img[10:30, self.count * 10 : self.count * 10 + 20] = 255
+                outputs["img"] = img
+                return outputs
+
+        class CountingModelNode(ModelNode):
+            def __init__(self, config):
+                super().__init__(config)
+                self.num_calls = 0
+
+            def run(self, inputs):
+                self.num_calls += 1
+                return {"bboxes": [self.num_calls]}
+
+        InputNode.instances = []
+        ModelNode.instances = []
+        gate = MotionGateNode()
+        model = CountingModelNode({"input": ["img"], "output": ["bboxes"]})
+        pipeline = Pipeline(
+            [
+                FrameInputNode(
+                    {
+                        "input": ["none"],
+                        "output": ["img", "filename", "pipeline_end"],
+                        "source": DEFAULT_SOURCE,
+                        "filename": "video.mp4",
+                    }
+                ),
+                gate,
+                model,
+            ]
+        )
+        InferenceGate(pipeline.nodes, gate).attach()
+        executor = MultiStreamExecutor(
+            pipeline, num_iter=3, sources=[DEFAULT_SOURCE, "long"]
+        )
+        executor.run()
+
+        # the static stream keeps the outputs of its own first frame, and is
+        # not given the outputs of the moving stream
+        assert model.batch_sizes == [2, 1, 1]
+        assert [data["bboxes"] for data in executor.stream_data] == [[1], [4]]
@@ -0,0 +1,175 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+
+from peekingduck.executors.parallel import ParallelExecutor
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline import Pipeline
+from tests.executors.conftest import SourceNode
+
+
+class MockedNode(AbstractNode):
+    def __init__(self, node_path, inputs, outputs, func=None):
+        super().__init__({"input": inputs, "output": outputs}, node_path=node_path)
+        self.func = func
+        self.thread_names = []
+
+    def run(self, inputs):
+        self.thread_names.append(threading.current_thread().name)
+        if self.func is not None:
+            return self.func(inputs)
+        return {key: f"{self.name}_{key}" for key in self.outputs if key != "none"}
+
+
+def draw(inputs):
+    inputs["img"].append(len(inputs["img"]))
+    return {}
+
+
+def merge(inputs):
+    return {"count": (inputs["bboxes"], inputs["bbox_scores"], inputs["keypoints"])}
+
+
+# Same outputs as model.yolo_face and model.posenet, both write bboxes and
+# bbox_labels
+FACE_OUTPUTS = ["bboxes", "bbox_labels", "bbox_scores"]
+POSE_OUTPUTS = [
+    "bboxes",
+    "keypoints",
+    "keypoint_scores",
+    "keypoint_conns",
+    "bbox_labels",
+]
+
+
+def make_nodes(barrier=None):
+    def wait_for_sibling(name, outputs):
+        def _func(inputs):
+            if barrier is not None:
+                barrier.wait(timeout=5)
+            return {key: f"{name}_{key}_{sum(inputs['img'])}" for key in outputs}
+
+        return _func
+
+    return [
+        SourceNode(5, mutable=True),
+        MockedNode(
+            "model.face", ["img"], FACE_OUTPUTS, wait_for_sibling("face", FACE_OUTPUTS)
+        ),
+        MockedNode(
+            "model.pose", ["img"], POSE_OUTPUTS, wait_for_sibling("pose", POSE_OUTPUTS)
+        ),
+        MockedNode(
+            "dabble.merge", ["bboxes", "bbox_scores", "keypoints"], ["count"], merge
+        ),
+        MockedNode("draw.img", ["img"], ["none"], draw),
+        MockedNode("output.all", ["all"], ["none"]),
+    ]
+
+
+class TestParallelExecutor:
+    def test_dependencies(self):
+        executor = ParallelExecutor(Pipeline(make_nodes()))
+
+        assert executor.dependencies == [
+            set(),
+            {0},
+            {0},
+            {0, 1, 2},
+            {0, 1, 2},
+            {0, 1, 2, 3, 4},
+        ]
+        assert executor.levels == [[0], [1, 2], [3, 4], [5]]
+        assert executor.max_workers == 2
+
+    def test_invalid_max_workers(self):
+        with pytest.raises(ValueError) as excinfo:
+            ParallelExecutor(Pipeline(make_nodes()), max_workers=0)
+        assert "max_workers must be a positive integer" in str(excinfo.value)
+
+    def test_nodes_with_same_outputs_run_concurrently(self):
+        # both model nodes write bboxes and bbox_labels and wait at the barrier,
+        # so the frame can only complete if they run at the same time
+        barrier = threading.Barrier(2)
+        nodes = make_nodes(barrier)
+        pipeline = Pipeline(nodes)
+        num_iter = ParallelExecutor(pipeline).run()
+
+        assert num_iter == 6
+        assert not barrier.broken
+        assert all(name.startswith("pkd-node") for name in nodes[1].thread_names)
+
+    def test_same_data_pool_as_sequential(self):
+        sequential_pipeline = Pipeline(make_nodes())
+        while not sequential_pipeline.terminate:
+            for node in sequential_pipeline.nodes:
+                if sequential_pipeline.data.get("pipeline_end", False):
+                    sequential_pipeline.terminate = True
+                    if "pipeline_end" not in node.inputs:
+                        continue
+                inputs = {
+                    key: sequential_pipeline.data[key]
+                    for key in node.inputs
+                    if key in sequential_pipeline.data
+                }
+                sequential_pipeline.data.update(node.run(inputs))
+        parallel_pipeline = Pipeline(make_nodes())
+        ParallelExecutor(parallel_pipeline, max_workers=4).run()
+
+        assert parallel_pipeline.data == sequential_pipeline.data
+
+    def test_inputs_from_latest_writer(self):
+        barrier = threading.Barrier(2)
+        pipeline = Pipeline(make_nodes(barrier))
+        ParallelExecutor(pipeline, num_iter=1).run()
+
+        # bboxes written by both model nodes are read from the later pose node,
+        # bbox_scores is only written by the face node
+        assert pipeline.data["count"] == (
+            "pose_bboxes_1",
+            "face_bbox_scores_1",
+            "pose_keypoints_1",
+        )
+        assert pipeline.data["bboxes"] == "pose_bboxes_1"
+        assert pipeline.data["bbox_labels"] == "pose_bbox_labels_1"
+
+    def test_callbacks_data_is_merged(self):
+        nodes = make_nodes()
+        nodes[1].callback_list.append(
+            "run_end", lambda data: data.update(face_count=len(data["bboxes"]))
+        )
+        pipeline = Pipeline(nodes)
+        ParallelExecutor(pipeline, num_iter=1).run()
+
+        assert pipeline.data["face_count"] == len("face_bboxes_1")
+
+    def test_num_iter(self):
+        nodes = make_nodes()
+        num_iter = ParallelExecutor(Pipeline(nodes), num_iter=3).run()
+
+        assert num_iter == 3
+        assert nodes[0].count == 3
+
+    def test_error_is_propagated(self):
+        def fail(inputs):
+            raise RuntimeError("model failed")
+
+        nodes = make_nodes()
+        nodes[2].func = fail
+        with pytest.raises(RuntimeError) as excinfo:
+            ParallelExecutor(Pipeline(nodes)).run()
+        assert "model failed" in str(excinfo.value)
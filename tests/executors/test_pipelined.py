@@ -0,0 +1,127 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+
+from peekingduck.executors.pipelined import PipelinedExecutor
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.pipeline import Pipeline
+from tests.executors.conftest import SourceNode
+
+
+class ModelNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["img"], "output": ["bboxes"]}, node_path="model.slow"
+        )
+
+    def run(self, inputs):
+        # sleep for a short random-ish duration to shuffle thread timings
+        time.sleep(0.001 * (inputs["img"] % 3))
+        return {"bboxes": [inputs["img"]] * 2}
+
+
+class OutputNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["img", "bboxes", "pipeline_end"], "output": ["none"]},
+            node_path="output.collector",
+        )
+        self.seen = []
+        self.ended = False
+
+    def run(self, inputs):
+        if inputs["pipeline_end"]:
+            self.ended = True
+        else:
+            self.seen.append((inputs["img"], inputs["bboxes"]))
+        return {}
+
+
+class FailingNode(AbstractNode):
+    def __init__(self):
+        super().__init__({"input": ["img"], "output": ["none"]}, node_path="draw.fail")
+
+    def run(self, inputs):
+        if inputs["img"] == 3:
+            raise RuntimeError("draw failed")
+        return {}
+
+
+@pytest.fixture
+def output_node():
+    return OutputNode()
+
+
+@pytest.fixture
+def pipeline(output_node):
+    return Pipeline([SourceNode(20), ModelNode(), output_node])
+
+
+class TestPipelinedExecutor:
+    def test_automatic_stages(self, pipeline):
+        executor = PipelinedExecutor(pipeline)
+        assert [len(nodes) for nodes in executor.stages] == [1, 1, 1]
+
+    def test_custom_stages(self, pipeline):
+        executor = PipelinedExecutor(pipeline, stages=[1, 2])
+        assert [len(nodes) for nodes in executor.stages] == [1, 2]
+
+    @pytest.mark.parametrize("stages", [[1, 1], [0, 3], [1, 1, 1, 1]])
+    def test_invalid_stages(self, pipeline, stages):
+        with pytest.raises(ValueError) as excinfo:
+            PipelinedExecutor(pipeline, stages=stages)
+        assert "must be positive numbers of nodes" in str(excinfo.value)
+
+    def test_invalid_queue_size(self, pipeline):
+        with pytest.raises(ValueError) as excinfo:
+            PipelinedExecutor(pipeline, queue_size=0)
+        assert "queue_size must be a positive integer" in str(excinfo.value)
+
+    @pytest.mark.parametrize("queue_size", [1, 4])
+    def test_preserves_frame_order(self, pipeline, output_node, queue_size):
+        num_frames = PipelinedExecutor(pipeline, queue_size=queue_size).run()
+
+        assert num_frames == 21
+        assert output_node.seen == [(i, [i, i]) for i in range(1, 21)]
+        assert output_node.ended
+        assert pipeline.terminate
+        assert pipeline.data["pipeline_end"]
+
+    def test_num_iter(self, pipeline, output_node):
+        num_frames = PipelinedExecutor(pipeline, num_iter=5).run()
+
+        assert num_frames == 5
+        assert output_node.seen == [(i, [i, i]) for i in range(1, 6)]
+        assert not output_node.ended
+
+    def test_queue_stats(self, pipeline):
+        executor = PipelinedExecutor(pipeline, queue_size=2)
+        executor.run()
+        stats = executor.get_queue_stats()
+
+        assert [stage["stage"] for stage in stats] == [
+            "model.slow",
+            "output.collector",
+        ]
+        assert all(0 <= stage["mean"] <= stage["max"] <= 2 for stage in stats)
+        assert executor.queue_depths == [0, 0]
+
+    def test_error_is_propagated(self):
+        pipeline = Pipeline([SourceNode(100), ModelNode(), FailingNode()])
+        with pytest.raises(RuntimeError) as excinfo:
+            PipelinedExecutor(pipeline, queue_size=1).run()
+        assert "draw failed" in str(excinfo.value)
@@ -0,0 +1,136 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from pathlib import Path
+
+import pytest
+
+from peekingduck.executors.sharded import ShardedExecutor, process_shard
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.nodes.dabble.motion_gate import Node as MotionGateNode
+from peekingduck.nodes.input.visual import Node as VisualNode
+from peekingduck.nodes.output.media_writer import Node as MediaWriterNode
+from peekingduck.pipeline import Pipeline
+from peekingduck.runner import Runner
+
+# number of frames in each input video
+NUM_FRAMES = {"a.avi": 4, "b.avi": 2, "c.avi": 3}
+
+
+class CountNode(AbstractNode):
+    def __init__(self, config):
+        super().__init__(config, node_path="dabble.count")
+        self.total = 0
+
+    def run(self, inputs):
+        self.total += 1
+        return {"total": self.total}
+
+
+@pytest.fixture
+def input_dir(create_input_video):
+    path = Path("inputs")
+    path.mkdir()
+    for name, num_frames in NUM_FRAMES.items():
+        create_input_video(str(path / name), 10, (32, 48, 3), num_frames)
+    # not an accepted file format, is skipped
+    (path / "notes.txt").write_text("not a video")
+    return path
+
+
+@pytest.fixture
+def pipeline(input_dir):
+    return Pipeline(
+        [
+            VisualNode(source=str(input_dir), threading=False),
+            CountNode({"input": ["img"], "output": ["total"]}),
+            MediaWriterNode(output_dir="outputs", output_filename="out.mp4"),
+        ]
+    )
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestShardedExecutor:
+    def test_invalid_num_workers(self, pipeline):
+        with pytest.raises(ValueError) as excinfo:
+            ShardedExecutor(pipeline, num_workers=0)
+        assert "num_workers must be a positive integer" in str(excinfo.value)
+
+    def test_source_not_directory(self, input_dir):
+        pipeline = Pipeline(
+            [VisualNode(source=str(input_dir / "a.avi"), threading=False)]
+        )
+        with pytest.raises(ValueError) as excinfo:
+            ShardedExecutor(pipeline)
+        assert "directory as source" in str(excinfo.value)
+
+    def test_split_shards(self, pipeline):
+        executor = ShardedExecutor(pipeline, num_workers=2)
+
+        assert sorted(path.name for shard in executor.shards for path in shard) == [
+            "a.avi",
+            "b.avi",
+            "c.avi",
+        ]
+        assert [len(shard) for shard in executor.shards] in ([1, 2], [2, 1])
+
+    def test_num_workers_limited_by_files(self, pipeline):
+        executor = ShardedExecutor(pipeline, num_workers=8)
+
+        assert len(executor.shards) == len(NUM_FRAMES)
+
+    def test_run(self, pipeline):
+        executor = ShardedExecutor(pipeline, num_workers=2)
+
+        assert executor.run() == sum(NUM_FRAMES.values())
+        assert pipeline.terminate
+        assert len(executor.worker_stats) == 2
+        assert sum(stats["num_files"] for stats in executor.worker_stats) == 3
+        output_stems = sorted(path.stem for path in Path("outputs").iterdir())
+        assert output_stems == ["out_a_00000", "out_b_00000", "out_c_00000"]
+
+    def test_process_shard(self, pipeline, input_dir):
+        node_specs = [
+            (node.node_name, type(node), node.config) for node in pipeline.nodes
+        ]
+        files = [input_dir / "a.avi", input_dir / "b.avi"]
+
+        stats = process_shard(0, node_specs, files, 0)
+        assert stats["num_files"] == 2
+        assert stats["num_frames"] == 6
+
+        stats = process_shard(1, node_specs, files, 5)
+        assert stats["num_files"] == 2
+        assert stats["num_frames"] == 5
+
+    def test_runner_rejects_motion_gate(self, input_dir):
+        # the worker processes would run the gated nodes on every frame
+        nodes = [
+            VisualNode(source=str(input_dir), threading=False),
+            MotionGateNode(),
+            CountNode({"input": ["img"], "output": ["total"]}),
+        ]
+        with pytest.raises(SystemExit):
+            Runner(nodes=nodes, executor="sharded")
+
+    def test_runner_rejects_cache_results(self, pipeline):
+        # the worker processes would run the model nodes uncached
+        with pytest.raises(SystemExit):
+            Runner(nodes=pipeline.nodes, executor="sharded", cache_results=True)
+
+    def test_runner_rejects_trace_output(self, pipeline):
+        # the worker processes would leave the trace empty
+        with pytest.raises(SystemExit):
+            Runner(nodes=pipeline.nodes, executor="sharded", trace_output="trace.json")
@@ -14,6 +14,7 @@
 
 import hashlib
 import logging
+import os
 import tempfile
 from pathlib import Path
 from unittest import TestCase, mock
@@ -196,6 +197,22 @@ class TestWeightsDownloaderMixin:
 
             assert weights_type_model._has_weights(model_dir)
 
+    @pytest.mark.parametrize("model_name", ["csrnet", "hrnet", "movenet"])
+    def test_converted_model_format_uses_source_weights(self, model_name):
+        """Checks that models converted on the local machine, i.e., "tflite",
+        download and find the weights of the format they are converted from.
+        """
+        weights_model = WeightsModel(
+            PKD_DIR / "configs" / "model" / f"{model_name}.yml"
+        )
+        expected_dir = weights_model._find_paths()
+        expected_weights = weights_model.weights
+        weights_model.config["model_format"] = "tflite"
+
+        assert weights_model.weights_format == "tensorflow"
+        assert weights_model.weights == expected_weights
+        assert weights_model._find_paths() == expected_dir
+
     def test_sha256sum_ignores_macos_files(self):
         """Checks that extra files created on Mac OS is ignored by the
         sha256sum() method.
@@ -216,6 +233,25 @@ class TestWeightsDownloaderMixin:
                 == expected.hexdigest()
             )
 
+    def test_stat_hash_does_not_read_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            weights_path = Path(tmp_dir) / "weights.pth"
+            weights_path.write_bytes(b"weights")
+            with mock.patch("builtins.open", side_effect=AssertionError):
+                expected = WeightsDownloaderMixin.stat_hash(weights_path).hexdigest()
+                assert (
+                    WeightsDownloaderMixin.stat_hash(weights_path).hexdigest()
+                    == expected
+                )
+
+            # same size, but modified
+            stat = weights_path.stat()
+            weights_path.write_bytes(b"WEIGHTS")
+            os.utime(weights_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            assert (
+                WeightsDownloaderMixin.stat_hash(weights_path).hexdigest() != expected
+            )
+
     @pytest.mark.usefixtures("tmp_dir")
     @mock.patch.object(WeightsDownloaderMixin, "_download_to", wraps=do_nothing)
     @mock.patch.object(WeightsDownloaderMixin, "_extract_file", wraps=do_nothing)
@@ -97,6 +97,18 @@ class TestCallbackList:
             if event != event_type:
                 assert empty_callback_list.callbacks[event] == []
 
+    @pytest.mark.parametrize("event_type", SUPPORTED_EVENTS)
+    def test_prepend_to_the_list_mapped_to_event_type(
+        self, empty_callback_list, event_type
+    ):
+        first_callback = lambda data_pool: None
+        callback = lambda data_pool: None
+
+        empty_callback_list.append(event_type, callback)
+        empty_callback_list.prepend(event_type, first_callback)
+
+        assert empty_callback_list.callbacks[event_type] == [first_callback, callback]
+
     @pytest.mark.parametrize("event_type", SUPPORTED_EVENTS)
     @pytest.mark.parametrize(
         "callback_type,expected",
@@ -0,0 +1,115 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from peekingduck.nodes.dabble.motion_gate import Node
+
+SIZE = (120, 160, 3)
+
+
+@pytest.fixture
+def static_frame():
+    return np.full(SIZE, 100, dtype=np.uint8)
+
+
+@pytest.fixture
+def moved_frame(static_frame):
+    frame = static_frame.copy()
+    frame[20:60, 30:90] = 255
+    return frame
+
+
+def _run(node, frames, source_ids=None):
+    source_ids = source_ids or [0] * len(frames)
+    return [
+        node.run({"img": frame, "source_id": source_id})["motion_detected"]
+        for frame, source_id in zip(frames, source_ids)
+    ]
+
+
+class TestMotionGate:
+    @pytest.mark.parametrize(
+        "config, message",
+        [
+            ({"method": "optical_flow"}, "method optical_flow: must be one of"),
+            ({"threshold": 1.5}, "threshold must be between [0, 1]."),
+            ({"pixel_threshold": 300}, "pixel_threshold must be between [0, 255]."),
+            ({"downscale_width": 0}, "downscale_width must be a positive integer."),
+            ({"max_skip": -1}, "max_skip must be a non-negative integer."),
+        ],
+    )
+    def test_invalid_config(self, config, message):
+        with pytest.raises(ValueError) as excinfo:
+            Node(**config)
+        assert message in str(excinfo.value)
+
+    def test_frame_diff(self, static_frame, moved_frame):
+        node = Node(method="frame_diff", max_skip=100)
+        motion = _run(node, [static_frame, static_frame, moved_frame, moved_frame])
+        assert motion == [True, False, True, False]
+        assert (node.num_frames, node.num_static) == (4, 2)
+
+    def test_frame_diff_score(self, static_frame, moved_frame):
+        node = Node(method="frame_diff", downscale_width=16)
+        node.run({"img": static_frame})
+        score = node.run({"img": moved_frame})["motion_score"]
+        assert score == pytest.approx(40 * 60 / (120 * 160), abs=0.02)
+
+    def test_frame_diff_accumulates_slow_motion(self, static_frame):
+        node = Node(method="frame_diff", threshold=0.2, max_skip=100)
+        frames = []
+        for width in range(0, 100, 20):
+            frame = static_frame.copy()
+            frame[:, :width] = 255
+            frames.append(frame)
+        # each frame differs from the previous by 12.5% of the columns, but
+        # the reference is only updated when motion is detected
+        assert _run(node, frames) == [True, False, True, False, True]
+
+    def test_pixel_threshold(self, static_frame):
+        node = Node(method="frame_diff", pixel_threshold=25)
+        assert _run(node, [static_frame, static_frame + 20]) == [True, False]
+
+    def test_background_subtraction(self, static_frame, moved_frame):
+        node = Node(method="background_subtraction", max_skip=100)
+        motion = _run(node, [static_frame] * 10 + [moved_frame])
+        assert motion[0]
+        assert not any(motion[5:10])
+        assert motion[10]
+
+    def test_max_skip(self, static_frame):
+        node = Node(max_skip=2)
+        assert _run(node, [static_frame] * 7) == [
+            True,
+            False,
+            False,
+            True,
+            False,
+            False,
+            True,
+        ]
+
+    def test_max_skip_zero_never_skips(self, static_frame):
+        assert _run(Node(max_skip=0), [static_frame] * 3) == [True] * 3
+
+    def test_sources_are_compared_separately(self, static_frame, moved_frame):
+        node = Node(max_skip=100)
+        motion = _run(
+            node,
+            [static_frame, moved_frame, static_frame, moved_frame],
+            source_ids=[0, 1, 0, 1],
+        )
+        assert motion == [True, True, False, False]
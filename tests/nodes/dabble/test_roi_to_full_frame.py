@@ -0,0 +1,119 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from peekingduck.nodes.dabble.roi_to_full_frame import Node
+
+FULL_SIZE = (60, 80, 3)
+ROI_BOXES = np.array([[10, 5, 30, 25], [40, 0, 50, 40]])
+
+
+@pytest.fixture
+def roi_to_full_frame():
+    return Node(
+        {
+            "input": ["img", "full_img", "roi_boxes"],
+            "optional_inputs": ["bboxes", "keypoints", "keypoint_conns", "masks"],
+            "output": ["img", "bboxes", "keypoints", "keypoint_conns", "masks"],
+        }
+    )
+
+
+@pytest.fixture
+def inputs():
+    return {
+        "img": np.zeros((40, 30, 3), dtype=np.uint8),
+        "full_img": np.ones(FULL_SIZE, dtype=np.uint8),
+        "roi_boxes": ROI_BOXES,
+    }
+
+
+class TestRoiToFullFrame:
+    def test_no_optional_inputs(self, roi_to_full_frame, inputs):
+        outputs = roi_to_full_frame.run(inputs)
+        assert outputs["img"] is inputs["full_img"]
+        assert outputs["bboxes"].shape == (0, 4)
+        assert outputs["keypoints"].size == 0
+        assert outputs["keypoint_conns"].size == 0
+        assert outputs["masks"].shape == (0, 60, 80)
+
+    def test_whole_frame_roi_is_identity(self, roi_to_full_frame):
+        img = np.zeros(FULL_SIZE, dtype=np.uint8)
+        bboxes = np.array([[0.1, 0.2, 0.3, 0.4]])
+        outputs = roi_to_full_frame.run(
+            {
+                "img": img,
+                "full_img": img,
+                "roi_boxes": np.array([[0, 0, 80, 60]]),
+                "bboxes": bboxes,
+            }
+        )
+        npt.assert_allclose(outputs["bboxes"], bboxes)
+
+    def test_maps_bboxes_and_masks(self, roi_to_full_frame, inputs):
+        masks = np.zeros((2, 40, 30), dtype=np.uint8)
+        masks[0, :20, :20] = 1
+        masks[1, :, 20:] = 1
+        inputs["bboxes"] = np.array([[0, 0, 0.5, 0.25], [2 / 3, 0.5, 1, 1]])
+        inputs["masks"] = masks
+        outputs = roi_to_full_frame.run(inputs)
+
+        npt.assert_allclose(
+            outputs["bboxes"] * [80, 60, 80, 60], [[10, 5, 25, 15], [40, 20, 50, 40]]
+        )
+        assert outputs["masks"].shape == (2, 60, 80)
+        npt.assert_equal(outputs["masks"][0, 5:25, 10:30], 1)
+        npt.assert_equal(outputs["masks"][1, :40, 40:50], 1)
+        assert outputs["masks"].sum() == 800
+
+    def test_no_bboxes(self, roi_to_full_frame, inputs):
+        inputs["bboxes"] = np.empty((0, 4))
+        inputs["masks"] = np.empty((0, 40, 30), dtype=np.uint8)
+        outputs = roi_to_full_frame.run(inputs)
+        assert outputs["bboxes"].shape == (0, 4)
+        assert outputs["masks"].shape == (0, 60, 80)
+
+    def test_maps_keypoints(self, roi_to_full_frame, inputs):
+        inputs["keypoints"] = np.array(
+            [[[0.5, 0.25], [-1, -1], [0, 0]], [[1, 1], [2 / 3, 0.5], [-1, -1]]]
+        )
+        inputs["keypoint_conns"] = np.array(
+            [[[[0.5, 0.25], [0, 0]]], [[[1, 1], [2 / 3, 0.5]]]], dtype=object
+        )
+        outputs = roi_to_full_frame.run(inputs)
+
+        npt.assert_allclose(
+            outputs["keypoints"][0] * [80, 60], [[25, 15], [-80, -60], [10, 5]]
+        )
+        npt.assert_allclose(
+            outputs["keypoints"][1] * [80, 60], [[50, 40], [40, 20], [-80, -60]]
+        )
+        npt.assert_allclose(
+            outputs["keypoint_conns"][0][0].astype(float) * [80, 60],
+            [[25, 15], [10, 5]],
+        )
+        npt.assert_allclose(
+            outputs["keypoint_conns"][1][0].astype(float) * [80, 60],
+            [[50, 40], [40, 20]],
+        )
+
+    def test_no_keypoints(self, roi_to_full_frame, inputs):
+        inputs["keypoints"] = np.empty(0)
+        inputs["keypoint_conns"] = np.empty(0)
+        outputs = roi_to_full_frame.run(inputs)
+        assert outputs["keypoints"].size == 0
+        assert outputs["keypoint_conns"].size == 0
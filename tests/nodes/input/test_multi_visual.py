@@ -0,0 +1,149 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.nodes.input.multi_visual import Node
+from peekingduck.runner import Runner
+
+SIZE = (32, 48, 3)
+
+
+class BatchModelNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["img"], "output": ["bboxes"]}, node_path="model.batch"
+        )
+        self.batches = []
+
+    def run(self, inputs):
+        raise AssertionError("run() should not be called")
+
+    def run_batch(self, inputs_list):
+        self.batches.append([inputs["img"] for inputs in inputs_list])
+        return [{"bboxes": np.empty((0, 4))} for _ in inputs_list]
+
+
+class OutputNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["source_id", "timestamp", "bboxes"], "output": ["none"]},
+            node_path="output.collector",
+        )
+        self.seen = []
+
+    def run(self, inputs):
+        self.seen.append(inputs["source_id"])
+        return {}
+
+
+@pytest.fixture
+def videos(tmp_dir, create_input_video):
+    return {
+        "video0.avi": create_input_video("video0.avi", fps=10, size=SIZE, num_frames=3),
+        "video1.avi": create_input_video("video1.avi", fps=10, size=SIZE, num_frames=5),
+    }
+
+
+def _read_all(node):
+    outputs = []
+    while True:
+        output = node.run({})
+        outputs.append(output)
+        if output["pipeline_end"]:
+            break
+    return outputs
+
+
+class TestMultiVisual:
+    def test_no_sources(self):
+        with pytest.raises(ValueError) as excinfo:
+            Node(sources=[])
+        assert str(excinfo.value) == "sources must contain at least one input source."
+
+    def test_invalid_sync(self, videos):
+        with pytest.raises(ValueError) as excinfo:
+            Node(sources=list(videos), sync="nearest")
+        assert "sync nearest: must be one of" in str(excinfo.value)
+
+    def test_invalid_source(self, videos):
+        with pytest.raises(ValueError) as excinfo:
+            Node(sources=[*videos, "missing.avi"])
+        assert "Video or image path incorrect" in str(excinfo.value)
+
+    def test_sequential_sync(self, videos):
+        node = Node(sources=list(videos), sync="sequential")
+        outputs = _read_all(node)
+        node.release_resources()
+
+        assert len(outputs) == 6
+        assert [output["source_ids"] for output in outputs] == [[0, 1]] * 3 + [
+            [1],
+            [1],
+            [],
+        ]
+        video0, video1 = videos.values()
+        for i, output in enumerate(outputs[:3]):
+            np.testing.assert_equal(output["imgs"], [video0[i], video1[i]])
+            assert all(timestamp > 0 for timestamp in output["timestamps"])
+        np.testing.assert_equal(outputs[4]["imgs"], [video1[4]])
+
+    def test_resize(self, videos):
+        node = Node(
+            sources=list(videos),
+            sync="sequential",
+            resize={"do_resizing": True, "width": 24, "height": 16},
+        )
+        output = node.run({})
+        node.release_resources()
+        assert [img.shape for img in output["imgs"]] == [(16, 24, 3)] * 2
+
+    def test_split_frames(self):
+        outputs = {
+            "imgs": ["a", "b"],
+            "source_ids": [0, 2],
+            "timestamps": [1.0, 2.0],
+            "pipeline_end": False,
+        }
+        frames = Node.split_frames(outputs)
+        assert [
+            (frame["img"], frame["source_id"], frame["timestamp"]) for frame in frames
+        ] == [("a", 0, 1.0), ("b", 2, 2.0)]
+        assert all(frame["imgs"] == ["a", "b"] for frame in frames)
+
+        end_frames = Node.split_frames(
+            {"imgs": [], "source_ids": [], "timestamps": [], "pipeline_end": True}
+        )
+        assert len(end_frames) == 1
+        assert end_frames[0]["pipeline_end"]
+
+    def test_runner_batches_frames_of_all_sources(self, videos):
+        model_node = BatchModelNode()
+        output_node = OutputNode()
+        input_node = Node(sources=list(videos), sync="sequential")
+        runner = Runner(nodes=[input_node, model_node, output_node])
+        runner.run()
+
+        # the batch size defaults to the number of sources, the frames of
+        # video1 after video0 has ended fill up batches across runs
+        assert [len(batch) for batch in model_node.batches] == [2, 2, 2, 2]
+        assert output_node.seen == [0, 1, 0, 1, 0, 1, 1, 1]
+
+    def test_runner_rejects_other_executors(self, videos):
+        input_node = Node(sources=list(videos), sync="sequential")
+        with pytest.raises(SystemExit):
+            Runner(nodes=[input_node, BatchModelNode()], executor="pipelined")
+        input_node.release_resources()
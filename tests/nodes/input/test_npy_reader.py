@@ -0,0 +1,140 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from time import perf_counter
+
+import cv2
+import numpy as np
+import pytest
+
+from peekingduck.nodes.input.utils.npy_reader import NpyReader
+from peekingduck.nodes.input.utils.read import FrameRange, VideoNoThread
+from peekingduck.nodes.input.visual import Node
+
+NUM_FRAMES = 6
+SIZE = (24, 32, 3)
+
+
+@pytest.fixture
+def frames_file(tmp_dir, create_video):
+    frames = np.stack(create_video(SIZE, NUM_FRAMES))
+    np.save("frames.npy", frames)
+    return "frames.npy", frames
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestNpyReader:
+    def test_properties(self, frames_file):
+        reader = NpyReader(frames_file[0], fps=25)
+        assert reader.get(cv2.CAP_PROP_FPS) == 25
+        assert reader.get(cv2.CAP_PROP_FRAME_COUNT) == NUM_FRAMES
+        assert reader.get(cv2.CAP_PROP_FRAME_WIDTH) == SIZE[1]
+        assert reader.get(cv2.CAP_PROP_FRAME_HEIGHT) == SIZE[0]
+        assert reader.get(cv2.CAP_PROP_BRIGHTNESS) == -1
+
+    def test_read_returns_copies_of_frames(self, frames_file):
+        reader = NpyReader(frames_file[0])
+        assert isinstance(reader.frames, np.memmap)
+        assert not reader.frames.flags.writeable
+        for i in range(NUM_FRAMES):
+            ret, frame = reader.read()
+            assert ret
+            np.testing.assert_equal(frame, frames_file[1][i])
+            assert not np.shares_memory(frame, reader.frames)
+            assert frame.flags.writeable
+        assert reader.read() == (False, None)
+
+    def test_writing_frames_does_not_modify_file(self, frames_file):
+        reader = NpyReader(frames_file[0])
+        _, frame = reader.read()
+        frame[:] = 0
+        np.testing.assert_equal(np.load(frames_file[0])[0], frames_file[1][0])
+
+    def test_single_frame(self, frames_file):
+        np.save("frame.npy", frames_file[1][0])
+        reader = NpyReader("frame.npy")
+        assert reader.get(cv2.CAP_PROP_FRAME_COUNT) == 1
+
+    @pytest.mark.parametrize(
+        "array",
+        [
+            np.zeros((2, 4, 4), dtype=np.float32),
+            np.zeros((2, 4, 4, 1), dtype=np.uint8),
+            np.zeros((4,), dtype=np.uint8),
+        ],
+    )
+    def test_invalid_array(self, array):
+        np.save("invalid.npy", array)
+        with pytest.raises(ValueError) as excinfo:
+            NpyReader("invalid.npy")
+        assert "expected a uint8 array of shape (N, H, W, 3)" in str(excinfo.value)
+
+    def test_invalid_file(self):
+        with open("invalid.npy", "w") as outfile:
+            outfile.write("not an array")
+        with pytest.raises(ValueError) as excinfo:
+            NpyReader("invalid.npy")
+        assert "Invalid frames file invalid.npy" in str(excinfo.value)
+
+    def test_replay_fps(self, frames_file):
+        reader = NpyReader(frames_file[0], fps=50)
+        start_time = perf_counter()
+        while reader.read()[0]:
+            pass
+        # the first frame is returned immediately
+        assert perf_counter() - start_time >= (NUM_FRAMES - 1) / 50
+
+    def test_frame_range(self, frames_file):
+        reader = VideoNoThread(
+            frames_file[0], False, FrameRange(stride=2, start_frame=1)
+        )
+        frames = []
+        while True:
+            ret, frame = reader.read_frame()
+            if not ret:
+                break
+            frames.append(frame)
+        np.testing.assert_equal(frames, frames_file[1][1::2])
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestNpySource:
+    def test_invalid_replay_fps(self, frames_file):
+        with pytest.raises(ValueError) as excinfo:
+            Node(source=frames_file[0], replay_fps=-1)
+        assert str(excinfo.value) == "replay_fps must be non-negative."
+
+    def test_reads_npy_file(self, frames_file):
+        reader = Node(source=frames_file[0], replay_fps=30)
+        outputs = [reader.run({}) for _ in range(NUM_FRAMES + 1)]
+        np.testing.assert_equal(
+            [output["img"] for output in outputs[:NUM_FRAMES]], frames_file[1]
+        )
+        assert outputs[0]["saved_video_fps"] == 30
+        assert outputs[NUM_FRAMES]["pipeline_end"]
+        assert reader.progress == 100
+
+    def test_reads_directory_of_npy_files(self, frames_file):
+        np.save("more_frames.npy", frames_file[1][:2])
+        reader = Node(source=".")
+        outputs = [reader.run({}) for _ in range(NUM_FRAMES + 3)]
+        assert [output["filename"] for output in outputs[: NUM_FRAMES + 2]] == [
+            "frames.npy"
+        ] * NUM_FRAMES + ["more_frames.npy"] * 2
+        assert outputs[-1]["pipeline_end"]
+
+    def test_npy_output_filename_rejected(self, frames_file):
+        with pytest.raises(ValueError) as excinfo:
+            Node(source=frames_file[0], filename="video.npy")
+        assert "filename video.npy: extension must be one of" in str(excinfo.value)
@@ -0,0 +1,158 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from peekingduck.nodes.input.utils.prefetch import (
+    ImagePrefetcher,
+    decode_image,
+    get_decode_flag,
+    get_image_size,
+)
+from peekingduck.nodes.input.visual import Node
+
+WIDTH = 160
+HEIGHT = 120
+
+
+def _encode(ext, img):
+    _, data = cv2.imencode(ext, img)
+    return data
+
+
+@pytest.fixture
+def image_files(tmp_dir, create_input_image):
+    images = {}
+    for i in range(5):
+        filename = f"image{i}.png"
+        images[Path(filename)] = create_input_image(filename, (HEIGHT, WIDTH, 3))
+    return images
+
+
+class TestImageSize:
+    @pytest.mark.parametrize("ext", [".jpg", ".png"])
+    def test_get_image_size(self, create_image, ext):
+        data = _encode(ext, create_image((HEIGHT, WIDTH, 3)))
+        assert get_image_size(data) == (WIDTH, HEIGHT)
+
+    def test_get_image_size_unsupported_format(self, create_image):
+        data = _encode(".bmp", create_image((HEIGHT, WIDTH, 3)))
+        assert get_image_size(data) is None
+
+    def test_get_image_size_truncated_jpeg(self, create_image):
+        data = _encode(".jpg", create_image((HEIGHT, WIDTH, 3)))
+        assert get_image_size(data[:10]) is None
+
+    @pytest.mark.parametrize(
+        "target_size,flag",
+        [
+            ((20, 15), cv2.IMREAD_REDUCED_COLOR_8),
+            ((21, 15), cv2.IMREAD_REDUCED_COLOR_4),
+            ((80, 60), cv2.IMREAD_REDUCED_COLOR_2),
+            ((81, 60), cv2.IMREAD_COLOR),
+        ],
+    )
+    def test_get_decode_flag(self, target_size, flag):
+        assert get_decode_flag((WIDTH, HEIGHT), target_size) == flag
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestDecodeImage:
+    def test_decode_full_resolution(self, create_input_image):
+        img = create_input_image("image.png", (HEIGHT, WIDTH, 3))
+        np.testing.assert_equal(decode_image(Path("image.png")), img)
+
+    @pytest.mark.parametrize("ext", ["jpg", "png"])
+    def test_decode_reduced_resolution(self, create_input_image, ext):
+        create_input_image(f"image.{ext}", (HEIGHT, WIDTH, 3))
+        img = decode_image(Path(f"image.{ext}"), (40, 30))
+        assert img.shape == (HEIGHT // 4, WIDTH // 4, 3)
+
+    def test_decode_invalid_file(self):
+        Path("image.jpg").write_bytes(b"not an image")
+        assert decode_image(Path("image.jpg")) is None
+
+
+class TestImagePrefetcher:
+    def test_invalid_num_prefetch(self):
+        with pytest.raises(ValueError) as excinfo:
+            ImagePrefetcher([], 0)
+        assert str(excinfo.value) == "num_prefetch must be a positive integer."
+
+    def test_get_in_order(self, image_files):
+        prefetcher = ImagePrefetcher(list(image_files), 2)
+        for path, img in image_files.items():
+            np.testing.assert_equal(prefetcher.get(path), img)
+        prefetcher.shutdown()
+
+    def test_get_skips_earlier_images(self, image_files):
+        paths = list(image_files)
+        prefetcher = ImagePrefetcher(paths, 2)
+        np.testing.assert_equal(prefetcher.get(paths[3]), image_files[paths[3]])
+        np.testing.assert_equal(prefetcher.get(paths[4]), image_files[paths[4]])
+        prefetcher.shutdown()
+
+    def test_get_image_which_was_not_queued(self, image_files):
+        path = list(image_files)[0]
+        prefetcher = ImagePrefetcher([], 2)
+        np.testing.assert_equal(prefetcher.get(path), image_files[path])
+        prefetcher.shutdown()
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestPrefetchingNode:
+    def test_invalid_prefetch(self):
+        with pytest.raises(ValueError) as excinfo:
+            Node(source=".", prefetch=-1)
+        assert str(excinfo.value) == "prefetch must be a non-negative integer."
+
+    def test_reads_directory_in_order(self, create_input_image, create_input_video):
+        images = [
+            create_input_image(f"image{i}.png", (HEIGHT, WIDTH, 3)) for i in range(3)
+        ]
+        video = create_input_video(
+            "image1_video.avi", fps=10, size=(HEIGHT, WIDTH, 3), num_frames=2
+        )
+        reader = Node(source=".", prefetch=2)
+        outputs = [reader.run({}) for _ in range(6)]
+        reader.release_resources()
+
+        assert [output["filename"] for output in outputs[:5]] == [
+            "image0.png",
+            "image1.png",
+            "image1_video.avi",
+            "image1_video.avi",
+            "image2.png",
+        ]
+        np.testing.assert_equal(
+            [output["img"] for output in outputs[:5]],
+            [images[0], images[1], video[0], video[1], images[2]],
+        )
+        assert outputs[5]["pipeline_end"]
+
+    def test_reduced_decode(self, create_input_image):
+        create_input_image("image.jpg", (HEIGHT, WIDTH, 3))
+        reader = Node(
+            source=".",
+            prefetch=1,
+            reduced_decode=True,
+            resize={"do_resizing": True, "width": 40, "height": 30},
+        )
+        assert reader.videocap.resolution == (WIDTH // 4, HEIGHT // 4)
+        assert reader.run({})["img"].shape == (30, 40, 3)
+        reader.release_resources()
@@ -0,0 +1,171 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from time import sleep
+
+import numpy as np
+import pytest
+
+from peekingduck.nodes.input.utils.read import FrameRange, VideoNoThread, VideoThread
+
+NUM_FRAMES = 20
+BUFFER_SIZE = 3
+SIZE = (32, 48, 3)
+
+
+@pytest.fixture
+def video_path(tmp_dir, create_input_video):
+    path = "video.avi"
+    frames = create_input_video(path, fps=10, size=SIZE, num_frames=NUM_FRAMES)
+    return path, frames
+
+
+def _read_all(reader):
+    frames = []
+    while True:
+        ret, frame = reader.read_frame()
+        if not ret:
+            break
+        if frame is not None:
+            frames.append(frame)
+    return frames
+
+
+class TestVideoThread:
+    def test_invalid_buffer_size(self, video_path):
+        with pytest.raises(ValueError) as excinfo:
+            VideoThread(video_path[0], False, True, buffer_size=-1)
+        assert str(excinfo.value) == "buffer_size must be a non-negative integer."
+
+    def test_invalid_buffer_policy(self, video_path):
+        with pytest.raises(ValueError) as excinfo:
+            VideoThread(video_path[0], False, True, buffer_policy="drop_all")
+        assert "buffer_policy must be one of" in str(excinfo.value)
+
+    def test_unbounded_buffer_keeps_every_frame(self, video_path):
+        reader = VideoThread(video_path[0], False, True)
+        reader.thread.join(timeout=10)
+        assert reader.queue_size == NUM_FRAMES
+        assert len(_read_all(reader)) == NUM_FRAMES
+        assert reader.dropped_frames == 0
+
+    def test_block_policy_bounds_buffer_without_dropping(self, video_path):
+        reader = VideoThread(
+            video_path[0], False, True, buffer_size=BUFFER_SIZE, buffer_policy="block"
+        )
+        sleep(0.5)
+        assert reader.queue_size == BUFFER_SIZE
+        # the reading thread resumes as frames are consumed
+        frames = []
+        while len(frames) < NUM_FRAMES:
+            ret, frame = reader.read_frame()
+            assert ret
+            if frame is not None and (not frames or frame is not frames[-1]):
+                frames.append(frame)
+            assert reader.queue_size <= BUFFER_SIZE
+        assert reader.dropped_frames == 0
+        reader.shutdown()
+
+    def test_drop_oldest_policy_keeps_latest_frames(self, video_path):
+        reader = VideoThread(
+            video_path[0],
+            False,
+            True,
+            buffer_size=BUFFER_SIZE,
+            buffer_policy="drop_oldest",
+        )
+        reader.thread.join(timeout=10)
+        assert reader.queue_size == BUFFER_SIZE
+        assert reader.dropped_frames == NUM_FRAMES - BUFFER_SIZE
+        frames = _read_all(reader)
+        assert len(frames) == BUFFER_SIZE
+        np.testing.assert_equal(frames[-1], video_path[1][-1])
+
+    def test_drop_newest_policy_keeps_earliest_frames(self, video_path):
+        reader = VideoThread(
+            video_path[0],
+            False,
+            True,
+            buffer_size=BUFFER_SIZE,
+            buffer_policy="drop_newest",
+        )
+        reader.thread.join(timeout=10)
+        assert reader.queue_size == BUFFER_SIZE
+        assert reader.dropped_frames == NUM_FRAMES - BUFFER_SIZE
+        frames = _read_all(reader)
+        assert len(frames) == BUFFER_SIZE
+        np.testing.assert_equal(frames[0], video_path[1][0])
+
+
+class TestFrameRange:
+    def test_resolve_frames_only(self):
+        assert FrameRange(start_frame=5, end_frame=10).resolve(0) == (5, 10)
+
+    def test_resolve_times(self):
+        frame_range = FrameRange(start_time=1.0, end_time=2.5)
+        assert frame_range.resolve(10) == (10, 25)
+
+    def test_resolve_combines_frames_and_times(self):
+        frame_range = FrameRange(
+            start_frame=15, end_frame=20, start_time=1.0, end_time=2.5
+        )
+        assert frame_range.resolve(10) == (15, 20)
+
+    def test_resolve_times_without_fps(self):
+        with pytest.raises(ValueError) as excinfo:
+            FrameRange(start_time=1.0).resolve(0)
+        assert "require a source with a known FPS" in str(excinfo.value)
+
+
+@pytest.mark.parametrize("reader_cls", [VideoNoThread, VideoThread])
+class TestFrameSelection:
+    @staticmethod
+    def _create_reader(reader_cls, path, frame_range):
+        if reader_cls is VideoThread:
+            reader = VideoThread(path, False, True, frame_range=frame_range)
+            # avoid duplicated frames when reading faster than the thread
+            reader.thread.join(timeout=10)
+            return reader
+        return reader_cls(path, False, frame_range)
+
+    def test_frame_stride(self, reader_cls, video_path):
+        reader = self._create_reader(reader_cls, video_path[0], FrameRange(stride=3))
+        frames = _read_all(reader)
+        np.testing.assert_equal(frames, video_path[1][::3])
+        assert reader.selected_frame_count == len(frames)
+        reader.shutdown()
+
+    def test_start_and_end_frame(self, reader_cls, video_path):
+        frame_range = FrameRange(stride=2, start_frame=5, end_frame=12)
+        reader = self._create_reader(reader_cls, video_path[0], frame_range)
+        frames = _read_all(reader)
+        np.testing.assert_equal(frames, video_path[1][5:12:2])
+        assert reader.selected_frame_count == len(frames)
+        reader.shutdown()
+
+    def test_start_and_end_time(self, reader_cls, video_path):
+        # the test video is 2 seconds long at 10 FPS
+        frame_range = FrameRange(start_time=0.5, end_time=1.5)
+        reader = self._create_reader(reader_cls, video_path[0], frame_range)
+        frames = _read_all(reader)
+        np.testing.assert_equal(frames, video_path[1][5:15])
+        reader.shutdown()
+
+    def test_end_frame_past_end_of_video(self, reader_cls, video_path):
+        frame_range = FrameRange(start_frame=15, end_frame=100)
+        reader = self._create_reader(reader_cls, video_path[0], frame_range)
+        frames = _read_all(reader)
+        np.testing.assert_equal(frames, video_path[1][15:])
+        assert reader.selected_frame_count == NUM_FRAMES - 15
+        reader.shutdown()
@@ -80,6 +80,91 @@ class TestMediaReader:
         print(captured.records)
         assert_msg_in_logs("Possible network connectivity error.", captured.records)
 
+    def test_invalid_buffer_policy(self):
+        with pytest.raises(ValueError) as excinfo:
+            Node(source=".", buffer_policy="drop_all")
+        assert "buffer_policy drop_all: must be one of" in str(excinfo.value)
+
+    def test_invalid_buffer_size(self):
+        with pytest.raises(ValueError) as excinfo:
+            Node(source=".", buffer_size=-1)
+        assert str(excinfo.value) == "buffer_size must be a non-negative integer."
+
+    @pytest.mark.parametrize(
+        "config,message",
+        [
+            ({"frame_stride": 0}, "frame_stride must be a positive integer."),
+            ({"start_frame": -1}, "start_frame must be a non-negative integer."),
+            (
+                {"start_frame": 5, "end_frame": 5},
+                "end_frame must be greater than start_frame.",
+            ),
+            ({"start_time": -1.0}, "start_time must be non-negative."),
+            (
+                {"start_time": 2, "end_time": 1.5},
+                "end_time must be greater than start_time.",
+            ),
+        ],
+    )
+    def test_invalid_frame_range(self, config, message):
+        with pytest.raises(ValueError) as excinfo:
+            Node(source=".", **config)
+        assert str(excinfo.value) == message
+
+    def test_reader_reads_frame_range(self, create_input_video):
+        video = create_input_video(
+            "video1.avi", fps=10, size=(60, 80, 3), num_frames=30
+        )
+        reader = Node(source="video1.avi", frame_stride=4, start_frame=6, end_frame=20)
+        assert reader.total_frame_count == 4
+        outputs = [reader.run({}) for _ in range(5)]
+        assert [output["pipeline_end"] for output in outputs] == [False] * 4 + [True]
+        assert np.array_equal([output["img"] for output in outputs[:4]], video[6:20:4])
+        assert outputs[0]["saved_video_fps"] == 2.5
+        assert reader.progress == 100
+
+    @pytest.mark.parametrize(
+        "roi, message",
+        [
+            ([], "roi must contain at least one region of interest."),
+            ([[0, 0, 10]], "Each roi must be in (x1, y1, x2, y2) format."),
+        ],
+    )
+    def test_invalid_roi(self, roi, message):
+        with pytest.raises(ValueError) as excinfo:
+            Node(source=".", roi=roi)
+        assert str(excinfo.value) == message
+
+    def test_reader_without_roi_has_no_roi_outputs(self, create_input_image):
+        create_input_image("image1.png", (60, 80, 3))
+        node = Node(source="image1.png")
+        output = node.run({})
+        assert "full_img" not in output
+        assert "roi_boxes" not in output
+        assert "full_img" not in node.outputs
+        assert "roi_boxes" not in node.outputs
+        assert "full_img" in Node(source="image1.png", roi=[[0, 0, 1, 1]]).outputs
+
+    def test_reader_crops_roi(self, create_input_image):
+        image1 = create_input_image("image1.png", (60, 80, 3))
+        output = Node(source="image1.png", roi=[[0.25, 0.5, 0.75, 1.0]]).run({})
+        np.testing.assert_equal(output["full_img"], image1)
+        np.testing.assert_equal(output["roi_boxes"], [[20, 30, 60, 60]])
+        np.testing.assert_equal(output["img"], image1[30:60, 20:60])
+        assert not np.shares_memory(output["img"], output["full_img"])
+
+    def test_reader_packs_multiple_rois(self, create_input_image):
+        image1 = create_input_image("image1.png", (60, 80, 3))
+        output = Node(
+            source="image1.png",
+            resize={"do_resizing": True, "width": 40, "height": 30},
+            roi=[[0, 0, 10, 10], [20, 0, 40, 30]],
+        ).run({})
+        assert output["full_img"].shape == (30, 40, 3)
+        assert output["img"].shape == (30, 30, 3)
+        np.testing.assert_equal(output["img"][:10, :10], output["full_img"][:10, :10])
+        np.testing.assert_equal(output["img"][:, 10:], output["full_img"][:, 20:])
+
     def test_reader_reads_one_image(self, create_input_image):
         filename = "image1.png"
         image1 = create_input_image(filename, (900, 800, 3))
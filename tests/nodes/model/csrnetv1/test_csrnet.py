@@ -13,11 +13,15 @@
 # limitations under the License.
 
 from pathlib import Path
+from unittest import mock
 
 import cv2
+import numpy.testing as npt
 import pytest
+import tensorflow as tf
 import yaml
 
+from peekingduck.nodes.base import WeightsDownloaderMixin
 from peekingduck.nodes.model.csrnet import Node
 from tests.conftest import PKD_DIR, get_groundtruth
 
@@ -42,6 +46,54 @@ def csrnet_bad_config_value(request, csrnet_config):
     return csrnet_config
 
 
+@pytest.fixture(
+    params=[
+        {"key": "model_format", "value": "onnx"},
+        {"key": "tflite_num_threads", "value": -1},
+    ],
+)
+def csrnet_bad_tflite_config_value(request, csrnet_config):
+    csrnet_config[request.param["key"]] = request.param["value"]
+    return csrnet_config
+
+
+class RandomCSRNet(tf.Module):
+    """Predicts a density map at an eighth of the input resolution with random
+    weights.
+    """
+
+    def __init__(self):
+        super().__init__()
+        tf.random.set_seed(0)
+        self.model = tf.keras.Sequential(
+            [
+                tf.keras.layers.Conv2D(8, 3, strides=2, padding="same"),
+                tf.keras.layers.Conv2D(8, 3, strides=2, padding="same"),
+                tf.keras.layers.Conv2D(1, 3, strides=2, padding="same"),
+                tf.keras.layers.Activation("sigmoid"),
+            ]
+        )
+        self.model.build((None, None, None, 3))
+
+    @tf.function(input_signature=[tf.TensorSpec([None, None, None, 3], tf.float32)])
+    def serve(self, input_1):
+        return {"y_out": self.model(input_1)}
+
+
+@pytest.fixture(name="random_csrnet_dir")
+def fixture_random_csrnet_dir(csrnet_config, tmp_path):
+    model_dir = tmp_path / "peekingduck_weights" / "csrnet" / "tensorflow"
+    model_file = csrnet_config["weights"]["tensorflow"]["model_file"]
+    model = RandomCSRNet()
+    tf.saved_model.save(
+        model,
+        str(model_dir / model_file[csrnet_config["model_type"]]),
+        signatures={"serving_default": model.serve},
+    )
+    csrnet_config["weights_parent_dir"] = str(tmp_path)
+    return model_dir
+
+
 @pytest.mark.mlmodel
 class TestCsrnet:
     def test_no_human(self, no_human_image, csrnet_config):
@@ -70,3 +122,27 @@ class TestCsrnet:
         with pytest.raises(ValueError) as excinfo:
             _ = Node(config=csrnet_bad_config_value)
         assert "must be between (0.0, inf]" in str(excinfo.value)
+
+
+class TestCsrnetTFLite:
+    def test_invalid_config_value(self, csrnet_bad_tflite_config_value):
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=csrnet_bad_tflite_config_value)
+        assert "must be" in str(excinfo.value)
+
+    @mock.patch.object(WeightsDownloaderMixin, "_has_weights", return_value=True)
+    def test_tflite_matches_tensorflow(
+        self, _, crowd_image, csrnet_config, random_csrnet_dir
+    ):
+        crowd_img = cv2.imread(crowd_image)
+        expected = Node(csrnet_config).run({"img": crowd_img})
+
+        csrnet_config["model_format"] = "tflite"
+        csrnet = Node(csrnet_config)
+        output = csrnet.run({"img": crowd_img})
+        # the resized input changes with the aspect ratio of the image
+        csrnet.run({"img": crowd_img[: crowd_img.shape[0] // 2]})
+
+        assert len(list(random_csrnet_dir.glob("*-tflite-*.tflite"))) == 1
+        npt.assert_allclose(output["density_map"], expected["density_map"], atol=1e-4)
+        assert output["count"] == expected["count"]
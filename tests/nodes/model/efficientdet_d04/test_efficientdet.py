@@ -13,14 +13,19 @@
 # limitations under the License.
 
 from pathlib import Path
+from unittest import mock
 
 import cv2
 import numpy as np
 import numpy.testing as npt
 import pytest
+import tensorflow as tf
 import yaml
 
 from peekingduck.nodes.model.efficientdet import Node
+from peekingduck.nodes.model.efficientdet_d04.efficientdet_files.detector import (
+    Detector,
+)
 from tests.conftest import PKD_DIR, get_groundtruth
 
 GT_RESULTS = get_groundtruth(Path(__file__).resolve())
@@ -40,6 +45,12 @@ def efficientdet_config():
         {"key": "score_threshold", "value": -0.5},
         {"key": "score_threshold", "value": 1.5},
         {"key": "model_type", "value": 5},
+        {"key": "model_format", "value": "onnx"},
+        {"key": "tflite_num_threads", "value": -1},
+        {"key": "tile_size", "value": 0},
+        {"key": "tile_overlap", "value": 1.0},
+        {"key": "tile_iou_threshold", "value": 1.5},
+        {"key": "tile_match_threshold", "value": 1.5},
     ],
 )
 def efficientdet_bad_config_value(request, efficientdet_config):
@@ -127,6 +138,13 @@ class TestEfficientDet:
             _ = Node(config=efficientdet_bad_config_value)
         assert "must be" in str(excinfo.value)
 
+    def test_invalid_config_jit_compile(self, efficientdet_config):
+        efficientdet_config["model_format"] = "tflite"
+        efficientdet_config["jit_compile"] = True
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=efficientdet_config)
+        assert "jit_compile is only supported by the tensorflow" in str(excinfo.value)
+
     def test_invalid_model_type(self, efficientdet_config):
         efficientdet_config["model_type"] = 1.5
         with pytest.raises(TypeError) as excinfo:
@@ -135,3 +153,52 @@ class TestEfficientDet:
             str(excinfo.value)
             == "type of model.efficientdet's `model_type` must be int; got float instead"
         )
+
+
+def random_efficientdet(x):
+    """Returns 3 boxes, scores and labels which depend on every pixel of the
+    input, including the padding.
+    """
+    boxes = tf.reshape(x[:, :2, :2, :], (1, 3, 4)) + tf.reduce_mean(x)
+    scores = tf.sigmoid(tf.reduce_mean(x, axis=[1, 2]))
+    labels = tf.constant([[0.0, 1.0, 0.0]])
+    return boxes, scores, labels
+
+
+class TestEfficientDetDetector:
+    @pytest.mark.parametrize("jit_compile", [False, True])
+    def test_graph_matches_numpy_preprocessing(self, create_image, jit_compile):
+        with mock.patch(
+            "peekingduck.nodes.model.efficientdet_d04.efficientdet_files.detector"
+            ".load_graph",
+            return_value=random_efficientdet,
+        ):
+            detector = Detector(
+                Path("."),
+                {0: "person", 1: "bicycle"},
+                [0],
+                "tensorflow",
+                0,
+                90,
+                {0: "model.pb"},
+                {"inputs": ["x:0"], "outputs": ["Identity:0"]},
+                {0: 64},
+                0.0,
+                False,
+                jit_compile=jit_compile,
+            )
+
+        for shape in [(72, 128, 3), (64, 48, 3), (72, 128, 3)]:
+            image = create_image(shape)
+            boxes, labels, scores = detector.predict_object_bbox_from_image(image)
+            preprocessed, scale = detector._preprocess(image)
+            network_output = tuple(
+                np.squeeze(output.numpy())
+                for output in random_efficientdet(tf.constant(preprocessed))
+            )
+            expected = detector._postprocess(network_output, scale, shape[:2])
+
+            npt.assert_allclose(boxes, expected[0], atol=1e-5)
+            npt.assert_equal(labels, expected[1])
+            npt.assert_allclose(scores, expected[2], atol=1e-5)
+        assert detector.detect_all.num_traces == 1
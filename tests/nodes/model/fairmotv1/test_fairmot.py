@@ -24,10 +24,12 @@ import yaml
 
 from peekingduck.nodes.base import WeightsDownloaderMixin
 from peekingduck.nodes.model.fairmot import Node
+from peekingduck.nodes.model.fairmotv1.fairmot_files.dla import DLASeg
 from peekingduck.nodes.model.fairmotv1.fairmot_files.matching import (
     fuse_motion,
     iou_distance,
 )
+from peekingduck.nodes.model.fairmotv1.fairmot_files.tracker import Tracker
 from tests.conftest import PKD_DIR
 
 # Frame index for manual manipulation of detections to trigger some
@@ -311,3 +313,35 @@ class TestFairMOT:
         with pytest.raises(TypeError) as excinfo:
             _ = fairmot.run({"img": ("image name", no_human_img)})
         assert str(excinfo.value) == "image must be a np.ndarray"
+
+
+@mock.patch.object(WeightsDownloaderMixin, "_has_weights", return_value=True)
+def test_torchscript_cache(_, fairmot_config, tmp_path):
+    """Uses randomly initialized weights, so that the cache can be tested
+    without downloading the weights.
+    """
+    model_dir = tmp_path / "peekingduck_weights" / "fairmot" / "pytorch"
+    model_dir.mkdir(parents=True)
+    torch.manual_seed(0)
+    model = DLASeg(Tracker.heads, Tracker.down_ratio)
+    torch.save({"state_dict": model.state_dict()}, model_dir / "fairmot.pth")
+    fairmot_config["weights"]["pytorch"]["model_file"]["dla_34"] = "fairmot.pth"
+    fairmot_config["weights_parent_dir"] = str(tmp_path)
+    fairmot_config["input_size"] = [128, 96]
+    inputs = torch.rand(1, 3, 96, 128)
+    with torch.no_grad():
+        expected = Node(config=fairmot_config).model.tracker.model(inputs)
+    fairmot_config["torchscript_cache"] = True
+
+    _ = Node(config=fairmot_config)
+    with mock.patch.object(Tracker, "_load_eager_model") as mock_load_eager_model:
+        fairmot = Node(config=fairmot_config)
+    with torch.no_grad():
+        output = fairmot.model.tracker.model(inputs)
+
+    assert len(list(model_dir.glob("fairmot-torchscript-*.pt"))) == 1
+    mock_load_eager_model.assert_not_called()
+    assert isinstance(fairmot.model.tracker.model, torch.jit.ScriptModule)
+    assert output.keys() == expected.keys()
+    for key, value in expected.items():
+        npt.assert_allclose(output[key], value, atol=1e-4)
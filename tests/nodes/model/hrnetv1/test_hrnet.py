@@ -13,13 +13,19 @@
 # limitations under the License.
 
 from pathlib import Path
+from unittest import mock
 
 import cv2
 import numpy as np
 import numpy.testing as npt
 import pytest
+import tensorflow as tf
 import yaml
+from tensorflow.python.framework.convert_to_constants import (
+    convert_variables_to_constants_v2,
+)
 
+from peekingduck.nodes.base import WeightsDownloaderMixin
 from peekingduck.nodes.model.hrnet import Node
 from tests.conftest import PKD_DIR, get_groundtruth
 
@@ -47,6 +53,41 @@ def hrnet_bad_config_value(request, hrnet_config):
     return hrnet_config
 
 
+@pytest.fixture(
+    params=[
+        {"key": "model_format", "value": "onnx"},
+        {"key": "tflite_num_threads", "value": -1},
+    ],
+)
+def hrnet_bad_tflite_config_value(request, hrnet_config):
+    hrnet_config[request.param["key"]] = request.param["value"]
+    return hrnet_config
+
+
+@pytest.fixture(name="random_hrnet_dir")
+def fixture_random_hrnet_dir(hrnet_config, tmp_path):
+    """Writes a frozen graph with the input and output nodes of HRNet and
+    random weights, which predicts heatmaps at a quarter of the resolution.
+    """
+    tf.random.set_seed(0)
+    model = tf.keras.Sequential(
+        [
+            tf.keras.layers.Rescaling(1 / 255.0),
+            tf.keras.layers.Conv2D(8, 3, strides=2, padding="same", activation="relu"),
+            tf.keras.layers.Conv2D(17, 3, strides=2, padding="same"),
+            tf.keras.layers.Activation("sigmoid"),
+        ]
+    )
+    concrete_func = tf.function(model).get_concrete_function(
+        tf.TensorSpec([None, None, None, 3], name="x")
+    )
+    graph_def = convert_variables_to_constants_v2(concrete_func).graph.as_graph_def()
+    model_dir = tmp_path / "peekingduck_weights" / "hrnet" / "tensorflow"
+    tf.io.write_graph(graph_def, str(model_dir), "hrnet_frozen.pb", as_text=False)
+    hrnet_config["weights_parent_dir"] = str(tmp_path)
+    return model_dir
+
+
 @pytest.mark.mlmodel
 class TestHRNet:
     def test_no_human_image(self, no_human_image, hrnet_config):
@@ -127,3 +168,79 @@ class TestHRNet:
         with pytest.raises(ValueError) as excinfo:
             _ = Node(config=hrnet_bad_config_value)
         assert "_threshold must be between [0.0, 1.0]" in str(excinfo.value)
+
+
+class TestHRNetTFLite:
+    def test_invalid_config_value(self, hrnet_bad_tflite_config_value):
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=hrnet_bad_tflite_config_value)
+        assert "must be" in str(excinfo.value)
+
+    @mock.patch.object(WeightsDownloaderMixin, "_has_weights", return_value=True)
+    def test_tflite_matches_tensorflow(
+        self, _, multi_person_image, hrnet_config, random_hrnet_dir
+    ):
+        multi_person_img = cv2.imread(multi_person_image)
+        inputs = {
+            "img": multi_person_img,
+            "bboxes": np.array([[0.1, 0.1, 0.5, 0.9], [0.5, 0.2, 0.9, 0.8]]),
+        }
+        expected = Node(hrnet_config).run(inputs)
+
+        hrnet_config["model_format"] = "tflite"
+        hrnet_config["tflite_num_threads"] = 2
+        output = Node(hrnet_config).run(inputs)
+
+        assert len(list(random_hrnet_dir.glob("hrnet_frozen-tflite-*.tflite"))) == 1
+        npt.assert_allclose(output["keypoints"], expected["keypoints"], atol=1e-4)
+        npt.assert_allclose(
+            output["keypoint_scores"], expected["keypoint_scores"], atol=1e-4
+        )
+
+
+class TestHRNetBatching:
+    def test_invalid_max_batch_size(self, hrnet_config):
+        hrnet_config["max_batch_size"] = 0
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=hrnet_config)
+        assert "max_batch_size must be" in str(excinfo.value)
+
+    @mock.patch.object(WeightsDownloaderMixin, "_has_weights", return_value=True)
+    def test_bucketed_batches(
+        self, _, multi_person_image, hrnet_config, random_hrnet_dir
+    ):
+        multi_person_img = cv2.imread(multi_person_image)
+        inputs = {
+            "img": multi_person_img,
+            "bboxes": np.array(
+                [
+                    [0.1, 0.1, 0.5, 0.9],
+                    [0.5, 0.2, 0.9, 0.8],
+                    [0.0, 0.0, 1.0, 1.0],
+                    [0.3, 0.4, 0.4, 0.6],
+                    [0.6, 0.0, 1.0, 0.3],
+                ]
+            ),
+        }
+        hrnet_config["max_batch_size"] = 1
+        expected = Node(hrnet_config).run(inputs)
+
+        hrnet_config["max_batch_size"] = 4
+        hrnet = Node(hrnet_config)
+        hrnet.model.detector.hrnet = mock.Mock(wraps=hrnet.model.detector.hrnet)
+        output = hrnet.run(inputs)
+        inputs["bboxes"] = inputs["bboxes"][:3]
+        output_3 = hrnet.run(inputs)
+
+        batch_sizes = [
+            call.args[0].shape[0] for call in hrnet.model.detector.hrnet.call_args_list
+        ]
+        assert batch_sizes == [4, 1, 4]
+        npt.assert_array_equal(
+            hrnet.model.detector.hrnet.call_args_list[-1].args[0].numpy()[3], 0
+        )
+        npt.assert_allclose(output["keypoints"], expected["keypoints"], atol=1e-5)
+        npt.assert_allclose(
+            output["keypoint_scores"], expected["keypoint_scores"], atol=1e-5
+        )
+        npt.assert_allclose(output_3["keypoints"], expected["keypoints"][:3], atol=1e-5)
@@ -63,3 +63,20 @@ class TestPreprocessing:
         _, actual_output = crop_and_resize(test_img, test_bboxes, test_out_size)
 
         npt.assert_almost_equal(actual_output, expected_output)
+
+    def test_crop_and_resize_into_buffer(self, create_image, projected_bbox_arr):
+        test_img = create_image((720, 480, 3))
+        test_out_size = (256, 192)
+        buffer = np.full((4, 192, 256, 3), 255, dtype=np.uint8)
+        expected_crops, expected_matrices = crop_and_resize(
+            test_img, projected_bbox_arr, test_out_size
+        )
+
+        crops, matrices = crop_and_resize(
+            test_img, projected_bbox_arr, test_out_size, buffer
+        )
+
+        assert crops.shape == (3, 192, 256, 3)
+        assert np.shares_memory(crops, buffer)
+        npt.assert_equal(crops, expected_crops)
+        npt.assert_equal(matrices, expected_matrices)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 from pathlib import Path
 from unittest import mock
 
@@ -24,7 +25,14 @@ import yaml
 
 from peekingduck.nodes.base import WeightsDownloaderMixin
 from peekingduck.nodes.model.mask_rcnn import Node
+from peekingduck.nodes.model.mask_rcnnv1.mask_rcnn_files.detection.backbone_utils import (
+    resnet_fpn_backbone,
+)
+from peekingduck.nodes.model.mask_rcnnv1.mask_rcnn_files.detection.mask_rcnn import (
+    MaskRCNN,
+)
 from peekingduck.utils.bbox.transforms import xyxy2xyxyn
+from peekingduck.utils.quantization import get_quantized_path
 from tests.conftest import PKD_DIR, get_groundtruth
 
 GT_RESULTS = get_groundtruth(Path(__file__).resolve())
@@ -211,3 +219,127 @@ class TestMaskRCNN:
         with pytest.raises(TypeError) as excinfo:
             _ = mask_rcnn.run({"img": ("image name", no_human_img)})
         assert "image must be a np.ndarray" == str(excinfo.value)
+
+
+@pytest.fixture
+def mask_rcnn_random_weights_config(mask_rcnn_config, tmp_path):
+    """Uses randomly initialized r50-fpn weights, so that quantization can be
+    tested without downloading the weights.
+    """
+    model_dir = tmp_path / "peekingduck_weights" / "mask_rcnn" / "pytorch"
+    model_dir.mkdir(parents=True)
+    torch.manual_seed(0)
+    model = MaskRCNN(backbone=resnet_fpn_backbone("resnet50"), num_classes=91)
+    torch.save(model.state_dict(), model_dir / "mask-rcnn-r50-fpn.pth")
+    classes = {str(i): {"id": i, "name": str(i)} for i in range(1, 92)}
+    (model_dir / "coco_90.json").write_text(json.dumps(classes))
+    mask_rcnn_config["weights_parent_dir"] = str(tmp_path)
+    mask_rcnn_config["min_size"] = 128
+    mask_rcnn_config["max_size"] = 160
+    mask_rcnn_config["score_threshold"] = 0.0
+    with mock.patch.object(WeightsDownloaderMixin, "_has_weights", return_value=True):
+        yield mask_rcnn_config
+
+
+class TestMaskRCNNQuantization:
+    def test_invalid_quantization_mode(self, mask_rcnn_config):
+        mask_rcnn_config["quantization"] = "int8"
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=mask_rcnn_config)
+        assert "quantization must be one of" in str(excinfo.value)
+
+    def test_dynamic_quantization_created_on_first_use(
+        self, create_image, mask_rcnn_random_weights_config
+    ):
+        image = create_image((96, 128, 3))
+        mask_rcnn_random_weights_config["quantization"] = "dynamic"
+        mask_rcnn = Node(config=mask_rcnn_random_weights_config)
+        quantized_path = get_quantized_path(
+            mask_rcnn.model.detector.model_path, "dynamic"
+        )
+
+        assert quantized_path.is_file()
+        assert isinstance(
+            mask_rcnn.model.detector.mask_rcnn.roi_heads.box_head.fc6,
+            torch.ao.nn.quantized.dynamic.Linear,
+        )
+        expected = mask_rcnn.run({"img": image})
+        output = Node(config=mask_rcnn_random_weights_config).run({"img": image})
+        for key in expected:
+            npt.assert_equal(output[key], expected[key])
+
+    def test_static_quantization(self, create_image, mask_rcnn_random_weights_config):
+        image = create_image((96, 128, 3))
+        mask_rcnn_random_weights_config["quantization"] = "static"
+        with pytest.raises(FileNotFoundError) as excinfo:
+            _ = Node(config=mask_rcnn_random_weights_config)
+        assert "peekingduck quantize model.mask_rcnn" in str(excinfo.value)
+
+        mask_rcnn_random_weights_config["quantization"] = None
+        mask_rcnn = Node(config=mask_rcnn_random_weights_config)
+        quantized_path = mask_rcnn.model.quantize("static", [image])
+        expected = mask_rcnn.run({"img": image})
+
+        assert quantized_path.is_file()
+        mask_rcnn_random_weights_config["quantization"] = "static"
+        output = Node(config=mask_rcnn_random_weights_config).run({"img": image})
+        for key in expected:
+            npt.assert_equal(output[key], expected[key])
+
+
+class TestMaskRCNNTorchScriptCache:
+    def test_cache_requires_float_model(self, mask_rcnn_config):
+        mask_rcnn_config["quantization"] = "dynamic"
+        mask_rcnn_config["torchscript_cache"] = True
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=mask_rcnn_config)
+        assert "torchscript_cache is not supported" in str(excinfo.value)
+
+    def test_compile_and_load(self, create_image, mask_rcnn_random_weights_config):
+        image = create_image((96, 128, 3))
+        # random weights rarely predict the person class
+        mask_rcnn_random_weights_config["detect"] = ["*"]
+        expected = Node(config=mask_rcnn_random_weights_config).run({"img": image})
+        mask_rcnn_random_weights_config["torchscript_cache"] = True
+
+        compiled_output = Node(config=mask_rcnn_random_weights_config).run(
+            {"img": image}
+        )
+        with mock.patch(
+            "peekingduck.nodes.model.mask_rcnnv1.mask_rcnn_files.detector."
+            "Detector._load_float_model"
+        ) as mock_load_float_model:
+            mask_rcnn = Node(config=mask_rcnn_random_weights_config)
+        output = mask_rcnn.run({"img": image})
+
+        model_dir = mask_rcnn.model.detector.model_path.parent
+        assert len(list(model_dir.glob("mask-rcnn-r50-fpn-torchscript-*.pt"))) == 1
+        mock_load_float_model.assert_not_called()
+        assert isinstance(
+            mask_rcnn.model.detector.mask_rcnn.backbone, torch.jit.ScriptModule
+        )
+        assert len(expected["bboxes"]) > 0
+        for result in (compiled_output, output):
+            npt.assert_allclose(result["bboxes"], expected["bboxes"], atol=1e-4)
+            npt.assert_equal(result["bbox_labels"], expected["bbox_labels"])
+            npt.assert_allclose(
+                result["bbox_scores"], expected["bbox_scores"], atol=1e-4
+            )
+            npt.assert_equal(result["masks"], expected["masks"])
+
+    def test_mismatched_head_weights(self, mask_rcnn_random_weights_config):
+        mask_rcnn_random_weights_config["torchscript_cache"] = True
+        mask_rcnn = Node(config=mask_rcnn_random_weights_config)
+        model_path = mask_rcnn.model.detector.model_path
+        (cache_path,) = model_path.parent.glob("mask-rcnn-r50-fpn-torchscript-*.pt")
+        state_dict = torch.load(model_path)
+        del state_dict["roi_heads.box_predictor.cls_score.weight"]
+        torch.save(state_dict, model_path)
+
+        with mock.patch(
+            "peekingduck.nodes.model.mask_rcnnv1.mask_rcnn_files.detector."
+            "get_cache_path",
+            return_value=cache_path,
+        ), pytest.raises(RuntimeError) as excinfo:
+            _ = Node(config=mask_rcnn_random_weights_config)
+        assert "roi_heads.box_predictor.cls_score.weight" in str(excinfo.value)
@@ -43,6 +43,8 @@ def movenet_config():
         {"key": "keypoint_score_threshold", "value": -0.5},
         {"key": "keypoint_score_threshold", "value": 1.5},
         {"key": "model_type", "value": "bad_model_type"},
+        {"key": "model_format", "value": "onnx"},
+        {"key": "tflite_num_threads", "value": -1},
     ],
 )
 def movenet_bad_config_value(request, movenet_config):
@@ -49,6 +49,8 @@ def posenet_type(request, posenet_config):
         {"key": "score_threshold", "value": 1.5},
         {"key": "model_type", "value": 101},
         {"key": "model_type", "value": "inception"},
+        {"key": "model_format", "value": "onnx"},
+        {"key": "tflite_num_threads", "value": -1},
     ],
 )
 def posenet_bad_config_value(request, posenet_config):
@@ -48,6 +48,7 @@ class TestPredictor:
     def test_predictor(self, posenet_config, model_dir):
         predictor = Predictor(
             model_dir,
+            posenet_config["model_format"],
             posenet_config["model_type"],
             posenet_config["weights"][posenet_config["model_format"]]["model_file"],
             posenet_config["model_nodes"],
@@ -62,6 +63,7 @@ class TestPredictor:
         single_person_img = cv2.imread(single_person_image)
         predictor = Predictor(
             model_dir,
+            posenet_config["model_format"],
             posenet_config["model_type"],
             posenet_config["weights"][posenet_config["model_format"]]["model_file"],
             posenet_config["model_nodes"],
@@ -79,6 +81,7 @@ class TestPredictor:
         single_person_img = cv2.imread(single_person_image)
         predictor = Predictor(
             model_dir,
+            posenet_config["model_format"],
             posenet_config["model_type"],
             posenet_config["weights"][posenet_config["model_format"]]["model_file"],
             posenet_config["model_nodes"],
@@ -98,6 +101,7 @@ class TestPredictor:
     def test_model_instantiation(self, posenet_config, model_dir):
         predictor = Predictor(
             model_dir,
+            posenet_config["model_format"],
             posenet_config["model_type"],
             posenet_config["weights"][posenet_config["model_format"]]["model_file"],
             posenet_config["model_nodes"],
@@ -113,6 +117,7 @@ class TestPredictor:
         single_person_img = cv2.imread(single_person_image)
         predictor = Predictor(
             model_dir,
+            posenet_config["model_format"],
             posenet_config["model_type"],
             posenet_config["weights"][posenet_config["model_format"]]["model_file"],
             posenet_config["model_nodes"],
@@ -131,6 +136,7 @@ class TestPredictor:
         single_person_img = cv2.imread(single_person_image)
         predictor = Predictor(
             model_dir,
+            posenet_config["model_format"],
             posenet_config["model_type"],
             posenet_config["weights"][posenet_config["model_format"]]["model_file"],
             posenet_config["model_nodes"],
@@ -19,10 +19,12 @@ import cv2
 import numpy as np
 import numpy.testing as npt
 import pytest
+import tensorflow as tf
 import yaml
 
 from peekingduck.nodes.base import WeightsDownloaderMixin
 from peekingduck.nodes.model.yolo import Node
+from peekingduck.nodes.model.yolov4.yolo_files.detector import Detector
 from tests.conftest import PKD_DIR, get_groundtruth
 
 GT_RESULTS = get_groundtruth(Path(__file__).resolve())
@@ -50,6 +52,48 @@ def yolo_bad_config_value(request, yolo_config):
     return yolo_config
 
 
+@pytest.fixture(
+    params=[
+        {"key": "model_format", "value": "onnx"},
+        {"key": "tflite_num_threads", "value": -1},
+    ],
+)
+def yolo_bad_tflite_config_value(request, yolo_config):
+    yolo_config[request.param["key"]] = request.param["value"]
+    return yolo_config
+
+
+@pytest.fixture(
+    params=[
+        {"key": "tile_size", "value": 0},
+        {"key": "tile_overlap", "value": 1.0},
+        {"key": "tile_iou_threshold", "value": 1.5},
+        {"key": "tile_match_threshold", "value": 1.5},
+    ],
+)
+def yolo_bad_tiling_config_value(request, yolo_config):
+    yolo_config[request.param["key"]] = request.param["value"]
+    return yolo_config
+
+
+@pytest.fixture(name="random_yolo")
+def fixture_random_yolo():
+    """A YOLO-like network which predicts a bbox and 2 class scores at every
+    position of its 16x16 input.
+    """
+    tf.random.set_seed(0)
+    conv = tf.keras.layers.Conv2D(6, 3, padding="same", activation="sigmoid")
+    conv.build((None, 16, 16, 3))
+
+    def model(inputs):
+        pred = tf.reshape(conv(inputs), (1, -1, 6))
+        # (y1, x1, y2, x2) bboxes
+        bboxes = tf.concat([pred[:, :, :2] * 0.5, pred[:, :, 2:4] * 0.5 + 0.5], -1)
+        return [pred, tf.concat([bboxes, pred[:, :, 4:]], -1)]
+
+    return model
+
+
 @pytest.fixture(params=["v4", "v4tiny"])
 def yolo_type(request, yolo_config):
     yolo_config["model_type"] = request.param
@@ -102,6 +146,23 @@ class TestYolo:
             _ = Node(config=yolo_bad_config_value)
         assert "_threshold must be between [0.0, 1.0]" in str(excinfo.value)
 
+    def test_invalid_config_jit_compile(self, yolo_config):
+        yolo_config["model_format"] = "tflite"
+        yolo_config["jit_compile"] = True
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=yolo_config)
+        assert "jit_compile is only supported by the tensorflow" in str(excinfo.value)
+
+    def test_invalid_tiling_config_value(self, yolo_bad_tiling_config_value):
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=yolo_bad_tiling_config_value)
+        assert "tile_" in str(excinfo.value)
+
+    def test_invalid_tflite_config_value(self, yolo_bad_tflite_config_value):
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=yolo_bad_tflite_config_value)
+        assert "must be" in str(excinfo.value)
+
     @mock.patch.object(WeightsDownloaderMixin, "_has_weights", return_value=True)
     def test_invalid_config_model_files(self, _, yolo_config):
         with pytest.raises(ValueError) as excinfo:
@@ -110,3 +171,43 @@ class TestYolo:
             ] = "some/invalid/path"
             _ = Node(config=yolo_config)
         assert "Graph file does not exist. Please check that" in str(excinfo.value)
+
+
+class TestYoloDetector:
+    @pytest.mark.parametrize("jit_compile", [False, True])
+    def test_graph_matches_eager(self, tmp_path, random_yolo, jit_compile):
+        (tmp_path / "model.pb").touch()
+        with mock.patch.object(
+            Detector, "_load_yolo_weights", return_value=random_yolo
+        ):
+            detector = Detector(
+                tmp_path,
+                ["person", "car"],
+                [1],
+                "tensorflow",
+                "v4tiny",
+                {"v4tiny": "model.pb"},
+                {},
+                10,
+                20,
+                16,
+                0.5,
+                0.1,
+                jit_compile=jit_compile,
+            )
+
+        rng = np.random.default_rng(0)
+        for shape in [(32, 48, 3), (20, 20, 3), (32, 48, 3)]:
+            image = rng.integers(0, 256, shape, dtype=np.uint8)
+            bboxes, labels, scores = detector.predict_object_bbox_from_image(image)
+            expected = detector._postprocess(
+                *(output.numpy() for output in detector._detect_all(image))
+            )
+
+            assert bboxes.size > 0
+            assert set(labels) == {"car"}
+            npt.assert_allclose(bboxes, expected[0], atol=1e-5)
+            npt.assert_allclose(scores, expected[1], atol=1e-5)
+            # swapped to (x1, y1, x2, y2)
+            assert (bboxes[:, 2:] >= bboxes[:, :2]).all()
+        assert detector.detect_all.num_traces == 1
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import shutil
 from pathlib import Path
 from unittest import mock
 
@@ -24,7 +25,14 @@ import yaml
 
 from peekingduck.nodes.base import WeightsDownloaderMixin
 from peekingduck.nodes.model.yolox import Node
-from tests.conftest import PKD_DIR, get_groundtruth
+from peekingduck.nodes.model.yoloxv1.yolox_files.model import YOLOX
+from tests.conftest import (
+    HUMAN_IMAGES,
+    NO_HUMAN_IMAGES,
+    PKD_DIR,
+    TEST_IMAGES_DIR,
+    get_groundtruth,
+)
 
 GT_RESULTS = get_groundtruth(Path(__file__).resolve())
 
@@ -51,6 +59,19 @@ def yolox_bad_config_value(request, yolox_config):
     return yolox_config
 
 
+@pytest.fixture(
+    params=[
+        {"key": "tile_size", "value": 0},
+        {"key": "tile_overlap", "value": 1.0},
+        {"key": "tile_iou_threshold", "value": 1.5},
+        {"key": "tile_match_threshold", "value": 1.5},
+    ],
+)
+def yolox_bad_tiling_config_value(request, yolox_config):
+    yolox_config[request.param["key"]] = request.param["value"]
+    return yolox_config
+
+
 @pytest.fixture(
     params=[
         {"agnostic_nms": True, "fuse": True, "half": True},
@@ -125,6 +146,24 @@ class TestYOLOX:
         npt.assert_equal(output["bbox_labels"], expected["bbox_labels"])
         npt.assert_allclose(output["bbox_scores"], expected["bbox_scores"], atol=1e-2)
 
+    def test_run_batch(self, yolox_config):
+        images = [
+            cv2.imread(str(TEST_IMAGES_DIR / image_name))
+            for image_name in HUMAN_IMAGES + NO_HUMAN_IMAGES
+        ]
+        yolox = Node(yolox_config)
+        batch_outputs = yolox.run_batch([{"img": image} for image in images])
+
+        assert len(batch_outputs) == len(images)
+        for image, batch_output in zip(images, batch_outputs):
+            output = yolox.run({"img": image})
+            assert batch_output.keys() == output.keys()
+            npt.assert_allclose(batch_output["bboxes"], output["bboxes"], atol=1e-4)
+            npt.assert_equal(batch_output["bbox_labels"], output["bbox_labels"])
+            npt.assert_allclose(
+                batch_output["bbox_scores"], output["bbox_scores"], atol=1e-4
+            )
+
     def test_get_detect_ids(self, yolox_config):
         yolox = Node(yolox_config)
         assert yolox.model.detect_ids == [0]
@@ -139,6 +178,11 @@ class TestYOLOX:
             _ = Node(config=yolox_bad_config_value)
         assert "_threshold must be between [0.0, 1.0]" in str(excinfo.value)
 
+    def test_invalid_tiling_config_value(self, yolox_bad_tiling_config_value):
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=yolox_bad_tiling_config_value)
+        assert "tile_" in str(excinfo.value)
+
     @mock.patch.object(WeightsDownloaderMixin, "_has_weights", return_value=True)
     def test_invalid_config_model_files(self, _, yolox_config):
         with pytest.raises(ValueError) as excinfo:
@@ -159,3 +203,189 @@ class TestYOLOX:
         with pytest.raises(TypeError) as excinfo:
             _ = yolox.run({"img": ("image name", no_human_img)})
         assert "image must be a np.ndarray" == str(excinfo.value)
+
+
+@pytest.fixture(
+    params=[
+        {"key": "onnx_graph_optimization", "value": "none"},
+        {"key": "onnx_intra_op_threads", "value": -1},
+        {"key": "onnx_inter_op_threads", "value": -1},
+    ],
+)
+def yolox_bad_onnx_config_value(request, yolox_config):
+    yolox_config["model_format"] = "onnx"
+    yolox_config[request.param["key"]] = request.param["value"]
+    return yolox_config
+
+
+@mock.patch("peekingduck.nodes.model.yolox.check_requirements", return_value=0)
+class TestYOLOXOnnx:
+    def test_invalid_config_value(self, _, yolox_bad_onnx_config_value):
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=yolox_bad_onnx_config_value)
+        assert "onnx_" in str(excinfo.value)
+
+    def test_invalid_model_format(self, _, yolox_config):
+        yolox_config["model_format"] = "tflite"
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=yolox_config)
+        assert "model_format must be one of" in str(excinfo.value)
+
+    @mock.patch.object(WeightsDownloaderMixin, "_download_to")
+    def test_missing_onnx_graph(self, _, __, yolox_config, tmp_path):
+        yolox_config["model_format"] = "onnx"
+        yolox_config["weights_parent_dir"] = str(tmp_path)
+        model_dir = tmp_path / "peekingduck_weights" / "yolox" / "onnx"
+        model_dir.mkdir(parents=True)
+        (model_dir / "coco.names").write_text("person\n")
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=yolox_config)
+        assert "convert_yolox_to_onnx.py" in str(excinfo.value)
+
+    @pytest.mark.mlmodel
+    def test_onnx_matches_pytorch(self, _, human_image, yolox_config, tmp_path):
+        pytest.importorskip("onnxruntime")
+        human_img = cv2.imread(human_image)
+        with mock.patch("torch.cuda.is_available", return_value=False):
+            yolox = Node(yolox_config)
+        expected = yolox.run({"img": human_img})
+
+        model_dir = tmp_path / "peekingduck_weights" / "yolox" / "onnx"
+        model_dir.mkdir(parents=True)
+        pytorch_dir = yolox.model.detector.model_path.parent
+        shutil.copy(pytorch_dir / "coco.names", model_dir)
+        torch.onnx.export(
+            yolox.model.detector.yolox,
+            torch.zeros(1, 3, 416, 416),
+            str(model_dir / "yolox-tiny.onnx"),
+            opset_version=11,
+        )
+        yolox_config["model_format"] = "onnx"
+        yolox_config["weights_parent_dir"] = str(tmp_path)
+        output = Node(yolox_config).run({"img": human_img})
+
+        npt.assert_allclose(output["bboxes"], expected["bboxes"], atol=1e-3)
+        npt.assert_equal(output["bbox_labels"], expected["bbox_labels"])
+        npt.assert_allclose(output["bbox_scores"], expected["bbox_scores"], atol=1e-3)
+
+
+@pytest.fixture
+def yolox_random_weights_config(yolox_config, tmp_path):
+    """Uses randomly initialized yolox-tiny weights, so that quantization can
+    be tested without downloading the weights.
+    """
+    model_dir = tmp_path / "peekingduck_weights" / "yolox" / "pytorch"
+    model_dir.mkdir(parents=True)
+    model_size = yolox_config["model_size"]["yolox-tiny"]
+    torch.manual_seed(0)
+    model = YOLOX(80, model_size["depth"], model_size["width"])
+    torch.save({"model": model.state_dict()}, model_dir / "yolox-tiny.pth")
+    (model_dir / "coco.names").write_text("\n".join(str(i) for i in range(80)))
+    yolox_config["weights_parent_dir"] = str(tmp_path)
+    yolox_config["input_size"] = 128
+    with mock.patch.object(
+        WeightsDownloaderMixin, "_has_weights", return_value=True
+    ), mock.patch("torch.cuda.is_available", return_value=False):
+        yield yolox_config
+
+
+class TestYOLOXQuantization:
+    def test_invalid_quantization_mode(self, yolox_config):
+        yolox_config["quantization"] = "dynamic"
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=yolox_config)
+        assert "quantization must be one of" in str(excinfo.value)
+
+    def test_quantization_requires_pytorch_format(self, yolox_config):
+        yolox_config["model_format"] = "tensorrt"
+        yolox_config["quantization"] = "static"
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=yolox_config)
+        assert "only supported by the pytorch model_format" in str(excinfo.value)
+
+    def test_missing_quantized_model(self, yolox_random_weights_config):
+        yolox_random_weights_config["quantization"] = "static"
+        with pytest.raises(FileNotFoundError) as excinfo:
+            _ = Node(config=yolox_random_weights_config)
+        assert "peekingduck quantize model.yolox" in str(excinfo.value)
+
+    def test_quantize_and_load(self, yolox_random_weights_config):
+        images = [
+            cv2.imread(str(TEST_IMAGES_DIR / image_name))
+            for image_name in HUMAN_IMAGES[:2]
+        ]
+        yolox = Node(config=yolox_random_weights_config)
+        with pytest.raises(ValueError):
+            yolox.model.quantize("dynamic", images)
+
+        quantized_path = yolox.model.quantize("static", images)
+        expected = yolox.run({"img": images[0]})
+
+        assert quantized_path.is_file()
+        assert quantized_path.parent == yolox.model.detector.model_path.parent
+        yolox_random_weights_config["quantization"] = "static"
+        quantized_yolox = Node(config=yolox_random_weights_config)
+        output = quantized_yolox.run({"img": images[0]})
+        batch_output = quantized_yolox.run_batch([{"img": images[0]}])[0]
+
+        assert quantized_yolox.model.detector.device.type == "cpu"
+        for key in ("bboxes", "bbox_labels", "bbox_scores"):
+            npt.assert_equal(output[key], expected[key])
+        npt.assert_allclose(batch_output["bbox_scores"], output["bbox_scores"])
+
+
+class TestYOLOXTorchScriptCache:
+    def test_cache_requires_float_pytorch_format(self, yolox_config):
+        yolox_config["torchscript_cache"] = True
+        yolox_config["quantization"] = "static"
+        with pytest.raises(ValueError) as excinfo:
+            _ = Node(config=yolox_config)
+        assert "torchscript_cache is only supported" in str(excinfo.value)
+
+    @pytest.mark.parametrize("fuse", [True, False])
+    def test_compile_and_load(self, yolox_random_weights_config, fuse):
+        image = cv2.imread(str(TEST_IMAGES_DIR / HUMAN_IMAGES[0]))
+        yolox_random_weights_config["fuse"] = fuse
+        # random weights only produce detections with low scores
+        yolox_random_weights_config["detect"] = ["*"]
+        yolox_random_weights_config["score_threshold"] = 0.01
+        yolox = Node(config=yolox_random_weights_config)
+        expected = [
+            yolox.run({"img": image}),
+            yolox.run_batch([{"img": image}, {"img": image}])[1],
+        ]
+        yolox_random_weights_config["torchscript_cache"] = True
+
+        compiled_yolox = Node(config=yolox_random_weights_config)
+        model_dir = compiled_yolox.model.detector.model_path.parent
+        cache_paths = list(model_dir.glob("yolox-tiny-torchscript-*.pt"))
+        with mock.patch(
+            "peekingduck.nodes.model.yoloxv1.yolox_files.detector."
+            "Detector._load_float_model"
+        ) as mock_load_float_model:
+            cached_yolox = Node(config=yolox_random_weights_config)
+        outputs = [
+            compiled_yolox.run({"img": image}),
+            cached_yolox.run({"img": image}),
+            cached_yolox.run_batch([{"img": image}, {"img": image}])[1],
+        ]
+
+        assert len(cache_paths) == 1
+        assert len(expected[0]["bboxes"]) > 0
+        mock_load_float_model.assert_not_called()
+        assert isinstance(cached_yolox.model.detector.yolox, torch.jit.ScriptModule)
+        for output, expected_output in zip(outputs, expected[:1] * 2 + expected[1:]):
+            npt.assert_allclose(output["bboxes"], expected_output["bboxes"], atol=1e-4)
+            npt.assert_equal(output["bbox_labels"], expected_output["bbox_labels"])
+            npt.assert_allclose(
+                output["bbox_scores"], expected_output["bbox_scores"], atol=1e-4
+            )
+
+    def test_settings_change_cache(self, yolox_random_weights_config):
+        yolox_random_weights_config["torchscript_cache"] = True
+        yolox = Node(config=yolox_random_weights_config)
+        yolox_random_weights_config["input_size"] = 160
+        _ = Node(config=yolox_random_weights_config)
+
+        model_dir = yolox.model.detector.model_path.parent
+        assert len(list(model_dir.glob("yolox-tiny-torchscript-*.pt"))) == 2
@@ -77,6 +77,10 @@ class TestNode:
         results = c_node.run({"input": 1})
         assert results == {"data1": 1, "data2": 42}
 
+    def test_node_run_batch_falls_back_to_run(self, c_node):
+        results = c_node.run_batch([{"input": 1}, {"input": 2}])
+        assert results == [{"data1": 1, "data2": 42}, {"data1": 1, "data2": 42}]
+
     def test_node_init_takes_empty_dictionary(self):
         ConcreteNode({})
         assert True
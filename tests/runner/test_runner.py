@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import sys
 from pathlib import Path
 from unittest import mock
@@ -232,3 +233,68 @@ class TestRunner:
 
         for idx, (node, _) in enumerate(node_list):
             assert node == NODES["nodes"][idx]
+
+    @pytest.mark.parametrize("executor", ["batched", "parallel", "pipelined"])
+    def test_run_nodes_with_executor(self, test_input_node, test_node_end, executor):
+        prepare_environment()
+        correct_data = {
+            "test_output_1": "test_output_0",
+            "test_output_2": "test_output_0",
+            "pipeline_end": "test_output_1",
+        }
+        test_runner = Runner(nodes=[test_input_node, test_node_end], executor=executor)
+        test_runner.run()
+
+        assert test_runner.pipeline.data == correct_data
+
+    def test_run_nodes_with_profile(self, test_input_node, test_node_end):
+        prepare_environment()
+        profile_output = MODULE_DIR / "profile.json"
+        test_runner = Runner(
+            nodes=[test_input_node, test_node_end],
+            profile=True,
+            profile_output=str(profile_output),
+        )
+        test_runner.run()
+
+        with open(profile_output) as infile:
+            stats = json.load(infile)
+        assert stats["num_frames"] == 1
+        assert [row["node"] for row in stats["nodes"]] == [PKD_NODE, PKD_NODE]
+        assert [row["count"] for row in stats["nodes"]] == [1, 1]
+
+    def test_run_nodes_with_trace(self, test_input_node, test_node_end):
+        prepare_environment()
+        trace_output = MODULE_DIR / "trace.json"
+        test_runner = Runner(
+            nodes=[test_input_node, test_node_end], trace_output=str(trace_output)
+        )
+        test_runner.run()
+
+        with open(trace_output) as infile:
+            trace = json.load(infile)
+        spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        assert [span["name"] for span in spans] == [PKD_NODE, PKD_NODE]
+
+    @pytest.mark.parametrize(
+        "executor,executor_config",
+        [
+            ("unknown", None),
+            ("pipelined", {"queue_size": 0}),
+            ("pipelined", {"a": 1}),
+            ("parallel", {"max_workers": 0}),
+            ("batched", {"batch_size": 0}),
+            ("multi_stream", {"sources": []}),
+            ("sharded", {"num_workers": 0}),
+        ],
+    )
+    def test_init_invalid_executor(
+        self, test_input_node, test_node_end, executor, executor_config
+    ):
+        prepare_environment()
+        with pytest.raises(SystemExit):
+            Runner(
+                nodes=[test_input_node, test_node_end],
+                executor=executor,
+                executor_config=executor_config,
+            )
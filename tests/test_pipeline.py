@@ -12,10 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import numpy.testing as npt
 import pytest
 
 from peekingduck.nodes.abstract_node import AbstractNode
-from peekingduck.pipeline import Pipeline
+from peekingduck.nodes.output.csv_writer import Node as CSVWriterNode
+from peekingduck.pipeline import DataPoolView, Pipeline, get_node_inputs
 
 
 class MockedNode(AbstractNode):
@@ -63,3 +69,109 @@ class TestPipeline:
 
     def test_empty_pipeline_results(self, pipeline_correct):
         assert not pipeline_correct.get_pipeline_results()
+
+
+@pytest.fixture
+def data_pool():
+    return {
+        "img": np.zeros((720, 1280, 3), dtype=np.uint8),
+        "bboxes": np.array([[0.1, 0.2, 0.3, 0.4]]),
+        "count": 1,
+        "filename": "video.mp4",
+        "zone_count": [1, 2],
+    }
+
+
+class TestDataPoolView:
+    def test_all_inputs_get_view(self, data_pool):
+        node = MockedNode(config={"input": ["all"], "output": ["none"]})
+        inputs = get_node_inputs(node, data_pool)
+
+        assert isinstance(inputs, DataPoolView)
+        assert list(inputs) == list(data_pool)
+        assert len(inputs) == len(data_pool)
+
+    def test_values_are_copied_on_access(self, data_pool):
+        view = DataPoolView(data_pool)
+
+        assert view["count"] == 1
+        assert view["filename"] == "video.mp4"
+        assert view.copied_keys == []
+
+        view["zone_count"].append(3)
+
+        assert view.copied_keys == ["zone_count"]
+        assert view["zone_count"] == [1, 2, 3]
+        assert data_pool["zone_count"] == [1, 2]
+
+    def test_arrays_are_copied_on_access(self, data_pool):
+        view = DataPoolView(data_pool)
+        img = view["img"]
+        img[0, 0] = 255
+
+        assert not np.shares_memory(img, data_pool["img"])
+        assert view.copied_keys == ["img"]
+        assert view["img"] is img
+        assert data_pool["img"][0, 0, 0] == 0
+
+    def test_custom_node_modifies_arrays_in_place(self, data_pool):
+        node = MockedNode(
+            config={"input": ["all"], "output": ["none"]}, node_name="draw.custom"
+        )
+        inputs = get_node_inputs(node, data_pool)
+        inputs["img"][0, 0] = 255
+        inputs["bboxes"] *= 2
+
+        assert inputs["img"][0, 0, 0] == 255
+        npt.assert_allclose(inputs["bboxes"], [[0.2, 0.4, 0.6, 0.8]])
+        assert data_pool["img"][0, 0, 0] == 0
+        npt.assert_allclose(data_pool["bboxes"], [[0.1, 0.2, 0.3, 0.4]])
+
+    def test_shared_arrays_are_read_only_views(self, data_pool):
+        view = DataPoolView(data_pool, share_arrays=True)
+        img = view["img"]
+
+        assert np.shares_memory(img, data_pool["img"])
+        assert view.copied_keys == []
+        with pytest.raises(ValueError):
+            img[0, 0] = 255
+        assert data_pool["img"].flags.writeable
+
+    def test_set_and_delete_do_not_modify_data_pool(self, data_pool):
+        view = DataPoolView(data_pool)
+        view["count"] = 2
+        view["new_key"] = "value"
+        del view["bboxes"]
+
+        assert view["count"] == 2
+        assert "new_key" in view
+        assert "bboxes" not in view
+        with pytest.raises(KeyError):
+            view["bboxes"]
+        with pytest.raises(KeyError):
+            del view["bboxes"]
+        assert data_pool["count"] == 1
+        assert "new_key" not in data_pool
+        assert "bboxes" in data_pool
+
+    @pytest.mark.usefixtures("tmp_dir")
+    def test_csv_writer_does_not_copy_img(self, data_pool):
+        node = CSVWriterNode(
+            {
+                "input": ["all"],
+                "output": ["none"],
+                "file_path": str(Path.cwd() / "stats.csv"),
+                "stats_to_track": ["count", "zone_count"],
+                "logging_interval": 1,
+            }
+        )
+        data_pool["pipeline_end"] = False
+        inputs = get_node_inputs(node, data_pool)
+
+        tracemalloc.start()
+        node.run(inputs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert inputs.copied_keys == ["zone_count"]
+        assert peak < data_pool["img"].nbytes
@@ -0,0 +1,34 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from peekingduck.utils.batch_tracker import BatchTracker
+
+
+class TestBatchTracker:
+    def test_single_frames(self):
+        tracker = BatchTracker()
+        for start_time in (1.0, 2.0):
+            tracker.begin(start_time)
+            assert tracker.end() == (start_time, 1)
+
+    def test_batch(self):
+        tracker = BatchTracker()
+        for start_time in (1.0, 2.0, 3.0):
+            tracker.begin(start_time)
+
+        assert tracker.end() == (1.0, 3)
+        assert tracker.end() is None
+        assert tracker.end() is None
+        tracker.begin(4.0)
+        assert tracker.end() == (4.0, 1)
@@ -0,0 +1,67 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+import tensorflow as tf
+
+from peekingduck.utils.graph_functions import GraphFunction
+
+SIGNATURE = [tf.TensorSpec([None, None, 3], tf.uint8)]
+
+
+def mean_pixel(image):
+    return tf.reduce_mean(tf.cast(image, tf.float32), axis=[0, 1])
+
+
+class TestGraphFunction:
+    def test_traced_once(self, caplog):
+        graph_func = GraphFunction(mean_pixel, SIGNATURE, "Test")
+
+        with caplog.at_level(logging.INFO, logger="peekingduck.utils.graph_functions"):
+            for shape in [(8, 8, 3), (16, 4, 3), (8, 8, 3)]:
+                image = np.random.randint(0, 256, shape, dtype=np.uint8)
+                npt.assert_allclose(
+                    graph_func(image).numpy(), mean_pixel(image).numpy(), rtol=1e-5
+                )
+
+        assert graph_func.num_traces == 1
+        assert [record.message for record in caplog.records] == ["Traced Test graph"]
+
+    def test_retrace_warning(self, caplog):
+        graph_func = GraphFunction(mean_pixel, SIGNATURE, "Test")
+        graph_func(np.zeros((8, 8, 3), dtype=np.uint8))
+        # forcing a retrace, which the fixed input signature otherwise prevents
+        graph_func.function = tf.function(mean_pixel)
+
+        with caplog.at_level(logging.INFO, logger="peekingduck.utils.graph_functions"):
+            graph_func(np.zeros((8, 8, 3), dtype=np.uint8))
+            graph_func(np.zeros((4, 4, 3), dtype=np.uint8))
+
+        assert graph_func.num_traces == 2
+        assert caplog.records[-1].levelname == "WARNING"
+        assert caplog.records[-1].message == "Retraced Test graph, traced 2 times"
+
+    @pytest.mark.parametrize(
+        "image",
+        [np.zeros((8, 8), dtype=np.uint8), np.zeros((8, 8, 4), dtype=np.uint8)],
+    )
+    def test_invalid_input(self, image):
+        graph_func = GraphFunction(mean_pixel, SIGNATURE, "Test")
+
+        with pytest.raises((TypeError, ValueError)):
+            graph_func(image)
@@ -0,0 +1,145 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.nodes.dabble.motion_gate import Node as MotionGateNode
+from peekingduck.runner import Runner
+from peekingduck.utils.inference_gate import InferenceGate
+from tests.conftest import FramesNode
+
+SIZE = (60, 80, 3)
+
+
+class CountingModelNode(AbstractNode):
+    def __init__(self, node_path="model.counting"):
+        super().__init__({"input": ["img"], "output": ["bboxes"]}, node_path=node_path)
+        self.num_calls = 0
+
+    def run(self, inputs):
+        assert "motion_detected" not in inputs
+        self.num_calls += 1
+        return {"bboxes": np.array([[self.num_calls, 0, 0, 0]])}
+
+
+class BatchModelNode(CountingModelNode):
+    def __init__(self):
+        super().__init__(node_path="model.batch")
+        self.batch_sizes = []
+
+    def run_batch(self, inputs_list):
+        self.batch_sizes.append(len(inputs_list))
+        return [self.run(inputs) for inputs in inputs_list]
+
+
+class CollectorNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["bboxes"], "output": ["none"]}, node_path="output.collector"
+        )
+        self.bboxes = []
+
+    def run(self, inputs):
+        self.bboxes.append(int(inputs["bboxes"][0, 0]))
+        return {}
+
+
+@pytest.fixture
+def frames():
+    static = np.full(SIZE, 100, dtype=np.uint8)
+    moved = static.copy()
+    moved[10:40, 20:60] = 255
+    return [static, static, static, moved, moved, static]
+
+
+class TestInferenceGate:
+    def test_gated_nodes_default_to_model_nodes(self):
+        gate = MotionGateNode()
+        model = CountingModelNode()
+        inference_gate = InferenceGate(
+            [FramesNode([]), gate, model, CollectorNode()], gate
+        )
+        assert inference_gate.nodes == [model]
+
+    def test_gated_node_not_found(self):
+        gate = MotionGateNode(gated_nodes=["model.yolox"])
+        model = CountingModelNode()
+        with pytest.raises(ValueError) as excinfo:
+            InferenceGate([FramesNode([]), model, gate], gate)
+        assert "gated_nodes ['model.yolox']" in str(excinfo.value)
+
+    def test_skips_and_reuses_outputs(self):
+        gate = MotionGateNode()
+        model = CountingModelNode()
+        inference_gate = InferenceGate([gate, model], gate)
+        inference_gate.attach()
+        assert model.optional_inputs == ["motion_detected", "source_id"]
+
+        flags = [True, False, False, True, False]
+        outputs = [model.run({"img": None, "motion_detected": flag}) for flag in flags]
+        assert [int(output["bboxes"][0, 0]) for output in outputs] == [1, 1, 1, 2, 2]
+        assert inference_gate.report() == {"model.counting": {"runs": 5, "skipped": 3}}
+
+    def test_runs_first_frame_of_each_source(self):
+        gate = MotionGateNode()
+        model = BatchModelNode()
+        inference_gate = InferenceGate([gate, model], gate)
+        inference_gate.attach()
+        outputs = model.run_batch(
+            [
+                {"img": None, "motion_detected": False, "source_id": 0},
+                {"img": None, "motion_detected": False, "source_id": 1},
+                {"img": None, "motion_detected": False, "source_id": 0},
+            ]
+        )
+        assert model.batch_sizes == [2]
+        assert [int(output["bboxes"][0, 0]) for output in outputs] == [1, 2, 1]
+
+    @pytest.mark.parametrize(
+        "executor", ["sequential", "batched", "parallel", "pipelined"]
+    )
+    def test_runner_skips_static_frames(self, frames, executor):
+        model = BatchModelNode()
+        collector = CollectorNode()
+        runner = Runner(
+            nodes=[FramesNode(frames), MotionGateNode(), model, collector],
+            executor=executor,
+        )
+        runner.run()
+
+        # the last frame differs from the frame the model last ran on
+        assert model.num_calls == 3
+        assert collector.bboxes == [1, 1, 1, 2, 2, 3]
+        assert runner.inference_gate.get_stats() == {
+            "model.batch": {"runs": 6, "skipped": 3}
+        }
+
+    def test_runner_without_motion_gate(self, frames):
+        runner = Runner(
+            nodes=[FramesNode(frames), CountingModelNode(), CollectorNode()]
+        )
+        assert runner.inference_gate is None
+
+    def test_runner_rejects_multiple_motion_gates(self, frames):
+        with pytest.raises(SystemExit):
+            Runner(
+                nodes=[
+                    FramesNode(frames),
+                    MotionGateNode(),
+                    MotionGateNode(),
+                    CountingModelNode(),
+                ]
+            )
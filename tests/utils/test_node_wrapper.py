@@ -0,0 +1,90 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.utils.node_wrapper import wrap_node_runs
+
+
+class DoubleNode(AbstractNode):
+    def __init__(self):
+        super().__init__({"input": ["x"], "output": ["y"]}, node_path="model.double")
+        self.num_calls = 0
+
+    def run(self, inputs):
+        self.num_calls += 1
+        return {"y": inputs["x"] * 2}
+
+
+class BatchDoubleNode(DoubleNode):
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def run_batch(self, inputs_list):
+        self.batch_sizes.append(len(inputs_list))
+        return [self.run(inputs) for inputs in inputs_list]
+
+
+class SkipOddWrapper:
+    """Runs the node on even inputs only, and returns -1 for odd inputs."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, inputs_list, run_batch):
+        self.batches.append([inputs["x"] for inputs in inputs_list])
+        even = [inputs for inputs in inputs_list if inputs["x"] % 2 == 0]
+        results = iter(run_batch(even))
+        return [
+            next(results) if inputs["x"] % 2 == 0 else {"y": -1}
+            for inputs in inputs_list
+        ]
+
+
+@pytest.fixture
+def wrapper():
+    return SkipOddWrapper()
+
+
+class TestNodeWrapper:
+    def test_run(self, wrapper):
+        node = DoubleNode()
+        wrap_node_runs(node, wrapper)
+
+        assert node.run({"x": 2}) == {"y": 4}
+        assert node.run({"x": 3}) == {"y": -1}
+        assert wrapper.batches == [[2], [3]]
+        assert node.num_calls == 1
+
+    def test_default_run_batch(self, wrapper):
+        node = DoubleNode()
+        wrap_node_runs(node, wrapper)
+
+        outputs = node.run_batch([{"x": 1}, {"x": 2}])
+        assert outputs == [{"y": -1}, {"y": 4}]
+        # the default run_batch() calls the wrapped run() on each frame
+        assert wrapper.batches == [[1], [2]]
+
+    def test_overridden_run_batch(self, wrapper):
+        node = BatchDoubleNode()
+        wrap_node_runs(node, wrapper)
+
+        outputs = node.run_batch([{"x": 1}, {"x": 2}, {"x": 4}])
+        assert outputs == [{"y": -1}, {"y": 4}, {"y": 8}]
+        # the run() calls of the node's run_batch() are not wrapped again
+        assert wrapper.batches == [[1, 2, 4]]
+        assert node.batch_sizes == [2]
+        assert node.num_calls == 2
@@ -0,0 +1,115 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+
+import pytest
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.utils.profiler import NodeProfiler
+
+
+class MockedNode(AbstractNode):
+    def __init__(self, node_path):
+        super().__init__({"input": ["none"], "output": ["none"]}, node_path=node_path)
+
+    def run(self, inputs):
+        return {}
+
+
+def run_frame(nodes):
+    for node in nodes:
+        node.callback_list.on_run_begin({})
+        node.run({})
+        node.callback_list.on_run_end({})
+
+
+@pytest.fixture
+def nodes():
+    return [MockedNode("input.mocked"), MockedNode("model.mocked")]
+
+
+class TestNodeProfiler:
+    def test_invalid_capacity(self, nodes):
+        with pytest.raises(ValueError) as excinfo:
+            NodeProfiler(nodes, capacity=0)
+        assert "capacity must be a positive integer" in str(excinfo.value)
+
+    def test_attach_wraps_existing_callbacks(self, nodes):
+        callback = lambda data_pool: None
+        nodes[0].callback_list.append("run_begin", callback)
+        nodes[0].callback_list.append("run_end", callback)
+        NodeProfiler(nodes).attach()
+
+        assert nodes[0].callback_list.callbacks["run_begin"][1] == callback
+        assert nodes[0].callback_list.callbacks["run_end"][0] == callback
+
+    def test_ring_buffer(self, nodes):
+        profiler = NodeProfiler(nodes, capacity=3)
+        profiler.attach()
+        for _ in range(5):
+            run_frame(nodes)
+
+        assert profiler.counts.tolist() == [5, 5]
+        assert profiler.latencies.shape == (2, 3)
+        assert (profiler.latencies > 0).all()
+
+        stats = profiler.get_stats()
+        assert stats["num_frames"] == 5
+        assert stats["fps"] > 0
+        for row in stats["nodes"]:
+            assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"] <= row["max_ms"]
+        assert sum(row["share"] for row in stats["nodes"]) == pytest.approx(1)
+
+    def test_batched_frames(self, nodes, monkeypatch):
+        # every run_begin is at 0 sec and every run_end is at 0.3 sec
+        times = iter([0.0] * 3 + [0.3] * 3 + [1.0] + [1.2])
+        monkeypatch.setattr(
+            "peekingduck.utils.profiler.perf_counter", lambda: next(times)
+        )
+        profiler = NodeProfiler(nodes)
+        profiler.attach()
+        for _ in range(3):
+            nodes[1].callback_list.on_run_begin({})
+        for _ in range(3):
+            nodes[1].callback_list.on_run_end({})
+        # an unbatched frame afterwards
+        nodes[1].callback_list.on_run_begin({})
+        nodes[1].callback_list.on_run_end({})
+
+        assert profiler.counts.tolist() == [0, 4]
+        assert profiler.latencies[1, :4] == pytest.approx([0.1, 0.1, 0.1, 0.2])
+        assert profiler.totals[1] == pytest.approx(0.5)
+
+    def test_no_frames(self, nodes):
+        stats = NodeProfiler(nodes).get_stats()
+
+        assert stats["num_frames"] == 0
+        assert stats["fps"] == 0
+        assert stats["nodes"][0]["p99_ms"] == 0
+
+    def test_report(self, nodes, tmp_path):
+        profiler = NodeProfiler(nodes)
+        profiler.attach()
+        run_frame(nodes)
+        output_path = tmp_path / "profile" / "profile.json"
+
+        stats = profiler.report(output_path)
+        with open(output_path) as infile:
+            assert json.load(infile) == stats
+        table = profiler.format_table(stats)
+        assert "input.mocked" in table
+        assert "p95 (ms)" in table
+        assert "1 frames" in table
@@ -0,0 +1,164 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+import torch
+from torch import nn
+
+from peekingduck.utils.quantization import (
+    compare_detections,
+    convert_static,
+    get_quantized_path,
+    prepare_static,
+    quantize_dynamic,
+)
+
+
+class ConvNet(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.conv = nn.Conv2d(3, 8, 3, padding=1)
+        self.bn = nn.BatchNorm2d(8)
+        self.relu = nn.ReLU()
+
+    def forward(self, inputs):
+        return self.relu(self.bn(self.conv(inputs)))
+
+
+def detections(bboxes, labels, scores):
+    return np.array(bboxes, dtype=float).reshape(-1, 4), np.array(labels), scores
+
+
+@pytest.fixture(name="conv_net")
+def fixture_conv_net():
+    torch.manual_seed(0)
+    return ConvNet().eval()
+
+
+class TestQuantization:
+    def test_get_quantized_path(self):
+        path = get_quantized_path(Path("weights") / "yolox-tiny.pth", "static")
+
+        assert path.parent == Path("weights")
+        assert path.name == (
+            f"yolox-tiny-int8-static-{torch.backends.quantized.engine}.pt"
+        )
+
+    def test_quantize_dynamic(self):
+        model = nn.Sequential(nn.Linear(16, 8), nn.ReLU()).eval()
+        inputs = torch.rand(4, 16)
+
+        quantized = quantize_dynamic(model)
+
+        assert isinstance(quantized[0], torch.ao.nn.quantized.dynamic.Linear)
+        assert isinstance(model[0], nn.Linear)
+        with torch.no_grad():
+            npt.assert_allclose(quantized(inputs), model(inputs), atol=0.05)
+
+    def test_static_quantization(self, conv_net):
+        inputs = torch.rand(1, 3, 16, 16)
+        prepared = prepare_static(conv_net, (inputs,))
+        with torch.no_grad():
+            prepared(inputs)
+
+        quantized = convert_static(prepared)
+
+        assert any(
+            isinstance(module, torch.ao.nn.intrinsic.quantized.ConvReLU2d)
+            for module in quantized.modules()
+        )
+        with torch.no_grad():
+            outputs = quantized(inputs)
+            expected = conv_net(inputs)
+        assert not outputs.is_quantized
+        npt.assert_allclose(outputs, expected, atol=0.05)
+
+    def test_load_uncalibrated_structure(self, conv_net, tmp_path):
+        inputs = torch.rand(1, 3, 16, 16)
+        prepared = prepare_static(conv_net, (inputs,))
+        with torch.no_grad():
+            prepared(inputs)
+        quantized = convert_static(prepared)
+        torch.save(quantized.state_dict(), tmp_path / "quantized.pt")
+
+        loaded = convert_static(
+            prepare_static(ConvNet().eval(), (inputs,)), calibrated=False
+        )
+        loaded.load_state_dict(torch.load(tmp_path / "quantized.pt"))
+
+        with torch.no_grad():
+            npt.assert_equal(loaded(inputs).numpy(), quantized(inputs).numpy())
+
+    def test_compare_identical_detections(self):
+        results = [
+            detections(
+                [[0.1, 0.1, 0.5, 0.5], [0.6, 0.6, 0.9, 0.9]], [0, 1], [0.9, 0.8]
+            ),
+            detections([], [], []),
+        ]
+
+        drift = compare_detections(results, results)
+
+        assert drift == {
+            "recall": 1.0,
+            "precision": 1.0,
+            "mean_iou": 1.0,
+            "mean_score_diff": 0.0,
+        }
+
+    def test_compare_drifted_detections(self):
+        reference = [
+            detections(
+                [[0.0, 0.0, 0.4, 0.4], [0.5, 0.5, 0.9, 0.9], [0.0, 0.5, 0.2, 0.9]],
+                ["person", "person", "car"],
+                [0.9, 0.8, 0.7],
+            )
+        ]
+        candidate = [
+            detections(
+                # second box shifted, third box labelled differently, and an
+                # extra box which does not overlap with any reference box
+                [
+                    [0.0, 0.0, 0.4, 0.4],
+                    [0.5, 0.5, 0.9, 0.8],
+                    [0.0, 0.5, 0.2, 0.9],
+                    [0.9, 0.0, 1.0, 0.1],
+                ],
+                ["person", "person", "bus", "person"],
+                [0.85, 0.8, 0.7, 0.3],
+            )
+        ]
+
+        drift = compare_detections(reference, candidate)
+
+        assert drift["recall"] == pytest.approx(2 / 3)
+        assert drift["precision"] == pytest.approx(2 / 4)
+        assert drift["mean_iou"] == pytest.approx((1.0 + 0.75) / 2)
+        assert drift["mean_score_diff"] == pytest.approx(0.025)
+
+    def test_compare_matches_each_candidate_once(self):
+        reference = [
+            detections([[0.0, 0.0, 0.4, 0.4], [0.0, 0.0, 0.4, 0.4]], [0, 0], [0.9, 0.8])
+        ]
+        candidate = [detections([[0.0, 0.0, 0.4, 0.4]], [0], [0.9])]
+
+        drift = compare_detections(reference, candidate)
+
+        assert drift["recall"] == pytest.approx(0.5)
+        assert drift["precision"] == 1.0
+        assert drift["mean_score_diff"] == 0.0
@@ -0,0 +1,223 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.runner import Runner
+from peekingduck.utils.result_cache import HASH_STRIDE, ResultCache
+from tests.conftest import FramesNode
+
+SIZE = (24, 32, 3)
+
+
+class StreamNode(AbstractNode):
+    """Reads the same frame three times from each source."""
+
+    def __init__(self, config):
+        super().__init__(config, node_path="input.visual")
+        self.frame = _frame(self.source)
+        self.count = 0
+
+    def run(self, inputs):
+        self.count += 1
+        return {"img": self.frame, "pipeline_end": self.count > 3}
+
+
+class DetectorNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["img"], "output": ["bboxes", "bbox_labels", "bbox_scores"]},
+            node_path="model.detector",
+        )
+        self.num_calls = 0
+
+    def run(self, inputs):
+        self.num_calls += 1
+        return {
+            "bboxes": np.array([[self.num_calls, 0, 0, 0]]),
+            "bbox_labels": np.array(["person"]),
+            "bbox_scores": np.array([0.9]),
+        }
+
+
+class BatchDetectorNode(DetectorNode):
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def run_batch(self, inputs_list):
+        self.batch_sizes.append(len(inputs_list))
+        return [self.run(inputs) for inputs in inputs_list]
+
+
+class PoseNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["img", "bboxes"], "output": ["keypoints"]},
+            node_path="model.pose",
+        )
+        self.num_calls = 0
+
+    def run(self, inputs):
+        self.num_calls += 1
+        return {"keypoints": np.zeros((1, 17, 2))}
+
+
+class CollectorNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["bboxes"], "output": ["none"]}, node_path="output.collector"
+        )
+        self.bboxes = []
+
+    def run(self, inputs):
+        self.bboxes.append(int(inputs["bboxes"][0, 0]))
+        return {}
+
+
+def _frame(value):
+    return np.full(SIZE, value, dtype=np.uint8)
+
+
+class TestResultCache:
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError) as excinfo:
+            ResultCache([DetectorNode()], capacity=0)
+        assert str(excinfo.value) == "capacity must be a positive integer."
+
+    def test_caches_model_nodes_with_img_input(self):
+        detector = DetectorNode()
+        result_cache = ResultCache([FramesNode([]), detector, CollectorNode()])
+        assert result_cache.nodes == [detector]
+
+    def test_hit_on_same_object(self):
+        detector = DetectorNode()
+        result_cache = ResultCache([detector])
+        result_cache.attach()
+        frame = _frame(1)
+        first = detector.run({"img": frame})
+        # modified in place, e.g. by a draw node
+        frame[:] = 255
+        assert detector.run({"img": frame}) is first
+        assert detector.num_calls == 1
+        assert result_cache.get_stats() == {"model.detector": {"hits": 1, "misses": 1}}
+
+    def test_hit_on_same_content(self):
+        detector = DetectorNode()
+        ResultCache([detector]).attach()
+        first = detector.run({"img": _frame(1)})
+        assert detector.run({"img": _frame(1)}) is first
+        assert detector.run({"img": _frame(2)}) is not first
+        assert detector.num_calls == 2
+
+    def test_different_shape_misses(self):
+        detector = DetectorNode()
+        ResultCache([detector]).attach()
+        frame = np.zeros((4, 6, 3), dtype=np.uint8)
+        detector.run({"img": frame})
+        detector.run({"img": frame.reshape(6, 4, 3)})
+        assert detector.num_calls == 2
+
+    def test_hash_samples_frame(self):
+        detector = DetectorNode()
+        ResultCache([detector]).attach()
+        frame = _frame(1)
+        detector.run({"img": frame})
+        between_samples = frame.copy()
+        between_samples[1, 1] = 0
+        detector.run({"img": between_samples})
+        sampled = frame.copy()
+        sampled[HASH_STRIDE, HASH_STRIDE] = 0
+        detector.run({"img": sampled})
+        assert detector.num_calls == 2
+
+    def test_other_inputs_must_be_same_objects(self):
+        pose = PoseNode()
+        ResultCache([pose]).attach()
+        frame = _frame(1)
+        bboxes = np.array([[0.1, 0.1, 0.5, 0.5]])
+        pose.run({"img": frame, "bboxes": bboxes})
+        pose.run({"img": frame, "bboxes": bboxes})
+        pose.run({"img": frame, "bboxes": bboxes.copy()})
+        assert pose.num_calls == 2
+
+    def test_capacity(self):
+        detector = DetectorNode()
+        ResultCache([detector], capacity=2).attach()
+        frames = [_frame(1), _frame(2)]
+        for frame in frames + frames:
+            detector.run({"img": frame})
+        assert detector.num_calls == 2
+
+    def test_run_batch_runs_each_frame_once(self):
+        detector = BatchDetectorNode()
+        result_cache = ResultCache([detector])
+        result_cache.attach()
+        frame = _frame(1)
+        outputs = detector.run_batch(
+            [{"img": frame}, {"img": frame}, {"img": _frame(2)}]
+        )
+        assert detector.batch_sizes == [2]
+        assert outputs[0] is outputs[1]
+        assert [int(output["bboxes"][0, 0]) for output in outputs] == [1, 1, 2]
+        assert result_cache.get_stats() == {"model.detector": {"hits": 1, "misses": 2}}
+
+    @pytest.mark.parametrize("executor", ["sequential", "batched", "pipelined"])
+    def test_runner_reuses_outputs_of_repeated_frames(self, executor):
+        frame = _frame(1)
+        frames = [frame, frame, _frame(2), _frame(2), frame]
+        detector = BatchDetectorNode()
+        collector = CollectorNode()
+        runner = Runner(
+            nodes=[FramesNode(frames), detector, collector],
+            executor=executor,
+            cache_results=True,
+        )
+        runner.run()
+
+        assert detector.num_calls == 3
+        assert collector.bboxes == [1, 1, 2, 2, 3]
+        assert runner.result_cache.get_stats() == {
+            "model.detector": {"hits": 2, "misses": 3}
+        }
+
+    def test_runner_keeps_a_frame_per_stream(self):
+        detector = BatchDetectorNode()
+        input_node = StreamNode(
+            {
+                "input": ["none"],
+                "output": ["img", "pipeline_end"],
+                "source": 1,
+                "filename": "video.mp4",
+            }
+        )
+        runner = Runner(
+            nodes=[input_node, detector],
+            executor="multi_stream",
+            executor_config={"sources": [1, 2, 3]},
+            cache_results=True,
+        )
+        runner.run()
+
+        assert runner.result_cache.capacity == 3
+        assert detector.num_calls == 3
+        assert runner.result_cache.get_stats() == {
+            "model.detector": {"hits": 6, "misses": 3}
+        }
+
+    def test_runner_without_cache(self):
+        runner = Runner(nodes=[FramesNode([]), DetectorNode(), CollectorNode()])
+        assert runner.result_cache is None
@@ -0,0 +1,111 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from peekingduck.utils.roi import (
+    assign_rois,
+    crop_rois,
+    get_canvas_boxes,
+    get_roi_boxes,
+    map_points_to_frame,
+    paste_masks,
+)
+
+WIDTH, HEIGHT = 80, 60
+
+
+@pytest.fixture
+def frame():
+    return np.arange(HEIGHT * WIDTH * 3, dtype=np.uint32).reshape(HEIGHT, WIDTH, 3)
+
+
+class TestRoi:
+    def test_get_roi_boxes(self):
+        boxes = get_roi_boxes(
+            [[0.25, 0, 0.5, 0.5], [10, 20, 30, 200], [0, 0, 1, 1]], WIDTH, HEIGHT
+        )
+        npt.assert_equal(
+            boxes, [[20, 0, 40, 30], [10, 20, 30, HEIGHT], [0, 0, WIDTH, HEIGHT]]
+        )
+        assert boxes.dtype == np.int64
+
+    @pytest.mark.parametrize(
+        "roi, message",
+        [
+            ([0, 0, 10], "must be in (x1, y1, x2, y2) format"),
+            ([30, 10, 20, 40], "is empty"),
+            ([100, 10, 120, 40], "is empty"),
+        ],
+    )
+    def test_invalid_roi(self, roi, message):
+        with pytest.raises(ValueError) as excinfo:
+            get_roi_boxes([roi], WIDTH, HEIGHT)
+        assert message in str(excinfo.value)
+
+    def test_crop_single_roi_is_copy(self, frame):
+        crop = crop_rois(frame, np.array([[10, 5, 30, 25]]))
+        npt.assert_equal(crop, frame[5:25, 10:30])
+        assert not np.shares_memory(crop, frame)
+
+    def test_crop_multiple_rois(self, frame):
+        roi_boxes = np.array([[10, 5, 30, 25], [40, 0, 50, 40]])
+        crop = crop_rois(frame, roi_boxes)
+        npt.assert_equal(get_canvas_boxes(roi_boxes), [[0, 0, 20, 20], [20, 0, 30, 40]])
+        assert crop.shape == (40, 30, 3)
+        npt.assert_equal(crop[:20, :20], frame[5:25, 10:30])
+        npt.assert_equal(crop[:, 20:], frame[:40, 40:50])
+        npt.assert_equal(crop[20:, :20], 0)
+
+    def test_assign_rois(self):
+        canvas_boxes = np.array([[0, 0, 20, 20], [20, 0, 30, 40]])
+        npt.assert_equal(
+            assign_rois(np.array([[5, 5], [19.9, 30], [20, 0], [35, 0]]), canvas_boxes),
+            [0, 0, 1, 1],
+        )
+
+    def test_map_points_to_frame(self):
+        roi_boxes = np.array([[10, 5, 30, 25], [40, 0, 50, 40]])
+        canvas_boxes = get_canvas_boxes(roi_boxes)
+        # (x, y) pairs of two boxes in a 30x40 crop
+        points = np.array([[[0, 0], [0.5, 0.25]], [[2 / 3, 0.5], [1, 1]]])
+        mapped = map_points_to_frame(
+            points,
+            np.array([0, 1]),
+            roi_boxes,
+            canvas_boxes,
+            (30, 40),
+            (WIDTH, HEIGHT),
+        )
+        # the first box is clipped to its ROI
+        npt.assert_allclose(
+            mapped * [WIDTH, HEIGHT], [[[10, 5], [25, 15]], [[40, 20], [50, 40]]]
+        )
+
+    def test_paste_masks(self):
+        roi_boxes = np.array([[10, 5, 30, 25], [40, 0, 50, 40]])
+        masks = np.zeros((1, 40, 30), dtype=np.uint8)
+        masks[0, :, 20:] = 1
+        full_masks = paste_masks(
+            masks,
+            np.array([1]),
+            roi_boxes,
+            get_canvas_boxes(roi_boxes),
+            (WIDTH, HEIGHT),
+        )
+        assert full_masks.shape == (1, HEIGHT, WIDTH)
+        assert full_masks.sum() == 400
+        npt.assert_equal(full_masks[0, :40, 40:50], 1)
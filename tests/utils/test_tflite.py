@@ -0,0 +1,158 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+import tensorflow as tf
+from tensorflow.python.framework.convert_to_constants import (
+    convert_variables_to_constants_v2,
+)
+
+from peekingduck.utils.graph_functions import load_graph
+from peekingduck.utils.tflite import get_tflite_path, load_tflite_model
+
+MODEL_NODES = {"inputs": ["x:0"], "outputs": ["Identity:0", "Identity_1:0"]}
+
+
+class ConvNet(tf.Module):
+    def __init__(self):
+        super().__init__()
+        tf.random.set_seed(0)
+        self.conv_1 = tf.keras.layers.Conv2D(64, 3, padding="same")
+        self.conv_2 = tf.keras.layers.Conv2D(8, 3, padding="same")
+        self.conv_1.build((None, None, None, 3))
+        self.conv_2.build((None, None, None, 64))
+
+    def features(self, inputs):
+        return self.conv_2(tf.nn.relu(self.conv_1(inputs)))
+
+    @tf.function(
+        input_signature=[tf.TensorSpec([None, None, None, 3], tf.int32, name="image")]
+    )
+    def serve(self, image):
+        return {"y_out": self.features(tf.cast(image, tf.float32) / 255.0)}
+
+
+@pytest.fixture(name="frozen_graph_path")
+def fixture_frozen_graph_path(tmp_path):
+    model = ConvNet()
+    concrete_func = tf.function(
+        lambda x: (model.features(x), tf.reduce_mean(model.features(x), [1, 2]))
+    ).get_concrete_function(tf.TensorSpec([None, None, None, 3], name="x"))
+    graph_def = convert_variables_to_constants_v2(concrete_func).graph.as_graph_def()
+    tf.io.write_graph(graph_def, str(tmp_path), "model.pb", as_text=False)
+    return tmp_path / "model.pb"
+
+
+@pytest.fixture(name="saved_model_path")
+def fixture_saved_model_path(tmp_path):
+    model = ConvNet()
+    tf.saved_model.save(
+        model, str(tmp_path / "model"), signatures={"serving_default": model.serve}
+    )
+    return tmp_path / "model"
+
+
+class TestTFLite:
+    def test_get_tflite_path(self, frozen_graph_path):
+        path = get_tflite_path(frozen_graph_path, {"int8": False})
+
+        assert path.parent == frozen_graph_path.parent
+        assert path.name.startswith("model-tflite-")
+        assert path.suffix == ".tflite"
+        assert path == get_tflite_path(frozen_graph_path, {"int8": False})
+        assert get_tflite_path(frozen_graph_path, {"int8": True}).name.startswith(
+            "model-tflite-int8-"
+        )
+        with mock.patch.object(tf, "__version__", "0.0.0"):
+            assert path != get_tflite_path(frozen_graph_path, {"int8": False})
+        frozen_graph_path.write_bytes(b"")
+        assert path != get_tflite_path(frozen_graph_path, {"int8": False})
+
+    def test_frozen_graph(self, frozen_graph_path):
+        graph_func = load_graph(str(frozen_graph_path), **MODEL_NODES)
+        model = load_tflite_model(frozen_graph_path, 2, model_nodes=MODEL_NODES)
+
+        for shape in [(1, 32, 48, 3), (3, 16, 16, 3), (1, 32, 48, 3)]:
+            inputs = np.random.rand(*shape).astype(np.float32)
+            outputs = model(inputs)
+            expected = graph_func(tf.constant(inputs))
+
+            assert isinstance(outputs, list)
+            assert len(outputs) == 2
+            for output, expected_output in zip(outputs, expected):
+                assert isinstance(output, tf.Tensor)
+                npt.assert_allclose(output.numpy(), expected_output.numpy(), atol=1e-5)
+        npt.assert_equal(model(x=inputs)[0].numpy(), outputs[0].numpy())
+
+    def test_saved_model(self, saved_model_path):
+        signature = tf.saved_model.load(str(saved_model_path)).signatures[
+            "serving_default"
+        ]
+        model = load_tflite_model(saved_model_path, 2)
+
+        for shape in [(1, 32, 48, 3), (2, 16, 16, 3)]:
+            inputs = np.random.randint(0, 256, shape)
+            outputs = model(tf.constant(inputs, dtype=tf.int32))
+
+            assert list(outputs) == ["y_out"]
+            npt.assert_allclose(
+                outputs["y_out"].numpy(),
+                signature(tf.constant(inputs, dtype=tf.int32))["y_out"].numpy(),
+                atol=1e-5,
+            )
+        npt.assert_equal(model(image=inputs)["y_out"].numpy(), outputs["y_out"].numpy())
+
+    def test_int8(self, frozen_graph_path):
+        inputs = np.random.rand(1, 16, 16, 3).astype(np.float32)
+        float_model = load_tflite_model(frozen_graph_path, model_nodes=MODEL_NODES)
+        int8_model = load_tflite_model(
+            frozen_graph_path, int8=True, model_nodes=MODEL_NODES
+        )
+
+        float_path = get_tflite_path(
+            frozen_graph_path, {"int8": False, "nodes": MODEL_NODES}
+        )
+        int8_path = get_tflite_path(
+            frozen_graph_path, {"int8": True, "nodes": MODEL_NODES}
+        )
+        assert int8_path.stat().st_size < float_path.stat().st_size / 2
+        npt.assert_allclose(
+            int8_model(inputs)[0].numpy(), float_model(inputs)[0].numpy(), atol=0.05
+        )
+
+    def test_cached_model(self, saved_model_path):
+        with mock.patch.object(
+            tf.lite.TFLiteConverter,
+            "from_saved_model",
+            wraps=tf.lite.TFLiteConverter.from_saved_model,
+        ) as mock_from_saved_model:
+            load_tflite_model(saved_model_path)
+            load_tflite_model(saved_model_path)
+
+        assert mock_from_saved_model.call_count == 1
+        assert len(list(saved_model_path.parent.glob("model-tflite-*.tflite"))) == 1
+        assert list(saved_model_path.parent.glob("*.tmp")) == []
+
+    def test_reconvert_corrupted_model(self, saved_model_path):
+        tflite_path = get_tflite_path(saved_model_path, {"int8": False, "nodes": None})
+        tflite_path.write_bytes(b"corrupted")
+
+        model = load_tflite_model(saved_model_path)
+
+        assert list(model(np.zeros((1, 8, 8, 3)))) == ["y_out"]
+        assert tflite_path.read_bytes() != b"corrupted"
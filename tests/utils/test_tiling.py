@@ -0,0 +1,193 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from peekingduck.utils.tiling import (
+    TiledInference,
+    get_tiles,
+    merge_cut_detections,
+    merge_detections,
+)
+
+
+def detect_bright_pixels(images):
+    """Detects the bright pixels of each image as a single "person"."""
+    results = []
+    for image in images:
+        ys, xs = np.nonzero(image[:, :, 0] > 127)
+        if len(xs) == 0:
+            results.append((np.empty((0, 4)), np.empty(0), np.empty(0)))
+            continue
+        height, width = image.shape[:2]
+        bbox = [
+            xs.min() / width,
+            ys.min() / height,
+            xs.max() / width,
+            ys.max() / height,
+        ]
+        results.append((np.array([bbox]), np.array(["person"]), np.array([0.9])))
+    return results
+
+
+@pytest.fixture(name="image")
+def fixture_image():
+    image = np.zeros((2160, 3840, 3), dtype=np.uint8)
+    # a small object in the overlap between the first two tiles
+    image[100:130, 540:560] = 255
+    return image
+
+
+class TestTiling:
+    def test_get_tiles(self):
+        tiles = get_tiles(2160, 3840, 640, 0.2)
+
+        assert len(tiles) == 8 * 4
+        npt.assert_equal(tiles[:, 2] - tiles[:, 0], 640)
+        npt.assert_equal(tiles[:, 3] - tiles[:, 1], 640)
+        npt.assert_equal(tiles[1], [512, 0, 1152, 640])
+        npt.assert_equal(tiles[-1], [3200, 1520, 3840, 2160])
+        covered = np.zeros((2160, 3840), dtype=bool)
+        for x1, y1, x2, y2 in tiles:
+            covered[y1:y2, x1:x2] = True
+        assert covered.all()
+
+    def test_get_tiles_small_frame(self):
+        npt.assert_equal(get_tiles(480, 640, 640, 0.2), [[0, 0, 640, 480]])
+        npt.assert_equal(
+            get_tiles(480, 800, 640, 0.5), [[0, 0, 640, 480], [160, 0, 800, 480]]
+        )
+
+    @pytest.mark.parametrize("full_frame", [True, False])
+    def test_tiled_inference(self, image, full_frame):
+        predict_batch = mock.Mock(side_effect=detect_bright_pixels)
+        tiled_inference = TiledInference(predict_batch, 640, 0.2, full_frame, 0.5, 0.5)
+
+        bboxes, labels, scores = tiled_inference(image)
+
+        (images,), _ = predict_batch.call_args
+        assert predict_batch.call_count == 1
+        assert len(images) == 32 + full_frame
+        assert (images[-1] is image) == full_frame
+        # the duplicates from the overlapping tiles and full frame are merged
+        npt.assert_allclose(
+            bboxes, [[540 / 3840, 100 / 2160, 559 / 3840, 129 / 2160]], atol=1e-3
+        )
+        npt.assert_equal(labels, ["person"])
+        npt.assert_allclose(scores, [0.9])
+        assert bboxes.dtype == np.float32
+
+    @pytest.mark.parametrize("full_frame", [True, False])
+    def test_object_straddling_tiles(self, full_frame):
+        image = np.zeros((640, 1152, 3), dtype=np.uint8)
+        # wider than the overlap, so neither tile sees the whole object
+        image[100:130, 450:750] = 255
+        tiled_inference = TiledInference(
+            detect_bright_pixels, 640, 0.2, full_frame, 0.5, 0.5
+        )
+
+        bboxes, labels, _ = tiled_inference(image)
+
+        # the partial bboxes cut by the inner tile edges are merged
+        npt.assert_allclose(
+            bboxes, [[450 / 1152, 100 / 640, 749 / 1152, 129 / 640]], atol=1e-3
+        )
+        npt.assert_equal(labels, ["person"])
+
+    def test_tiled_inference_no_detections(self):
+        tiled_inference = TiledInference(detect_bright_pixels, 640, 0.2, True, 0.5, 0.5)
+
+        bboxes, labels, scores = tiled_inference(np.zeros((720, 1280, 3), np.uint8))
+
+        assert bboxes.shape == (0, 4)
+        assert labels.size == 0
+        assert scores.size == 0
+
+    def test_merge_detections(self):
+        bboxes = np.array(
+            [[0.1, 0.1, 0.3, 0.3], [0.1, 0.1, 0.31, 0.3], [0.1, 0.1, 0.3, 0.3]],
+            dtype=np.float32,
+        )
+        labels = np.array(["person", "person", "car"])
+        scores = np.array([0.5, 0.8, 0.6], dtype=np.float32)
+
+        merged_bboxes, merged_labels, merged_scores = merge_detections(
+            bboxes, labels, scores, 0.5
+        )
+
+        npt.assert_equal(merged_bboxes, bboxes[[1, 2]])
+        npt.assert_equal(merged_labels, ["person", "car"])
+        npt.assert_equal(merged_scores, scores[[1, 2]])
+
+    @pytest.mark.parametrize("full_frame", [True, False])
+    def test_overlapping_objects_in_one_tile(self, full_frame):
+        # a person standing in front of another person, in the first tile
+        people = np.array([[0.1, 0.1, 0.5, 0.9], [0.3, 0.5, 0.45, 0.8]])
+        people_px = people * [1152, 640, 1152, 640]
+        labels = np.array(["person", "person"])
+
+        def detect_people(images):
+            results = [
+                # the first tile
+                (people_px / 640, labels, np.array([0.9, 0.8])),
+                # the second tile, starting at x = 512, cuts both people
+                (
+                    (np.maximum(people_px, [512, 0, 512, 0]) - [512, 0, 512, 0]) / 640,
+                    labels,
+                    np.array([0.7, 0.6]),
+                ),
+            ]
+            if full_frame:
+                results.append((people, labels, np.array([0.85, 0.75])))
+            return results
+
+        image = np.zeros((640, 1152, 3), dtype=np.uint8)
+        tiled_inference = TiledInference(detect_people, 640, 0.2, full_frame, 0.5, 0.5)
+
+        bboxes, labels, scores = tiled_inference(image)
+
+        npt.assert_allclose(bboxes, people, atol=1e-3)
+        npt.assert_equal(labels, ["person", "person"])
+        npt.assert_allclose(scores, [0.9, 0.8])
+
+    def test_merge_cut_detections(self):
+        bboxes = np.array(
+            [
+                # a whole bbox from the full frame
+                [0.1, 0.1, 0.5, 0.3],
+                # the cut bbox of the same object in a tile
+                [0.3, 0.1, 0.5, 0.3],
+                # a whole bbox inside the first one, from another tile
+                [0.2, 0.15, 0.25, 0.25],
+                # a cut bbox of another class
+                [0.3, 0.1, 0.5, 0.3],
+            ],
+            dtype=np.float32,
+        )
+        labels = np.array(["person", "person", "person", "car"])
+        scores = np.array([0.6, 0.9, 0.8, 0.5], dtype=np.float32)
+        tile_ids = np.array([2, 0, 1, 0])
+        is_cut = np.array([False, True, False, True])
+
+        merged_bboxes, merged_labels, merged_scores = merge_cut_detections(
+            bboxes, labels, scores, tile_ids, is_cut, 0.5
+        )
+
+        npt.assert_equal(merged_bboxes, bboxes[[0, 2, 3]])
+        npt.assert_equal(merged_labels, ["person", "person", "car"])
+        npt.assert_equal(merged_scores, scores[[1, 2, 3]])
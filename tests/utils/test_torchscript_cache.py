@@ -0,0 +1,119 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import numpy.testing as npt
+import pytest
+import torch
+from torch import nn
+
+from peekingduck.utils.torchscript_cache import get_cache_path, load_or_compile
+
+
+class ConvNet(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.conv = nn.Conv2d(3, 8, 3, padding=1)
+        self.bn = nn.BatchNorm2d(8)
+
+    def forward(self, inputs):
+        return {"features": torch.relu(self.bn(self.conv(inputs)))}
+
+
+class Untraceable(nn.Module):
+    def forward(self, inputs):
+        return inputs.tolist()
+
+
+@pytest.fixture(name="weights_path")
+def fixture_weights_path(tmp_path):
+    weights_path = tmp_path / "model.pth"
+    torch.manual_seed(0)
+    torch.save(ConvNet().state_dict(), weights_path)
+    return weights_path
+
+
+@pytest.fixture(name="create_model")
+def fixture_create_model(weights_path):
+    def create_model():
+        model = ConvNet()
+        model.load_state_dict(torch.load(weights_path))
+        return model.eval()
+
+    return mock.Mock(side_effect=create_model)
+
+
+class TestTorchScriptCache:
+    def test_get_cache_path(self, weights_path):
+        cache_path = get_cache_path([weights_path], {"input_size": 416})
+
+        assert cache_path.parent == weights_path.parent
+        assert cache_path.name.startswith("model-torchscript-")
+        assert cache_path == get_cache_path([weights_path], {"input_size": 416})
+        assert cache_path != get_cache_path([weights_path], {"input_size": 320})
+        with mock.patch.object(torch, "__version__", "0.0.0"):
+            assert cache_path != get_cache_path([weights_path], {"input_size": 416})
+        config_path = weights_path.with_name("model.cfg")
+        config_path.write_text("[net]")
+        assert cache_path != get_cache_path(
+            [weights_path, config_path], {"input_size": 416}
+        )
+        torch.save({}, weights_path)
+        assert cache_path != get_cache_path([weights_path], {"input_size": 416})
+
+    @pytest.mark.parametrize("trace", [True, False])
+    def test_compile_and_load(self, weights_path, create_model, trace):
+        inputs = torch.rand(1, 3, 16, 16)
+        example_inputs = (inputs,) if trace else None
+        cache_path = get_cache_path([weights_path], {"trace": trace})
+        with torch.no_grad():
+            expected = create_model()(inputs)
+
+        compiled = load_or_compile(
+            cache_path, create_model, torch.device("cpu"), example_inputs
+        )
+        loaded = load_or_compile(
+            cache_path, create_model, torch.device("cpu"), example_inputs
+        )
+
+        assert cache_path.is_file()
+        assert create_model.call_count == 2
+        assert list(weights_path.parent.glob("*.tmp")) == []
+        for model in (compiled, loaded):
+            assert isinstance(model, torch.jit.ScriptModule)
+            with torch.no_grad():
+                npt.assert_allclose(
+                    model(inputs)["features"], expected["features"], atol=1e-5
+                )
+
+    def test_recompile_corrupted_cache(self, weights_path, create_model):
+        cache_path = get_cache_path([weights_path], {})
+        cache_path.write_bytes(b"corrupted")
+
+        model = load_or_compile(
+            cache_path, create_model, torch.device("cpu"), (torch.rand(1, 3, 8, 8),)
+        )
+
+        assert isinstance(model, torch.jit.ScriptModule)
+        assert isinstance(torch.jit.load(str(cache_path)), torch.jit.ScriptModule)
+
+    def test_fall_back_to_eager_model(self, tmp_path):
+        cache_path = tmp_path / "untraceable-torchscript.pt"
+        model = Untraceable()
+
+        compiled = load_or_compile(cache_path, lambda: model, torch.device("cpu"))
+
+        assert compiled is model
+        assert not cache_path.exists()
@@ -0,0 +1,144 @@
+# Copyright 2022 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import threading
+from unittest import mock
+
+import pytest
+
+from peekingduck.nodes.abstract_node import AbstractNode
+from peekingduck.nodes.input.utils.read import VideoThread
+from peekingduck.utils.tracer import PipelineTracer
+
+
+class MockedNode(AbstractNode):
+    def __init__(self, node_path):
+        super().__init__({"input": ["none"], "output": ["none"]}, node_path=node_path)
+
+    def run(self, inputs):
+        return {}
+
+
+def run_frame(nodes):
+    for node in nodes:
+        node.callback_list.on_run_begin({})
+        node.run({})
+        node.callback_list.on_run_end({})
+
+
+@pytest.fixture
+def nodes():
+    return [MockedNode("input.mocked"), MockedNode("model.mocked")]
+
+
+class TestPipelineTracer:
+    def test_invalid_max_spans(self, nodes):
+        with pytest.raises(ValueError) as excinfo:
+            PipelineTracer(nodes, max_spans=0)
+        assert "max_spans must be a positive integer" in str(excinfo.value)
+
+    def test_spans(self, nodes):
+        tracer = PipelineTracer(nodes)
+        tracer.attach()
+        for _ in range(3):
+            run_frame(nodes)
+
+        events = tracer.get_events()
+        metadata = [event for event in events if event["ph"] == "M"]
+        spans = [event for event in events if event["ph"] == "X"]
+        assert metadata == [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": mock.ANY,
+                "tid": threading.get_ident(),
+                "args": {"name": threading.current_thread().name},
+            }
+        ]
+        assert [(span["name"], span["args"]["frame"]) for span in spans] == [
+            ("input.mocked", 0),
+            ("model.mocked", 0),
+            ("input.mocked", 1),
+            ("model.mocked", 1),
+            ("input.mocked", 2),
+            ("model.mocked", 2),
+        ]
+        assert all(span["dur"] >= 0 for span in spans)
+        assert all(
+            prev["ts"] + prev["dur"] <= span["ts"]
+            for prev, span in zip(spans, spans[1:])
+        )
+
+    def test_one_span_per_batch(self, nodes):
+        tracer = PipelineTracer(nodes)
+        tracer.attach()
+        run_frame(nodes)
+        for _ in range(4):
+            nodes[1].callback_list.on_run_begin({})
+        for _ in range(4):
+            nodes[1].callback_list.on_run_end({})
+        run_frame(nodes[1:])
+
+        spans = [event for event in tracer.get_events() if event["ph"] == "X"]
+        assert [
+            (span["name"], span["args"]["frame"], span["args"]["batch_size"])
+            for span in spans
+        ] == [
+            ("input.mocked", 0, 1),
+            ("model.mocked", 0, 1),
+            ("model.mocked", 1, 4),
+            ("model.mocked", 5, 1),
+        ]
+
+    def test_max_spans(self, nodes):
+        tracer = PipelineTracer(nodes, max_spans=3)
+        tracer.attach()
+        for _ in range(3):
+            run_frame(nodes)
+
+        assert len(tracer.spans) == 3
+        assert tracer.spans[0][:2] == (1, 1)
+
+    def test_video_thread_queue_size(self, nodes):
+        videocap = mock.Mock(spec=VideoThread)
+        videocap.queue_size = 5
+        nodes[0].videocap = videocap
+        tracer = PipelineTracer(nodes)
+        tracer.attach()
+        run_frame(nodes)
+
+        counters = [event for event in tracer.get_events() if event["ph"] == "C"]
+        assert counters == [
+            {
+                "name": "input.mocked buffer",
+                "ph": "C",
+                "ts": mock.ANY,
+                "pid": mock.ANY,
+                "args": {"queue_size": 5},
+            }
+        ]
+
+    def test_write(self, nodes, tmp_path):
+        tracer = PipelineTracer(nodes)
+        tracer.attach()
+        run_frame(nodes)
+        output_path = tmp_path / "trace" / "trace.json"
+        tracer.write(output_path)
+
+        with open(output_path) as infile:
+            trace = json.load(infile)
+        assert trace["displayTimeUnit"] == "ms"
+        assert len(trace["traceEvents"]) == 3